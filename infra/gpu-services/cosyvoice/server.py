@@ -7,18 +7,33 @@ WebSocket 协议 (`/ws/synthesize`)
 客户端 → 服务端（JSON 文本帧）：
 - ``{"event": "start", "session_id": "<opt>", "language": "zh"|"en"|...,
      "speed": 1.0, "prompt_wav": "<opt path inside container>",
-     "prompt_text": "<opt>"}``
+     "prompt_text": "<opt>", "encoding": "<opt>", "sample_rate": <opt int>}``
   开始一段合成会话；可指定参考声纹 wav（zero-shot 克隆）；不传走默认 prompt。
+  ``encoding`` 请求下行编码：``pcm_s16le``（默认）、``mulaw`` / ``alaw``（G.711，
+  带宽减半）；``sample_rate`` 请求下行采样率：8000 / 16000 / 24000 或模型原生采样率
+  （缺省 = 原生）。服务端流式重采样 + 编码（``_OutputFormatter``），电话腿可以直接
+  拿 8 kHz μ-law / A-law，编排器不再逐帧转码。不认识的值回退原生采样率 /
+  pcm_s16le，以 ``audio_start`` 的 ``sample_rate`` / ``encoding`` 为准。
 - ``{"event": "text", "text": "...", "language": "zh"|"en", "is_final_segment": bool}``
   追加一段文本进合成队列。``is_final_segment=True`` 提示模型当前句末——本服务实现里
   我们就在收到该帧后把内部 generator 关掉触发 flush。
-- ``{"event": "stop"}`` 结束当前会话。
+  一个 WS 可以连续合成多句：每句从它的首个 text 帧起、到 ``is_final_segment`` 止，
+  按到达顺序分配递增的 ``utterance_id``（从 0 开始）并排队串行合成，receive 循环
+  不被合成阻塞。
+- ``{"event": "cancel", "utterance_id": <opt int>}`` 取消一句（barge-in）：排队中
+  的不再合成，正在合成的在下一个音频块处停止推理、让出 GPU 名额；缺省 ``utterance_id`` = 取消所有已收到、
+  未结束的句子。每句被取消的句子仍会收到 ``audio_end``（带 ``cancelled: true``），
+  会话保持可用。
+- ``{"event": "stop"}`` 合成完已排队的句子后结束会话。
 
 服务端 → 客户端：
-- 二进制帧：PCM int16 LE，单声道，采样率 = ``COSYVOICE_OUTPUT_SAMPLE_RATE``（默认 24kHz）
+- 二进制帧：单声道，采样率 = ``audio_start.sample_rate``（未协商时为模型原生，
+  默认 24kHz），编码 = ``audio_start.encoding``（PCM int16 LE / μ-law / A-law）
 - JSON 文本帧（仅控制信号 / 错误）：
-  - ``{"event": "audio_start", "sample_rate": 24000, "encoding": "pcm_s16le"}``
-  - ``{"event": "audio_end", "utterance_id": int, "text": "<合成的全文回显>"}``
+  - ``{"event": "audio_start", "sample_rate": 24000,
+       "encoding": "pcm_s16le"|"mulaw"|"alaw",
+       "utterance_id": int}``——其后的二进制帧都属于这一句，直到同 id 的 ``audio_end``
+  - ``{"event": "audio_end", "utterance_id": int, "cancelled": <opt true>}``
   - ``{"error": "<msg>", "fatal": bool}``
 
 设计取舍（best-effort，Phase 3 客户端再补）
@@ -51,6 +66,8 @@ TODO(phase-3)：客户端可在 ``start`` 帧里通过 ``prompt_lang`` 显式声
 from __future__ import annotations
 
 import asyncio
+import functools
+import hashlib
 import json
 import logging
 import os
@@ -60,8 +77,9 @@ import sys
 import threading
 import time
 import uuid
+from collections import OrderedDict, deque
 from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass, field
 from typing import Any, Iterator
 
@@ -96,6 +114,16 @@ DEFAULT_PROMPT_TEXT = os.getenv(
     "DEFAULT_PROMPT_TEXT", "希望你以后能够做的比我还好呦。"
 )
 GRACEFUL_TIMEOUT_SEC = float(os.getenv("GRACEFUL_TIMEOUT_SEC", "60"))
+# 非默认 prompt（自定义 prompt_wav / prompt_text）的特征缓存上限；ENTRIES=0 关闭
+PROMPT_CACHE_MAX_ENTRIES = int(os.getenv("PROMPT_CACHE_MAX_ENTRIES", "32"))
+PROMPT_CACHE_MAX_MB = float(os.getenv("PROMPT_CACHE_MAX_MB", "64"))
+# 出音前裁掉首块开头 / 末块结尾的近零样本（默认关：只测不裁，见 LEADING_SILENCE_MS）
+TRIM_SILENCE = os.getenv("TRIM_SILENCE", "0").lower() in ("1", "true", "yes")
+# 裁剪后在语音起止两侧各保留的静音，避免切掉轻声起音 / 尾音衰减
+TRIM_SILENCE_PAD_MS = float(os.getenv("TRIM_SILENCE_PAD_MS", "20"))
+# worker → event loop 每句最多积压的音频块；满了 worker 阻塞（背压），超时丢块
+AUDIO_HANDOFF_MAX_CHUNKS = int(os.getenv("AUDIO_HANDOFF_MAX_CHUNKS", "64"))
+AUDIO_HANDOFF_PUT_TIMEOUT_SEC = float(os.getenv("AUDIO_HANDOFF_PUT_TIMEOUT_SEC", "10"))
 
 
 # ---------------------------------------------------------------------------
@@ -165,12 +193,35 @@ LEADING_SILENCE_MS = Histogram(
     ["mode"],
     buckets=(0, 50, 100, 200, 400, 800, 1600),
 )
+TRIMMED_SILENCE_SECONDS = Counter(
+    "cosyvoice_trimmed_silence_seconds_total",
+    "Near-silent audio dropped before emitting (TRIM_SILENCE=1)",
+    ["edge"],
+)
 TOTAL_SYNTH_LATENCY = Histogram(
     "cosyvoice_total_synthesis_latency_seconds",
     "End-to-end synthesis duration",
     ["mode"],
     buckets=(0.2, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0),
 )
+AUDIO_HANDOFF_LATENCY = Histogram(
+    "cosyvoice_audio_handoff_latency_seconds",
+    "Time an audio chunk waits between the synthesis thread and the WS writer",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+EVENT_LOOP_LAG = Histogram(
+    "cosyvoice_event_loop_lag_seconds",
+    "Delay between a synthesis thread waking the event loop and the callback running",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+AUDIO_HANDOFF_BLOCKED_SECONDS = Counter(
+    "cosyvoice_audio_handoff_blocked_seconds_total",
+    "Time synthesis threads spent blocked on a full audio hand-off (backpressure)",
+)
+AUDIO_HANDOFF_DROPPED = Counter(
+    "cosyvoice_audio_handoff_dropped_total",
+    "Audio chunks dropped because the hand-off stayed full or the reader went away",
+)
 ACTIVE_SESSIONS = Gauge("cosyvoice_active_sessions", "Currently open WS sessions")
 QUEUE_DEPTH = Gauge(
     "cosyvoice_queue_depth", "Synthesis requests waiting on the GPU semaphore"
@@ -178,8 +229,44 @@ QUEUE_DEPTH = Gauge(
 GPU_MEM_BYTES = Gauge(
     "cosyvoice_gpu_memory_allocated_bytes", "torch.cuda.memory_allocated() snapshot"
 )
+UTTERANCES_CANCELLED = Counter(
+    "cosyvoice_utterances_cancelled_total",
+    "Utterances cancelled by the client (barge-in) while queued or synthesizing",
+)
+PROMPT_CACHE_HITS = Counter(
+    "cosyvoice_prompt_cache_hits_total",
+    "Zero-shot syntheses served from cached prompt features (default speaker included)",
+)
+PROMPT_CACHE_MISSES = Counter(
+    "cosyvoice_prompt_cache_misses_total",
+    "Zero-shot prompts whose features had to be extracted",
+)
+PROMPT_CACHE_EVICTIONS = Counter(
+    "cosyvoice_prompt_cache_evictions_total",
+    "Cached prompt features evicted by the entry / memory limits",
+)
+PROMPT_CACHE_ENTRIES = Gauge(
+    "cosyvoice_prompt_cache_entries", "Custom prompts with cached features"
+)
+PROMPT_CACHE_BYTES = Gauge(
+    "cosyvoice_prompt_cache_bytes", "Estimated tensor bytes held by cached prompt features"
+)
+CANCEL_GPU_SECONDS_SAVED = Counter(
+    "cosyvoice_cancel_gpu_seconds_saved_total",
+    "Estimated GPU seconds not spent because cancelled utterances stopped early",
+)
 AUDIO_BYTES_OUT = Counter(
-    "cosyvoice_audio_bytes_total", "Total PCM bytes streamed to clients"
+    "cosyvoice_audio_bytes_total",
+    "Total audio bytes streamed to clients, as sent on the wire (after link encoding)",
+)
+OUTPUT_FORMATS = Counter(
+    "cosyvoice_output_format_sessions_total",
+    "Sessions started per negotiated output sample rate and encoding",
+    ["sample_rate", "encoding"],
+)
+OUTPUT_TRANSCODE_SECONDS = Counter(
+    "cosyvoice_output_transcode_seconds_total",
+    "CPU time spent resampling / encoding audio into the negotiated output format",
 )
 
 
@@ -190,6 +277,8 @@ AUDIO_BYTES_OUT = Counter(
 class AppState:
     model: Any = None
     model_loaded: bool = False
+    # _load_model 里 add_zero_shot_spk(..., "default") 成功才走 "default" 快路径
+    default_spk_cached: bool = False
     gpu_available: bool = False
     shutdown_event: asyncio.Event = field(default_factory=asyncio.Event)
     inference_sem: asyncio.Semaphore = field(
@@ -315,6 +404,7 @@ def _load_model() -> Any:
             model.add_zero_shot_spk(
                 DEFAULT_PROMPT_TEXT, DEFAULT_PROMPT_WAV, "default"
             )
+            state.default_spk_cached = True
             log.info("default speaker cached")
     except Exception as exc:
         log.exception("failed to cache default speaker; falling back to per-call",
@@ -340,8 +430,11 @@ class _TextStreamBridge:
 
     def __init__(self) -> None:
         self._q: queue.Queue[Any] = queue.Queue()
+        # 已推入的字数；取消时用来估算没合成的部分
+        self.chars = 0
 
     def push_text(self, text: str) -> None:
+        self.chars += len(text)
         self._q.put(text)
 
     def close(self) -> None:
@@ -362,9 +455,345 @@ def _iter_bridge_text(bridge: _TextStreamBridge) -> Iterator[str]:
         yield item
 
 
+class _AudioHandoff:
+    """合成线程 → event loop 的有界音频通道（每句一个）。
+
+    早期实现每块都 ``run_coroutine_threadsafe(audio_q.put(...))`` 再阻塞等
+    ``fut.result()``：每块一次 event loop 往返，loop 一忙 GPU 线程就跟着停。这里：
+
+    - ``put`` 在线程侧加锁 append 到 deque，立即返回；只有 reader 正在等（deque
+      原本为空）时才 ``call_soon_threadsafe`` 唤醒一次，连发的块不再逐块打扰 loop。
+    - 背压是显式的：积压到 ``max_chunks`` 块时 ``put`` 在 ``threading.Condition``
+      上等 reader 取走，最多 ``put_timeout`` 秒，超时丢块（计入
+      ``cosyvoice_audio_handoff_dropped_total``）。结束哨兵 / 异常不占名额、不会丢。
+    - ``close()``（reader 不再读：WS 断开、超时取消）后 ``put`` 直接丢弃返回，
+      线程不会在一个没人读的队列上一块一块地等超时。
+    - 每块记入队时刻：``cosyvoice_audio_handoff_latency_seconds`` 是块在通道里
+      等了多久，``cosyvoice_event_loop_lag_seconds`` 是唤醒回调排队多久（loop 滞后）。
+    - ``formatter``（协商了非原生输出格式时）在线程侧把每块重采样 + 编码后再入队，
+      结束哨兵前先冲出重采样尾巴；转码不占 event loop。
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        max_chunks: int = AUDIO_HANDOFF_MAX_CHUNKS,
+        put_timeout: float = AUDIO_HANDOFF_PUT_TIMEOUT_SEC,
+        formatter: _OutputFormatter | None = None,
+    ) -> None:
+        self._loop = loop
+        self._formatter = formatter
+        self._max_chunks = max(1, max_chunks)
+        self._put_timeout = put_timeout
+        self._items: deque[tuple[float, Any]] = deque()
+        self._chunks = 0
+        self._cond = threading.Condition()
+        self._reader_waiting = False
+        self._closed = False
+        self._ready = asyncio.Event()
+
+    def put(self, item: Any) -> bool:
+        """线程侧投递。``bytes`` 受容量约束；``None`` / 异常总能投递。返回是否入队。"""
+        is_chunk = isinstance(item, (bytes, bytearray))
+        if self._formatter is not None and not self._closed:
+            if is_chunk:
+                item = self._formatter.feed(bytes(item))
+                if not item:
+                    return True
+            elif item is None:
+                formatter, self._formatter = self._formatter, None
+                tail = formatter.flush()
+                if tail:
+                    self.put(tail)
+        with self._cond:
+            if is_chunk and self._chunks >= self._max_chunks and not self._closed:
+                t0 = time.perf_counter()
+                self._cond.wait_for(
+                    lambda: self._closed or self._chunks < self._max_chunks,
+                    timeout=self._put_timeout,
+                )
+                AUDIO_HANDOFF_BLOCKED_SECONDS.inc(time.perf_counter() - t0)
+            if self._closed or (is_chunk and self._chunks >= self._max_chunks):
+                if is_chunk:
+                    AUDIO_HANDOFF_DROPPED.inc()
+                return False
+            now = time.perf_counter()
+            self._items.append((now, item))
+            self._chunks += is_chunk
+            wake = self._reader_waiting
+            self._reader_waiting = False
+        if wake:
+            try:
+                self._loop.call_soon_threadsafe(self._wake, now)
+            except RuntimeError:  # pragma: no cover - loop 已关闭
+                pass
+        return True
+
+    def _wake(self, scheduled_at: float) -> None:
+        EVENT_LOOP_LAG.observe(time.perf_counter() - scheduled_at)
+        self._ready.set()
+
+    async def get(self) -> Any:
+        """loop 侧取下一项（FIFO）。"""
+        while True:
+            with self._cond:
+                if self._items:
+                    queued_at, item = self._items.popleft()
+                    if isinstance(item, (bytes, bytearray)):
+                        self._chunks -= 1
+                        self._cond.notify()
+                    break
+                self._reader_waiting = True
+                self._ready.clear()
+            await self._ready.wait()
+        AUDIO_HANDOFF_LATENCY.observe(time.perf_counter() - queued_at)
+        return item
+
+    def close(self) -> None:
+        """reader 退出：之后的 ``put`` 直接丢弃，阻塞中的 ``put`` 立即返回。"""
+        with self._cond:
+            self._closed = True
+            self._items.clear()
+            self._chunks = 0
+            self._cond.notify_all()
+
+
+class _CancelToken:
+    """一句话的跨线程取消标志：event loop 侧 ``cancel()``，合成线程在块与块之间查。"""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class _SynthCostModel:
+    """估算被取消的句子省下的 GPU 秒（``cosyvoice_cancel_gpu_seconds_saved_total``）。
+
+    省下的 = (这句预计总时长 - 已合成时长) × RTF。两个系数都用完整合成的句子做
+    EWMA 在线校准：每字音频秒数按语种分开；RTF 只取 batch 路径（流式的墙钟时间
+    含等 LLM 出字，偏大）。冷启动用保守的初值。只是估算，用于看趋势。
+    """
+
+    def __init__(
+        self, alpha: float = 0.2, audio_s_per_char: float = 0.2, rtf: float = 0.5
+    ) -> None:
+        self._alpha = alpha
+        self._default_per_char = audio_s_per_char
+        self._per_char: dict[str, float] = {}
+        self._rtf = rtf
+        self._lock = threading.Lock()
+
+    def observe(
+        self, language: str, chars: int, audio_s: float, synth_s: float | None
+    ) -> None:
+        if chars <= 0 or audio_s <= 0:
+            return
+        a = self._alpha
+        with self._lock:
+            prev = self._per_char.get(language, self._default_per_char)
+            self._per_char[language] = (1 - a) * prev + a * audio_s / chars
+            if synth_s is not None:
+                self._rtf = (1 - a) * self._rtf + a * synth_s / audio_s
+
+    def saved_seconds(self, language: str, chars: int, audio_s: float) -> float:
+        with self._lock:
+            per_char = self._per_char.get(language, self._default_per_char)
+            return max(0.0, chars * per_char - audio_s) * self._rtf
+
+
+_SYNTH_COST = _SynthCostModel()
+# 取消后等合成线程退出的上限（一个 chunk 的推理 + 上游清理）
+_CANCEL_JOIN_TIMEOUT_SEC = 5.0
+
+
+def _close_iterator(iterator: Any) -> None:
+    """提前结束上游 generator：触发其 finally，停止后续 chunk 的 flow / hift 推理。"""
+    close = getattr(iterator, "close", None)
+    if close is None:
+        return
+    try:
+        close()
+    except Exception:  # pragma: no cover - 上游清理失败不影响收尾
+        log.exception("closing synthesis iterator failed")
+
+
+def _record_cancelled(
+    mode: str, *, language: str, chars: int, audio_s: float, session_id: str,
+    utterance_id: int,
+) -> None:
+    saved = _SYNTH_COST.saved_seconds(language, chars, audio_s)
+    CANCEL_GPU_SECONDS_SAVED.inc(saved)
+    SYNTH_TOTAL.labels(mode=mode, outcome="cancelled").inc()
+    log.info("synthesis cancelled", extra={
+        "mode": mode, "session_id": session_id, "utterance_id": utterance_id,
+        "audio_s": round(audio_s, 2), "gpu_s_saved_est": round(saved, 2),
+    })
+
+
 # ---------------------------------------------------------------------------
-# 单次合成：在 worker thread 里跑 CosyVoice 推理，把音频 chunk 推回 asyncio.Queue
+# 单次合成：在 worker thread 里跑 CosyVoice 推理，把音频 chunk 经 _AudioHandoff 推回 loop
 # ---------------------------------------------------------------------------
+def _mulaw_encode_table() -> np.ndarray:
+    """int16 → G.711 μ-law 的 65536 项表（按 uint16 位型索引）。
+
+    与编排器 ``vocalize.codec`` 同一定义（逐值等同 ``audioop.lin2ulaw``）。
+    """
+    x = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32) >> 2
+    mask = np.where(x < 0, 0x7F, 0xFF)
+    mag = np.minimum(np.abs(x), 8159) + 0x21
+    seg = np.maximum(np.floor(np.log2(mag)).astype(np.int32) - 5, 0)
+    uval = np.where(
+        seg >= 8, 0x7F, (np.minimum(seg, 7) << 4) | ((mag >> (seg + 1)) & 0x0F)
+    )
+    return (uval ^ mask).astype(np.uint8)
+
+
+def _alaw_encode_table() -> np.ndarray:
+    """int16 → G.711 A-law 的 65536 项表（同 ``vocalize.codec``，逐值等同 ``audioop.lin2alaw``）。"""
+    x = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32) >> 3
+    mask = np.where(x >= 0, 0xD5, 0x55)
+    mag = np.where(x >= 0, x, -x - 1)
+    seg = np.maximum(np.floor(np.log2(np.maximum(mag, 1))).astype(np.int32) - 4, 0)
+    aval = np.where(
+        seg >= 8,
+        0x7F,
+        (np.minimum(seg, 7) << 4) | ((mag >> np.maximum(seg, 1)) & 0x0F),
+    )
+    return (aval ^ mask).astype(np.uint8)
+
+
+_ENCODE_TABLES = {"mulaw": _mulaw_encode_table(), "alaw": _alaw_encode_table()}
+_LINK_ENCODINGS = ("pcm_s16le", "mulaw", "alaw")
+# start 帧可请求的下行采样率（另外总是接受模型原生采样率）
+_OUTPUT_SAMPLE_RATES = (8000, 16000, 24000)
+
+
+def _encode_pcm(encoding: str, pcm: bytes) -> bytes:
+    """int16 LE PCM → 下行链路编码（整块一次查表，无跨块状态）。"""
+    table = _ENCODE_TABLES.get(encoding)
+    if table is not None:
+        return table[np.frombuffer(pcm, dtype=np.uint16)].tobytes()
+    return pcm
+
+
+# 多相滤波器每侧的 sinc 过零点数：8 个时阻带 ~-80 dB（Kaiser β=8），24k→8k 每个
+# 输出样本 55 次乘加
+_RESAMPLE_ZERO_CROSSINGS = 8
+_RESAMPLE_KAISER_BETA = 8.0
+# 截止频率 = 较低一侧 Nyquist × 0.9，留过渡带（24k→8k 时通带到 3.6 kHz，覆盖电话频带）
+_RESAMPLE_ROLLOFF = 0.9
+
+
+@functools.lru_cache(maxsize=16)
+def _polyphase_bank(up: int, down: int) -> tuple[np.ndarray, int]:
+    """``up/down`` 有理重采样的多相滤波器组 ``(up, taps)`` 与群延迟（上采样域样本数）。
+
+    Kaiser 窗 sinc 低通，在上采样后的采样率上设计，增益 ``up`` 补偿插零。
+    第 ``p`` 相是原型滤波器的 ``h[p::up]``。
+    """
+    factor = max(up, down)
+    cutoff = _RESAMPLE_ROLLOFF * 0.5 / factor  # cycles / 上采样域样本
+    half = int(np.ceil(_RESAMPLE_ZERO_CROSSINGS / (2 * cutoff)))
+    n = np.arange(2 * half + 1, dtype=np.float64) - half
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(n.size, _RESAMPLE_KAISER_BETA)
+    h *= up
+    taps = -(-h.size // up)
+    padded = np.zeros(taps * up)
+    padded[: h.size] = h
+    return padded.reshape(taps, up).T.astype(np.float32).copy(), half
+
+
+class _StreamingResampler:
+    """有状态的流式 int16 重采样（有理比 ``dst/src``，多相 FIR，整块向量化）。
+
+    跨块保留最后 ``taps - 1`` 个输入样本与下一个输出样本的位置，任意切块的输出
+    与整段一次性重采样逐样本一致；按群延迟对齐，所以不引入额外延迟偏移，
+    ``flush()`` 补零冲出最后几个输出样本，总长 = ``ceil(输入长度 × dst / src)``。
+    """
+
+    def __init__(self, src_rate: int, dst_rate: int) -> None:
+        g = np.gcd(src_rate, dst_rate)
+        self._up = dst_rate // g
+        self._down = src_rate // g
+        self._bank, self._delay = _polyphase_bank(self._up, self._down)
+        taps = self._bank.shape[1]
+        self._offsets = np.arange(taps)
+        # 输入历史：buf[0] 对应全局输入样本 ``self._consumed - (taps - 1)``
+        self._history = np.zeros(taps - 1, dtype=np.float32)
+        self._consumed = 0
+        self._produced = 0
+
+    def feed(self, pcm: bytes) -> bytes:
+        x = np.frombuffer(pcm, dtype="<i2").astype(np.float32)
+        return self._process(x, limit=None)
+
+    def flush(self) -> bytes:
+        """补零冲出群延迟内的尾巴；之后不应再 ``feed``。"""
+        total = -(-self._consumed * self._up // self._down)
+        pad = np.zeros(self._delay // self._up + 2, dtype=np.float32)
+        return self._process(pad, limit=total)
+
+    def _process(self, x: np.ndarray, limit: int | None) -> bytes:
+        taps = self._bank.shape[1]
+        buf = np.concatenate((self._history, x))
+        base = self._consumed - (taps - 1)
+        self._consumed += x.size
+        # 输出 k 对应上采样域位置 k*down + delay，需要的最新输入是 pos // up
+        stop = -(-(self._consumed * self._up - self._delay) // self._down)
+        if limit is not None:
+            stop = min(stop, limit)
+        self._history = buf[buf.size - (taps - 1):] if taps > 1 else buf[:0]
+        if stop <= self._produced:
+            return b""
+        pos = np.arange(self._produced, stop, dtype=np.int64) * self._down + self._delay
+        self._produced = stop
+        phase = pos % self._up
+        idx = (pos // self._up - base)[:, None] - self._offsets[None, :]
+        y = np.einsum("kt,kt->k", self._bank[phase], buf[idx])
+        return np.clip(np.rint(y), -32768, 32767).astype("<i2").tobytes()
+
+
+class _OutputFormatter:
+    """一句话的下行格式转换：模型原生 PCM →（重采样）→ 协商的编码。
+
+    在合成线程里由 ``_AudioHandoff.put`` 调用，event loop 只转发现成的字节。
+    """
+
+    def __init__(self, src_rate: int, dst_rate: int, encoding: str) -> None:
+        self._resampler = (
+            _StreamingResampler(src_rate, dst_rate) if src_rate != dst_rate else None
+        )
+        self._encoding = encoding
+
+    @classmethod
+    def for_session(cls, sess: Session) -> _OutputFormatter | None:
+        """原生采样率 + PCM 时返回 None（零拷贝直通）。"""
+        src = state.sample_rate
+        dst = sess.sample_rate or src
+        if dst == src and sess.encoding == "pcm_s16le":
+            return None
+        return cls(src, dst, sess.encoding)
+
+    def feed(self, pcm: bytes) -> bytes:
+        t0 = time.perf_counter()
+        if self._resampler is not None:
+            pcm = self._resampler.feed(pcm)
+        out = _encode_pcm(self._encoding, pcm)
+        OUTPUT_TRANSCODE_SECONDS.inc(time.perf_counter() - t0)
+        return out
+
+    def flush(self) -> bytes:
+        if self._resampler is None:
+            return b""
+        return _encode_pcm(self._encoding, self._resampler.flush())
+
+
 def _audio_tensor_to_pcm_bytes(t: Any) -> bytes:
     """torch.Tensor float32 → int16 LE bytes（mono）。
 
@@ -378,37 +807,142 @@ def _audio_tensor_to_pcm_bytes(t: Any) -> bytes:
     return pcm.tobytes()
 
 
+# |s| < 32 ≈ 0.1% of int16 max — covers DC bias / model warmup noise without
+# false positives on quiet speech.
+_SILENCE_THRESHOLD = 32
+
+
+def _audible(samples: np.ndarray) -> np.ndarray:
+    """逐样本是否高于静音阈值（两侧比较而非 ``abs``：int16 的 -32768 取绝对值会溢出）。"""
+    return (samples >= _SILENCE_THRESHOLD) | (samples <= -_SILENCE_THRESHOLD)
+
+
+def _leading_silent_samples(pcm: bytes) -> int:
+    """int16 PCM 开头连续近零样本数；全静音返回总样本数。"""
+    loud = _audible(np.frombuffer(pcm, dtype=np.int16))
+    first = int(loud.argmax()) if loud.size else 0
+    return first if loud.size and loud[first] else loud.size
+
+
+def _probe_leading_silence(
+    pcm: bytes, *, mode: str, session_id: str, utterance_id: int
+) -> None:
+    """首块开头静音打点（日志 + ``LEADING_SILENCE_MS``）；量的是模型原始输出，裁剪前。
+
+    Duration is computed against state.sample_rate (model-reported SR set in
+    _load_model — falls back to env default if missing).
+    """
+    try:
+        leading = _leading_silent_samples(pcm)
+        sr_hz = state.sample_rate or COSYVOICE_OUTPUT_SAMPLE_RATE
+        leading_silence_ms = (leading * 1000.0) / sr_hz
+        log.info(
+            "first_chunk_leading_silence",
+            extra={
+                "mode": mode,
+                "session_id": session_id,
+                "utterance_id": utterance_id,
+                "leading_samples": leading,
+                "leading_silence_ms": round(leading_silence_ms, 1),
+            },
+        )
+        LEADING_SILENCE_MS.labels(mode=mode).observe(leading_silence_ms)
+    except Exception:  # pragma: no cover - probe must never abort synthesis
+        log.exception("leading-silence probe failed; continuing")
+
+
+class _SilenceTrimmer:
+    """一句话的 int16 PCM 流：去掉语音前 / 后的近零样本，两侧各留 ``pad_samples``。
+
+    - 开头：第一个可闻样本之前的静音丢掉（跨块也算——首块整块静音则整块不发）。
+    - 结尾：每块末尾的静音先扣住；后面还有可闻音频就原样补回（句中停顿不受影响），
+      ``flush()`` 时说明它是句尾，只留 pad。扣住的只是静音，不推迟任何可闻样本。
+    """
+
+    def __init__(self, sample_rate: int, pad_ms: float) -> None:
+        self._sample_rate = sample_rate
+        self._pad_bytes = 2 * max(0, int(sample_rate * pad_ms / 1000))
+        self._started = False
+        self._held = b""
+
+    @classmethod
+    def from_env(cls) -> "_SilenceTrimmer | None":
+        if not TRIM_SILENCE:
+            return None
+        return cls(state.sample_rate or COSYVOICE_OUTPUT_SAMPLE_RATE, TRIM_SILENCE_PAD_MS)
+
+    def _drop(self, edge: str, nbytes: int) -> None:
+        if nbytes > 0:
+            TRIMMED_SILENCE_SECONDS.labels(edge=edge).inc(
+                nbytes / 2 / self._sample_rate
+            )
+
+    def feed(self, pcm: bytes) -> bytes:
+        """返回现在可以发出的音频（可能为空）。"""
+        loud = np.flatnonzero(_audible(np.frombuffer(pcm, dtype=np.int16)))
+        if not loud.size:
+            self._held += pcm
+            if not self._started and len(self._held) > self._pad_bytes:
+                cut = len(self._held) - self._pad_bytes
+                self._drop("leading", cut)
+                self._held = self._held[cut:]
+            return b""
+        head, tail = 2 * int(loud[0]), 2 * (int(loud[-1]) + 1)
+        if self._started:
+            out = self._held + pcm[:tail]
+        else:
+            lead = self._held + pcm[:head]
+            cut = max(0, len(lead) - self._pad_bytes)
+            self._drop("leading", cut)
+            out = lead[cut:] + pcm[head:tail]
+            self._started = True
+        self._held = pcm[tail:]
+        return out
+
+    def flush(self) -> bytes:
+        """句子结束：扣住的尾部静音只留 pad。"""
+        if not self._started:
+            # 整句都是静音：什么也不发
+            self._drop("leading", len(self._held))
+            self._held = b""
+            return b""
+        tail = self._held[:self._pad_bytes]
+        self._drop("trailing", len(self._held) - len(tail))
+        self._held = b""
+        return tail
+
+
 def _run_synth_thread(
     bridge: _TextStreamBridge,
-    audio_q: "asyncio.Queue[Any]",
-    loop: asyncio.AbstractEventLoop,
+    handoff: _AudioHandoff,
+    token: _CancelToken,
     *,
     mode: str,
+    language: str = "zh",
     prompt_wav: str,
     prompt_text: str,
     speed: float,
     session_id: str = "",
     utterance_id: int = 0,
 ) -> None:
-    """同步 worker：跑 CosyVoice，把每个 chunk 通过 audio_q 投回 event loop。
+    """同步 worker：跑 CosyVoice，把每个 chunk 通过 ``handoff`` 投回 event loop。
 
-    任一异常 → 把异常对象 put 进 audio_q；async 侧识别后回错误帧。
-    完成后 put None 作为结束哨兵。
+    任一异常 → 把异常对象 put 进 ``handoff``；async 侧识别后回错误帧。
+    完成后 put None 作为结束哨兵。``token`` 被取消（barge-in / 断开）时在下一个
+    chunk 处关掉上游 iterator 提前结束，不再为没人听的音频占 GPU。
 
     Phase 4 Wave 1: ``session_id`` and ``utterance_id`` are passed in only for
     log context — they let the leading-silence log line be correlated with the
     matching audio_end frame on the client side without changing the worker's
     runtime behavior.
     """
-    def _put(item: Any) -> None:
-        # call_soon_threadsafe 不带 future；改用 run_coroutine_threadsafe + 完成后丢弃
-        # 这里 audio_q.put 是 awaitable，要走 coroutine 路径
-        fut = asyncio.run_coroutine_threadsafe(audio_q.put(item), loop)
-        try:
-            fut.result(timeout=10.0)
-        except Exception:  # pragma: no cover - 防止 loop 已关闭时阻塞
-            pass
+    _put = handoff.put
 
+    if token.cancelled:
+        _record_cancelled(mode, language=language, chars=bridge.chars, audio_s=0.0,
+                          session_id=session_id, utterance_id=utterance_id)
+        _put(None)
+        return
     try:
         if mode == "cross_lingual":
             # 不带 prompt_text；inference_cross_lingual(tts_text_or_gen, prompt_wav)
@@ -421,71 +955,52 @@ def _run_synth_thread(
                 speed=speed,
             )
         else:
-            # Phase 4 Wave 2 Fix #3: when prompt matches the cached default,
-            # call inference_zero_shot with zero_shot_spk_id="default" to skip
-            # frontend tensor extraction (~0.1 s warm savings per RESEARCH).
-            if (
-                prompt_wav == DEFAULT_PROMPT_WAV
-                and prompt_text == DEFAULT_PROMPT_TEXT
-            ):
-                iterator = state.model.inference_zero_shot(
-                    _iter_bridge_text(bridge),
-                    "",
-                    "",
-                    zero_shot_spk_id="default",
-                    stream=True,
-                    speed=speed,
-                )
-            else:
-                iterator = state.model.inference_zero_shot(
-                    _iter_bridge_text(bridge),
-                    prompt_text,
-                    _load_prompt_wav(prompt_wav),
-                    stream=True,
-                    speed=speed,
-                )
+            # Phase 4 Wave 2 Fix #3 + prompt feature cache: cached speakers
+            # (default or custom) skip frontend tensor extraction.
+            iterator = _zero_shot_iterator(
+                _iter_bridge_text(bridge),
+                prompt_wav,
+                prompt_text,
+                stream=True,
+                speed=speed,
+            )
+        trimmer = _SilenceTrimmer.from_env()
         first = True
+        samples = 0
         t0 = time.perf_counter()
         for output in iterator:
+            if token.cancelled:
+                break
             chunk = output.get("tts_speech") if isinstance(output, dict) else None
             if chunk is None:
                 continue
             pcm = _audio_tensor_to_pcm_bytes(chunk)
+            samples += len(pcm) // 2
             if first:
                 FIRST_AUDIO_LATENCY.labels(mode=mode).observe(time.perf_counter() - t0)
                 # Phase 4 Wave 1: leading-silence probe (CONCERNS.md hyp #3).
-                # Count near-zero int16 samples at the head of the first chunk
-                # (|s| < 32 ≈ 0.1% of int16 max — covers DC bias / model
-                # warmup noise without false positives on quiet speech).
-                # Duration is computed against state.sample_rate (model-reported
-                # SR set in _load_model — falls back to env default if missing).
-                try:
-                    samples = np.frombuffer(pcm, dtype=np.int16)
-                    leading = 0
-                    for s in samples:
-                        if abs(int(s)) < 32:
-                            leading += 1
-                        else:
-                            break
-                    sr_hz = state.sample_rate or COSYVOICE_OUTPUT_SAMPLE_RATE
-                    leading_silence_ms = (leading * 1000.0) / sr_hz
-                    log.info(
-                        "first_chunk_leading_silence",
-                        extra={
-                            "mode": mode,
-                            "session_id": session_id,
-                            "utterance_id": utterance_id,
-                            "leading_samples": leading,
-                            "leading_silence_ms": round(leading_silence_ms, 1),
-                        },
-                    )
-                    LEADING_SILENCE_MS.labels(mode=mode).observe(leading_silence_ms)
-                except Exception:  # pragma: no cover - probe must never abort synthesis
-                    log.exception("leading-silence probe failed; continuing")
+                _probe_leading_silence(
+                    pcm, mode=mode, session_id=session_id, utterance_id=utterance_id
+                )
                 first = False
-            _put(pcm)
+            if trimmer is not None:
+                pcm = trimmer.feed(pcm)
+            if pcm:
+                _put(pcm)
+        audio_s = samples / (state.sample_rate or COSYVOICE_OUTPUT_SAMPLE_RATE)
+        if token.cancelled:
+            _close_iterator(iterator)
+            _record_cancelled(mode, language=language, chars=bridge.chars,
+                              audio_s=audio_s, session_id=session_id,
+                              utterance_id=utterance_id)
+            return
+        if trimmer is not None:
+            tail = trimmer.flush()
+            if tail:
+                _put(tail)
         TOTAL_SYNTH_LATENCY.labels(mode=mode).observe(time.perf_counter() - t0)
         SYNTH_TOTAL.labels(mode=mode, outcome="ok").inc()
+        _SYNTH_COST.observe(language, bridge.chars, audio_s, None)
     except Exception as exc:
         SYNTH_TOTAL.labels(mode=mode, outcome="error").inc()
         log.exception("synthesis worker failed", extra={"err": str(exc), "mode": mode})
@@ -516,7 +1031,9 @@ def _load_prompt_wav(path: str) -> str:
     soundfile 会抛 TypeError("Invalid file: tensor([[...]])")。
 
     所以正确契约是：传**文件路径字符串**，让上游自己 torchaudio.load + resample。
-    我们这里只做一次存在性验证，不做缓存（CosyVoice 内部会重复读，省不掉）。
+    我们这里只做一次存在性验证。每句重复读 wav + 提特征的开销由 zero-shot 路径上的
+    ``_PromptFeatureCache`` 省掉（缓存的是上游提好的特征，不是 wav tensor）；
+    cross_lingual 仍按句传路径。
     """
     if path in _VERIFIED_PROMPT_PATHS:
         return path
@@ -526,6 +1043,180 @@ def _load_prompt_wav(path: str) -> str:
     return path
 
 
+def _tensor_nbytes(value: Any) -> int:
+    """粗估 spk2info 条目占用：torch tensor 按 numel × element_size，其余忽略。"""
+    try:
+        return int(value.numel()) * int(value.element_size())
+    except Exception:
+        return 0
+
+
+class _PromptFeatureCache:
+    """自定义 zero-shot prompt 的特征 LRU（默认 prompt 之外的音色）。
+
+    上游 ``add_zero_shot_spk(prompt_text, wav, spk_id)`` 把 speech token / speaker
+    embedding / speech feat 提好存进 ``model.frontend.spk2info[spk_id]``；之后
+    ``inference_zero_shot(..., zero_shot_spk_id=spk_id)`` 直接展开 dict、跳过 frontend。
+    这里给任意 (wav, prompt_text) 分配一个 spk_id 并按 LRU 管理：
+
+    - key = sha256(wav 内容) + sha256(prompt_text)：同一音色换路径 / 挂卷仍命中；
+      wav 的摘要按 (path, mtime_ns, size) 记住，每句只多一次 ``stat``
+    - 条目数 ≤ ``max_entries``，估算字节 ≤ ``max_bytes``；淘汰时从 spk2info 删掉。
+      正在被推理引用（``lease`` 未退出）的条目不淘汰，保证上游读 spk2info 时还在
+    - 所有方法在推理线程里调用；一把锁护住索引，miss 的提取也在锁内——并发的同一
+      prompt 只提一次（其余等它，然后命中）
+    - 模型没有 ``add_zero_shot_spk`` / ``frontend.spk2info`` 或提取失败 → ``None``，
+      调用方退回每句传 wav 的老路径
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> (spk_id, nbytes)，按最近使用排序
+        self._entries: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self._in_use: dict[str, int] = {}
+        self._bytes = 0
+        self._digests: dict[tuple[str, int, int], str] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0 and self._max_bytes > 0
+
+    def _file_digest(self, path: str) -> str:
+        st = os.stat(path)
+        stamp = (path, st.st_mtime_ns, st.st_size)
+        digest = self._digests.get(stamp)
+        if digest is None:
+            h = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 16), b""):
+                    h.update(block)
+            digest = h.hexdigest()
+            self._digests[stamp] = digest
+        return digest
+
+    def _spk2info(self) -> dict[str, Any] | None:
+        frontend = getattr(state.model, "frontend", None)
+        spk2info = getattr(frontend, "spk2info", None)
+        if not isinstance(spk2info, dict) or not hasattr(state.model, "add_zero_shot_spk"):
+            return None
+        return spk2info
+
+    def _acquire(self, prompt_wav: str, prompt_text: str) -> tuple[str, str] | None:
+        """返回 (key, spk_id) 并把条目标记为使用中；不可用时 ``None``。"""
+        spk2info = self._spk2info()
+        if spk2info is None:
+            return None
+        with self._lock:
+            key = hashlib.sha256(
+                f"{self._file_digest(prompt_wav)}\0{prompt_text}".encode()
+            ).hexdigest()
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] in spk2info:
+                self._entries.move_to_end(key)
+                PROMPT_CACHE_HITS.inc()
+            else:
+                PROMPT_CACHE_MISSES.inc()
+                spk_id = f"p_{key[:16]}"
+                t0 = time.perf_counter()
+                try:
+                    state.model.add_zero_shot_spk(prompt_text, prompt_wav, spk_id)
+                except Exception as exc:
+                    log.warning("prompt feature extraction failed; per-call fallback",
+                                extra={"prompt_wav": prompt_wav, "err": str(exc)})
+                    return None
+                nbytes = sum(_tensor_nbytes(v) for v in spk2info.get(spk_id, {}).values())
+                if entry is not None:
+                    self._bytes -= entry[1]
+                entry = (spk_id, nbytes)
+                self._entries[key] = entry
+                self._bytes += nbytes
+                log.info("prompt features cached", extra={
+                    "prompt_wav": prompt_wav, "spk_id": spk_id, "bytes": nbytes,
+                    "extract_ms": round((time.perf_counter() - t0) * 1000, 1),
+                })
+            self._in_use[key] = self._in_use.get(key, 0) + 1
+            self._evict(spk2info)
+            return key, entry[0]
+
+    def _release(self, key: str) -> None:
+        with self._lock:
+            left = self._in_use.pop(key, 1) - 1
+            if left > 0:
+                self._in_use[key] = left
+            spk2info = self._spk2info()
+            if spk2info is not None:
+                self._evict(spk2info)
+
+    def _evict(self, spk2info: dict[str, Any]) -> None:
+        for key in list(self._entries):
+            if (
+                len(self._entries) <= self._max_entries
+                and self._bytes <= self._max_bytes
+            ):
+                break
+            if key in self._in_use:
+                continue
+            spk_id, nbytes = self._entries.pop(key)
+            spk2info.pop(spk_id, None)
+            self._bytes -= nbytes
+            PROMPT_CACHE_EVICTIONS.inc()
+        PROMPT_CACHE_ENTRIES.set(len(self._entries))
+        PROMPT_CACHE_BYTES.set(self._bytes)
+
+    @contextmanager
+    def lease(self, prompt_wav: str, prompt_text: str) -> Iterator[str | None]:
+        """给出可传 ``zero_shot_spk_id`` 的 spk_id；``None`` 表示走每句提取。"""
+        if not self.enabled:
+            yield None
+            return
+        acquired = self._acquire(prompt_wav, prompt_text)
+        if acquired is None:
+            yield None
+            return
+        key, spk_id = acquired
+        try:
+            yield spk_id
+        finally:
+            self._release(key)
+
+
+_PROMPT_FEATURES = _PromptFeatureCache(
+    PROMPT_CACHE_MAX_ENTRIES, int(PROMPT_CACHE_MAX_MB * 1024 * 1024)
+)
+
+
+def _zero_shot_iterator(
+    text: Any, prompt_wav: str, prompt_text: str, *, stream: bool, speed: float
+) -> Iterator[Any]:
+    """``inference_zero_shot`` 的统一入口：能用缓存的 spk_id 就用，否则每句传 wav。
+
+    默认 prompt 用 ``_load_model`` 里注册的 ``"default"``（常驻、不计入 LRU）；
+    其余 prompt 经 ``_PROMPT_FEATURES``。生成器结束 / 被关闭时才释放 lease。
+    """
+    _load_prompt_wav(prompt_wav)
+    if (
+        state.default_spk_cached
+        and prompt_wav == DEFAULT_PROMPT_WAV
+        and prompt_text == DEFAULT_PROMPT_TEXT
+    ):
+        PROMPT_CACHE_HITS.inc()
+        yield from state.model.inference_zero_shot(
+            text, "", "", zero_shot_spk_id="default", stream=stream, speed=speed
+        )
+        return
+    with _PROMPT_FEATURES.lease(prompt_wav, prompt_text) as spk_id:
+        if spk_id is not None:
+            yield from state.model.inference_zero_shot(
+                text, "", "", zero_shot_spk_id=spk_id, stream=stream, speed=speed
+            )
+        else:
+            yield from state.model.inference_zero_shot(
+                text, prompt_text, prompt_wav, stream=stream, speed=speed
+            )
+
+
 # ---------------------------------------------------------------------------
 # WebSocket 处理
 # ---------------------------------------------------------------------------
@@ -536,9 +1227,43 @@ class Session:
     prompt_wav: str = DEFAULT_PROMPT_WAV
     prompt_text: str = DEFAULT_PROMPT_TEXT
     speed: float = 1.0
+    # 下行二进制帧的链路编码 / 采样率（start 帧协商；0 = 模型原生采样率）
+    encoding: str = "pcm_s16le"
+    sample_rate: int = 0
+    # 下一句的 utterance_id：按收到首个 text 帧的顺序分配，整个 WS 内单调递增
     utterance_id: int = 0
 
 
+@dataclass
+class _Utterance:
+    """会话内排队的一句话。``text`` 非 None 走 batch 路径，否则走 ``bridge`` 流式。"""
+
+    utterance_id: int
+    text: str | None = None
+    bridge: _TextStreamBridge | None = None
+    # ``cancel`` 事件 / 断开 / 超时置位：排队中的直接跳过；在合成中的由线程在下一个
+    # chunk 处停下，剩余音频丢弃
+    token: _CancelToken = field(default_factory=_CancelToken)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token.cancelled
+
+    def cancel(self) -> None:
+        self.token.cancel()
+
+
+def _negotiate_sample_rate(requested: Any) -> int:
+    """start 帧的 ``sample_rate`` → 会话输出采样率；0 = 原生（缺省 / 不支持的值）。"""
+    try:
+        rate = int(requested or 0)
+    except (TypeError, ValueError):
+        return 0
+    if rate == state.sample_rate or rate not in _OUTPUT_SAMPLE_RATES:
+        return 0
+    return rate
+
+
 async def _emit_json(ws: WebSocket, payload: dict[str, Any]) -> None:
     if ws.client_state != WebSocketState.CONNECTED:
         return
@@ -546,12 +1271,33 @@ async def _emit_json(ws: WebSocket, payload: dict[str, Any]) -> None:
 
 
 async def _emit_bytes(ws: WebSocket, data: bytes) -> None:
+    """写出已是协商格式的音频（转换在合成线程侧的 ``_OutputFormatter`` 里完成）。"""
     if ws.client_state != WebSocketState.CONNECTED:
         return
     AUDIO_BYTES_OUT.inc(len(data))
     await ws.send_bytes(data)
 
 
+async def _emit_audio_start(
+    ws: WebSocket, sess: Session, utt: _Utterance, mode: str
+) -> None:
+    await _emit_json(ws, {
+        "event": "audio_start",
+        "sample_rate": sess.sample_rate or state.sample_rate,
+        "encoding": sess.encoding,
+        "channels": 1,
+        "utterance_id": utt.utterance_id,
+        "mode": mode,
+    })
+
+
+async def _emit_audio_end(ws: WebSocket, utt: _Utterance) -> None:
+    payload: dict[str, Any] = {"event": "audio_end", "utterance_id": utt.utterance_id}
+    if utt.cancelled:
+        payload["cancelled"] = True
+    await _emit_json(ws, payload)
+
+
 def _select_mode(sess: Session) -> str:
     """决定走 zero_shot 还是 cross_lingual。
 
@@ -563,16 +1309,56 @@ def _select_mode(sess: Session) -> str:
     return "zero_shot" if sess.prompt_text else "cross_lingual"
 
 
+async def _pump_audio(
+    ws: WebSocket, sess: Session, utt: _Utterance, handoff: _AudioHandoff
+) -> bool:
+    """把合成线程交出的音频写到 WS，直到结束哨兵（异常项回错误帧后也算结束）。
+
+    返回 True。写 WS 失败 / 任务被取消时异常向上抛，调用方据此取消合成。
+    已取消的句子继续读到哨兵，只是不再写音频。
+    """
+    while True:
+        item = await handoff.get()
+        if item is None:
+            return True
+        if isinstance(item, BaseException):
+            await _emit_json(ws, {
+                "error": f"synthesis failed: {item}",
+                "fatal": False,
+            })
+            return True
+        if isinstance(item, (bytes, bytearray)) and not utt.cancelled:
+            await _emit_bytes(ws, bytes(item))
+
+
+async def _abort_synth_thread(worker: threading.Thread, utt: _Utterance) -> None:
+    """reader 提前退出时取消合成线程，并在 GPU 名额内等它退出。
+
+    线程只在 chunk 之间查 token，一个 chunk 的推理打断不了；最多等
+    ``_CANCEL_JOIN_TIMEOUT_SEC``，仍未退出就放手（回到旧行为：线程自己跑完）。
+    """
+    utt.cancel()
+    if not worker.is_alive():
+        return
+    await asyncio.shield(asyncio.to_thread(worker.join, _CANCEL_JOIN_TIMEOUT_SEC))
+    if worker.is_alive():
+        log.warning("synthesis thread still running after cancel; releasing slot",
+                    extra={"utterance_id": utt.utterance_id})
+
+
 async def _run_synth_session(
-    ws: WebSocket, sess: Session, bridge: _TextStreamBridge
+    ws: WebSocket, sess: Session, utt: _Utterance
 ) -> None:
     """协调 worker thread 与 WS：
     - 启 worker（在信号量保护下）
-    - 监听 audio_q → 写 bytes / 错误处理
+    - 监听 handoff → 写 bytes / 错误处理
     - 退出条件：worker put None；或 ws 断开
     """
-    audio_q: asyncio.Queue[Any] = asyncio.Queue(maxsize=64)
-    loop = asyncio.get_running_loop()
+    assert utt.bridge is not None
+    bridge = utt.bridge
+    handoff = _AudioHandoff(
+        asyncio.get_running_loop(), formatter=_OutputFormatter.for_session(sess)
+    )
     mode = _select_mode(sess)
 
     state.queue_depth += 1
@@ -583,52 +1369,41 @@ async def _run_synth_session(
             state.queue_depth -= 1
             QUEUE_DEPTH.set(state.queue_depth)
             decremented = True
+            if utt.cancelled:
+                await _emit_audio_end(ws, utt)
+                return
 
-            await _emit_json(ws, {
-                "event": "audio_start",
-                "sample_rate": state.sample_rate,
-                "encoding": "pcm_s16le",
-                "channels": 1,
-                "utterance_id": sess.utterance_id,
-                "mode": mode,
-            })
+            await _emit_audio_start(ws, sess, utt, mode)
 
             worker = threading.Thread(
                 target=_run_synth_thread,
                 kwargs={
                     "bridge": bridge,
-                    "audio_q": audio_q,
-                    "loop": loop,
+                    "handoff": handoff,
+                    "token": utt.token,
+                    "language": sess.language,
                     "mode": mode,
                     "prompt_wav": sess.prompt_wav,
                     "prompt_text": sess.prompt_text,
                     "speed": sess.speed,
                     # Phase 4 Wave 1: log context for leading-silence probe.
                     "session_id": sess.session_id,
-                    "utterance_id": sess.utterance_id,
+                    "utterance_id": utt.utterance_id,
                 },
                 daemon=True,
             )
             worker.start()
 
-            while True:
-                item = await audio_q.get()
-                if item is None:
-                    break
-                if isinstance(item, BaseException):
-                    await _emit_json(ws, {
-                        "error": f"synthesis failed: {item}",
-                        "fatal": False,
-                    })
-                    break
-                if isinstance(item, (bytes, bytearray)):
-                    await _emit_bytes(ws, bytes(item))
-
-            await _emit_json(ws, {
-                "event": "audio_end",
-                "utterance_id": sess.utterance_id,
-            })
-            sess.utterance_id += 1
+            finished = False
+            try:
+                finished = await _pump_audio(ws, sess, utt, handoff)
+            finally:
+                handoff.close()
+                if not finished:
+                    # 写失败（断开）/ 超时 / 任务取消：停掉线程后才放 GPU 名额
+                    await _abort_synth_thread(worker, utt)
+
+            await _emit_audio_end(ws, utt)
             _update_gpu_metric()
     finally:
         if not decremented:
@@ -658,10 +1433,11 @@ async def _run_synth_session(
 # (preserved as fallback per Pitfall 5 in RESEARCH).
 def _run_batch_synth_thread(
     text: str,
-    audio_q: "asyncio.Queue[Any]",
-    loop: asyncio.AbstractEventLoop,
+    handoff: _AudioHandoff,
+    token: _CancelToken,
     *,
     mode: str,
+    language: str = "zh",
     prompt_wav: str,
     prompt_text: str,
     speed: float,
@@ -677,15 +1453,17 @@ def _run_batch_synth_thread(
     - ``stream=False`` 让上游一次返回所有 chunk（典型 1-2 个 chunk for
       短回复）；流式 stall 不会发生。
     - mode 标签后缀 ``_batch``，便于 Prometheus 区分两路。
+    - 取消只能落在上游按句切分后的段与段之间（``stream=False`` 每段一个 chunk）。
     """
-    def _put(item: Any) -> None:
-        fut = asyncio.run_coroutine_threadsafe(audio_q.put(item), loop)
-        try:
-            fut.result(timeout=10.0)
-        except Exception:  # pragma: no cover
-            pass
+    _put = handoff.put
 
     metric_mode = f"{mode}_batch"
+    if token.cancelled:
+        _record_cancelled(metric_mode, language=language, chars=len(text),
+                          audio_s=0.0, session_id=session_id,
+                          utterance_id=utterance_id)
+        _put(None)
+        return
     try:
         if mode == "cross_lingual":
             iterator = state.model.inference_cross_lingual(
@@ -695,34 +1473,22 @@ def _run_batch_synth_thread(
                 speed=speed,
             )
         else:
-            # Same Fix #3 default-cache short-circuit as _run_synth_thread.
-            if (
-                prompt_wav == DEFAULT_PROMPT_WAV
-                and prompt_text == DEFAULT_PROMPT_TEXT
-            ):
-                iterator = state.model.inference_zero_shot(
-                    text,
-                    "",
-                    "",
-                    zero_shot_spk_id="default",
-                    stream=False,
-                    speed=speed,
-                )
-            else:
-                iterator = state.model.inference_zero_shot(
-                    text,
-                    prompt_text,
-                    _load_prompt_wav(prompt_wav),
-                    stream=False,
-                    speed=speed,
-                )
+            # Same cached-speaker short-circuit as _run_synth_thread.
+            iterator = _zero_shot_iterator(
+                text, prompt_wav, prompt_text, stream=False, speed=speed
+            )
+        trimmer = _SilenceTrimmer.from_env()
         first = True
+        samples = 0
         t0 = time.perf_counter()
         for output in iterator:
+            if token.cancelled:
+                break
             chunk = output.get("tts_speech") if isinstance(output, dict) else None
             if chunk is None:
                 continue
             pcm = _audio_tensor_to_pcm_bytes(chunk)
+            samples += len(pcm) // 2
             if first:
                 FIRST_AUDIO_LATENCY.labels(mode=metric_mode).observe(
                     time.perf_counter() - t0
@@ -730,37 +1496,32 @@ def _run_batch_synth_thread(
                 # Phase 4 Wave 1 leading-silence probe (mirrors _run_synth_thread).
                 # The batch path should produce ~zero leading silence (no
                 # bistream stall lead-in) — this metric will validate that.
-                try:
-                    samples = np.frombuffer(pcm, dtype=np.int16)
-                    leading = 0
-                    for s in samples:
-                        if abs(int(s)) < 32:
-                            leading += 1
-                        else:
-                            break
-                    sr_hz = state.sample_rate or COSYVOICE_OUTPUT_SAMPLE_RATE
-                    leading_silence_ms = (leading * 1000.0) / sr_hz
-                    log.info(
-                        "first_chunk_leading_silence",
-                        extra={
-                            "mode": metric_mode,
-                            "session_id": session_id,
-                            "utterance_id": utterance_id,
-                            "leading_samples": leading,
-                            "leading_silence_ms": round(leading_silence_ms, 1),
-                        },
-                    )
-                    LEADING_SILENCE_MS.labels(mode=metric_mode).observe(
-                        leading_silence_ms
-                    )
-                except Exception:  # pragma: no cover
-                    log.exception("leading-silence probe failed; continuing")
+                _probe_leading_silence(
+                    pcm,
+                    mode=metric_mode,
+                    session_id=session_id,
+                    utterance_id=utterance_id,
+                )
                 first = False
-            _put(pcm)
-        TOTAL_SYNTH_LATENCY.labels(mode=metric_mode).observe(
-            time.perf_counter() - t0
-        )
+            if trimmer is not None:
+                pcm = trimmer.feed(pcm)
+            if pcm:
+                _put(pcm)
+        audio_s = samples / (state.sample_rate or COSYVOICE_OUTPUT_SAMPLE_RATE)
+        if token.cancelled:
+            _close_iterator(iterator)
+            _record_cancelled(metric_mode, language=language, chars=len(text),
+                              audio_s=audio_s, session_id=session_id,
+                              utterance_id=utterance_id)
+            return
+        if trimmer is not None:
+            tail = trimmer.flush()
+            if tail:
+                _put(tail)
+        synth_s = time.perf_counter() - t0
+        TOTAL_SYNTH_LATENCY.labels(mode=metric_mode).observe(synth_s)
         SYNTH_TOTAL.labels(mode=metric_mode, outcome="ok").inc()
+        _SYNTH_COST.observe(language, len(text), audio_s, synth_s)
     except Exception as exc:
         SYNTH_TOTAL.labels(mode=metric_mode, outcome="error").inc()
         log.exception("batch synthesis worker failed",
@@ -779,16 +1540,17 @@ def _run_batch_synth_thread(
 
 
 async def _run_batch_synth_session(
-    ws: WebSocket, sess: Session, text: str
+    ws: WebSocket, sess: Session, utt: _Utterance
 ) -> None:
     """Sibling of ``_run_synth_session`` for the batch (single-segment) path.
 
-    No bridge — ``text`` is the full utterance. Reuses the existing
+    No bridge — ``utt.text`` is the full utterance. Reuses the existing
     ``state.inference_sem`` + ``QUEUE_DEPTH`` accounting so concurrency caps
     are preserved (T-04-03 mitigation per plan threat model).
     """
-    audio_q: asyncio.Queue[Any] = asyncio.Queue(maxsize=64)
-    loop = asyncio.get_running_loop()
+    handoff = _AudioHandoff(
+        asyncio.get_running_loop(), formatter=_OutputFormatter.for_session(sess)
+    )
     mode = _select_mode(sess)
 
     state.queue_depth += 1
@@ -799,51 +1561,40 @@ async def _run_batch_synth_session(
             state.queue_depth -= 1
             QUEUE_DEPTH.set(state.queue_depth)
             decremented = True
+            if utt.cancelled:
+                await _emit_audio_end(ws, utt)
+                return
 
-            await _emit_json(ws, {
-                "event": "audio_start",
-                "sample_rate": state.sample_rate,
-                "encoding": "pcm_s16le",
-                "channels": 1,
-                "utterance_id": sess.utterance_id,
-                "mode": f"{mode}_batch",
-            })
+            await _emit_audio_start(ws, sess, utt, f"{mode}_batch")
 
             worker = threading.Thread(
                 target=_run_batch_synth_thread,
                 kwargs={
-                    "text": text,
-                    "audio_q": audio_q,
-                    "loop": loop,
+                    "text": utt.text or "",
+                    "handoff": handoff,
+                    "token": utt.token,
+                    "language": sess.language,
                     "mode": mode,
                     "prompt_wav": sess.prompt_wav,
                     "prompt_text": sess.prompt_text,
                     "speed": sess.speed,
                     "session_id": sess.session_id,
-                    "utterance_id": sess.utterance_id,
+                    "utterance_id": utt.utterance_id,
                 },
                 daemon=True,
             )
             worker.start()
 
-            while True:
-                item = await audio_q.get()
-                if item is None:
-                    break
-                if isinstance(item, BaseException):
-                    await _emit_json(ws, {
-                        "error": f"synthesis failed: {item}",
-                        "fatal": False,
-                    })
-                    break
-                if isinstance(item, (bytes, bytearray)):
-                    await _emit_bytes(ws, bytes(item))
-
-            await _emit_json(ws, {
-                "event": "audio_end",
-                "utterance_id": sess.utterance_id,
-            })
-            sess.utterance_id += 1
+            finished = False
+            try:
+                finished = await _pump_audio(ws, sess, utt, handoff)
+            finally:
+                handoff.close()
+                if not finished:
+                    # 写失败（断开）/ 超时 / 任务取消：停掉线程后才放 GPU 名额
+                    await _abort_synth_thread(worker, utt)
+
+            await _emit_audio_end(ws, utt)
             _update_gpu_metric()
     finally:
         if not decremented:
@@ -851,6 +1602,58 @@ async def _run_batch_synth_session(
             QUEUE_DEPTH.set(state.queue_depth)
 
 
+async def _utterance_worker(
+    ws: WebSocket,
+    sess: Session,
+    jobs: "asyncio.Queue[_Utterance | None]",
+    live: dict[int, _Utterance],
+) -> None:
+    """按到达顺序逐句合成；receive 循环因此不被合成阻塞，能及时处理 ``cancel``。"""
+    while True:
+        utt = await jobs.get()
+        if utt is None:
+            return
+        try:
+            await _run_utterance(ws, sess, utt)
+        finally:
+            live.pop(utt.utterance_id, None)
+
+
+async def _run_utterance(ws: WebSocket, sess: Session, utt: _Utterance) -> None:
+    run = (
+        _run_batch_synth_session(ws, sess, utt)
+        if utt.bridge is None
+        else _run_synth_session(ws, sess, utt)
+    )
+    try:
+        await asyncio.wait_for(run, timeout=120)
+    except (TimeoutError, asyncio.TimeoutError):
+        await _emit_json(ws, {"error": "synthesis timeout", "fatal": False})
+        # 客户端按 audio_end 结算每一句；超时那句也要收尾
+        utt.cancel()
+        await _emit_audio_end(ws, utt)
+
+
+async def _stop_worker(
+    worker: asyncio.Task[None] | None,
+    jobs: "asyncio.Queue[_Utterance | None]",
+    timeout: float,
+) -> None:
+    """排在队尾的 None 让 worker 合成完已排队的句子后退出；超时则取消。"""
+    if worker is None or worker.done():
+        return
+    jobs.put_nowait(None)
+    try:
+        await asyncio.wait_for(asyncio.shield(worker), timeout=timeout)
+    except (TimeoutError, asyncio.TimeoutError):
+        log.warning("synth worker did not drain in time; cancelling")
+        worker.cancel()
+        try:
+            await worker
+        except (asyncio.CancelledError, Exception):
+            pass
+
+
 async def _handle_ws(ws: WebSocket) -> None:
     if state.shutdown_event.is_set():
         SESSIONS_REJECTED.labels(reason="shutdown").inc()
@@ -868,16 +1671,20 @@ async def _handle_ws(ws: WebSocket) -> None:
     sess = Session(session_id=str(uuid.uuid4()))
     log.info("ws session opened", extra={"session_id": sess.session_id})
 
-    # 当前活动的合成 task / bridge；客户端可在一个 WS 内连续合成多句话
-    current_task: asyncio.Task[None] | None = None
-    current_bridge: _TextStreamBridge | None = None
-    # Phase 4 Wave 2 Fix #1: per-utterance dispatch counters. Reset on each
-    # event=="start". The first event=="text" frame consults these to choose
-    # between batch path (single-segment short-circuit) and bistream path.
-    text_frame_count_for_session = 0
-    batch_path_decided = False
+    # 一个 WS 承载整通电话的多句话：receive 循环把每句排进 ``jobs``，由
+    # ``_utterance_worker`` 串行合成（音频按 utterance_id 顺序不交错）。
+    jobs: asyncio.Queue[_Utterance | None] = asyncio.Queue()
+    worker: asyncio.Task[None] | None = None
+    # 还在收 text 帧的流式句（bistream）；None = 下一个 text 帧开新句
+    open_utt: _Utterance | None = None
+    # 已排队、未合成完的句子，供 ``cancel`` 查找
+    live: dict[int, _Utterance] = {}
     started = False  # whether the client sent event=="start" yet
 
+    def _enqueue(utt: _Utterance) -> None:
+        live[utt.utterance_id] = utt  # worker 合成完后移除
+        jobs.put_nowait(utt)
+
     try:
         while True:
             try:
@@ -903,35 +1710,30 @@ async def _handle_ws(ws: WebSocket) -> None:
 
             event = cmd.get("event")
             if event == "start":
-                # 中止上一段合成（如果还在跑）；客户端要新开就要先 stop 上一段或我们这里强制
-                if current_bridge is not None:
-                    current_bridge.close()
-                if current_task is not None and not current_task.done():
-                    try:
-                        await asyncio.wait_for(current_task, timeout=5)
-                    except (TimeoutError, asyncio.TimeoutError):
-                        log.warning("previous synth did not finish in time; cancelling")
-                        current_task.cancel()
-                        try:
-                            await current_task
-                        except (asyncio.CancelledError, Exception):
-                            pass
+                # 重复 start：先把已排队的句子合成完（最多 5s）再换会话参数
+                if open_utt is not None and open_utt.bridge is not None:
+                    open_utt.bridge.close()
+                open_utt = None
+                await _stop_worker(worker, jobs, timeout=5)
+                jobs = asyncio.Queue()
+                live.clear()
                 sess.language = str(cmd.get("language", "zh"))
                 sess.speed = float(cmd.get("speed", 1.0))
+                encoding = cmd.get("encoding") or "pcm_s16le"
+                # 不认识的编码 / 采样率回退 PCM / 原生；客户端按 audio_start 解
+                sess.encoding = encoding if encoding in _LINK_ENCODINGS else "pcm_s16le"
+                sess.sample_rate = _negotiate_sample_rate(cmd.get("sample_rate"))
+                OUTPUT_FORMATS.labels(
+                    sample_rate=str(sess.sample_rate or state.sample_rate),
+                    encoding=sess.encoding,
+                ).inc()
                 if "prompt_wav" in cmd and cmd["prompt_wav"]:
                     sess.prompt_wav = str(cmd["prompt_wav"])
                 if "prompt_text" in cmd:
                     sess.prompt_text = str(cmd.get("prompt_text") or "")
                 if cmd.get("session_id"):
                     sess.session_id = str(cmd["session_id"])
-
-                # Fix #1: defer eager bridge/task creation. The first
-                # event=="text" frame decides whether to take batch (single-
-                # segment short-circuit) or bistream (lazy-init bridge) path.
-                current_bridge = None
-                current_task = None
-                text_frame_count_for_session = 0
-                batch_path_decided = False
+                worker = asyncio.create_task(_utterance_worker(ws, sess, jobs, live))
                 started = True
             elif event == "text":
                 if not started:
@@ -943,62 +1745,46 @@ async def _handle_ws(ws: WebSocket) -> None:
                 text = str(cmd.get("text", ""))
                 is_final = bool(cmd.get("is_final_segment"))
 
-                # Fix #1 short-path: first AND final text frame in a session
-                # → batch synthesize (skip _TextStreamBridge bistream entirely).
-                if (
-                    not batch_path_decided
-                    and is_final
-                    and text_frame_count_for_session == 0
-                    and current_bridge is None
-                ):
-                    batch_path_decided = True
-                    current_task = asyncio.create_task(
-                        _run_batch_synth_session(ws, sess, text)
-                    )
-                    try:
-                        await asyncio.wait_for(current_task, timeout=120)
-                    except (TimeoutError, asyncio.TimeoutError):
-                        await _emit_json(ws, {
-                            "error": "synthesis timeout",
-                            "fatal": False,
-                        })
-                    current_task = None
-                    continue
-
-                # Otherwise: bistream path. Lazy-init bridge + task on first
-                # text frame; subsequent text frames push into the bridge.
-                batch_path_decided = True
-                text_frame_count_for_session += 1
-                if current_bridge is None:
-                    current_bridge = _TextStreamBridge()
-                    current_task = asyncio.create_task(
-                        _run_synth_session(ws, sess, current_bridge)
-                    )
+                if open_utt is None:
+                    utt = _Utterance(utterance_id=sess.utterance_id)
+                    sess.utterance_id += 1
+                    if is_final:
+                        # Fix #1 short-path: first AND final text frame of an
+                        # utterance → batch synthesize (skip the bistream bridge).
+                        utt.text = text
+                        _enqueue(utt)
+                        continue
+                    # Otherwise: bistream path; subsequent text frames push
+                    # into this utterance's bridge until is_final_segment.
+                    utt.bridge = _TextStreamBridge()
+                    open_utt = utt
+                    _enqueue(utt)
+                assert open_utt.bridge is not None
                 if text:
-                    current_bridge.push_text(text)
+                    open_utt.bridge.push_text(text)
                 if is_final:
-                    # 句末 → 关 generator 触发 inference flush
-                    current_bridge.close()
-                    current_bridge = None
-                    if current_task is not None:
-                        try:
-                            await asyncio.wait_for(current_task, timeout=120)
-                        except (TimeoutError, asyncio.TimeoutError):
-                            await _emit_json(ws, {
-                                "error": "synthesis timeout",
-                                "fatal": False,
-                            })
-                        current_task = None
+                    # 句末 → 关 generator 触发 inference flush；下一个 text 帧开新句
+                    open_utt.bridge.close()
+                    open_utt = None
+            elif event == "cancel":
+                # barge-in：只取消指定句（缺省 = 所有已收到、未结束的句子），
+                # 会话和连接保持可用
+                target = cmd.get("utterance_id")
+                for utt in list(live.values()):
+                    if utt.cancelled or (target is not None and utt.utterance_id != target):
+                        continue
+                    utt.cancel()
+                    UTTERANCES_CANCELLED.inc()
+                    if utt.bridge is not None:
+                        utt.bridge.close()
+                    if utt is open_utt:
+                        open_utt = None
             elif event == "stop":
-                if current_bridge is not None:
-                    current_bridge.close()
-                    current_bridge = None
-                if current_task is not None:
-                    try:
-                        await asyncio.wait_for(current_task, timeout=30)
-                    except (TimeoutError, asyncio.TimeoutError):
-                        log.warning("synth did not drain on stop")
-                    current_task = None
+                if open_utt is not None and open_utt.bridge is not None:
+                    open_utt.bridge.close()
+                    open_utt = None
+                await _stop_worker(worker, jobs, timeout=30)
+                worker = None
                 break
             else:
                 await _emit_json(ws, {
@@ -1010,14 +1796,12 @@ async def _handle_ws(ws: WebSocket) -> None:
             "session_id": sess.session_id, "err": str(exc),
         })
     finally:
-        # 兜底：把还没结束的 worker 推到结束
-        if current_bridge is not None:
-            current_bridge.close()
-        if current_task is not None and not current_task.done():
-            try:
-                await asyncio.wait_for(current_task, timeout=10)
-            except (TimeoutError, asyncio.TimeoutError):
-                current_task.cancel()
+        # 兜底：客户端断开时不再合成排队的句子，在跑的那句在下一个 chunk 处停下
+        for utt in live.values():
+            utt.cancel()
+        if open_utt is not None and open_utt.bridge is not None:
+            open_utt.bridge.close()
+        await _stop_worker(worker, jobs, timeout=10)
         state.active_session_count -= 1
         ACTIVE_SESSIONS.set(state.active_session_count)
         log.info("ws session closed", extra={"session_id": sess.session_id})
@@ -1089,6 +1873,8 @@ async def health() -> JSONResponse:
         "shutting_down": is_shutting,
         "output_sample_rate": state.sample_rate,
         "output_encoding": "pcm_s16le",
+        "output_sample_rates": sorted({*_OUTPUT_SAMPLE_RATES, state.sample_rate}),
+        "output_encodings": list(_LINK_ENCODINGS),
         "output_channels": 1,
     }
     return JSONResponse(payload, status_code=200 if ok else 503)
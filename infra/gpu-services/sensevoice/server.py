@@ -5,18 +5,33 @@
 WebSocket 协议 (`/ws/transcribe`)
 -----------------------------------
 客户端 → 服务端：
-- 二进制帧：原始 PCM int16 LE，单声道，16kHz（由 env AUDIO_SAMPLE_RATE 暴露）
+- 二进制帧：原始 PCM int16 LE，单声道，16kHz（由 env AUDIO_SAMPLE_RATE 暴露）。
+  ``start`` 帧带 ``"encoding": "mulaw"`` 时改为 G.711 μ-law（每样本 1 字节，带宽
+  减半），服务端查表解回 int16 再进 buffer
+  帧长不限：编排器默认把 30 ms 块攒成 ~120 ms 一条（``STT_UPLINK_COALESCE_MS``），
+  partial / 强制 flush 阈值都按累计样本数判断，与帧长无关
 - 文本帧（JSON）：
-  - ``{"event": "start", "session_id": "<opt>", "language": "auto"|"zh"|"en"|...}``
-    会话开始；language 决定 SenseVoice 解码语言提示，默认 "auto"
+  - ``{"event": "start", "session_id": "<opt>", "language": "auto"|"zh"|"en"|...,
+    "encoding": "pcm_s16le"|"mulaw"}``
+    会话开始；language 决定 SenseVoice 解码语言提示，默认 "auto"；encoding 是之后
+    二进制帧的链路编码，默认 pcm_s16le，不认识的编码回 fatal error
   - ``{"event": "end_of_utterance"}`` 客户端 VAD 判定本句话说完，触发 final 推理
   - ``{"event": "stop"}`` 结束会话；服务端触发剩余 buffer 的最后一次 final 后关闭
+  - ``{"event": "gap", "ms": int}`` 客户端静音压缩（``STT_UPLINK_DTX``）省掉了这么
+    多毫秒的静音没发。服务端不往 buffer 里补零，只在 utterance 内的 gap 计入
+    ``start_time`` / ``end_time`` 的时长；utterance 开始前的 gap 直接忽略
+  - ``{"event": "reset", "seq": int}`` 丢弃当前 buffer（不推理），供会话级长连接
+    （客户端 ``SenseVoiceStream``）在一轮结束 / 被放弃时切到下一轮；服务端回
+    ``{"event": "reset_ack", "seq": <原样回显>, "utterance_id": int}``
 
 服务端 → 客户端（JSON 文本帧）：
 - ``{"text": "...", "is_final": bool, "confidence": float, "start_time": float,
      "end_time": float, "utterance_id": int, "language": "zh"|"en"|...}``
-  其中 start_time/end_time 是相对会话开始的秒数。
+  其中 start_time/end_time 是相对会话开始的秒数。``PARTIAL_MODE=incremental``
+  时 partial 另带 ``"stable_text"``：``text`` 中不会再变的前缀。
 - 错误：``{"error": "<msg>", "fatal": bool}``；fatal=True 时服务端会关闭连接。
+- reset 确认：``{"event": "reset_ack", "seq": int, "utterance_id": int}``。帧按序
+  处理，所以 ack 之前发出的 transcript 都属于 reset 之前的 utterance。
 
 设计取舍（best-effort，Phase 1 再补强）
 ---------------------------------------
@@ -29,15 +44,38 @@ SenseVoice native API 是非流式的——AutoModel.generate 会对一整段音
 - partial transcript：当 buffer 长度跨过 ``PARTIAL_INTERVAL_SEC`` 阈值（默认 1.5s）
   时跑一次 best-effort 推理，``is_final=False``。Phase 1 客户端可忽略 partial 直接
   靠 final，端到端延迟由 VAD 决定（典型 200-500ms）。
+- ``PARTIAL_MODE=incremental``：partial 只解尾窗。未定稿音频超过
+  ``PARTIAL_WINDOW_SEC`` 时，在窗口后半段挑最安静的一帧切开，前一段解码一次后定稿
+  （``stable_text``），之后的 partial 只解切点之后的音频（外加
+  ``PARTIAL_CONTEXT_SEC`` 左上下文，重解出的重叠文字按字去重）。每个 partial 的解码
+  量与 utterance 长度无关；回包多带 ``stable_text``，``text`` 中超出它的部分是
+  还会变的尾巴。final 仍整段重解，准确率不受影响。
 - partial 不参与 utterance_id 计数；同一 utterance 的所有 partial+final 共享同一
   ``utterance_id``。
+- partial 在后台 task 里跑，接收循环不等它：新 partial 到点时，还在排队（没拿到
+  推理名额）的旧 partial 被取消、由新的顶替；已经在跑的让它跑完，下一帧再排。
+  ``end_of_utterance`` / ``reset`` 直接取消当前 partial，final 不排在 partial 后面。
+  已进线程的推理无法中断，被取消时仍占着名额直到线程返回，GPU 并发不超过名额数。
 
 TODO(phase-1)：评估 funasr-onnx 的 SenseVoiceSmall 流式包装；若延迟可接受则替换 partial
 路径以拿到 token-level 增量输出。
 
 并发与资源
 ----------
-- 全局 ``asyncio.Semaphore(MAX_CONCURRENT_SESSIONS)`` 限制同时进行的 WS 会话数。
+- ``_InferenceScheduler`` 把同时进行的推理限制在 ``MAX_CONCURRENT_SESSIONS`` 个名额，
+  按优先级发放：final 插队到所有 partial 前面；partial 带截止时间，排队超过
+  ``PARTIAL_DEADLINE_MS`` 或队列已满（``PARTIAL_SHED_QUEUE_DEPTH``）时被丢弃，
+  计入 ``sensevoice_partials_shed_total{reason}``。
+- final 跨会话微批（``_FinalBatcher``）：排队中的 final 按语言分组，合成一次
+  ``model.generate(input=[...])``，结果按序分发回各会话。轻载时最多等
+  ``FINAL_BATCH_WINDOW_MS``；重载时上一批在跑，队列自然攒批。``FINAL_BATCH_MAX=1``
+  关闭。同时在跑的批数 ``FINAL_BATCH_LANES`` 默认等于 ``MAX_CONCURRENT_SESSIONS``。
+- 两条推理路径：``vad``（``vad_model="fsmn-vad"``，先切段再识别）与 ``fast``
+  （同一模型、不带 VAD 前端，一批直接 batch 前向）。客户端按 ``end_of_utterance``
+  切好的、不超过 ``FAST_PATH_MAX_SEC`` 的音频走 fast；``MAX_UTTERANCE_SEC`` 强制
+  flush（客户端没切句）和超长音频走 vad 兜底。fast 多占一份模型显存（SenseVoiceSmall
+  约 1GB）；``FAST_PATH_MAX_SEC=0`` 不加载。分路径延迟见
+  ``sensevoice_inference_path_latency_seconds{path,kind}``。
 - 每次 inference 通过 ``asyncio.to_thread`` 调入 funasr（CPU/GPU 阻塞），避免阻塞 event loop。
 - ``torch.cuda.OutOfMemoryError``：捕获 → 清空 cache → 回客户端 fatal error。
 
@@ -60,10 +98,13 @@ import json
 import logging
 import os
 import signal
+import heapq
+import itertools
 import sys
 import time
 import uuid
-from collections.abc import AsyncIterator
+from collections import deque
+from collections.abc import AsyncIterator, Callable
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from typing import Any
@@ -94,6 +135,29 @@ AUDIO_SAMPLE_RATE = int(os.getenv("AUDIO_SAMPLE_RATE", "16000"))
 PARTIAL_INTERVAL_SEC = float(os.getenv("PARTIAL_INTERVAL_SEC", "1.5"))
 MAX_UTTERANCE_SEC = float(os.getenv("MAX_UTTERANCE_SEC", "30.0"))
 GRACEFUL_TIMEOUT_SEC = float(os.getenv("GRACEFUL_TIMEOUT_SEC", "60"))
+# final 微批：第一个 final 到达后最多再等这么久收集同批请求；满 FINAL_BATCH_MAX
+# 立即发车。FINAL_BATCH_MAX=1 退化为逐条推理（旧行为）。
+FINAL_BATCH_WINDOW_MS = float(os.getenv("FINAL_BATCH_WINDOW_MS", "5"))
+FINAL_BATCH_MAX = int(os.getenv("FINAL_BATCH_MAX", "8"))
+# 同时在跑的 final 批数。默认 = 推理名额数，和不合批时 final 的并发一致：VAD 路径
+# 的批在 funasr 里仍逐条跑，lane 少了 final 就被串行化。调小可给 partial 留名额。
+FINAL_BATCH_LANES = int(
+    os.getenv("FINAL_BATCH_LANES", str(MAX_CONCURRENT_SESSIONS))
+)
+# partial 调度：排队超过 PARTIAL_DEADLINE_MS 还没拿到名额就丢弃（结果已过时）；
+# 排队项数达到 PARTIAL_SHED_QUEUE_DEPTH 时新 partial 直接丢弃。final 永不丢弃。
+PARTIAL_DEADLINE_MS = float(os.getenv("PARTIAL_DEADLINE_MS", "1000"))
+PARTIAL_SHED_QUEUE_DEPTH = int(
+    os.getenv("PARTIAL_SHED_QUEUE_DEPTH", str(MAX_CONCURRENT_SESSIONS * 2))
+)
+# partial 解码方式：full = 每次从头重解整段（默认）；incremental = 只解不超过
+# PARTIAL_WINDOW_SEC 的尾窗（带 PARTIAL_CONTEXT_SEC 左上下文），前面定稿的文字直接拼接
+PARTIAL_MODE = os.getenv("PARTIAL_MODE", "full").strip().lower()
+PARTIAL_WINDOW_SEC = float(os.getenv("PARTIAL_WINDOW_SEC", "6.0"))
+PARTIAL_CONTEXT_SEC = float(os.getenv("PARTIAL_CONTEXT_SEC", "1.0"))
+# 客户端已用 webrtcvad 切好句：不超过该长度的音频走不带 fsmn-vad 的第二个模型实例
+# （fast path）；MAX_UTTERANCE_SEC 强制 flush 与更长的音频仍走 VAD。0 = 关闭
+FAST_PATH_MAX_SEC = float(os.getenv("FAST_PATH_MAX_SEC", "15"))
 
 
 # ---------------------------------------------------------------------------
@@ -152,9 +216,44 @@ INFERENCE_LATENCY = Histogram(
     ["kind"],
     buckets=(0.05, 0.1, 0.2, 0.4, 0.8, 1.5, 3.0, 6.0),
 )
+PARTIALS_SUPERSEDED = Counter(
+    "sensevoice_partials_superseded_total",
+    "Partials cancelled before emitting (by a newer partial / final / reset)",
+    ["by"],
+)
+PARTIAL_DECODED_SECONDS = Histogram(
+    "sensevoice_partial_decoded_audio_seconds",
+    "Audio decoded per partial (incl. left context and commits)",
+    buckets=(0.5, 1, 2, 4, 6, 8, 12, 20, 30),
+)
+INFERENCE_PATH_LATENCY = Histogram(
+    "sensevoice_inference_path_latency_seconds",
+    "Inference latency by model path (vad: fsmn-vad front-end / fast: none)",
+    ["path", "kind"],
+    buckets=(0.05, 0.1, 0.2, 0.4, 0.8, 1.5, 3.0, 6.0),
+)
+FINAL_BATCH_SIZE = Histogram(
+    "sensevoice_final_batch_size",
+    "Final requests merged into one model.generate call",
+    buckets=(1, 2, 3, 4, 6, 8, 12, 16),
+)
 ACTIVE_SESSIONS = Gauge("sensevoice_active_sessions", "Currently open WS sessions")
 QUEUE_DEPTH = Gauge(
-    "sensevoice_queue_depth", "Inference requests waiting on the GPU semaphore"
+    "sensevoice_queue_depth", "Inference requests waiting for a GPU slot"
+)
+AUDIO_BYTES_IN = Counter(
+    "sensevoice_audio_bytes_total",
+    "Audio bytes received from clients, as sent on the wire",
+    ["encoding"],
+)
+UPLINK_GAP_SECONDS = Counter(
+    "sensevoice_uplink_gap_seconds_total",
+    "Silence the client reported via gap frames instead of sending PCM",
+)
+PARTIALS_SHED = Counter(
+    "sensevoice_partials_shed_total",
+    "Partials dropped by the scheduler (stale: past deadline / overload: queue full)",
+    ["reason"],
 )
 GPU_MEM_BYTES = Gauge(
     "sensevoice_gpu_memory_allocated_bytes", "torch.cuda.memory_allocated() snapshot"
@@ -164,17 +263,129 @@ GPU_MEM_BYTES = Gauge(
 # ---------------------------------------------------------------------------
 # 模型与生命周期
 # ---------------------------------------------------------------------------
+class _PartialShed(Exception):
+    """partial 被调度器丢弃；调用方静默放弃这次 partial（下一次会带上更多音频）。"""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    n: int = field(compare=False)
+    deadline: float | None = field(compare=False)
+    future: asyncio.Future[None] = field(compare=False)
+
+
+class _InferenceScheduler:
+    """推理名额的优先级调度，取代 FIFO ``asyncio.Semaphore``。
+
+    FIFO 下几个会话的 partial 一拥而上就会把所有人的 final 堵在后面，而端到端
+    延迟只看 final。这里名额空出时按 (优先级, 到达顺序) 发放：final = 0，
+    partial = 1。partial 另有两道闸：
+
+    - 入队时排队项数已达 ``shed_queue_depth``（且没有空闲名额）→ 立即丢弃
+      （``overload``）；
+    - 轮到它时已超过 ``partial_deadline_s`` → 丢弃（``stale``），名额给下一个。
+
+    丢弃以 ``_PartialShed`` 抛给调用方。``queue_depth`` 按推理条数计（一批
+    final 算 n 条）。
+    """
+
+    def __init__(
+        self,
+        slots: int,
+        *,
+        partial_deadline_s: float = PARTIAL_DEADLINE_MS / 1000.0,
+        shed_queue_depth: int = PARTIAL_SHED_QUEUE_DEPTH,
+    ) -> None:
+        self.slots = max(1, slots)
+        self.partial_deadline_s = partial_deadline_s
+        self.shed_queue_depth = shed_queue_depth
+        self._free = self.slots
+        self._heap: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._queued = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queued
+
+    @asynccontextmanager
+    async def slot(self, kind: str, n: int = 1) -> AsyncIterator[None]:
+        await self.acquire(kind, n)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, kind: str, n: int = 1) -> None:
+        if self._free > 0 and not self._heap:
+            self._free -= 1
+            return
+        is_partial = kind == "partial"
+        if is_partial and self._free == 0 and self._queued >= self.shed_queue_depth:
+            PARTIALS_SHED.labels(reason="overload").inc()
+            raise _PartialShed("overload")
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(
+            priority=1 if is_partial else 0,
+            seq=next(self._seq),
+            n=n,
+            deadline=loop.time() + self.partial_deadline_s if is_partial else None,
+            future=loop.create_future(),
+        )
+        heapq.heappush(self._heap, waiter)
+        self._queued += n
+        QUEUE_DEPTH.set(self._queued)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            fut = waiter.future
+            if fut.done() and not fut.cancelled() and fut.exception() is None:
+                # 名额已分到、还没来得及用就被取消：交还
+                self.release()
+            raise
+        finally:
+            self._queued -= n
+            QUEUE_DEPTH.set(self._queued)
+
+    def release(self) -> None:
+        self._free += 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        now: float | None = None
+        while self._free > 0 and self._heap:
+            waiter = heapq.heappop(self._heap)
+            if waiter.future.done():  # 排队中被取消
+                continue
+            if waiter.deadline is not None:
+                if now is None:
+                    now = asyncio.get_running_loop().time()
+                if now > waiter.deadline:
+                    PARTIALS_SHED.labels(reason="stale").inc()
+                    waiter.future.set_exception(_PartialShed("stale"))
+                    continue
+            self._free -= 1
+            waiter.future.set_result(None)
+
+
 @dataclass
 class AppState:
     model: Any = None              # funasr.AutoModel；用 Any 因为 funasr 没暴露稳定类型
+    model_fast: Any = None         # 同一模型、不带 VAD 前端；None = fast path 关闭
     model_loaded: bool = False
     gpu_available: bool = False
     shutdown_event: asyncio.Event = field(default_factory=asyncio.Event)
-    inference_sem: asyncio.Semaphore = field(
-        default_factory=lambda: asyncio.Semaphore(MAX_CONCURRENT_SESSIONS)
+    scheduler: _InferenceScheduler = field(
+        default_factory=lambda: _InferenceScheduler(MAX_CONCURRENT_SESSIONS)
     )
     active_session_count: int = 0
-    queue_depth: int = 0
     # 由 main() 注入；用于 SIGTERM handler 调用以触发 uvicorn graceful shutdown
     servers: list[Any] = field(default_factory=list)
 
@@ -210,6 +421,35 @@ def _load_model() -> Any:
     return model
 
 
+def _load_fast_model() -> Any:
+    """加载不带 VAD 前端的第二个实例（fast path）；启动时调用一次。"""
+    from funasr import AutoModel
+
+    t0 = time.perf_counter()
+    model = AutoModel(
+        model=SENSEVOICE_MODEL_ID,
+        device=SENSEVOICE_DEVICE,
+        disable_update=True,
+    )
+    log.info("SenseVoice fast-path model loaded", extra={
+        "model_id": SENSEVOICE_MODEL_ID,
+        "max_sec": FAST_PATH_MAX_SEC,
+        "load_seconds": round(time.perf_counter() - t0, 2),
+    })
+    return model
+
+
+def _pick_path(samples: int, *, forced: bool = False) -> str:
+    """选推理路径：客户端切好的短音频走 fast，强制 flush / 超长 / 未加载走 vad。"""
+    if (
+        forced
+        or state.model_fast is None
+        or samples > FAST_PATH_MAX_SEC * AUDIO_SAMPLE_RATE
+    ):
+        return "vad"
+    return "fast"
+
+
 def _check_gpu() -> bool:
     """探测 torch.cuda；用 try/except 覆盖 CPU-only 镜像（开发场景）"""
     try:
@@ -261,90 +501,372 @@ def _parse_language_and_clean_text(raw_text: str) -> tuple[str | None, str]:
 
 
 def _run_inference_sync(
-    model: Any, audio_pcm_int16: np.ndarray, language_hint: str
+    model: Any, audio_f32: np.ndarray, language_hint: str
 ) -> tuple[str | None, str]:
-    """阻塞调 funasr；返回 (detected_language, plain_text)。
-
-    funasr.AutoModel.generate 接受 numpy float32 或文件路径；我们传 float32 mono
-    16kHz。语言 hint 走 ``language=`` 参数，"auto" 让模型自检。
+    """阻塞调 funasr；返回 (detected_language, plain_text)。"""
+    return _run_inference_batch_sync(model, [audio_f32], language_hint)[0]
+
+
+def _run_inference_batch_sync(
+    model: Any,
+    audios_f32: list[np.ndarray],
+    language_hint: str,
+    *,
+    vad: bool = True,
+) -> list[tuple[str | None, str]]:
+    """阻塞调 funasr；对每段输入返回 (detected_language, plain_text)，顺序与输入一致。
+
+    funasr.AutoModel.generate 接受 numpy float32 或文件路径（单个或 list）；调用方
+    传 [-1, 1) 的 float32 mono 16kHz（通常是 ``_PcmBuffer.float32_view`` 返回的
+    scratch 快照，推理期间 buffer 继续追加也不影响它）。语言 hint 走 ``language=`` 参数，"auto" 让模型自检，所以一批内的输入
+    必须共享同一个 hint。单条时仍传裸数组，保持原调用形状。
+
+    注意：带 ``vad_model`` 时 funasr 对 list 输入仍逐条跑 VAD + ASR，合批省下的
+    是每次调用的线程切换 / 调度开销；``vad=False``（fast path 模型）时按
+    ``batch_size`` 条数一次 batch 前向。
     """
-    audio_f32 = audio_pcm_int16.astype(np.float32) / 32768.0
+    inputs = audios_f32
+    batching: dict[str, int] = (
+        {"batch_size_s": 60} if vad else {"batch_size": len(inputs)}
+    )
     res = model.generate(
-        input=audio_f32,
+        input=inputs if len(inputs) > 1 else inputs[0],
         cache={},
         language=language_hint or "auto",
         use_itn=True,
-        batch_size_s=60,
+        **batching,
     )
-    if not res:
-        return None, ""
-    raw = res[0].get("text", "")
-    return _parse_language_and_clean_text(raw)
+    res = res or []
+    if len(res) != len(inputs):
+        log.warning("batched generate returned mismatched results", extra={
+            "inputs": len(inputs), "results": len(res),
+        })
+    out: list[tuple[str | None, str]] = []
+    for i in range(len(inputs)):
+        raw = res[i].get("text", "") if i < len(res) else ""
+        out.append(_parse_language_and_clean_text(raw) if raw else (None, ""))
+    return out
 
 
 async def _run_inference(
-    audio_pcm_int16: np.ndarray, language_hint: str, kind: str
+    audio_f32: np.ndarray,
+    language_hint: str,
+    kind: str,
+    *,
+    path: str = "vad",
+    on_start: Callable[[], None] | None = None,
 ) -> tuple[str | None, str]:
-    """获信号量 → 在线程里跑 funasr → 返回结果；记录 metrics。"""
-    state.queue_depth += 1
-    QUEUE_DEPTH.set(state.queue_depth)
-    decremented = False
-    try:
-        async with state.inference_sem:
-            state.queue_depth -= 1
-            QUEUE_DEPTH.set(state.queue_depth)
-            decremented = True
-            t0 = time.perf_counter()
-            try:
-                lang, text = await asyncio.to_thread(
-                    _run_inference_sync, state.model, audio_pcm_int16, language_hint
-                )
-                INFERENCES_TOTAL.labels(kind=kind, outcome="ok").inc()
-                return lang, text
-            except Exception as exc:
-                INFERENCES_TOTAL.labels(kind=kind, outcome="error").inc()
-                # GPU OOM：清显存让后续请求有机会恢复
-                msg = str(exc).lower()
-                if "out of memory" in msg or "cuda" in msg:
-                    try:
-                        import torch
-
-                        torch.cuda.empty_cache()
-                    except Exception:
-                        pass
-                log.error("inference failed", extra={"kind": kind, "err": str(exc)})
-                raise
-            finally:
-                INFERENCE_LATENCY.labels(kind=kind).observe(time.perf_counter() - t0)
-                _update_gpu_metric()
-    finally:
-        if not decremented:
-            # Cancelled / failed before semaphore acquire returned. Cover
-            # BaseException (asyncio.CancelledError) too — bare `except Exception`
-            # would miss it and leak the counter forever.
-            state.queue_depth -= 1
-            QUEUE_DEPTH.set(state.queue_depth)
+    """单条推理：按优先级获推理名额 → 在线程里跑 funasr → 返回结果；记录 metrics。"""
+    results = await _run_inference_batch(
+        [audio_f32], language_hint, kind, path=path, on_start=on_start
+    )
+    return results[0]
+
+
+async def _run_inference_batch(
+    audios_f32: list[np.ndarray],
+    language_hint: str,
+    kind: str,
+    *,
+    path: str = "vad",
+    on_start: Callable[[], None] | None = None,
+) -> list[tuple[str | None, str]]:
+    """一批输入占一个推理名额、一次 ``model.generate``；记录 metrics。
+
+    ``path="fast"`` 用不带 VAD 的模型实例（未加载时退回 vad）。
+
+    名额由 ``state.scheduler`` 按 kind 的优先级发放；partial 可能被丢弃
+    （抛 ``_PartialShed``）。``on_start`` 在拿到名额、进线程前调用。调用方 task
+    被取消时：排队中直接退出；线程已在跑则等它返回再让出名额（线程无法中断），
+    然后照常抛 CancelledError。
+    """
+    n = len(audios_f32)
+    if path == "fast" and state.model_fast is None:
+        path = "vad"
+    model = state.model_fast if path == "fast" else state.model
+    async with state.scheduler.slot(kind, n):
+        if on_start is not None:
+            on_start()
+        t0 = time.perf_counter()
+        thread = asyncio.ensure_future(asyncio.to_thread(
+            _run_inference_batch_sync,
+            model, audios_f32, language_hint, vad=path == "vad",
+        ))
+        try:
+            results = await asyncio.shield(thread)
+            INFERENCES_TOTAL.labels(kind=kind, outcome="ok").inc(n)
+            return results
+        except asyncio.CancelledError:
+            INFERENCES_TOTAL.labels(kind=kind, outcome="cancelled").inc(n)
+            await asyncio.wait([thread])
+            if not thread.cancelled():
+                thread.exception()  # 结果没人要；取走异常避免 "never retrieved"
+            raise
+        except Exception as exc:
+            INFERENCES_TOTAL.labels(kind=kind, outcome="error").inc(n)
+            # GPU OOM：清显存让后续请求有机会恢复
+            msg = str(exc).lower()
+            if "out of memory" in msg or "cuda" in msg:
+                try:
+                    import torch
+
+                    torch.cuda.empty_cache()
+                except Exception:
+                    pass
+            log.error("inference failed", extra={
+                "kind": kind, "batch": n, "err": str(exc),
+            })
+            raise
+        finally:
+            elapsed = time.perf_counter() - t0
+            INFERENCE_LATENCY.labels(kind=kind).observe(elapsed)
+            INFERENCE_PATH_LATENCY.labels(path=path, kind=kind).observe(elapsed)
+            _update_gpu_metric()
+
+
+@dataclass
+class _PendingFinal:
+    audio: np.ndarray
+    language_hint: str
+    future: asyncio.Future[tuple[str | None, str]]
+    enqueued_at: float
+    path: str = "vad"
+
+
+class _FinalBatcher:
+    """跨会话 final 微批调度。
+
+    最多 ``lanes`` 条发车 lane；每条 lane 循环：等队头请求满 ``window_s``（或攒够
+    ``max_batch``）→ 取与队头 language hint、推理路径都相同的最多 ``max_batch`` 条
+    （``generate`` 只收一个 ``language``，两条路径是不同的模型实例）→ 一次
+    ``_run_inference_batch`` → 结果经 future 送回。
+    负载高时上一批还在跑，新 final 在队列里自然攒成下一批，窗口只在轻载时生效。
+    已断开会话（future 已取消）的请求在取批时剔除。
+    """
+
+    def __init__(self, window_s: float, max_batch: int, lanes: int = 1) -> None:
+        self.window_s = window_s
+        self.max_batch = max_batch
+        self.lanes = max(1, lanes)
+        self._pending: deque[_PendingFinal] = deque()
+        self._lane_tasks: set[asyncio.Task[None]] = set()
+
+    async def submit(
+        self, audio_f32: np.ndarray, language_hint: str, path: str = "vad"
+    ) -> tuple[str | None, str]:
+        if self.max_batch <= 1:
+            return await _run_inference(audio_f32, language_hint, "final", path=path)
+        loop = asyncio.get_running_loop()
+        item = _PendingFinal(
+            audio_f32, language_hint, loop.create_future(), loop.time(), path
+        )
+        self._pending.append(item)
+        self._kick()
+        return await item.future
+
+    def _kick(self) -> None:
+        if self._pending and len(self._lane_tasks) < self.lanes:
+            task = asyncio.create_task(self._lane())
+            self._lane_tasks.add(task)
+            task.add_done_callback(self._on_lane_done)
+
+    def _on_lane_done(self, task: asyncio.Task[None]) -> None:
+        self._lane_tasks.discard(task)
+        self._kick()  # lane 退出前刚到的请求
+
+    async def _lane(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            wait_s = self._pending[0].enqueued_at + self.window_s - loop.time()
+            if wait_s > 0 and len(self._pending) < self.max_batch:
+                await asyncio.sleep(wait_s)
+            items = self._take_batch()
+            if items:
+                await self._run_group(items)
+
+    def _take_batch(self) -> list[_PendingFinal]:
+        while self._pending and self._pending[0].future.done():
+            self._pending.popleft()
+        if not self._pending:
+            return []
+        head = self._pending[0]
+        items: list[_PendingFinal] = []
+        rest: deque[_PendingFinal] = deque()
+        for item in self._pending:
+            if item.future.done():
+                continue
+            if (
+                item.language_hint == head.language_hint
+                and item.path == head.path
+                and len(items) < self.max_batch
+            ):
+                items.append(item)
+            else:
+                rest.append(item)
+        self._pending = rest
+        return items
+
+    async def _run_group(self, items: list[_PendingFinal]) -> None:
+        FINAL_BATCH_SIZE.observe(len(items))
+        try:
+            results = await _run_inference_batch(
+                [item.audio for item in items], items[0].language_hint, "final",
+                path=items[0].path,
+            )
+        except Exception as exc:
+            for item in items:
+                if not item.future.done():
+                    item.future.set_exception(exc)
+            return
+        for item, result in zip(items, results):
+            if not item.future.done():
+                item.future.set_result(result)
+
+
+final_batcher = _FinalBatcher(
+    FINAL_BATCH_WINDOW_MS / 1000.0, FINAL_BATCH_MAX, FINAL_BATCH_LANES
+)
 
 
 # ---------------------------------------------------------------------------
 # WebSocket 处理
 # ---------------------------------------------------------------------------
+def _mulaw_decode_table() -> np.ndarray:
+    """G.711 μ-law → int16 的 256 项表；与编排器 ``vocalize.codec`` 同一定义。"""
+    u = ~np.arange(256, dtype=np.int32) & 0xFF
+    exponent = (u >> 4) & 0x07
+    magnitude = ((((u & 0x0F) << 3) + 0x84) << exponent) - 0x84
+    return np.where(u & 0x80, -magnitude, magnitude).astype(np.int16)
+
+
+_MULAW_DECODE = _mulaw_decode_table()
+_LINK_ENCODINGS = ("pcm_s16le", "mulaw")
+
+
+def _decode_pcm(encoding: str, data: bytes) -> np.ndarray:
+    """二进制帧 → int16 样本（``pcm_s16le`` 零拷贝视图，``mulaw`` 一次查表）。"""
+    if encoding == "mulaw":
+        return _MULAW_DECODE[np.frombuffer(data, dtype=np.uint8)]
+    return np.frombuffer(data, dtype=np.int16)
+
+
+_INT16_SCALE = np.float32(1.0 / 32768.0)
+# 初始容量：一般 utterance 在几秒内，放不下时倍增
+_PCM_INITIAL_SEC = 4.0
+
+
+class _PcmBuffer:
+    """单会话 utterance 音频：预分配 int16 缓冲，原地追加，零拷贝视图。
+
+    取代 ``list[np.ndarray]`` + 每次 flush ``np.concatenate`` 的做法——30s
+    utterance 过去每 1.5s partial 都把整段重拷一遍再 ``astype`` 一遍。这里：
+
+    - ``append``：写进预分配数组的尾部；容量不够时倍增（一次 utterance 内至多
+      log2(30/4) 次），``clear()`` 只归零长度、保留容量供下一轮复用。
+    - ``view()``：``data[:n]`` 零拷贝 int16 视图。
+    - ``float32_view(kind, start, end)``：把 ``[start, end)``（默认整段）转成
+      [-1, 1) float32，写进按 kind（partial / final / ...）复用的 scratch 数组，
+      返回其零拷贝视图。
+
+    并发约定：partial 在后台 task 里推理，``_handle_ws`` 同时继续读帧、``append``。
+    所以送进推理线程的永远是 ``float32_view`` 的结果——它在 event loop 上、推理
+    开始前把 ``[start, end)`` 转换拷贝进 scratch，是那一刻的快照；之后的
+    ``append`` 只写 ``n`` 之后的位置（或扩容换一块新数组），``clear`` 只归零长度，
+    都碰不到 scratch。``view()`` 的 int16 视图只能在同一段同步代码里用（如
+    ``_quiet_cut``），不能跨 ``await`` 持有。scratch 按 kind 各一份：同 kind 的下一次
+    ``float32_view`` 会覆盖它，所以 ``_run_partial`` 要等上一个 partial 的推理线程
+    结束才取新快照。
+    """
+
+    def __init__(self, initial_samples: int) -> None:
+        self._data = np.empty(max(1, initial_samples), dtype=np.int16)
+        self._n = 0
+        self._scratch: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def capacity(self) -> int:
+        return int(self._data.size)
+
+    def append(self, pcm: np.ndarray) -> None:
+        end = self._n + pcm.size
+        if end > self._data.size:
+            grown = np.empty(max(end, self._data.size * 2), dtype=np.int16)
+            grown[: self._n] = self._data[: self._n]
+            self._data = grown
+        self._data[self._n:end] = pcm
+        self._n = end
+
+    def clear(self) -> None:
+        self._n = 0
+
+    def view(self) -> np.ndarray:
+        return self._data[: self._n]
+
+    def float32_view(
+        self, kind: str, start: int = 0, end: int | None = None
+    ) -> np.ndarray:
+        end = self._n if end is None else min(end, self._n)
+        need = max(0, end - start)
+        scratch = self._scratch.get(kind)
+        if scratch is None or scratch.size < need:
+            scratch = np.empty(max(need, self._data.size), dtype=np.float32)
+            self._scratch[kind] = scratch
+        out = scratch[:need]
+        np.multiply(self._data[start:end], _INT16_SCALE, out=out)
+        return out
+
+
 @dataclass
 class Session:
     session_id: str
     language_hint: str = "auto"
+    # 二进制帧的链路编码（start 帧协商）
+    encoding: str = "pcm_s16le"
     utterance_id: int = 0
     started_at: float = field(default_factory=time.monotonic)
-    # 当前 utterance 累积 buffer：np.int16 一维数组拼接
-    buffer: list[np.ndarray] = field(default_factory=list)
-    buffer_samples: int = 0
+    # 当前 utterance 累积音频（int16，预分配，见 _PcmBuffer）
+    pcm: _PcmBuffer = field(
+        default_factory=lambda: _PcmBuffer(int(_PCM_INITIAL_SEC * AUDIO_SAMPLE_RATE))
+    )
     last_partial_at_samples: int = 0
+    # 当前 utterance 内客户端用 gap 帧省掉的静音样本数（只计时长，不进 buffer）
+    gap_samples: int = 0
+    # PARTIAL_MODE=incremental：已定稿的文字及其覆盖到的样本位置
+    stable_text: str = ""
+    stable_samples: int = 0
+    # 当前（或最近一次被取消、线程可能仍在跑的）后台 partial
+    partial: _PartialJob | None = None
+
+    @property
+    def buffer_samples(self) -> int:
+        return len(self.pcm)
+
+
+@dataclass
+class _PartialJob:
+    task: asyncio.Task[None] | None = None
+    # 已拿到推理名额进了线程：不再被新 partial 顶替
+    started: bool = False
+
+    def mark_started(self) -> None:
+        self.started = True
 
 
-def _utterance_window(sess: Session) -> tuple[float, float]:
-    """返回当前 utterance 的 (start_time, end_time) 自会话开始秒数。"""
+def _utterance_window(
+    sess: Session, samples: int | None = None
+) -> tuple[float, float]:
+    """返回当前 utterance 的 (start_time, end_time) 自会话开始秒数。
+
+    ``samples`` 是推理实际用到的样本数（后台 partial 跑的时候 buffer 还在涨）。
+    utterance 内的 gap（客户端压缩掉的静音）算进时长，它在真实时间线上存在。
+    """
     end = time.monotonic() - sess.started_at
-    duration = sess.buffer_samples / AUDIO_SAMPLE_RATE
+    if samples is None:
+        samples = sess.buffer_samples
+    duration = (samples + sess.gap_samples) / AUDIO_SAMPLE_RATE
     start = max(0.0, end - duration)
     return start, end
 
@@ -359,22 +881,20 @@ async def _emit_error(ws: WebSocket, msg: str, fatal: bool = False) -> None:
     await _emit(ws, {"error": msg, "fatal": fatal})
 
 
-async def _flush_inference(
-    ws: WebSocket, sess: Session, *, is_final: bool
+async def _emit_transcript(
+    ws: WebSocket,
+    sess: Session,
+    lang: str | None,
+    text: str,
+    *,
+    is_final: bool,
+    samples: int,
+    stable_text: str | None = None,
 ) -> None:
-    if sess.buffer_samples == 0:
-        return
-    audio = np.concatenate(sess.buffer) if len(sess.buffer) > 1 else sess.buffer[0]
-    kind = "final" if is_final else "partial"
-    try:
-        lang, text = await _run_inference(audio, sess.language_hint, kind)
-    except Exception as exc:
-        await _emit_error(ws, f"inference failed: {exc}", fatal=False)
-        return
-    start_s, end_s = _utterance_window(sess)
+    start_s, end_s = _utterance_window(sess, samples)
     # confidence：funasr SenseVoice 当前未暴露 token-level 置信度；用占位 1.0
     # TODO(phase-1)：若切到 funasr-onnx 路径，可拿到真正的 logprob → 转 confidence
-    await _emit(ws, {
+    payload: dict[str, Any] = {
         "text": text,
         "is_final": is_final,
         "confidence": 1.0,
@@ -382,15 +902,207 @@ async def _flush_inference(
         "end_time": round(end_s, 3),
         "utterance_id": sess.utterance_id,
         "language": lang,
-    })
-    if is_final:
-        # 重置 buffer，递增 utterance_id
-        sess.buffer.clear()
-        sess.buffer_samples = 0
-        sess.last_partial_at_samples = 0
+    }
+    if stable_text is not None:
+        payload["stable_text"] = stable_text
+    await _emit(ws, payload)
+
+
+async def _flush_inference(
+    ws: WebSocket, sess: Session, *, forced: bool = False
+) -> None:
+    """final：取消在途 partial，对整段 buffer 推理并回包，然后开始下一个 utterance。
+
+    ``forced``：buffer 撑到 ``MAX_UTTERANCE_SEC`` 的强制 flush（客户端没切句），
+    走 VAD 路径兜底。
+    """
+    _cancel_partial(sess, by="final")
+    samples = sess.buffer_samples
+    if samples == 0:
+        return
+    audio = sess.pcm.float32_view("final")
+    path = _pick_path(samples, forced=forced)
+    try:
+        lang, text = await final_batcher.submit(audio, sess.language_hint, path)
+    except Exception as exc:
+        await _emit_error(ws, f"inference failed: {exc}", fatal=False)
+        return
+    await _emit_transcript(ws, sess, lang, text, is_final=True, samples=samples)
+    # 重置 buffer，递增 utterance_id
+    sess.pcm.clear()
+    sess.last_partial_at_samples = 0
+    sess.gap_samples = 0
+    sess.stable_text, sess.stable_samples = "", 0
+    sess.utterance_id += 1
+
+
+def _schedule_partial(ws: WebSocket, sess: Session) -> None:
+    """到点时起后台 partial；顶替仍在排队的旧 partial，已在跑的让它跑完。"""
+    prev = sess.partial
+    if prev is not None and prev.task is not None and not prev.task.done():
+        if prev.started:
+            return
+        prev.task.cancel()
+        PARTIALS_SUPERSEDED.labels(by="partial").inc()
+    sess.last_partial_at_samples = sess.buffer_samples
+    job = _PartialJob()
+    job.task = asyncio.create_task(_run_partial(ws, sess, job, prev))
+    sess.partial = job
+
+
+async def _run_partial(
+    ws: WebSocket, sess: Session, job: _PartialJob, prev: _PartialJob | None
+) -> None:
+    # partial scratch 只有一份：被取消的上一个 partial 线程可能还在读它
+    if prev is not None and prev.task is not None and not prev.task.done():
+        await asyncio.wait([prev.task])
+    samples = sess.buffer_samples
+    if samples == 0:
+        return
+    stable_text: str | None = None
+    try:
+        if PARTIAL_MODE == "incremental":
+            lang, text = await _incremental_partial(sess, samples, job)
+            stable_text = sess.stable_text
+        else:
+            PARTIAL_DECODED_SECONDS.observe(samples / AUDIO_SAMPLE_RATE)
+            lang, text = await _run_inference(
+                sess.pcm.float32_view("partial"), sess.language_hint, "partial",
+                path=_pick_path(samples), on_start=job.mark_started,
+            )
+    except _PartialShed:
+        return  # 过时 / 过载：不回包，下一个 partial 会带上更多音频
+    except Exception as exc:
+        await _emit_error(ws, f"inference failed: {exc}", fatal=False)
+        return
+    await _emit_transcript(
+        ws, sess, lang, text,
+        is_final=False, samples=samples, stable_text=stable_text,
+    )
+
+
+async def _incremental_partial(
+    sess: Session, samples: int, job: _PartialJob
+) -> tuple[str | None, str]:
+    """只解尾窗的 partial；必要时顺带把较早的音频定稿。返回 (language, 完整 text)。
+
+    定稿段与尾窗合成一次 ``generate``（同一语言 hint），结果按顺序去重拼接后
+    才写回 ``sess.stable_*``——推理期间被取消（final / reset）则什么都不改。
+    """
+    window = int(PARTIAL_WINDOW_SEC * AUDIO_SAMPLE_RATE)
+    ctx = int(PARTIAL_CONTEXT_SEC * AUDIO_SAMPLE_RATE)
+    spans: list[tuple[int, int]] = []  # 待定稿的 [lo, hi)
+    stable = sess.stable_samples
+    while samples - stable > window:
+        cut = _quiet_cut(sess.pcm.view(), stable + window // 2, stable + window)
+        spans.append((stable, cut))
+        stable = cut
+    spans.append((stable, samples))  # 尾窗
+    audios = [
+        sess.pcm.float32_view(f"partial{i}", max(0, lo - ctx), hi)
+        for i, (lo, hi) in enumerate(spans)
+    ]
+    PARTIAL_DECODED_SECONDS.observe(sum(a.size for a in audios) / AUDIO_SAMPLE_RATE)
+    results = await _run_inference_batch(
+        audios, sess.language_hint, "partial",
+        path=_pick_path(max(a.size for a in audios)), on_start=job.mark_started,
+    )
+    text_acc, acc_samples = sess.stable_text, sess.stable_samples
+    lang: str | None = None
+    tail = ""
+    for i, ((lo, hi), (lang, raw)) in enumerate(zip(spans, results)):
+        ctx_used = lo - max(0, lo - ctx)
+        if ctx_used and text_acc:
+            expected = _expected_chars(text_acc, acc_samples, ctx_used)
+            raw = _strip_overlap(text_acc, raw, expected)
+        if i < len(spans) - 1:
+            text_acc, acc_samples = _join_text(text_acc, raw), hi
+        else:
+            tail = raw
+    sess.stable_text, sess.stable_samples = text_acc, acc_samples
+    return lang, _join_text(text_acc, tail)
+
+
+_FRAME_SAMPLES = AUDIO_SAMPLE_RATE // 50  # 20ms
+# 去重时忽略的标点 / 空白（ITN 会给上下文重解出的文字加不同的标点）
+_STITCH_IGNORED = frozenset(" \t\n，。！？、；：,.!?;:\"'“”‘’（）()…-")
+
+
+def _quiet_cut(pcm: np.ndarray, lo: int, hi: int) -> int:
+    """``[lo, hi)`` 内能量最低的 20ms 帧中点，作为定稿切点（尽量不切在字中间）。"""
+    n_frames = (hi - lo) // _FRAME_SAMPLES
+    if n_frames <= 1:
+        return hi
+    frames = pcm[lo:lo + n_frames * _FRAME_SAMPLES].reshape(n_frames, _FRAME_SAMPLES)
+    energy = np.einsum("ij,ij->i", frames, frames, dtype=np.float64)
+    return lo + int(np.argmin(energy)) * _FRAME_SAMPLES + _FRAME_SAMPLES // 2
+
+
+def _expected_chars(text: str, samples: int, ctx_samples: int) -> int:
+    """按已定稿部分的语速估计 ``ctx_samples`` 左上下文会重解出多少个字。"""
+    if samples <= 0:
+        return 0
+    n = sum(1 for c in text if c not in _STITCH_IGNORED)
+    return round(n * ctx_samples / samples)
+
+
+def _strip_overlap(prefix: str, text: str, expected: int) -> str:
+    """去掉 ``text`` 开头与 ``prefix`` 结尾重复的字（左上下文重解出来的部分）。
+
+    忽略标点 / 空白和大小写找最长的精确重叠；找不到像样的（短于 expected 一半）
+    就按 expected 估计丢字。best-effort：不稳定尾巴反正会被下一个 partial / final 覆盖。
+    """
+    keep = [i for i, c in enumerate(text) if c not in _STITCH_IGNORED]
+    if not keep or expected <= 0:
+        return text
+    head = [text[i].lower() for i in keep]
+    tail = [c.lower() for c in prefix if c not in _STITCH_IGNORED]
+    drop = min(expected, len(head))
+    for k in range(min(len(tail), len(head), 2 * expected + 4), max(1, expected // 2) - 1, -1):
+        if tail[-k:] == head[:k]:
+            drop = k
+            break
+    if drop >= len(head):
+        return ""
+    return text[keep[drop - 1] + 1:].lstrip("".join(_STITCH_IGNORED)) if drop else text
+
+
+def _join_text(a: str, b: str) -> str:
+    if a and b and a[-1].isascii() and a[-1].isalnum() and b[0].isascii() and b[0].isalnum():
+        return f"{a} {b}"
+    return a + b
+
+
+def _cancel_partial(sess: Session, *, by: str) -> None:
+    job = sess.partial
+    if job is not None and job.task is not None and not job.task.done():
+        job.task.cancel()
+        PARTIALS_SUPERSEDED.labels(by=by).inc()
+
+
+def _note_gap(sess: Session, ms: Any) -> None:
+    """``gap`` 控制帧：记下被压缩的静音时长。还没有音频时（句首静音）不计。"""
+    try:
+        samples = int(ms) * AUDIO_SAMPLE_RATE // 1000
+    except (TypeError, ValueError):
+        return
+    if samples <= 0:
+        return
+    UPLINK_GAP_SECONDS.inc(samples / AUDIO_SAMPLE_RATE)
+    if sess.buffer_samples > 0:
+        sess.gap_samples += samples
+
+
+def _reset_utterance(sess: Session) -> None:
+    """丢弃当前 utterance 的 buffer（``reset`` 事件）；有未 flush 的音频时推进
+    utterance_id，保证长连接上 id 不会被下一轮复用。"""
+    _cancel_partial(sess, by="reset")
+    if sess.buffer_samples > 0:
         sess.utterance_id += 1
-    else:
-        sess.last_partial_at_samples = sess.buffer_samples
+    sess.pcm.clear()
+    sess.last_partial_at_samples = 0
+    sess.gap_samples = 0
+    sess.stable_text, sess.stable_samples = "", 0
 
 
 async def _handle_ws(ws: WebSocket) -> None:
@@ -400,7 +1112,7 @@ async def _handle_ws(ws: WebSocket) -> None:
         await ws.close(code=1013, reason="server shutting down")
         return
     if state.active_session_count >= MAX_CONCURRENT_SESSIONS * 2:
-        # 软上限：信号量限制 inference 并发，但 WS 连接数也设个上限避免资源耗尽
+        # 软上限：调度器限制 inference 并发，但 WS 连接数也设个上限避免资源耗尽
         SESSIONS_REJECTED.labels(reason="saturation").inc()
         await ws.close(code=1013, reason="server saturated")
         return
@@ -432,37 +1144,52 @@ async def _handle_ws(ws: WebSocket) -> None:
                     continue
                 event = cmd.get("event")
                 if event == "start":
+                    encoding = str(cmd.get("encoding") or "pcm_s16le")
+                    if encoding not in _LINK_ENCODINGS:
+                        await _emit_error(
+                            ws, f"unsupported encoding: {encoding!r}", fatal=True
+                        )
+                        break
+                    sess.encoding = encoding
                     sess.language_hint = str(cmd.get("language", "auto"))
                     sid = cmd.get("session_id")
                     if sid:
                         sess.session_id = str(sid)
                 elif event == "end_of_utterance":
-                    await _flush_inference(ws, sess, is_final=True)
+                    await _flush_inference(ws, sess)
+                elif event == "gap":
+                    _note_gap(sess, cmd.get("ms"))
+                elif event == "reset":
+                    _reset_utterance(sess)
+                    await _emit(ws, {
+                        "event": "reset_ack",
+                        "seq": cmd.get("seq"),
+                        "utterance_id": sess.utterance_id,
+                    })
                 elif event == "stop":
                     if sess.buffer_samples > 0:
-                        await _flush_inference(ws, sess, is_final=True)
+                        await _flush_inference(ws, sess)
                     break
                 else:
                     await _emit_error(ws, f"unknown event: {event!r}")
             elif "bytes" in msg and msg["bytes"] is not None:
                 # 二进制 PCM 帧
-                pcm = np.frombuffer(msg["bytes"], dtype=np.int16)
+                AUDIO_BYTES_IN.labels(encoding=sess.encoding).inc(len(msg["bytes"]))
+                pcm = _decode_pcm(sess.encoding, msg["bytes"])
                 if pcm.size == 0:
                     continue
-                sess.buffer.append(pcm)
-                sess.buffer_samples += pcm.size
+                sess.pcm.append(pcm)
 
                 # 安全网：如果客户端没发 end_of_utterance 而 buffer 跨过 MAX，强制 flush
                 if sess.buffer_samples >= int(MAX_UTTERANCE_SEC * AUDIO_SAMPLE_RATE):
-                    await _flush_inference(ws, sess, is_final=True)
+                    await _flush_inference(ws, sess, forced=True)
                     continue
 
                 # 周期性 partial（自上次 partial 起，每 PARTIAL_INTERVAL_SEC 跑一次）
                 advance = sess.buffer_samples - sess.last_partial_at_samples
                 if advance >= int(PARTIAL_INTERVAL_SEC * AUDIO_SAMPLE_RATE):
-                    # partial 不阻塞下一次接收：开 task；但要避免 partial 风暴，所以在
-                    # 当前实现里直接 await（partial 间隔已是秒级，可接受的串行化）
-                    await _flush_inference(ws, sess, is_final=False)
+                    # 后台跑，不阻塞接收；final 到达时会取消它
+                    _schedule_partial(ws, sess)
     except Exception as exc:
         log.exception("ws session crashed", extra={
             "session_id": sess.session_id, "err": str(exc),
@@ -472,6 +1199,7 @@ async def _handle_ws(ws: WebSocket) -> None:
         except Exception:
             pass
     finally:
+        _cancel_partial(sess, by="close")
         state.active_session_count -= 1
         ACTIVE_SESSIONS.set(state.active_session_count)
         log.info("ws session closed", extra={"session_id": sess.session_id})
@@ -497,6 +1225,12 @@ async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
         log.exception("model load failed", extra={"err": str(exc)})
         state.model_loaded = False
         # 让 /health 一直返 degraded；docker HEALTHCHECK 会标 unhealthy 触发重启
+    if state.model_loaded and FAST_PATH_MAX_SEC > 0:
+        try:
+            state.model_fast = await asyncio.to_thread(_load_fast_model)
+        except Exception as exc:
+            # fast path 只是优化：加载失败全部走 VAD 路径
+            log.exception("fast-path model load failed", extra={"err": str(exc)})
 
     # SIGTERM / SIGINT: 既触发 shutdown_event（拒绝新 WS、health 转 degraded），
     # 也要让 uvicorn 自己开始 graceful shutdown（停止 accept、等现有连接结束）
@@ -551,10 +1285,11 @@ async def health() -> JSONResponse:
     payload = {
         "status": "ok" if ok else "degraded",
         "model_loaded": state.model_loaded,
+        "fast_path_loaded": state.model_fast is not None,
         "model_id": SENSEVOICE_MODEL_ID,
         "gpu_available": state.gpu_available,
         "active_sessions": state.active_session_count,
-        "queue_depth": state.queue_depth,
+        "queue_depth": state.scheduler.queue_depth,
         "max_concurrent_sessions": MAX_CONCURRENT_SESSIONS,
         "shutting_down": is_shutting,
         "audio_sample_rate": AUDIO_SAMPLE_RATE,
@@ -0,0 +1,169 @@
+"""CosyVoice 音频块 hand-off 基准：合成线程 → event loop，旧的逐块往返 vs ``_AudioHandoff``。
+
+不需要 GPU / CosyVoice：直接 import ``infra/gpu-services/cosyvoice/server.py``。每个
+模拟会话一个合成线程，每 ``--chunk-ms`` 产出一块 24 kHz PCM（``time.sleep`` 模拟
+GPU，放开 GIL），event loop 侧按服务端的写法取块、μ-law 编码后"写出"。另有一个
+loop 占用任务每 10 ms 阻塞 ``--loop-busy-ms``，模拟同一 loop 上其它会话的收发 /
+JSON 处理。
+
+- ``run_coroutine_threadsafe``：旧行为，每块 ``asyncio.Queue.put`` 走一次 loop，
+  线程阻塞在 ``fut.result()`` 直到 loop 处理完。
+- ``handoff``：``_AudioHandoff``，线程侧 append + 按需唤醒，只有积压满才阻塞。
+
+输出每种模式在 2 / 4 / 8 路并发下的块延迟（线程交出 → loop 拿到）p50 / p99 / max，
+以及合成线程每块被阻塞的平均 / 最大时间（GPU 空转的部分）。
+
+Usage (repo root):
+    python scripts/cosyvoice-handoff-bench.py
+    python scripts/cosyvoice-handoff-bench.py --sessions 2 8 16 --loop-busy-ms 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import importlib.util
+import logging
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import numpy as np
+
+_SERVER_PY = (
+    Path(__file__).resolve().parent.parent
+    / "infra" / "gpu-services" / "cosyvoice" / "server.py"
+)
+_SR = 24_000
+
+
+def _load_server() -> ModuleType:
+    spec = importlib.util.spec_from_file_location("cosyvoice_server", _SERVER_PY)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    # server.py 把 root logger 改成 JSON-to-stdout；基准输出只要表格
+    logging.getLogger().setLevel(logging.WARNING)
+    return module
+
+
+class _LegacyHandoff:
+    """旧行为：``run_coroutine_threadsafe(audio_q.put(item))`` + ``fut.result()``。"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._q: asyncio.Queue[Any] = asyncio.Queue(maxsize=64)
+
+    def put(self, item: Any) -> bool:
+        fut = asyncio.run_coroutine_threadsafe(self._q.put(item), self._loop)
+        try:
+            fut.result(timeout=10.0)
+        except Exception:
+            return False
+        return True
+
+    async def get(self) -> Any:
+        return await self._q.get()
+
+    def close(self) -> None:
+        pass
+
+
+def _worker(
+    handoff: Any, chunks: int, chunk_ms: float, blocked: list[float]
+) -> None:
+    pcm = (np.sin(np.arange(int(_SR * chunk_ms / 1000)) / 7) * 8_000).astype("<i2")
+    for _ in range(chunks):
+        time.sleep(chunk_ms / 1000)  # "GPU" 出下一块
+        t0 = time.perf_counter()
+        handoff.put((t0, pcm.tobytes()))
+        blocked.append(time.perf_counter() - t0)
+    handoff.put(None)
+
+
+async def _session(
+    server: ModuleType, mode: str, args: argparse.Namespace,
+    latencies: list[float], blocked: list[float],
+) -> None:
+    loop = asyncio.get_running_loop()
+    handoff = (
+        server._AudioHandoff(loop) if mode == "handoff" else _LegacyHandoff(loop)
+    )
+    thread = threading.Thread(
+        target=_worker, args=(handoff, args.chunks, args.chunk_ms, blocked), daemon=True
+    )
+    thread.start()
+    try:
+        while True:
+            item = await handoff.get()
+            if item is None:
+                break
+            put_at, pcm = item
+            latencies.append(time.perf_counter() - put_at)
+            server._encode_pcm("mulaw", pcm)
+            await asyncio.sleep(0)  # ws.send_bytes 让出一次
+    finally:
+        handoff.close()
+    await asyncio.to_thread(thread.join)
+
+
+async def _loop_hog(busy_ms: float, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        end = time.perf_counter() + busy_ms / 1000
+        while time.perf_counter() < end:
+            pass
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(stop.wait(), 0.010)
+
+
+async def _run(
+    server: ModuleType, mode: str, sessions: int, args: argparse.Namespace
+) -> tuple[list[float], list[float]]:
+    latencies: list[float] = []
+    blocked: list[float] = []
+    stop = asyncio.Event()
+    hog = asyncio.create_task(_loop_hog(args.loop_busy_ms, stop))
+    await asyncio.gather(*(
+        _session(server, mode, args, latencies, blocked) for _ in range(sessions)
+    ))
+    stop.set()
+    await hog
+    return latencies, blocked
+
+
+def _pct(values: list[float], q: float) -> float:
+    return statistics.quantiles(values, n=100)[q - 1] if len(values) > 1 else values[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--chunks", type=int, default=100,
+                        help="audio chunks per session")
+    parser.add_argument("--chunk-ms", type=float, default=20.0,
+                        help="synthesis time (and audio length) per chunk")
+    parser.add_argument("--loop-busy-ms", type=float, default=2.0,
+                        help="event-loop blocking burst every 10 ms (0 = idle loop)")
+    args = parser.parse_args()
+
+    server = _load_server()
+    print(f"{args.chunks} x {args.chunk_ms:.0f} ms chunks per session; loop busy "
+          f"{args.loop_busy_ms:.1f} ms every 10 ms")
+    print(f"{'mode':>26} {'sessions':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+          f"{'thread blocked avg ms':>22} {'max ms':>8}")
+    for sessions in args.sessions:
+        for mode in ("run_coroutine_threadsafe", "handoff"):
+            latencies, blocked = asyncio.run(_run(server, mode, sessions, args))
+            print(f"{mode:>26} {sessions:>8} {_pct(latencies, 50) * 1e3:>8.3f} "
+                  f"{_pct(latencies, 99) * 1e3:>8.3f} {max(latencies) * 1e3:>8.3f} "
+                  f"{statistics.fmean(blocked) * 1e3:>22.3f} "
+                  f"{max(blocked) * 1e3:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
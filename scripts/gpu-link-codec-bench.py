@@ -0,0 +1,134 @@
+"""Pi↔GPU 链路编码基准：每种 ``GPU_LINK_ENCODING`` 在 1 / 8 / 32 路并发下的带宽与 CPU。
+
+不需要 GPU：两端用的都是真实代码——编排器侧 ``vocalize.codec``，GPU 侧
+``infra/gpu-services/sensevoice/server.py::_decode_pcm`` 与
+``infra/gpu-services/cosyvoice/server.py::_encode_pcm``。每路模拟一通通话：
+
+- 上行（STT）：16 kHz PCM，按 ``STT_UPLINK_COALESCE_MS`` 攒成 ``--uplink-ms`` 一条，
+  编排器编码 → SenseVoice 解码。
+- 下行（TTS）：24 kHz PCM，CosyVoice 每 ``--downlink-ms`` 一块，CosyVoice 编码 →
+  编排器解码。
+
+带宽含 WebSocket 帧头（客户端 → 服务端另加 4 字节掩码），不含 TCP/IP 与隧道开销。
+CPU 用 ``time.process_time()``，换算成"N 路实时通话占一个核的百分比"。编排器那一列
+在 Pi 上跑才有生产意义。``SNR`` 是上行往返一次的信噪比（有损编码的音质代价）。
+
+Usage (repo root, package installed with ``pip install -e .``):
+    python scripts/gpu-link-codec-bench.py
+    python scripts/gpu-link-codec-bench.py --legs 1 8 32 64 --audio-s 30
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import logging
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from types import ModuleType
+
+import numpy as np
+
+from vocalize import codec
+
+_INFRA = Path(__file__).resolve().parent.parent / "infra" / "gpu-services"
+_UP_SR = 16_000
+_DOWN_SR = 24_000
+
+
+def _load(name: str, service: str) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(name, _INFRA / service / "server.py")
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    # server.py 把 root logger 改成 JSON-to-stdout；基准输出只要表格
+    logging.getLogger().setLevel(logging.WARNING)
+    return module
+
+
+def _ws_overhead(payload: int, *, masked: bool) -> int:
+    header = 2 if payload < 126 else 4 if payload < 65_536 else 10
+    return header + (4 if masked else 0)
+
+
+def _speech_like(samples: int, seed: int) -> np.ndarray:
+    """有起伏的带限噪声，幅度分布接近语音（μ-law 的量化误差依赖幅度）。"""
+    rng = np.random.default_rng(seed)
+    noise = np.convolve(rng.standard_normal(samples), np.ones(8) / 8, mode="same")
+    envelope = 0.2 + 0.8 * np.abs(np.sin(np.arange(samples) / (0.4 * _UP_SR)))
+    return np.clip(noise * envelope * 9_000, -32_768, 32_767).astype("<i2")
+
+
+def _chunks(pcm: np.ndarray, samples_per_msg: int) -> list[bytes]:
+    return [
+        pcm[i:i + samples_per_msg].tobytes()
+        for i in range(0, pcm.size, samples_per_msg)
+    ]
+
+
+def _snr_db(pcm: bytes, encoding: str) -> float:
+    ref = np.frombuffer(pcm, "<i2").astype(np.float64)
+    back = np.frombuffer(codec.decode(encoding, codec.encode(encoding, pcm)), "<i2")
+    noise = np.mean((ref - back) ** 2)
+    return float("inf") if noise == 0 else 10 * np.log10(np.mean(ref**2) / noise)
+
+
+def _cpu(fn: Callable[[bytes], object], msgs: list[bytes], legs: int) -> float:
+    # 各路交错处理，模拟同一进程里 N 路同时在跑
+    t0 = time.process_time()
+    for msg in msgs:
+        for _ in range(legs):
+            fn(msg)
+    return time.process_time() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--legs", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--audio-s", type=float, default=20.0,
+                        help="audio seconds per leg in each direction")
+    parser.add_argument("--uplink-ms", type=int, default=120,
+                        help="uplink message size (STT_UPLINK_COALESCE_MS)")
+    parser.add_argument("--downlink-ms", type=int, default=40,
+                        help="CosyVoice audio chunk size")
+    args = parser.parse_args()
+
+    sensevoice = _load("sensevoice_server", "sensevoice")
+    cosyvoice = _load("cosyvoice_server", "cosyvoice")
+    up = _chunks(
+        _speech_like(int(args.audio_s * _UP_SR), 1), _UP_SR * args.uplink_ms // 1000
+    )
+    down = _chunks(
+        _speech_like(int(args.audio_s * _DOWN_SR), 2),
+        _DOWN_SR * args.downlink_ms // 1000,
+    )
+
+    print(f"{args.audio_s:.0f}s audio per leg each way; uplink {args.uplink_ms} ms "
+          f"msgs @16k, downlink {args.downlink_ms} ms chunks @24k")
+    print(f"{'encoding':>10} {'legs':>5} {'up kbps/leg':>12} {'down kbps/leg':>14} "
+          f"{'total Mbps':>11} {'Pi CPU %':>9} {'GPU-host CPU %':>15} {'SNR dB':>7}")
+    for encoding in codec.LINK_ENCODINGS:
+        up_wire = [codec.encode(encoding, m) for m in up]
+        down_wire = [cosyvoice._encode_pcm(encoding, m) for m in down]
+        up_bits = 8 * sum(len(m) + _ws_overhead(len(m), masked=True) for m in up_wire)
+        down_bits = 8 * sum(
+            len(m) + _ws_overhead(len(m), masked=False) for m in down_wire
+        )
+        up_kbps = up_bits / args.audio_s / 1000
+        down_kbps = down_bits / args.audio_s / 1000
+        snr = _snr_db(b"".join(up), encoding)
+        for legs in args.legs:
+            pi_cpu = _cpu(lambda m: codec.encode(encoding, m), up, legs)
+            pi_cpu += _cpu(lambda m: codec.decode(encoding, m), down_wire, legs)
+            gpu_cpu = _cpu(lambda m: sensevoice._decode_pcm(encoding, m), up_wire, legs)
+            gpu_cpu += _cpu(lambda m: cosyvoice._encode_pcm(encoding, m), down, legs)
+            total_mbps = (up_kbps + down_kbps) * legs / 1000
+            print(f"{encoding:>10} {legs:>5} {up_kbps:>12.1f} {down_kbps:>14.1f} "
+                  f"{total_mbps:>11.2f} {pi_cpu / args.audio_s * 100:>9.2f} "
+                  f"{gpu_cpu / args.audio_s * 100:>15.2f} {snr:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
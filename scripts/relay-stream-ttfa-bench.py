@@ -0,0 +1,128 @@
+"""Relay 首音延迟基准：整段译文生成完再 ``speak()`` vs 边生成边 ``speak_stream()``。
+
+不需要 LLM / GPU：假 LLM 每 ``--token-ms`` 吐一个 token（译文由 ``--sentences``
+句组成，每句 ``--tokens-per-sentence`` 个 token），假 TTS 每收到一段先等
+``--tts-first-ms`` 再出第一块音频。transport 记录第一块音频到达的时刻。
+
+- ``speak``：旧的 relay 行为，``"".join(translated_pieces)`` 之后单帧朗读。
+- ``speak_stream``：译文增量按 ``VoicePipeline`` 的句末标点切段，首句切出就合成。
+
+输出每种模式在不同句数下的 time-to-first-audio（relay 开始 → 第一块音频）与
+全部音频送完的时间，各取 ``--runs`` 次的中位数。
+
+Usage (repo root):
+    python scripts/relay-stream-ttfa-bench.py
+    python scripts/relay-stream-ttfa-bench.py --sentences 1 3 6 --token-ms 25
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import AsyncIterator
+
+from vocalize.pipeline import VoicePipeline
+from vocalize.transports.base import AudioEncoding
+from vocalize.tts.base import TextChunk
+
+
+class _FakeLLMStream:
+    def __init__(self, sentences: int, tokens_per_sentence: int, token_s: float) -> None:
+        self.sentences = sentences
+        self.tokens_per_sentence = tokens_per_sentence
+        self.token_s = token_s
+
+    async def deltas(self) -> AsyncIterator[str]:
+        for _ in range(self.sentences):
+            for t in range(self.tokens_per_sentence):
+                await asyncio.sleep(self.token_s)
+                last = t == self.tokens_per_sentence - 1
+                yield "句。" if last else "字"
+
+
+class _FakeTTS:
+    output_sample_rate: int = 24000
+    output_encoding: AudioEncoding = "pcm_s16le"
+
+    def __init__(self, first_s: float) -> None:
+        self.first_s = first_s
+
+    async def stream_synthesize(
+        self, text_chunks: AsyncIterator[TextChunk]
+    ) -> AsyncIterator[bytes]:
+        async for chunk in text_chunks:
+            if not chunk.text:
+                continue
+            await asyncio.sleep(self.first_s)
+            yield b"\x00" * 960
+
+
+class _Transport:
+    sample_rate: int = 24000
+    channels: int = 1
+    encoding: AudioEncoding = "pcm_s16le"
+
+    def __init__(self) -> None:
+        self.first_audio_at: float | None = None
+
+    async def input_stream(self) -> AsyncIterator[bytes]:  # pragma: no cover - unused
+        if False:
+            yield b""
+
+    async def output_stream(self, audio: AsyncIterator[bytes]) -> None:
+        async for _ in audio:
+            if self.first_audio_at is None:
+                self.first_audio_at = time.perf_counter()
+
+    async def close(self) -> None:
+        pass
+
+
+async def _relay_once(mode: str, sentences: int, args: argparse.Namespace) -> tuple[float, float]:
+    transport = _Transport()
+    pipeline = VoicePipeline(
+        transport=transport,  # type: ignore[arg-type]
+        stt=None,  # type: ignore[arg-type]
+        llm=None,  # type: ignore[arg-type]
+        tts=_FakeTTS(args.tts_first_ms / 1000),
+        system_prompt="",
+    )
+    llm = _FakeLLMStream(sentences, args.tokens_per_sentence, args.token_ms / 1000)
+    started = time.perf_counter()
+    if mode == "speak":
+        text = "".join([d async for d in llm.deltas()]).strip()
+        await pipeline.speak(text, "zh")
+    else:
+        await pipeline.speak_stream(llm.deltas(), "zh")
+    done = time.perf_counter()
+    assert transport.first_audio_at is not None
+    return transport.first_audio_at - started, done - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sentences", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--tokens-per-sentence", type=int, default=12)
+    parser.add_argument("--token-ms", type=float, default=30.0,
+                        help="fake LLM inter-token delay")
+    parser.add_argument("--tts-first-ms", type=float, default=150.0,
+                        help="fake TTS delay from segment to its first audio chunk")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.tokens_per_sentence} tokens/sentence at {args.token_ms:.0f} ms/token; "
+          f"TTS first audio {args.tts_first_ms:.0f} ms after each segment")
+    print(f"{'mode':>13} {'sentences':>9} {'ttfa ms':>9} {'total ms':>9}")
+    for sentences in args.sentences:
+        for mode in ("speak", "speak_stream"):
+            results = [
+                asyncio.run(_relay_once(mode, sentences, args)) for _ in range(args.runs)
+            ]
+            ttfa = statistics.median(r[0] for r in results)
+            total = statistics.median(r[1] for r in results)
+            print(f"{mode:>13} {sentences:>9} {ttfa * 1e3:>9.1f} {total * 1e3:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""SenseVoice final 微批基准：固定 p95 final 延迟下，一张卡能撑多少并发会话。
+
+不需要 GPU / funasr：直接 import ``infra/gpu-services/sensevoice/server.py``，
+把 ``state.model`` 换成假模型。假模型的耗时 = 固定开销 + 每条输入的增量
+（``--fixed-ms`` / ``--per-item-ms``），模拟 GPU 上短 utterance 以 kernel 启动、
+调度等固定成本为主、batch 增量很小的特性；同一时刻只跑一个 ``generate``（一张卡
+上并发调用实际是分时的）。
+
+每个模拟会话循环：思考 ``--think-s``（指数分布）→ 提交一个 final → 记录延迟。
+对 ``--sessions`` 列表里的每个并发数分别跑"逐条"（FINAL_BATCH_MAX=1）与"微批"
+两种模式，输出 p50/p95 和满足 ``--slo-ms`` 的最大会话数。某模式 p95 超过 3 倍 SLO
+后视为饱和，不再跑更高并发（过载时积压排空很慢）。
+
+Usage (repo root):
+    python scripts/sensevoice-batch-bench.py
+    python scripts/sensevoice-batch-bench.py --sessions 4 8 16 32 64 \\
+        --fixed-ms 60 --per-item-ms 6 --slo-ms 300 --duration-s 8
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import logging
+import random
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import numpy as np
+
+_SERVER_PY = (
+    Path(__file__).resolve().parent.parent
+    / "infra" / "gpu-services" / "sensevoice" / "server.py"
+)
+
+
+def _load_server() -> ModuleType:
+    spec = importlib.util.spec_from_file_location("sensevoice_server", _SERVER_PY)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    # server.py 把 root logger 改成 JSON-to-stdout；基准输出只要表格
+    logging.getLogger().setLevel(logging.WARNING)
+    return module
+
+
+class FakeModel:
+    """``AutoModel.generate`` 替身：独占"GPU"阻塞 fixed + per_item * batch 毫秒。"""
+
+    def __init__(self, fixed_ms: float, per_item_ms: float) -> None:
+        self.fixed_s = fixed_ms / 1000.0
+        self.per_item_s = per_item_ms / 1000.0
+        self._gpu = threading.Lock()
+
+    def generate(self, input: Any, **_kw: Any) -> list[dict[str, str]]:
+        n = len(input) if isinstance(input, list) else 1
+        with self._gpu:
+            time.sleep(self.fixed_s + self.per_item_s * n)
+        return [{"key": str(i), "text": "<|zh|><|NEUTRAL|><|Speech|>好的"} for i in range(n)]
+
+
+async def _run_point(
+    server: ModuleType,
+    *,
+    sessions: int,
+    batch_max: int,
+    window_ms: float,
+    max_concurrency: int,
+    think_s: float,
+    duration_s: float,
+    seed: int,
+) -> list[float]:
+    # 调度器 / batcher 持有 event loop 上的 future：每个测点重新建
+    server.state.scheduler = server._InferenceScheduler(max_concurrency)
+    batcher = server._FinalBatcher(
+        window_ms / 1000.0, batch_max, lanes=max_concurrency
+    )
+    rng = random.Random(seed)
+    latencies: list[float] = []
+    deadline = time.perf_counter() + duration_s
+
+    async def one_session() -> None:
+        audio = np.zeros(int(16000 * rng.uniform(0.8, 3.0)), dtype=np.float32)
+        await asyncio.sleep(rng.uniform(0, think_s))  # 错开起跑
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            await batcher.submit(audio, "auto")
+            latencies.append(time.perf_counter() - t0)
+            await asyncio.sleep(rng.expovariate(1.0 / think_s))
+
+    await asyncio.gather(*(one_session() for _ in range(sessions)))
+    return latencies
+
+
+def _pct(values: list[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(q) - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+",
+                        default=[8, 16, 24, 32, 48, 64, 96])
+    parser.add_argument("--fixed-ms", type=float, default=60.0)
+    parser.add_argument("--per-item-ms", type=float, default=6.0)
+    parser.add_argument("--think-s", type=float, default=1.5,
+                        help="mean gap between a session's finals")
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    parser.add_argument("--batch-max", type=int, default=8)
+    parser.add_argument("--max-concurrency", type=int, default=4,
+                        help="inference slots (MAX_CONCURRENT_SESSIONS)")
+    parser.add_argument("--slo-ms", type=float, default=300.0)
+    parser.add_argument("--duration-s", type=float, default=6.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    server = _load_server()
+    server.state.model = FakeModel(args.fixed_ms, args.per_item_ms)
+
+    modes = [("sequential", 1), ("batched", args.batch_max)]
+    best: dict[str, int] = {name: 0 for name, _ in modes}
+    saturated: set[str] = set()
+    print(f"fake model: {args.fixed_ms:.0f} ms + {args.per_item_ms:.0f} ms/item, "
+          f"slots={args.max_concurrency}, SLO p95 <= {args.slo_ms:.0f} ms")
+    print(f"{'sessions':>8} {'mode':>10} {'finals':>7} {'p50 ms':>8} {'p95 ms':>8}")
+    for n in args.sessions:
+        for name, batch_max in modes:
+            if name in saturated:
+                print(f"{n:>8} {name:>10} {'-':>7} {'saturated':>17}")
+                continue
+            lat = asyncio.run(_run_point(
+                server,
+                sessions=n,
+                batch_max=batch_max,
+                window_ms=args.window_ms,
+                max_concurrency=args.max_concurrency,
+                think_s=args.think_s,
+                duration_s=args.duration_s,
+                seed=args.seed,
+            ))
+            p50, p95 = _pct(lat, 50) * 1000, _pct(lat, 95) * 1000
+            if p95 <= args.slo_ms:
+                best[name] = max(best[name], n)
+            elif p95 > 3 * args.slo_ms:
+                saturated.add(name)
+            print(f"{n:>8} {name:>10} {len(lat):>7} {p50:>8.1f} {p95:>8.1f}")
+    print()
+    for name, _ in modes:
+        print(f"max sessions within SLO ({name}): {best[name]}")
+
+
+if __name__ == "__main__":
+    main()
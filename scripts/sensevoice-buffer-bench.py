@@ -0,0 +1,130 @@
+"""SenseVoice utterance 缓冲基准：list + concatenate vs 预分配 ``_PcmBuffer``。
+
+不需要 GPU / funasr：直接 import ``infra/gpu-services/sensevoice/server.py``，
+只比较服务端在每次 flush 前准备推理输入的那一步：
+
+- ``list``：旧做法——每帧 ``append`` 一个 ndarray，flush 时 ``np.concatenate``
+  整段，再 ``astype(float32) / 32768``（两次整段分配）。
+- ``pcmbuf``：``_PcmBuffer.append`` 原地写入，flush 时 ``float32_view(kind)``
+  写进复用 scratch。
+
+模拟一个会话连续说 ``--utterances`` 段、每段 ``--utterance-s`` 秒的话（20ms 帧），
+每 ``--partial-s`` 秒一次 partial、段末一次 final。用 tracemalloc 统计每次 flush
+的临时分配量（flush 内峰值 - flush 前占用）之和，以及 flush 的总耗时。
+
+Usage (repo root):
+    python scripts/sensevoice-buffer-bench.py
+    python scripts/sensevoice-buffer-bench.py --utterance-s 30 --partial-s 1.5
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from types import ModuleType
+
+import numpy as np
+
+_SERVER_PY = (
+    Path(__file__).resolve().parent.parent
+    / "infra" / "gpu-services" / "sensevoice" / "server.py"
+)
+_SR = 16_000
+_FRAME = 320  # 20ms @ 16kHz
+
+
+def _load_server() -> ModuleType:
+    spec = importlib.util.spec_from_file_location("sensevoice_server", _SERVER_PY)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    # server.py 把 root logger 改成 JSON-to-stdout；基准输出只要表格
+    logging.getLogger().setLevel(logging.WARNING)
+    return module
+
+
+class _ListBuffer:
+    """旧实现：帧列表 + flush 时拼接再转 float32。"""
+
+    def __init__(self) -> None:
+        self.frames: list[np.ndarray] = []
+
+    def append(self, pcm: np.ndarray) -> None:
+        self.frames.append(pcm)
+
+    def clear(self) -> None:
+        self.frames.clear()
+
+    def float32_view(self, _kind: str) -> np.ndarray:
+        audio = np.concatenate(self.frames) if len(self.frames) > 1 else self.frames[0]
+        return audio.astype(np.float32) / 32768.0
+
+
+def _run(buf: object, frames: list[bytes], args: argparse.Namespace) -> tuple[int, float, int]:
+    partial_every = int(args.partial_s * _SR / _FRAME)
+    frames_per_utt = int(args.utterance_s * _SR / _FRAME)
+    transient = 0
+    flush_s = 0.0
+    flushes = 0
+    sink = 0.0
+
+    def flush(kind: str) -> None:
+        nonlocal transient, flush_s, flushes, sink
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        audio = buf.float32_view(kind)  # type: ignore[attr-defined]
+        sink += float(audio[-1])  # 模拟推理读输入
+        flush_s += time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        transient += max(0, peak - before)
+        flushes += 1
+
+    i = 0
+    for _ in range(args.utterances):
+        for n in range(1, frames_per_utt + 1):
+            buf.append(np.frombuffer(frames[i % len(frames)], dtype=np.int16))  # type: ignore[attr-defined]
+            i += 1
+            if n % partial_every == 0 and n != frames_per_utt:
+                flush("partial")
+        flush("final")
+        buf.clear()  # type: ignore[attr-defined]
+    return transient, flush_s, flushes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--utterance-s", type=float, default=30.0)
+    parser.add_argument("--partial-s", type=float, default=1.5)
+    parser.add_argument("--utterances", type=int, default=5)
+    args = parser.parse_args()
+
+    server = _load_server()
+    rng = np.random.default_rng(7)
+    frames = [
+        rng.integers(-3000, 3000, _FRAME, dtype=np.int16).tobytes() for _ in range(64)
+    ]
+    initial = int(server._PCM_INITIAL_SEC * _SR)
+
+    print(f"{args.utterances} x {args.utterance_s:.0f}s utterances, "
+          f"partial every {args.partial_s}s")
+    print(f"{'buffer':>8} {'flushes':>8} {'alloc MiB':>10} {'KiB/flush':>10} "
+          f"{'flush ms':>9} {'us/flush':>9}")
+    for name, make in (("list", _ListBuffer), ("pcmbuf", lambda: server._PcmBuffer(initial))):
+        tracemalloc.start()
+        try:
+            transient, flush_s, flushes = _run(make(), frames, args)
+        finally:
+            tracemalloc.stop()
+        print(f"{name:>8} {flushes:>8} {transient / 2**20:>10.1f} "
+              f"{transient / flushes / 1024:>10.1f} {flush_s * 1000:>9.1f} "
+              f"{flush_s / flushes * 1e6:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
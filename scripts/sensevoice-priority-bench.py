@@ -0,0 +1,160 @@
+"""SenseVoice 推理调度基准：partial 风暴下 final 的延迟，FIFO 信号量 vs 优先级调度。
+
+不需要 GPU / funasr：直接 import ``infra/gpu-services/sensevoice/server.py``，
+把 ``state.model`` 换成假模型（同一时刻只跑一个 ``generate``，耗时
+``--infer-ms``）。每个模拟会话在说话期间每 ``--partial-s`` 秒提交一个 partial，
+说完提交一个 final，停顿 ``--think-s`` 后开始下一句。
+
+- ``fifo``：旧行为，``asyncio.Semaphore`` 先到先得，partial 从不丢弃。
+- ``priority``：``_InferenceScheduler``，final 插队，过时 / 过载的 partial 丢弃。
+
+输出每种模式下 final 的 p50/p95、partial 的完成数与丢弃数。
+
+Usage (repo root):
+    python scripts/sensevoice-priority-bench.py
+    python scripts/sensevoice-priority-bench.py --sessions 12 --infer-ms 80
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import importlib.util
+import logging
+import random
+import statistics
+import sys
+import threading
+import time
+from collections.abc import AsyncIterator
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import numpy as np
+
+_SERVER_PY = (
+    Path(__file__).resolve().parent.parent
+    / "infra" / "gpu-services" / "sensevoice" / "server.py"
+)
+
+
+def _load_server() -> ModuleType:
+    spec = importlib.util.spec_from_file_location("sensevoice_server", _SERVER_PY)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    # server.py 把 root logger 改成 JSON-to-stdout；基准输出只要表格
+    logging.getLogger().setLevel(logging.WARNING)
+    return module
+
+
+class FakeModel:
+    """``AutoModel.generate`` 替身：独占"GPU"阻塞 infer_ms。"""
+
+    def __init__(self, infer_ms: float) -> None:
+        self.infer_s = infer_ms / 1000.0
+        self._gpu = threading.Lock()
+
+    def generate(self, input: Any, **_kw: Any) -> list[dict[str, str]]:
+        n = len(input) if isinstance(input, list) else 1
+        with self._gpu:
+            time.sleep(self.infer_s)
+        return [{"text": "<|zh|><|NEUTRAL|><|Speech|>好的"}] * n
+
+
+class _FifoScheduler:
+    """旧行为：``asyncio.Semaphore``，不分 kind、不丢弃。"""
+
+    def __init__(self, slots: int) -> None:
+        self._sem = asyncio.Semaphore(slots)
+        self.queue_depth = 0
+
+    @contextlib.asynccontextmanager
+    async def slot(self, _kind: str, _n: int = 1) -> AsyncIterator[None]:
+        async with self._sem:
+            yield
+
+
+async def _run_mode(
+    server: ModuleType, mode: str, args: argparse.Namespace
+) -> tuple[list[float], int, int]:
+    if mode == "fifo":
+        server.state.scheduler = _FifoScheduler(args.slots)
+    else:
+        server.state.scheduler = server._InferenceScheduler(args.slots)
+    rng = random.Random(args.seed)
+    finals: list[float] = []
+    partial_done = 0
+    partial_shed = 0
+    deadline = time.perf_counter() + args.duration_s
+    audio = np.zeros(16000 * 3, dtype=np.float32)
+
+    async def partial() -> None:
+        nonlocal partial_done, partial_shed
+        try:
+            await server._run_inference(audio, "auto", "partial")
+            partial_done += 1
+        except server._PartialShed:
+            partial_shed += 1
+
+    async def one_session() -> None:
+        await asyncio.sleep(rng.uniform(0, args.think_s))  # 错开起跑
+        pending: list[asyncio.Task[None]] = []
+        while time.perf_counter() < deadline:
+            speak_s = rng.uniform(1.5, 6.0)
+            t_end = time.perf_counter() + speak_s
+            while True:
+                left = t_end - time.perf_counter()
+                if left <= 0:
+                    break
+                await asyncio.sleep(min(args.partial_s, left))
+                if time.perf_counter() < t_end:
+                    pending.append(asyncio.create_task(partial()))
+            # 与服务端一致：final 到达时取消本会话在途 partial
+            for task in pending:
+                task.cancel()
+            pending.clear()
+            t0 = time.perf_counter()
+            await server._run_inference(audio, "auto", "final")
+            finals.append(time.perf_counter() - t0)
+            await asyncio.sleep(rng.expovariate(1.0 / args.think_s))
+
+    await asyncio.gather(*(one_session() for _ in range(args.sessions)))
+    return finals, partial_done, partial_shed
+
+
+def _pct(values: list[float], q: float) -> float:
+    if len(values) < 2:
+        return values[0] if values else float("nan")
+    return statistics.quantiles(values, n=100, method="inclusive")[int(q) - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--infer-ms", type=float, default=60.0)
+    parser.add_argument("--slots", type=int, default=4,
+                        help="inference slots (MAX_CONCURRENT_SESSIONS)")
+    parser.add_argument("--partial-s", type=float, default=0.3,
+                        help="partial cadence while speaking (PARTIAL_INTERVAL_SEC)")
+    parser.add_argument("--think-s", type=float, default=1.0)
+    parser.add_argument("--duration-s", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    server = _load_server()
+    server.state.model = FakeModel(args.infer_ms)
+    print(f"{args.sessions} sessions, fake model {args.infer_ms:.0f} ms, "
+          f"slots={args.slots}, partial every {args.partial_s}s")
+    print(f"{'mode':>9} {'finals':>7} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'partials':>9} {'shed':>6}")
+    for mode in ("fifo", "priority"):
+        finals, done, shed = asyncio.run(_run_mode(server, mode, args))
+        print(f"{mode:>9} {len(finals):>7} {_pct(finals, 50) * 1000:>8.1f} "
+              f"{_pct(finals, 95) * 1000:>8.1f} {done:>9} {shed:>6}")
+
+
+if __name__ == "__main__":
+    main()
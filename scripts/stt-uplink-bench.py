@@ -0,0 +1,111 @@
+"""STT 上行攒包基准：每路会话的客户端 CPU，逐块发送 vs ``uplink_coalesce_ms`` 攒包。
+
+在编排器那台机器（生产是 Raspberry Pi）上跑：用真实的 ``SenseVoiceClient``
+把 ``--sessions`` 路并发会话各 ``--audio-s`` 秒的 30 ms PCM 块推给一个本地假
+SenseVoice 服务端。服务端跑在子进程里（``np.frombuffer`` + append，和真服务端
+收包路径一致），所以本进程的 ``time.process_time()`` 只算客户端一侧。
+
+默认不按实时节奏发送（``--realtime`` 打开）：结果按"每秒音频花多少 CPU 毫秒"
+归一化，相当于每路会话在实时通话中占用的 CPU 比例。
+
+Usage (repo root, package installed with ``pip install -e .``):
+    python scripts/stt-uplink-bench.py
+    python scripts/stt-uplink-bench.py --sessions 4 --audio-s 30 --coalesce-ms 0 120 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import time
+from collections.abc import AsyncIterator
+
+import numpy as np
+
+from vocalize.stt.sensevoice import SenseVoiceClient
+
+_BLOCK_BYTES = 960  # 30 ms @ 16 kHz int16，MicrophoneTransport 的块大小
+
+
+def _serve(port_q: mp.Queue) -> None:  # type: ignore[type-arg]
+    from websockets.asyncio.server import serve
+
+    async def handler(ws) -> None:  # type: ignore[no-untyped-def]
+        buf: list[np.ndarray] = []
+        async for msg in ws:
+            if isinstance(msg, bytes):
+                buf.append(np.frombuffer(msg, dtype=np.int16))
+            elif json.loads(msg).get("event") == "stop":
+                await ws.close()
+                return
+
+    async def main() -> None:
+        async with serve(handler, "127.0.0.1", 0, max_size=None) as server:
+            port_q.put(server.sockets[0].getsockname()[1])
+            await asyncio.Future()
+
+    asyncio.run(main())
+
+
+async def _one_session(
+    port: int, coalesce_ms: int, blocks: int, realtime: bool
+) -> None:
+    client = SenseVoiceClient(
+        host="127.0.0.1", port=port, uplink_coalesce_ms=coalesce_ms,
+    )
+    block = np.random.default_rng(0).integers(
+        -2000, 2000, _BLOCK_BYTES // 2, dtype=np.int16
+    ).tobytes()
+
+    async def audio() -> AsyncIterator[bytes]:
+        for _ in range(blocks):
+            if realtime:
+                await asyncio.sleep(0.03)
+            yield block
+
+    async for _ in client.stream_transcribe(audio()):
+        pass
+
+
+async def _run(port: int, args: argparse.Namespace, coalesce_ms: int) -> float:
+    blocks = int(args.audio_s / 0.03)
+    t_cpu = time.process_time()
+    await asyncio.gather(*(
+        _one_session(port, coalesce_ms, blocks, args.realtime)
+        for _ in range(args.sessions)
+    ))
+    return time.process_time() - t_cpu
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--audio-s", type=float, default=60.0,
+                        help="audio seconds pushed per session")
+    parser.add_argument("--coalesce-ms", type=int, nargs="+", default=[0, 120, 200])
+    parser.add_argument("--realtime", action="store_true",
+                        help="pace blocks at 30 ms like a live microphone")
+    args = parser.parse_args()
+
+    port_q: mp.Queue = mp.Queue()  # type: ignore[type-arg]
+    server = mp.Process(target=_serve, args=(port_q,), daemon=True)
+    server.start()
+    port = port_q.get(timeout=10)
+    try:
+        asyncio.run(_run(port, args, 0))  # 预热 import / 连接路径
+        print(f"{args.sessions} sessions x {args.audio_s:.0f}s audio, 30 ms blocks")
+        print(f"{'coalesce':>9} {'msgs/s':>7} {'cpu s':>7} "
+              f"{'cpu ms / audio-s / session':>27}")
+        for ms in args.coalesce_ms:
+            cpu = asyncio.run(_run(port, args, ms))
+            msgs_per_s = 1000 / max(30, ms) if ms else 1000 / 30
+            per = cpu * 1000 / (args.audio_s * args.sessions)
+            label = f"{ms} ms" if ms else "off"
+            print(f"{label:>9} {msgs_per_s:>7.1f} {cpu:>7.2f} {per:>27.2f}")
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Pi↔GPU 音频链路编码（``start`` 帧里协商的 ``encoding``）。
+
+SenseVoice 上行 16 kHz、CosyVoice 下行 24 kHz 默认都是裸 PCM int16（256 / 384
+kbps 每路）。``mulaw`` 是 G.711 μ-law：每样本 8 bit，带宽减半，逐样本无状态，
+所以用查表一次 fancy-index 完成整条消息的编解码，任意帧长都行（攒包 / DTX 不受
+影响），CPU 开销可以忽略。音质是电话级（~38 dB SNR），对 ASR 与 TTS 听感都足够；
+需要原样 PCM 时保持默认 ``pcm_s16le``。表按 ``audioop.lin2ulaw`` 的定义生成、
+逐值一致；不直接用 ``audioop`` 是因为它 3.11 起 deprecated、3.13 移除。
+
+``alaw``（G.711 A-law，同理按 ``audioop.lin2alaw`` 生成）只用于 TTS 下行：电话腿
+直接要 8 kHz μ-law / A-law 时，由 CosyVoice 服务端重采样 + 编码，编排器原样转发
+（``OUTPUT_ENCODINGS``）。上行 / SenseVoice 仍只认 ``LINK_ENCODINGS``。
+
+服务端（``infra/gpu-services/*/server.py``）各自内嵌同一张表——GPU 镜像不装
+vocalize 包——改算法时两边一起改。
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from vocalize.transports.base import AudioEncoding
+
+PCM_S16LE: AudioEncoding = "pcm_s16le"
+MULAW: AudioEncoding = "mulaw"
+ALAW: AudioEncoding = "alaw"
+LINK_ENCODINGS: tuple[AudioEncoding, ...] = (PCM_S16LE, MULAW)
+# CosyVoice 下行可协商的编码（``start`` 帧 ``encoding``）
+OUTPUT_ENCODINGS: tuple[AudioEncoding, ...] = (PCM_S16LE, MULAW, ALAW)
+
+_MULAW_BIAS = 0x84
+
+
+def _mulaw_tables() -> tuple[np.ndarray, np.ndarray]:
+    """G.711 μ-law：65536 项编码表（按 int16 的 uint16 位型索引）+ 256 项解码表。
+
+    编码按 ITU-T G.711 / CPython ``audioop.lin2ulaw`` 的 14 bit 定义，两者逐值一致。
+    """
+    x = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32) >> 2
+    mask = np.where(x < 0, 0x7F, 0xFF)
+    mag = np.minimum(np.abs(x), 8159) + (_MULAW_BIAS >> 2)
+    seg = np.maximum(np.floor(np.log2(mag)).astype(np.int32) - 5, 0)
+    uval = np.where(
+        seg >= 8, 0x7F, (np.minimum(seg, 7) << 4) | ((mag >> (seg + 1)) & 0x0F)
+    )
+    encode = (uval ^ mask).astype(np.uint8)
+
+    u = ~np.arange(256, dtype=np.int32) & 0xFF
+    exponent = (u >> 4) & 0x07
+    magnitude = ((((u & 0x0F) << 3) + _MULAW_BIAS) << exponent) - _MULAW_BIAS
+    decode = np.where(u & 0x80, -magnitude, magnitude).astype("<i2")
+    return encode, decode
+
+
+_MULAW_ENCODE, _MULAW_DECODE = _mulaw_tables()
+
+
+def _alaw_tables() -> tuple[np.ndarray, np.ndarray]:
+    """G.711 A-law：65536 项编码表 + 256 项解码表（13 bit，逐值等同 ``audioop``）。"""
+    x = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32) >> 3
+    mask = np.where(x >= 0, 0xD5, 0x55)
+    mag = np.where(x >= 0, x, -x - 1)
+    # 段号：mag <= 0x1F → 0，之后每段上界翻倍（0x3F, 0x7F, ..., 0xFFF）
+    seg = np.maximum(np.floor(np.log2(np.maximum(mag, 1))).astype(np.int32) - 4, 0)
+    aval = np.where(
+        seg >= 8,
+        0x7F,
+        (np.minimum(seg, 7) << 4) | ((mag >> np.maximum(seg, 1)) & 0x0F),
+    )
+    encode = (aval ^ mask).astype(np.uint8)
+
+    a = np.arange(256, dtype=np.int32) ^ 0x55
+    seg = (a >> 4) & 0x07
+    t = ((a & 0x0F) << 4) + np.where(seg == 0, 8, 0x108)
+    t = t << np.maximum(seg - 1, 0)
+    decode = np.where(a & 0x80, t, -t).astype("<i2")
+    return encode, decode
+
+
+_ALAW_ENCODE, _ALAW_DECODE = _alaw_tables()
+_ENCODE_TABLES = {MULAW: _MULAW_ENCODE, ALAW: _ALAW_ENCODE}
+_DECODE_TABLES = {MULAW: _MULAW_DECODE, ALAW: _ALAW_DECODE}
+
+
+def encode(encoding: AudioEncoding, pcm: bytes) -> bytes:
+    """PCM int16 LE → ``encoding`` 的链路字节。"""
+    if encoding == PCM_S16LE:
+        return pcm
+    table = _ENCODE_TABLES.get(encoding)
+    if table is not None:
+        return bytes(table[np.frombuffer(pcm, dtype="<u2")].tobytes())
+    raise ValueError(f"unsupported link encoding: {encoding!r}")
+
+
+def decode(encoding: AudioEncoding, data: bytes) -> bytes:
+    """链路字节 → PCM int16 LE。"""
+    if encoding == PCM_S16LE:
+        return data
+    table = _DECODE_TABLES.get(encoding)
+    if table is not None:
+        return table[np.frombuffer(data, dtype=np.uint8)].tobytes()
+    raise ValueError(f"unsupported link encoding: {encoding!r}")
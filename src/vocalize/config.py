@@ -7,7 +7,13 @@
 import logging
 import os
 from dataclasses import dataclass
-from typing import Literal
+from typing import TYPE_CHECKING, Literal, cast
+
+if TYPE_CHECKING:
+    from vocalize.llm.hedging import HedgePolicy
+    from vocalize.llm.http_pool import SharedLLMClient
+    from vocalize.transports.base import AudioEncoding
+    from vocalize.ws_pool import WsPool
 
 try:
     from dotenv import load_dotenv
@@ -29,6 +35,20 @@ def _int_env(name: str, default: int) -> int:
         return default
 
 
+def _choice_env(name: str, default: str, choices: tuple[str, ...]) -> str:
+    """读取枚举型环境变量；空字符串或不在 choices 里时回退到 default。"""
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return default
+    value = raw.strip().lower()
+    if value not in choices:
+        logging.warning(
+            "环境变量 %s=%r 不在 %s 中，使用默认值 %s", name, raw, choices, default
+        )
+        return default
+    return value
+
+
 @dataclass
 class Config:
     """应用配置类。"""
@@ -37,12 +57,61 @@ class Config:
     openai_api_key: str | None = None
     openai_base_url: str = "https://api.deepseek.com/v1"
     openai_model: str = "deepseek-chat"
+    # 进程级共享的 LLM HTTP 连接池（``vocalize.llm.http_pool``）：HTTP/2 需要装 h2，
+    # 否则退回 HTTP/1.1 keep-alive；启动时预热 prewarm_connections 条，0 = 不预热
+    llm_http2: bool = True
+    llm_http_max_connections: int = 20
+    llm_http_keepalive_s: int = 120
+    llm_http_prewarm_connections: int = 2
+    # LLM 请求对冲（``vocalize.llm.hedging``，默认关）：首 token 超过最近 TTFT 的
+    # percentile 分位（夹在 min/max 之间）还没来就再发一个相同请求；每条通话腿
+    # 最多对冲 budget_pct% 的请求（另加 2 次起步额度）
+    llm_hedge: bool = False
+    llm_hedge_percentile: int = 90
+    llm_hedge_min_delay_ms: int = 250
+    llm_hedge_max_delay_ms: int = 2000
+    llm_hedge_budget_pct: int = 10
+    # 多 provider 路由（``vocalize.llm.router``）：``LLM_BACKENDS`` 为空 = 只用
+    # OPENAI_*；否则 ``name|base_url|model|API_KEY_ENV`` 用 ``;`` 分隔。
+    # route_layers 把 prompt 层钉到某个 backend（``layer=name,...``）
+    llm_backends: str = ""
+    llm_route_layers: str = ""
+    llm_route_first_token_timeout_ms: int = 5000
+    llm_route_failure_threshold: int = 3
+    llm_route_reset_s: int = 30
 
     # GPU 推理节点（Tailscale 内网地址）。空串=未配置；`localhost` 是 Phase 0.5
     # 同机部署的合法值，validate_for_phase("gpu") 不会把它判为缺失。
     gpu_host: str = ""
     sensevoice_ws_port: int = 8000
     cosyvoice_ws_port: int = 8001
+    # 共享 GPU WebSocket 预连接池（``vocalize.ws_pool``）；max_size=0 关闭该服务的池化。
+    # 空闲连接在 GPU 服务端也占会话名额（满 MAX_CONCURRENT_SESSIONS*2 即拒绝：
+    # SenseVoice 默认 8、CosyVoice 默认 4），所以按服务分别设上限，
+    # max_size × 编排进程数 + 峰值并发通话 ≤ 服务端上限。
+    gpu_ws_pool_min_idle: int = 1
+    gpu_ws_pool_max_size_sensevoice: int = 2
+    gpu_ws_pool_max_size_cosyvoice: int = 1
+    gpu_ws_pool_idle_timeout_s: int = 60
+    # STT 上行攒包：PCM 攒到这么多毫秒再发一条 WS 消息（EOS 时立即冲刷）；0 = 逐块发
+    stt_uplink_coalesce_ms: int = 120
+    # STT 上行静音压缩（DTX）：transport VAD 判为静音的段落只发 ``gap`` 控制帧
+    stt_uplink_dtx: bool = False
+    # GPU 链路音频编码（SenseVoice 上行 / CosyVoice 下行，start 帧协商）：
+    # pcm_s16le 原样；mulaw 带宽减半（G.711，电话音质）
+    gpu_link_encoding: "AudioEncoding" = "pcm_s16le"
+    # 固定台词 TTS 缓存（``vocalize.tts.cache``）：内存 LRU + 磁盘 mmap，两级 0=关闭；
+    # 只缓存白名单台词（``vocalize.tts.warmup.cacheable_phrases``）
+    tts_cache_memory_mb: int = 16
+    tts_cache_disk_mb: int = 128
+    tts_cache_dir: str = ".cache/tts"
+    # 启动时后台预合成静态台词（``vocalize.tts.warmup``）的并发数；0 = 不预热
+    tts_warmup_concurrency: int = 2
+    # relay 译文缓存（``vocalize.dialogue.relay_cache``）：条数上限 0=关闭；
+    # 只缓存不超过 max_chars 个字的短句
+    relay_cache_max_entries: int = 512
+    relay_cache_ttl_s: int = 3600
+    relay_cache_max_chars: int = 64
 
     # Pi 生产服务（Phase 4.5）
     orchestrator_listen_port: int = 8080
@@ -63,9 +132,75 @@ class Config:
             openai_api_key=os.getenv("OPENAI_API_KEY"),
             openai_base_url=os.getenv("OPENAI_BASE_URL", cls.openai_base_url),
             openai_model=os.getenv("OPENAI_MODEL", cls.openai_model),
+            llm_http2=os.getenv("LLM_HTTP2", "1") != "0",
+            llm_http_max_connections=_int_env(
+                "LLM_HTTP_MAX_CONNECTIONS", cls.llm_http_max_connections
+            ),
+            llm_http_keepalive_s=_int_env(
+                "LLM_HTTP_KEEPALIVE_S", cls.llm_http_keepalive_s
+            ),
+            llm_http_prewarm_connections=_int_env(
+                "LLM_HTTP_PREWARM_CONNECTIONS", cls.llm_http_prewarm_connections
+            ),
+            llm_hedge=os.getenv("LLM_HEDGE", "0") == "1",
+            llm_hedge_percentile=_int_env(
+                "LLM_HEDGE_PERCENTILE", cls.llm_hedge_percentile
+            ),
+            llm_hedge_min_delay_ms=_int_env(
+                "LLM_HEDGE_MIN_DELAY_MS", cls.llm_hedge_min_delay_ms
+            ),
+            llm_hedge_max_delay_ms=_int_env(
+                "LLM_HEDGE_MAX_DELAY_MS", cls.llm_hedge_max_delay_ms
+            ),
+            llm_hedge_budget_pct=_int_env(
+                "LLM_HEDGE_BUDGET_PCT", cls.llm_hedge_budget_pct
+            ),
+            llm_backends=os.getenv("LLM_BACKENDS", cls.llm_backends),
+            llm_route_layers=os.getenv("LLM_ROUTE_LAYERS", cls.llm_route_layers),
+            llm_route_first_token_timeout_ms=_int_env(
+                "LLM_ROUTE_FIRST_TOKEN_TIMEOUT_MS", cls.llm_route_first_token_timeout_ms
+            ),
+            llm_route_failure_threshold=_int_env(
+                "LLM_ROUTE_FAILURE_THRESHOLD", cls.llm_route_failure_threshold
+            ),
+            llm_route_reset_s=_int_env("LLM_ROUTE_RESET_S", cls.llm_route_reset_s),
             gpu_host=os.getenv("GPU_HOST", cls.gpu_host),
             sensevoice_ws_port=_int_env("SENSEVOICE_WS_PORT", cls.sensevoice_ws_port),
             cosyvoice_ws_port=_int_env("COSYVOICE_WS_PORT", cls.cosyvoice_ws_port),
+            gpu_ws_pool_min_idle=_int_env(
+                "GPU_WS_POOL_MIN_IDLE", cls.gpu_ws_pool_min_idle
+            ),
+            gpu_ws_pool_max_size_sensevoice=_int_env(
+                "GPU_WS_POOL_MAX_SIZE_SENSEVOICE", cls.gpu_ws_pool_max_size_sensevoice
+            ),
+            gpu_ws_pool_max_size_cosyvoice=_int_env(
+                "GPU_WS_POOL_MAX_SIZE_COSYVOICE", cls.gpu_ws_pool_max_size_cosyvoice
+            ),
+            gpu_ws_pool_idle_timeout_s=_int_env(
+                "GPU_WS_POOL_IDLE_TIMEOUT_S", cls.gpu_ws_pool_idle_timeout_s
+            ),
+            stt_uplink_coalesce_ms=_int_env(
+                "STT_UPLINK_COALESCE_MS", cls.stt_uplink_coalesce_ms
+            ),
+            stt_uplink_dtx=os.getenv("STT_UPLINK_DTX", "0") != "0",
+            gpu_link_encoding=cast("AudioEncoding", _choice_env(
+                "GPU_LINK_ENCODING", cls.gpu_link_encoding, ("pcm_s16le", "mulaw")
+            )),
+            tts_cache_memory_mb=_int_env(
+                "TTS_CACHE_MEMORY_MB", cls.tts_cache_memory_mb
+            ),
+            tts_cache_disk_mb=_int_env("TTS_CACHE_DISK_MB", cls.tts_cache_disk_mb),
+            tts_cache_dir=os.getenv("TTS_CACHE_DIR", cls.tts_cache_dir),
+            tts_warmup_concurrency=_int_env(
+                "TTS_WARMUP_CONCURRENCY", cls.tts_warmup_concurrency
+            ),
+            relay_cache_max_entries=_int_env(
+                "RELAY_CACHE_MAX_ENTRIES", cls.relay_cache_max_entries
+            ),
+            relay_cache_ttl_s=_int_env("RELAY_CACHE_TTL_S", cls.relay_cache_ttl_s),
+            relay_cache_max_chars=_int_env(
+                "RELAY_CACHE_MAX_CHARS", cls.relay_cache_max_chars
+            ),
             orchestrator_listen_port=_int_env(
                 "ORCHESTRATOR_LISTEN_PORT", cls.orchestrator_listen_port
             ),
@@ -90,6 +225,74 @@ class Config:
                 missing.append("GPU_HOST")
         return missing
 
+    def gpu_ws_pool(self, url: str, *, service: str) -> "WsPool | None":
+        """返回 ``url`` 的进程级共享预连接池；该服务的 max_size=0 时为 None。
+
+        ``service`` 是 ``"sensevoice"`` / ``"cosyvoice"``，决定用哪个上限。
+        """
+        max_size = (
+            self.gpu_ws_pool_max_size_cosyvoice
+            if service == "cosyvoice"
+            else self.gpu_ws_pool_max_size_sensevoice
+        )
+        if max_size <= 0:
+            return None
+        from vocalize.ws_pool import get_pool
+
+        return get_pool(
+            url,
+            service=service,
+            min_idle=min(self.gpu_ws_pool_min_idle, max_size),
+            max_size=max_size,
+            idle_timeout_s=float(self.gpu_ws_pool_idle_timeout_s),
+        )
+
+    def llm_http_client(
+        self,
+        *,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        model: str | None = None,
+    ) -> "SharedLLMClient":
+        """返回 ``OPENAI_*``（或给定 endpoint）对应的进程级共享 LLM 客户端。
+
+        不给 endpoint 时调用前先 ``validate_for_phase("llm")``；多 provider 路由
+        的备用 backend 传自己的 ``base_url`` / ``api_key`` / ``model``，连接池参数共用。
+        """
+        from vocalize.llm.http_pool import get_client
+
+        api_key = api_key if api_key is not None else self.openai_api_key
+        if api_key is None:
+            raise ValueError(
+                "llm_http_client needs an API key: set OPENAI_API_KEY or pass api_key"
+            )
+        return get_client(
+            base_url=base_url if base_url is not None else self.openai_base_url,
+            api_key=api_key,
+            model=model if model is not None else self.openai_model,
+            http2=self.llm_http2,
+            max_connections=self.llm_http_max_connections,
+            keepalive_s=float(self.llm_http_keepalive_s),
+            prewarm_connections=self.llm_http_prewarm_connections,
+        )
+
+    def llm_hedge_policy(self) -> "HedgePolicy | None":
+        """``LLM_HEDGE=1`` 时返回对冲策略，否则 None。"""
+        if not self.llm_hedge:
+            return None
+        from vocalize.llm.hedging import HedgePolicy
+
+        min_delay_s = max(0, self.llm_hedge_min_delay_ms) / 1000
+        max_delay_s = max(min_delay_s, self.llm_hedge_max_delay_ms / 1000)
+        return HedgePolicy(
+            percentile=min(100, max(1, self.llm_hedge_percentile)) / 100,
+            min_delay_s=min_delay_s,
+            max_delay_s=max_delay_s,
+            # 样本不够时取上下限中点，不至于一开局就频繁对冲
+            initial_delay_s=(min_delay_s + max_delay_s) / 2,
+            budget_ratio=max(0, self.llm_hedge_budget_pct) / 100,
+        )
+
     def get_missing_configs(self) -> list[str]:
         """返回缺失的必填配置项名称（向后兼容；等价于 Phase 0 的 LLM 校验）。"""
         return self.validate_for_phase("llm")
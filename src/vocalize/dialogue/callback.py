@@ -15,6 +15,7 @@ from vocalize.dialogue.state import (
     TaskState,
 )
 from vocalize.llm.base import ChatMessage, FinishChunk, TextDelta, ToolCallDelta
+from vocalize.llm.router import for_layer
 
 __all__ = ["drive_callback_turn", "render_callback_prompt", "run_callback"]
 
@@ -64,7 +65,7 @@ async def drive_callback_turn(
     tool_names: dict[int, str] = {}
     finish_reason: str | None = None
 
-    async for chunk in llm.stream_chat(messages=messages):
+    async for chunk in for_layer(llm, "callback").stream_chat(messages=messages):
         if isinstance(chunk, TextDelta):
             pieces.append(chunk.text)
         elif isinstance(chunk, ToolCallDelta):
@@ -34,6 +34,7 @@ from vocalize.dialogue.language import is_cross_lingual
 from vocalize.dialogue.prompts import load_prompt
 from vocalize.dialogue.reactive_holding import ReactiveHolding
 from vocalize.dialogue.relay import merchant_text_to_user_lang
+from vocalize.dialogue.relay_cache import RelayCache
 from vocalize.dialogue.state import (
     DialogueOrchestratorError,
     TaskPhase,
@@ -57,6 +58,7 @@ from vocalize.llm.base import (
     ToolCallDelta,
     ToolDef,
 )
+from vocalize.llm.router import for_layer
 from vocalize.pipeline import TurnTiming, VoicePipeline
 from vocalize.tts.base import TextChunk
 
@@ -190,6 +192,7 @@ class DialogueOrchestrator:
         cache_merchant_transcript: Callable[..., None] | None = None,
         consume_user_hints: Callable[[], list[tuple[str, str]]] | None = None,
         merchant_speak: Callable[..., Awaitable[None]] | None = None,
+        relay_cache: RelayCache | None = None,
     ) -> None:
         self._state = state
         self._user_channel = user_channel
@@ -198,6 +201,8 @@ class DialogueOrchestrator:
         self._cache_merchant_transcript = cache_merchant_transcript
         self._consume_user_hints = consume_user_hints
         self._merchant_speak = merchant_speak
+        # Layer 5 relay translations shared across sessions (None = no cache).
+        self._relay_cache = relay_cache
 
         # Shared LLM service object — both pipelines use stateless services
         # (STT / LLM / TTS); messages are independently owned per channel.
@@ -549,6 +554,9 @@ class DialogueOrchestrator:
                 src=src,
                 dst=dst,
                 llm=self._llm,
+                cache=self._relay_cache,
+                task_category=self._state.task_category or "",
+                relay_strategy=self._state.relay_strategy or "",
             )
         except asyncio.CancelledError:
             raise
@@ -617,9 +625,9 @@ class DialogueOrchestrator:
             text_pieces: list[str] = []
             finish_reason: str | None = None
 
-            async for chunk in self._llm.stream_chat(
-                channel.messages, tools=channel.tools
-            ):
+            async for chunk in for_layer(
+                self._llm, self._prompt_layer(channel)
+            ).stream_chat(channel.messages, tools=channel.tools):
                 if isinstance(chunk, TextDelta):
                     text_pieces.append(chunk.text)
                 elif isinstance(chunk, ToolCallDelta):
@@ -700,6 +708,17 @@ class DialogueOrchestrator:
             # loop back into stream_chat with the appended tool results
             continue
 
+    def _prompt_layer(self, channel: Channel) -> str:
+        """Prompt layer driving ``channel`` right now (LLM routing key)."""
+        if channel.name == "merchant":
+            return "merchant_agent"
+        if self._state.phase in (
+            TaskPhase.NEEDS_CLARIFICATION,
+            TaskPhase.AWAIT_USER_CLARIFICATION,
+        ):
+            return "clarification_collector"
+        return "preflight_collector"
+
     async def _drive_turn(
         self,
         channel: Channel,
@@ -1028,7 +1047,7 @@ class DialogueOrchestrator:
         target_lang: Literal["zh", "en"],
         source_text: str,
     ) -> str:
-        """D-15 cross-lingual relay: one-shot stream_chat translation + speak on opposite side.
+        """D-15 cross-lingual relay: stream_chat translation spoken on the opposite side as it streams.
 
         Direction (B-3):
         - merchant-channel trigger → translate for zh user → user_pipeline speaks.
@@ -1062,7 +1081,8 @@ class DialogueOrchestrator:
                 source_lang, canonical_target,
             )
             return source_text
-        relay_prompt = load_prompt(f"relay_{source_lang}_to_{canonical_target}")
+        prompt_name = f"relay_{source_lang}_to_{canonical_target}"
+        relay_prompt = load_prompt(prompt_name)
         # Substitute the same single-brace placeholders the layered system
         # prompts use, so the relay LLM sees real task context instead of
         # literal "{task_category}" / "{relay_strategy}" tokens. The source
@@ -1076,12 +1096,71 @@ class DialogueOrchestrator:
             ChatMessage(role="system", content=relay_prompt),
             ChatMessage(role="user", content=source_text),
         ]
+
+        # Stream the translation into TTS as it is generated (sentence
+        # segmentation as in VoicePipeline._handle_llm_chunk), so a long
+        # relay starts playing after its first sentence. The merchant side
+        # streams only when no runner-level merchant_speak override (which
+        # gates takeover / force output) is installed.
+        stream_pipeline: VoicePipeline | None = (
+            self._user.pipeline if calling_channel.name == "merchant"
+            else self._merchant.pipeline if self._merchant_speak is None
+            else None
+        )
+        streamed = False
+        llm_error: BaseException | None = None
         translated_pieces: list[str] = []
-        async for c in self._llm.stream_chat(relay_messages, tools=None):
-            if isinstance(c, TextDelta):
-                translated_pieces.append(c.text)
-            # FinishChunk / ToolCallDelta — no action; relay uses no tools.
-        translated = "".join(translated_pieces).strip()
+        relay_llm = for_layer(self._llm, "relay")
+
+        async def deltas() -> AsyncIterator[str]:
+            nonlocal llm_error
+            try:
+                async for c in relay_llm.stream_chat(relay_messages, tools=None):
+                    if isinstance(c, TextDelta):
+                        translated_pieces.append(c.text)
+                        yield c.text
+                    # FinishChunk / ToolCallDelta — no action; relay uses no tools.
+            except BaseException as exc:
+                llm_error = exc
+                raise
+
+        async def translate() -> str:
+            nonlocal streamed
+            if stream_pipeline is None:
+                async for _ in deltas():
+                    pass
+                return "".join(translated_pieces).strip()
+            streamed = True
+            try:
+                await stream_pipeline.speak_stream(deltas(), canonical_target)
+            except Exception as exc:
+                if exc is llm_error:
+                    raise
+                log.warning("[orchestrator] relay TTS speak failed: %s", exc)
+            return "".join(translated_pieces).strip()
+
+        # Repeated short phrases ("OK", "please hold") and duplicate triggers
+        # are served from the relay cache and go straight to TTS. Only the
+        # translated text is shared: a streaming translate() speaks into this
+        # session's TTS, so it runs in the caller's task (cancelled with it on
+        # barge-in) instead of as a shielded single-flight call other sessions
+        # could join.
+        if self._relay_cache is None:
+            translated = await translate()
+        else:
+            translated = await self._relay_cache.translate(
+                self._relay_cache.key(
+                    direction=f"{source_lang}->{canonical_target}:{prompt_name}",
+                    text=source_text,
+                    task_category=self._state.task_category or "",
+                    relay_strategy=self._state.relay_strategy or "",
+                    model=getattr(relay_llm, "model", ""),
+                ),
+                translate,
+                shared=stream_pipeline is None,
+            ) or ""
+        if streamed:
+            return translated
 
         try:
             if calling_channel.name == "merchant":
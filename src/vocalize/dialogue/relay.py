@@ -2,6 +2,10 @@
 
 v1.0 RC exposes merchant-to-user translation only. Cross-lingual user
 takeover is deferred: takeover text is treated as merchant-language TTS input.
+
+Both directions accept an optional ``RelayCache``: repeated short phrases and
+back-to-back duplicate triggers are answered from the cache (or share the
+in-flight LLM call) instead of paying a full LLM round trip each time.
 """
 from __future__ import annotations
 
@@ -11,7 +15,9 @@ from collections.abc import AsyncIterator
 from typing import Literal, Protocol
 
 from vocalize.dialogue.prompts import load_prompt
+from vocalize.dialogue.relay_cache import RelayCache
 from vocalize.llm.base import ChatMessage, LLMChunk
+from vocalize.llm.router import for_layer
 
 log = logging.getLogger(__name__)
 
@@ -41,31 +47,15 @@ async def merchant_text_to_user_lang(
     src: Literal["zh", "en"],
     dst: Literal["zh", "en"],
     llm: _RelayLLM,
+    cache: RelayCache | None = None,
+    task_category: str = "",
+    relay_strategy: str = "",
 ) -> RelayResult:
     """Translate merchant text into the user's language without blocking calls."""
-    if src == dst:
-        return RelayResult(translated=text, skipped=True)
-
-    prompt = load_prompt(
-        f"relay_{dst}",
-        src_lang=src,
-        dst_lang=dst,
+    return await _relay(
+        text, src=src, dst=dst, llm=llm, cache=cache,
+        task_category=task_category, relay_strategy=relay_strategy,
     )
-    messages = [
-        ChatMessage(role="system", content=prompt),
-        ChatMessage(role="user", content=text),
-    ]
-    pieces: list[str] = []
-    try:
-        async for chunk in llm.stream_chat(messages=messages):
-            piece = getattr(chunk, "text", None)
-            if piece:
-                pieces.append(piece)
-    except Exception:
-        log.exception("relay LLM failed; continuing without translation")
-        return RelayResult(translated=None, failed=True)
-
-    return RelayResult(translated="".join(pieces).strip())
 
 
 async def user_to_merchant(
@@ -74,13 +64,34 @@ async def user_to_merchant(
     src: Literal["zh", "en"],
     dst: Literal["zh", "en"],
     llm: _RelayLLM,
+    cache: RelayCache | None = None,
+    task_category: str = "",
+    relay_strategy: str = "",
 ) -> RelayResult:
     """Translate user text into merchant language for TTS playback."""
+    return await _relay(
+        text, src=src, dst=dst, llm=llm, cache=cache,
+        task_category=task_category, relay_strategy=relay_strategy,
+    )
+
+
+async def _relay(
+    text: str,
+    *,
+    src: Literal["zh", "en"],
+    dst: Literal["zh", "en"],
+    llm: _RelayLLM,
+    cache: RelayCache | None,
+    task_category: str,
+    relay_strategy: str,
+) -> RelayResult:
     if src == dst:
         return RelayResult(translated=text, skipped=True)
 
+    llm = for_layer(llm, "relay")
+    prompt_name = f"relay_{dst}"
     prompt = load_prompt(
-        f"relay_{dst}",
+        prompt_name,
         src_lang=src,
         dst_lang=dst,
     )
@@ -88,14 +99,32 @@ async def user_to_merchant(
         ChatMessage(role="system", content=prompt),
         ChatMessage(role="user", content=text),
     ]
-    pieces: list[str] = []
-    try:
-        async for chunk in llm.stream_chat(messages=messages):
-            piece = getattr(chunk, "text", None)
-            if piece:
-                pieces.append(piece)
-    except Exception:
-        log.exception("relay LLM failed; continuing without translation")
-        return RelayResult(translated=None, failed=True)
 
-    return RelayResult(translated="".join(pieces).strip())
+    async def translate() -> str | None:
+        pieces: list[str] = []
+        try:
+            async for chunk in llm.stream_chat(messages=messages):
+                piece = getattr(chunk, "text", None)
+                if piece:
+                    pieces.append(piece)
+        except Exception:
+            log.exception("relay LLM failed; continuing without translation")
+            return None
+        return "".join(pieces).strip()
+
+    if cache is None:
+        translated = await translate()
+    else:
+        translated = await cache.translate(
+            cache.key(
+                direction=f"{src}->{dst}:{prompt_name}",
+                text=text,
+                task_category=task_category,
+                relay_strategy=relay_strategy,
+                model=getattr(llm, "model", ""),
+            ),
+            translate,
+        )
+    if translated is None:
+        return RelayResult(translated=None, failed=True)
+    return RelayResult(translated=translated)
@@ -0,0 +1,258 @@
+"""Layer 5 relay 译文缓存（有界 LRU + TTL + 同 key 并发合并）。
+
+跨语种通话里大量 relay 是重复的短句："OK"、"please hold"、"好的"、"对，没错"；
+ASR 抖动 / LLM 重复调 ``relay_to_user`` 还会让同一句话背靠背触发两次。每次都
+整轮调 LLM，译文要多等几百毫秒才能进 TTS。
+
+- key = ``(direction, 归一化原文, task_category, relay_strategy, model)``。
+  ``direction`` 是语言方向加所用 prompt 模板名（如 ``en->zh:relay_en_to_zh``），
+  不同模板的译文互不复用；换任务类型 / relay 策略 / 模型自动不命中。
+- 归一化：NFKC、去首尾空白、合并连续空白、casefold、去掉句末的句号 / 逗号——
+  "OK." / "ok" / "ＯＫ" 是同一条；``?`` / ``!`` 保留在 key 里，"OK?"（问句，
+  译成"可以吗？"）和 "OK"（应答，译成"好的"）不共用译文。
+  只缓存不超过 ``max_chars`` 个字的原文：
+  长句带具体信息（时间、人名、金额），几乎不会重复，也不该复用。
+- 同 key 的并发请求共享一次 LLM 调用（single-flight）；等待方全部取消时才
+  取消底层调用，一方 barge-in 不影响另一方。共享的只有译文文本：``produce``
+  带调用方专属副作用（边译边播进该会话的 TTS）时传 ``shared=False``，未命中就
+  在调用方自己的 task 里跑，随调用方取消，也不被别的会话合并进来。
+- 失败 / 空译文不入缓存，异常原样抛给所有等待方。
+- 命中时按该条当初的 LLM 耗时记 ``vocalize_relay_cache_saved_seconds_total``；
+  合并进进行中调用的请求记已省下的那一段。
+
+``get_relay_cache()`` 按配置返回进程级单例，所有会话共享。
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import NamedTuple
+
+from vocalize.config import Config
+
+log = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+# 只去掉不改变语气的句末标点："OK." 与 "OK" 同 key；问号 / 叹号改变语气
+# （"OK?" 是在提问），保留。NFKC 之后全角 "？！" 已折成半角。
+_TRAILING_PUNCT = ".。,，、;；"
+
+
+class RelayCacheKey(NamedTuple):
+    direction: str
+    text: str
+    task_category: str
+    relay_strategy: str
+    model: str
+
+
+def normalize_relay_text(text: str) -> str:
+    """缓存 key 用的原文归一化（不改变实际送去翻译的文本）。"""
+    text = unicodedata.normalize("NFKC", text)
+    text = _WHITESPACE.sub(" ", text).strip().rstrip(_TRAILING_PUNCT).rstrip()
+    return text.casefold()
+
+
+@dataclass
+class _Entry:
+    translated: str
+    # 这条译文当初的 LLM 耗时：命中时算作省下的延迟
+    latency_s: float
+    expires_at: float
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Task[str | None]
+    started: float
+    waiters: int = 0
+
+
+class RelayCache:
+    """relay 译文缓存。
+
+    Args:
+        max_entries: LRU 条数上限；0 关闭缓存（``translate`` 直接透传）。
+        ttl_s: 条目存活秒数；<= 0 表示不过期。
+        max_chars: 只缓存归一化后不超过这么多字的原文。
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_s: float = 3600.0,
+        max_chars: int = 64,
+    ) -> None:
+        self.max_entries = max(0, max_entries)
+        self.ttl_s = ttl_s
+        self.max_chars = max(0, max_chars)
+        self._entries: OrderedDict[RelayCacheKey, _Entry] = OrderedDict()
+        self._inflight: dict[RelayCacheKey, _Flight] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_chars > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(
+        self,
+        *,
+        direction: str,
+        text: str,
+        task_category: str = "",
+        relay_strategy: str = "",
+        model: str = "",
+    ) -> RelayCacheKey | None:
+        """可缓存时返回 key；原文为空 / 过长 / 缓存关闭时返回 None。"""
+        if not self.enabled:
+            return None
+        normalized = normalize_relay_text(text)
+        if not normalized or len(normalized) > self.max_chars:
+            return None
+        return RelayCacheKey(direction, normalized, task_category, relay_strategy, model)
+
+    def get(self, key: RelayCacheKey) -> str | None:
+        entry = self._lookup(key)
+        return entry.translated if entry is not None else None
+
+    def put(self, key: RelayCacheKey, translated: str, *, latency_s: float = 0.0) -> None:
+        if not self.enabled or not translated:
+            return
+        expires_at = (
+            time.monotonic() + self.ttl_s if self.ttl_s > 0 else float("inf")
+        )
+        self._entries[key] = _Entry(translated, latency_s, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def translate(
+        self,
+        key: RelayCacheKey | None,
+        produce: Callable[[], Awaitable[str | None]],
+        *,
+        shared: bool = True,
+    ) -> str | None:
+        """命中直接返回；否则调用 ``produce()``（同 key 并发只调一次）并缓存结果。
+
+        ``produce`` 返回 None / 空串表示失败，不入缓存。``key`` 为 None 时直接透传。
+        ``shared=False`` 时仍会命中缓存、合并进已有的共享调用，但自己未命中时
+        在当前 task 里直接 ``await produce()``，不登记为共享调用。
+        """
+        if key is None:
+            return await produce()
+
+        entry = self._lookup(key)
+        if entry is not None:
+            self._observe(key.direction, "cached", entry.latency_s)
+            return entry.translated
+
+        flight = self._inflight.get(key)
+        if flight is not None:
+            self._observe(key.direction, "inflight", time.monotonic() - flight.started)
+        elif not shared:
+            self._observe(key.direction, "miss", 0.0)
+            return await self._produce(key, produce)
+        else:
+            self._observe(key.direction, "miss", 0.0)
+            flight = _Flight(
+                task=asyncio.create_task(self._produce(key, produce)),
+                started=time.monotonic(),
+            )
+            self._inflight[key] = flight
+
+        flight.waiters += 1
+        try:
+            # shield：一个等待方被取消不连带取消共享的 LLM 调用
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                # 最后一个等待方也走了：没人要这句译文，停掉 LLM 调用
+                flight.task.cancel()
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+            raise
+        finally:
+            flight.waiters -= 1
+
+    async def _produce(
+        self,
+        key: RelayCacheKey,
+        produce: Callable[[], Awaitable[str | None]],
+    ) -> str | None:
+        started = time.monotonic()
+        try:
+            translated = await produce()
+            if translated:
+                self.put(key, translated, latency_s=time.monotonic() - started)
+            return translated
+        finally:
+            # 被取消的调用已由等待方摘掉，同 key 可能已换成新的调用；
+            # shared=False 的调用从没登记过，这里也不会误删别人的
+            flight = self._inflight.get(key)
+            if flight is not None and flight.task is asyncio.current_task():
+                del self._inflight[key]
+
+    def _lookup(self, key: RelayCacheKey) -> _Entry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    @staticmethod
+    def _observe(direction: str, outcome: str, saved_s: float) -> None:
+        from vocalize.server.metrics import (
+            RELAY_CACHE_LOOKUPS_TOTAL,
+            RELAY_CACHE_SAVED_SECONDS_TOTAL,
+        )
+
+        RELAY_CACHE_LOOKUPS_TOTAL.labels(direction=direction, outcome=outcome).inc()
+        if saved_s > 0:
+            RELAY_CACHE_SAVED_SECONDS_TOTAL.labels(direction=direction).inc(saved_s)
+
+
+_caches: dict[tuple[int, float, int], RelayCache] = {}
+
+
+def get_relay_cache(cfg: Config) -> RelayCache | None:
+    """按配置取进程级共享缓存；``RELAY_CACHE_MAX_ENTRIES=0`` 时返回 None。"""
+    if cfg.relay_cache_max_entries <= 0 or cfg.relay_cache_max_chars <= 0:
+        return None
+    ident = (
+        cfg.relay_cache_max_entries,
+        float(cfg.relay_cache_ttl_s),
+        cfg.relay_cache_max_chars,
+    )
+    cache = _caches.get(ident)
+    if cache is None:
+        cache = RelayCache(
+            max_entries=cfg.relay_cache_max_entries,
+            ttl_s=float(cfg.relay_cache_ttl_s),
+            max_chars=cfg.relay_cache_max_chars,
+        )
+        _caches[ident] = cache
+    return cache
+
+
+__all__ = [
+    "RelayCache",
+    "RelayCacheKey",
+    "get_relay_cache",
+    "normalize_relay_text",
+]
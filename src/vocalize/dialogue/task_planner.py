@@ -205,6 +205,7 @@ async def generate_task_schema(
     from pathlib import Path
 
     from vocalize.llm.base import ChatMessage, FinishChunk, ToolCallDelta, ToolDef
+    from vocalize.llm.router import for_layer
 
     # Load Layer 1 prompt
     prompt_dir = Path(__file__).parent / "prompts"
@@ -226,7 +227,9 @@ async def generate_task_schema(
     deltas_by_index: dict[int, dict] = {}
     final_tool_call = None
 
-    async for chunk in llm.stream_chat(messages, tools=[tool]):
+    async for chunk in for_layer(llm, "task_planner").stream_chat(
+        messages, tools=[tool]
+    ):
         if isinstance(chunk, ToolCallDelta):
             idx = chunk.tool_call_index
             if idx not in deltas_by_index:
@@ -0,0 +1,87 @@
+"""LLM 请求对冲（hedged requests）的策略与预算。
+
+merchant 轮次的 p99 延迟主要来自 provider 偶发的慢首 token：同一个请求大多数
+几百毫秒出首 token，少数要好几秒。``OpenAICompatClient`` 的重试只在硬失败后
+触发，对"没失败、只是慢"无能为力。对冲：首 token 超过阈值还没来，就再发一个
+完全相同的请求，谁先出 token 用谁，另一个立刻关掉（远端随之停止生成）。
+
+- 阈值自适应：最近 ``window`` 次首 token 耗时（``TTFTWindow``，按 endpoint 共享）
+  的 ``percentile`` 分位数，夹在 ``[min_delay_s, max_delay_s]``；样本不足
+  ``min_samples`` 时用 ``initial_delay_s``。p90 意味着正常情况下约 10% 的请求会
+  对冲。
+- 预算：每个客户端实例（一条通话腿）最多对冲 ``budget_burst + budget_ratio ×
+  已发请求数`` 次，provider 整体变慢时不会把请求量翻倍。
+- 指标：``vocalize_llm_hedge_requests_total{outcome}``（对冲率）、
+  ``vocalize_llm_hedge_wins_total{winner}``（对冲请求胜出率）、
+  ``vocalize_llm_ttft_seconds``。
+
+默认关闭（``LLM_HEDGE=1`` 打开）：对冲会多花一部分 token 费用。
+"""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+
+
+class TTFTWindow:
+    """最近 ``size`` 次首 token 耗时（秒）的滑动窗口。"""
+
+    def __init__(self, size: int = 200) -> None:
+        self._samples: deque[float] = deque(maxlen=max(1, size))
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def quantile(self, q: float) -> float:
+        """``q`` ∈ [0, 1] 分位数（最近邻取整）；窗口为空时返回 0。"""
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, int(q * len(ordered) + 0.5) - 1))
+        return ordered[index]
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """对冲阈值与预算参数（见模块 docstring）。"""
+
+    percentile: float = 0.9
+    min_delay_s: float = 0.25
+    max_delay_s: float = 2.0
+    initial_delay_s: float = 1.0
+    min_samples: int = 20
+    budget_ratio: float = 0.1
+    budget_burst: int = 2
+
+    def delay(self, window: TTFTWindow) -> float:
+        """当前的对冲阈值（秒）：首 token 超过这么久还没来就发第二个请求。"""
+        if len(window) < self.min_samples:
+            base = self.initial_delay_s
+        else:
+            base = window.quantile(self.percentile)
+        return min(self.max_delay_s, max(self.min_delay_s, base))
+
+
+class HedgeBudget:
+    """每个客户端实例的对冲配额：``burst + ratio × 请求数``。"""
+
+    def __init__(self, *, ratio: float, burst: int) -> None:
+        self.ratio = max(0.0, ratio)
+        self.burst = max(0, burst)
+        self.requests = 0
+        self.hedges = 0
+
+    def note_request(self) -> None:
+        self.requests += 1
+
+    def try_acquire(self) -> bool:
+        if self.hedges >= self.burst + self.ratio * self.requests:
+            return False
+        self.hedges += 1
+        return True
+
+
+__all__ = ["HedgeBudget", "HedgePolicy", "TTFTWindow"]
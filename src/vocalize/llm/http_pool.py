@@ -0,0 +1,289 @@
+"""LLM HTTP 客户端注册表（进程级共享、预热、keep-alive）。
+
+每个 ``OpenAICompatClient`` 原来各建一个 ``AsyncOpenAI``：每个会话的 pipeline
+各有一套连接池，每通电话第一轮 LLM 都要付一次 TCP + TLS 握手（公网 endpoint
+上 100–300 ms，直接加在首 token 上）。这里按 ``(base_url, api_key, model)``
+去重，整个进程共用一个 ``AsyncOpenAI`` 及其底层 ``httpx.AsyncClient``：
+
+- 连接池：HTTP/2（装了 ``h2`` 时；一条连接多路复用所有会话的流），否则
+  HTTP/1.1 keep-alive；``keepalive_s`` 远大于 httpx 默认的 5 s，轮次之间的
+  停顿不会让连接过期。
+- 预热：app lifespan 里 ``prewarm()`` 先开 ``prewarm_connections`` 条连接（对
+  ``base_url`` 发 HEAD，状态码无所谓，握手完成即可）；之后后台每
+  ``refresh_interval_s`` 检查一次，空闲太久就再碰一下，保证连接一直是热的。
+- SSE 收尾：部分 SDK 版本读到 ``data: [DONE]`` 就关响应，HTTP/1.1 的消息结束
+  标记还没读到，连接因此被丢弃、下一轮重新握手。SSE 响应关闭前先在
+  ``_DRAIN_TIMEOUT_S`` 内把已到达的剩余字节读完，连接得以回池；barge-in 时
+  流还在生成，读不完就照常关连接（远端随之停止生成）。
+- 指标：每个请求按 httpx trace 事件判断是否复用了已有连接
+  （``vocalize_llm_http_requests_total{connection}``），新建连接的 TCP + TLS
+  耗时记入 ``vocalize_llm_http_connect_seconds``。
+
+与 ``vocalize.ws_pool`` 一样，客户端绑定首次使用它的 event loop；换了 loop
+（测试里每个用例一个 loop）时注册表换一个新的。``close_all_clients()`` 在 app
+关闭时调用。
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import importlib.util
+import logging
+import sys
+import time
+from collections.abc import AsyncIterator
+from types import ModuleType
+from typing import Any
+
+import openai
+from openai import AsyncOpenAI
+
+from vocalize.llm.hedging import TTFTWindow
+
+log = logging.getLogger(__name__)
+
+# SSE 响应关闭前读剩余字节的时限：正常结束时只剩几个字节、已在缓冲区里
+_DRAIN_TIMEOUT_S = 0.02
+_DRAIN_MAX_BYTES = 64 * 1024
+
+
+def _httpx() -> ModuleType:
+    """openai SDK 实际使用的 httpx 模块（1.x 是 ``httpx``，新版本是其分支 ``httpx2``）。"""
+    base = openai.DefaultAsyncHttpxClient.__mro__[1]
+    return sys.modules[base.__module__.partition(".")[0]]
+
+
+def http2_available() -> bool:
+    """``httpx`` 的 HTTP/2 需要可选依赖 ``h2``。"""
+    return importlib.util.find_spec("h2") is not None
+
+
+class SharedLLMClient:
+    """一个 ``(base_url, api_key, model)`` 的共享 ``AsyncOpenAI`` + 连接池。
+
+    Args:
+        base_url / api_key / model: 同 ``OpenAICompatConfig``。
+        request_timeout: SDK 请求超时。
+        http2: 请求 HTTP/2；没装 ``h2`` 时退回 HTTP/1.1（记一条 warning）。
+        max_connections: 连接池上限（所有会话共享）。
+        keepalive_s: 空闲连接保活时间。
+        prewarm_connections: 预热 / 保温的连接数；0 = 不预热。
+        refresh_interval_s: 后台保温周期。
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        api_key: str,
+        model: str,
+        request_timeout: float = 30.0,
+        http2: bool = True,
+        max_connections: int = 20,
+        keepalive_s: float = 120.0,
+        prewarm_connections: int = 1,
+        refresh_interval_s: float = 30.0,
+    ) -> None:
+        if http2 and not http2_available():
+            log.warning("LLM_HTTP2 requested but h2 is not installed; using HTTP/1.1")
+            http2 = False
+        self.base_url = base_url
+        self.model = model
+        self.http2 = http2
+        self.max_connections = max(1, max_connections)
+        self.keepalive_s = keepalive_s
+        # HTTP/2 一条连接就能承载所有并发流
+        self.prewarm_connections = min(
+            max(0, prewarm_connections), 1 if http2 else self.max_connections
+        )
+        self.refresh_interval_s = refresh_interval_s
+        self._last_used = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._maintainer: asyncio.Task[None] | None = None
+        self._closed = False
+        # 这个 endpoint 最近的首 token 耗时（所有会话共享；请求对冲的阈值来源）
+        self.ttft = TTFTWindow()
+        self.http = openai.DefaultAsyncHttpxClient(
+            http2=http2,
+            limits=_httpx().Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=keepalive_s,
+            ),
+            event_hooks={
+                "request": [self._attach_trace],
+                "response": [_drain_sse_on_close],
+            },
+        )
+        # SDK 自带 retry 关掉，由 OpenAICompatClient 显式重试
+        self.openai = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=request_timeout,
+            max_retries=0,
+            http_client=self.http,
+        )
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def bound_to(self, loop: asyncio.AbstractEventLoop) -> bool:
+        """未绑定或绑定的就是 ``loop``。"""
+        return self._loop is None or self._loop is loop
+
+    def start(self) -> None:
+        """起后台保温任务（幂等）；需要在 running loop 里调用。"""
+        self._loop = asyncio.get_running_loop()
+        if self._closed or self.prewarm_connections == 0:
+            return
+        if self._maintainer is None or self._maintainer.done():
+            self._maintainer = asyncio.create_task(self._maintain_forever())
+
+    async def prewarm(self) -> None:
+        """把 ``prewarm_connections`` 条连接握手建好（失败只记日志），并起保温任务。"""
+        self.start()
+        await self._touch(self.prewarm_connections)
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._maintainer is not None and not self._maintainer.done():
+            self._maintainer.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await self._maintainer
+        self._maintainer = None
+        with contextlib.suppress(Exception):
+            await self.http.aclose()
+
+    # ------------------------------------------------------------------
+    # internals
+    # ------------------------------------------------------------------
+    async def _touch(self, connections: int) -> None:
+        if connections <= 0:
+            return
+        results = await asyncio.gather(
+            *(self.http.head(self.base_url) for _ in range(connections)),
+            return_exceptions=True,
+        )
+        failed = [r for r in results if isinstance(r, Exception)]
+        if failed:
+            # endpoint 不可达时不刷屏：下个保温周期再试
+            log.debug("LLM connection prewarm failed for %s: %s", self.base_url, failed[0])
+
+    async def _maintain_forever(self) -> None:
+        while not self._closed:
+            await asyncio.sleep(self.refresh_interval_s)
+            if time.monotonic() - self._last_used >= self.refresh_interval_s:
+                await self._touch(self.prewarm_connections)
+
+    async def _attach_trace(self, request: Any) -> None:
+        """给每个请求挂 httpcore trace：看它是新建连接还是复用了池里的。"""
+        from vocalize.server.metrics import (
+            LLM_HTTP_CONNECT_SECONDS,
+            LLM_HTTP_REQUESTS_TOTAL,
+        )
+
+        self._last_used = time.monotonic()
+        connect_started: float | None = None
+        # 握手到这一步算连接建好：https 是 TLS 完成，明文 http 是 TCP 完成
+        connected_event = (
+            "connection.start_tls.complete" if request.url.scheme == "https"
+            else "connection.connect_tcp.complete"
+        )
+
+        async def trace(event: str, info: dict[str, Any]) -> None:
+            nonlocal connect_started
+            if event == "connection.connect_tcp.started":
+                connect_started = time.perf_counter()
+            elif event == connected_event and connect_started is not None:
+                LLM_HTTP_CONNECT_SECONDS.observe(time.perf_counter() - connect_started)
+            elif event.endswith(".send_request_headers.started"):
+                LLM_HTTP_REQUESTS_TOTAL.labels(
+                    connection="new" if connect_started is not None else "reused"
+                ).inc()
+
+        request.extensions["trace"] = trace
+
+
+class _DrainOnClose(_httpx().AsyncByteStream):  # type: ignore[misc]
+    """包一层响应字节流：``aclose()`` 前把已到达的剩余字节读完，让连接能回池。"""
+
+    def __init__(self, inner: Any) -> None:
+        self._inner = inner
+        self._it: Any = None
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        self._it = self._inner.__aiter__()
+        async for chunk in self._it:
+            yield chunk
+
+    async def aclose(self) -> None:
+        if self._it is not None:
+            drained = 0
+            with contextlib.suppress(Exception):
+                async with asyncio.timeout(_DRAIN_TIMEOUT_S):
+                    async for chunk in self._it:
+                        drained += len(chunk)
+                        if drained > _DRAIN_MAX_BYTES:
+                            break
+        await self._inner.aclose()
+
+
+async def _drain_sse_on_close(response: Any) -> None:
+    if response.headers.get("content-type", "").startswith("text/event-stream"):
+        response.stream = _DrainOnClose(response.stream)
+
+
+# ---------------------------------------------------------------------------
+# 进程级注册表
+# ---------------------------------------------------------------------------
+_clients: dict[tuple[str, str, str], SharedLLMClient] = {}
+
+
+def _key(base_url: str, api_key: str, model: str) -> tuple[str, str, str]:
+    # 注册表里不留明文 key
+    return (base_url, hashlib.sha256(api_key.encode()).hexdigest()[:16], model)
+
+
+def get_client(
+    *, base_url: str, api_key: str, model: str, **kwargs: Any
+) -> SharedLLMClient:
+    """取（或创建）进程级共享客户端；同一 key 的后续调用忽略 ``kwargs``。"""
+    key = _key(base_url, api_key, model)
+    client = _clients.get(key)
+    try:
+        loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if client is not None and loop is not None and not client.bound_to(loop):
+        # 旧 loop 上的连接无法在这里关闭，直接丢弃
+        log.debug("LLM client for %s rebound to a new event loop", base_url)
+        client = None
+    if client is None or client.closed:
+        client = SharedLLMClient(base_url=base_url, api_key=api_key, model=model, **kwargs)
+        _clients[key] = client
+    if loop is not None:
+        client._loop = loop
+    return client
+
+
+def all_clients() -> list[SharedLLMClient]:
+    return list(_clients.values())
+
+
+async def close_all_clients() -> None:
+    """关闭并清空所有共享客户端（app 关闭 / 测试清理）。"""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.close()
+
+
+__all__ = [
+    "SharedLLMClient",
+    "all_clients",
+    "close_all_clients",
+    "get_client",
+    "http2_available",
+]
@@ -22,11 +22,19 @@
   导致用户听到 AI 朗读自己的英文推理。这里在 client 出口做无副作用的状态机
   剥离：没有 ``<think>`` 标签时 0 字符变更；有标签时按字面匹配吞掉标签
   及其内部内容。详见 ``_ThinkingStripper``。
+- **连接复用**：``from_app_config`` 构造的实例共用 ``vocalize.llm.http_pool`` 里
+  按 ``(base_url, api_key, model)`` 去重的 ``AsyncOpenAI``——所有会话、两条
+  pipeline 一个连接池，app 启动时已预热，首轮首 token 不付握手。
+- **请求对冲**（``OpenAICompatConfig.hedge``，默认关）：首 token 超过自适应阈值
+  还没来就再发一个相同请求，先出 token 的胜出，另一个关闭。详见
+  ``vocalize.llm.hedging``。
 """
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
+import time
 from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from typing import Any, Literal, cast
@@ -44,6 +52,8 @@ from vocalize.llm.base import (
     ToolCallDelta,
     ToolDef,
 )
+from vocalize.llm.hedging import HedgeBudget, HedgePolicy, TTFTWindow
+from vocalize.llm.http_pool import SharedLLMClient
 
 log = logging.getLogger(__name__)
 
@@ -199,6 +209,8 @@ class OpenAICompatConfig:
     model: str
     request_timeout: float = 30.0
     max_retries: int = 2
+    # None = 不对冲
+    hedge: HedgePolicy | None = None
 
     def __post_init__(self) -> None:
         if self.max_retries < 0:
@@ -208,17 +220,32 @@ class OpenAICompatConfig:
 
 
 class OpenAICompatClient:
-    """OpenAI-compatible 流式 chat 客户端，实现 ``LLMService`` Protocol。"""
+    """OpenAI-compatible 流式 chat 客户端，实现 ``LLMService`` Protocol。
 
-    def __init__(self, config: OpenAICompatConfig) -> None:
+    ``shared`` 给定时复用其 ``AsyncOpenAI``（进程级连接池），否则自建一个。
+    """
+
+    def __init__(
+        self, config: OpenAICompatConfig, shared: SharedLLMClient | None = None
+    ) -> None:
         self._config = config
-        # SDK 自带 retry 关掉，我们自己控制重试策略（区分 4xx vs 网络错误）
-        self._client = AsyncOpenAI(
-            api_key=config.api_key,
-            base_url=config.base_url,
-            timeout=config.request_timeout,
-            max_retries=0,
+        self.shared = shared
+        # 首 token 耗时窗口按 endpoint 共享（对冲阈值用），预算按实例（通话腿）算
+        self._ttft = shared.ttft if shared is not None else TTFTWindow()
+        self._hedge_budget = (
+            HedgeBudget(ratio=config.hedge.budget_ratio, burst=config.hedge.budget_burst)
+            if config.hedge is not None else None
         )
+        if shared is not None:
+            self._client = shared.openai
+        else:
+            # SDK 自带 retry 关掉，我们自己控制重试策略（区分 4xx vs 网络错误）
+            self._client = AsyncOpenAI(
+                api_key=config.api_key,
+                base_url=config.base_url,
+                timeout=config.request_timeout,
+                max_retries=0,
+            )
         log.info(
             "OpenAICompatClient ready: base_url=%s model=%s",
             config.base_url, config.model,
@@ -238,9 +265,16 @@ class OpenAICompatClient:
                 api_key=cfg.openai_api_key,
                 base_url=cfg.openai_base_url,
                 model=cfg.openai_model,
-            )
+                hedge=cfg.llm_hedge_policy(),
+            ),
+            shared=cfg.llm_http_client(),
         )
 
+    @property
+    def model(self) -> str:
+        """当前请求的模型名（relay 缓存等按模型区分结果）。"""
+        return self._config.model
+
     async def stream_chat(
         self,
         messages: list[ChatMessage],
@@ -259,47 +293,24 @@ class OpenAICompatClient:
         oai_tools = (
             [_tool_def_to_openai(t) for t in tools] if tools else None
         )
-        stream = await self._create_stream_with_retry(oai_messages, oai_tools)
+        started = time.monotonic()
+        stream, head = await self._open_stream(oai_messages, oai_tools)
         stripper = _ThinkingStripper()
+        first_output = False
         try:
+            # head：对冲等首 token 时已读出的 chunk，先按原顺序处理
+            for chunk in head:
+                if not first_output and _has_output(chunk):
+                    first_output = True
+                    self._observe_ttft(time.monotonic() - started)
+                for out in _convert_chunk(chunk, stripper):
+                    yield out
             async for chunk in stream:
-                if not chunk.choices:
-                    continue
-                choice = chunk.choices[0]
-                delta = choice.delta
-
-                if delta is not None:
-                    content = getattr(delta, "content", None)
-                    if content:
-                        clean = stripper.feed(content)
-                        if clean:
-                            log.debug("text delta: %r", clean)
-                            yield TextDelta(text=clean)
-
-                    tool_calls = getattr(delta, "tool_calls", None)
-                    if tool_calls:
-                        for tc in tool_calls:
-                            fn = getattr(tc, "function", None)
-                            name = getattr(fn, "name", None) if fn is not None else None
-                            args = getattr(fn, "arguments", None) if fn is not None else None
-                            yield ToolCallDelta(
-                                tool_call_index=tc.index,
-                                tool_call_id=tc.id,
-                                name=name,
-                                arguments_delta=args or "",
-                            )
-
-                if choice.finish_reason is not None:
-                    # 流结束：把 stripper 残留 buffer 吐给下游。注意必须
-                    # 在 FinishChunk 之前发，否则 pipeline 会把 tail 文本
-                    # 当成下一轮的开头。
-                    tail = stripper.flush()
-                    if tail:
-                        log.debug("text delta (flush): %r", tail)
-                        yield TextDelta(text=tail)
-                    reason = _normalize_finish_reason(choice.finish_reason)
-                    usage = _extract_usage(chunk)
-                    yield FinishChunk(reason=reason, usage=usage)
+                if not first_output and _has_output(chunk):
+                    first_output = True
+                    self._observe_ttft(time.monotonic() - started)
+                for out in _convert_chunk(chunk, stripper):
+                    yield out
         finally:
             try:
                 await stream.close()
@@ -335,6 +346,97 @@ class OpenAICompatClient:
             log.warning("health_check transient failure: %s", exc)
             return False
 
+    def _observe_ttft(self, seconds: float) -> None:
+        from vocalize.server.metrics import LLM_TTFT_SECONDS
+
+        self._ttft.observe(seconds)
+        LLM_TTFT_SECONDS.observe(seconds)
+
+    async def _open_stream(
+        self,
+        oai_messages: list[dict[str, Any]],
+        oai_tools: list[dict[str, Any]] | None,
+    ) -> tuple[AsyncStream[ChatCompletionChunk], list[ChatCompletionChunk]]:
+        """建立流；开了对冲时返回首 token 前已读出的 chunk（否则 head 为空）。"""
+        policy = self._config.hedge
+        if policy is None or self._hedge_budget is None:
+            return await self._create_stream_with_retry(oai_messages, oai_tools), []
+        return await self._open_hedged(oai_messages, oai_tools, policy, self._hedge_budget)
+
+    async def _open_hedged(
+        self,
+        oai_messages: list[dict[str, Any]],
+        oai_tools: list[dict[str, Any]] | None,
+        policy: HedgePolicy,
+        budget: HedgeBudget,
+    ) -> tuple[AsyncStream[ChatCompletionChunk], list[ChatCompletionChunk]]:
+        from vocalize.server.metrics import (
+            LLM_HEDGE_REQUESTS_TOTAL,
+            LLM_HEDGE_WINS_TOTAL,
+        )
+
+        budget.note_request()
+        primary = asyncio.create_task(self._until_first_output(oai_messages, oai_tools))
+        attempts = [primary]
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=policy.delay(self._ttft))
+            if done:
+                LLM_HEDGE_REQUESTS_TOTAL.labels(outcome="not_needed").inc()
+                # 返回的流不能被 finally 关掉
+                attempts.remove(primary)
+                return primary.result()
+            if not budget.try_acquire():
+                LLM_HEDGE_REQUESTS_TOTAL.labels(outcome="budget_exhausted").inc()
+                attempts.remove(primary)
+                return await primary
+            LLM_HEDGE_REQUESTS_TOTAL.labels(outcome="hedged").inc()
+            log.info("LLM first token slow; hedging request (model=%s)", self._config.model)
+            attempts.append(
+                asyncio.create_task(self._until_first_output(oai_messages, oai_tools))
+            )
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED,
+                )
+                # 同一轮都完成时优先原请求；失败的一方等另一方
+                for task in sorted(done, key=attempts.index):
+                    if task.exception() is None:
+                        LLM_HEDGE_WINS_TOTAL.labels(
+                            winner="primary" if task is primary else "hedge"
+                        ).inc()
+                        attempts.remove(task)
+                        return task.result()
+            # 两个都失败：按原请求的错误上抛
+            return primary.result()
+        finally:
+            # 输家（或调用方被取消时的全部请求）：取消并关闭流
+            for task in attempts:
+                await _discard_attempt(task)
+
+    async def _until_first_output(
+        self,
+        oai_messages: list[dict[str, Any]],
+        oai_tools: list[dict[str, Any]] | None,
+    ) -> tuple[AsyncStream[ChatCompletionChunk], list[ChatCompletionChunk]]:
+        """建流并读到第一个有内容的 chunk（文本 / tool call / finish）为止。"""
+        stream = await self._create_stream_with_retry(oai_messages, oai_tools)
+        head: list[ChatCompletionChunk] = []
+        try:
+            while True:
+                try:
+                    chunk = await stream.__anext__()
+                except StopAsyncIteration:
+                    break
+                head.append(chunk)
+                if _has_output(chunk):
+                    break
+        except BaseException:
+            with contextlib.suppress(Exception):
+                await stream.close()
+            raise
+        return stream, head
+
     async def _create_stream_with_retry(
         self,
         oai_messages: list[dict[str, Any]],
@@ -400,6 +502,75 @@ class OpenAICompatClient:
         ) from last_exc
 
 
+def _has_output(chunk: Any) -> bool:
+    """chunk 是否带模型输出（文本 / tool call / finish_reason），即"首 token"。"""
+    if not chunk.choices:
+        return False
+    choice = chunk.choices[0]
+    delta = choice.delta
+    return bool(
+        choice.finish_reason is not None
+        or (delta is not None and (
+            getattr(delta, "content", None) or getattr(delta, "tool_calls", None)
+        ))
+    )
+
+
+def _convert_chunk(chunk: Any, stripper: "_ThinkingStripper") -> list[LLMChunk]:
+    """一个 SDK ``ChatCompletionChunk`` → 要 yield 的 ``LLMChunk`` 列表。"""
+    out: list[LLMChunk] = []
+    if not chunk.choices:
+        return out
+    choice = chunk.choices[0]
+    delta = choice.delta
+
+    if delta is not None:
+        content = getattr(delta, "content", None)
+        if content:
+            clean = stripper.feed(content)
+            if clean:
+                log.debug("text delta: %r", clean)
+                out.append(TextDelta(text=clean))
+
+        tool_calls = getattr(delta, "tool_calls", None)
+        if tool_calls:
+            for tc in tool_calls:
+                fn = getattr(tc, "function", None)
+                name = getattr(fn, "name", None) if fn is not None else None
+                args = getattr(fn, "arguments", None) if fn is not None else None
+                out.append(ToolCallDelta(
+                    tool_call_index=tc.index,
+                    tool_call_id=tc.id,
+                    name=name,
+                    arguments_delta=args or "",
+                ))
+
+    if choice.finish_reason is not None:
+        # 流结束：把 stripper 残留 buffer 吐给下游。注意必须
+        # 在 FinishChunk 之前发，否则 pipeline 会把 tail 文本
+        # 当成下一轮的开头。
+        tail = stripper.flush()
+        if tail:
+            log.debug("text delta (flush): %r", tail)
+            out.append(TextDelta(text=tail))
+        reason = _normalize_finish_reason(choice.finish_reason)
+        usage = _extract_usage(chunk)
+        out.append(FinishChunk(reason=reason, usage=usage))
+    return out
+
+
+async def _discard_attempt(task: "asyncio.Task[Any]") -> None:
+    """取消一个对冲请求；已经拿到流的话关掉它（远端停止生成）。"""
+    if not task.done():
+        task.cancel()
+    try:
+        stream, _head = await task
+    except BaseException:
+        return
+    with contextlib.suppress(Exception):
+        await stream.close()
+
+
 def _chat_message_to_openai(m: ChatMessage) -> dict[str, Any]:
     """``ChatMessage`` → OpenAI ``messages[]`` 字典。
 
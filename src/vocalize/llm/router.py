@@ -0,0 +1,499 @@
+"""多 provider LLM 路由：延迟感知选路 + 熔断 + failover。
+
+``Config`` 只指向一个 OpenAI-compat endpoint（默认 DeepSeek）时，provider 一降级
+（首 token 十几秒、成片 5xx）通话里就是冷场。``LLMRouter`` 包住多个
+``OpenAICompatClient``（``primary`` = ``OPENAI_*``，其余来自 ``LLM_BACKENDS``），
+本身实现 ``LLMService``，对调用方透明：
+
+- **统计**（``BackendHealth``，按 backend 名进程级共享）：首 token 耗时的 EWMA、
+  错误率的 EWMA（成功记 0、失败记 1）。超过 ``stale_after_s`` 没有新样本的
+  EWMA 视为过期，按"未知"参与排序，慢过一次的 backend 之后还有机会被选回来。
+- **选路按 prompt 层**：``for_layer(llm, layer)`` 给 Layer 1–5 各取一个视图。
+  ``LLM_ROUTE_LAYERS`` 可把某层钉到指定 backend（如 Layer 1 task_planner 要
+  强模型、不在乎几百毫秒），钉住的排第一、其余按分数作 failover；没钉的层按
+  分数（EWMA TTFT × (1 + 4 × 错误率)）取最快的。层名：``task_planner`` /
+  ``preflight_collector`` / ``merchant_agent`` / ``clarification_collector`` /
+  ``relay`` / ``callback``，其他调用方是 ``default``。
+- **熔断**（``CircuitBreaker``）：连续 ``failure_threshold`` 次失败断开
+  ``reset_timeout_s``，之后半开放行；半开时成功即闭合、失败立刻再断开。
+  断开的 backend 排到最后——全部断开时仍按序尝试，总比冷场强。
+- **failover**：首个 chunk 之前的失败（建流出错、首 token 超过
+  ``first_token_timeout_s``）换下一个 backend 重发；已经向调用方吐过 chunk 就
+  不再切换（否则文本 / tool call 会重复），记一次失败后原样上抛。请求本身的
+  问题（400 / 413 / 422）换谁都一样，直接上抛、不计入 backend 错误。最后一个
+  候选不设首 token 超时。
+- **tool call**：chunk（含 ``ToolCallDelta``）原样透传，``tools`` 原样下发；
+  各 provider 都是 OpenAI 的 tool call 格式，上一轮由别的 backend 产生的
+  ``tool_calls`` 消息也能接着用。
+- **指标**：``vocalize_llm_route_requests_total{layer,backend}``（选路结果）、
+  ``vocalize_llm_route_failovers_total{layer,backend,reason}``、
+  ``vocalize_llm_backend_ttft_seconds{backend}``，以及 gauge
+  ``vocalize_llm_backend_ewma_ttft_seconds`` / ``_error_rate`` / ``_circuit_state``。
+
+没配 ``LLM_BACKENDS`` 时 ``build_llm_service`` 直接返回单个 ``OpenAICompatClient``，
+行为与原来完全一致。
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from vocalize.llm.base import ChatMessage, LLMChunk, LLMService, ToolDef
+
+if TYPE_CHECKING:
+    from vocalize.config import Config
+
+log = logging.getLogger(__name__)
+
+DEFAULT_LAYER = "default"
+PRIMARY_BACKEND = "primary"
+
+# 错误率对分数的放大系数：错误率 25% 的 backend 相当于慢一倍
+_ERROR_PENALTY = 4.0
+# 这些状态码说明请求本身有问题，换 backend 也一样
+_CALLER_ERROR_STATUSES = frozenset({400, 413, 422})
+
+
+class CircuitBreaker:
+    """连续失败计数熔断器：closed → open → (超时后) half_open → closed / open。"""
+
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 3,
+        reset_timeout_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout_s = reset_timeout_s
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at >= self.reset_timeout_s:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def available(self) -> bool:
+        return self.state != self.OPEN
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        if self.state == self.HALF_OPEN:
+            # 半开探测失败：立刻重新断开
+            self._trip()
+            return
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            self._trip()
+
+    def _trip(self) -> None:
+        self._failures = 0
+        self._opened_at = self._clock()
+
+
+class BackendHealth:
+    """一个 backend 的 EWMA 首 token 耗时 / 错误率 + 熔断器（进程级共享）。"""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        alpha: float = 0.2,
+        stale_after_s: float = 60.0,
+        breaker: CircuitBreaker | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.alpha = alpha
+        self.stale_after_s = stale_after_s
+        self.breaker = breaker if breaker is not None else CircuitBreaker(clock=clock)
+        self._clock = clock
+        self.ewma_ttft_s: float | None = None
+        self.error_rate = 0.0
+        self._last_sample_at = 0.0
+
+    def observe_ttft(self, seconds: float) -> None:
+        from vocalize.server.metrics import LLM_BACKEND_TTFT_SECONDS
+
+        if self.ewma_ttft_s is None or self._stale():
+            self.ewma_ttft_s = seconds
+        else:
+            self.ewma_ttft_s += self.alpha * (seconds - self.ewma_ttft_s)
+        self._last_sample_at = self._clock()
+        LLM_BACKEND_TTFT_SECONDS.labels(backend=self.name).observe(seconds)
+        self._publish()
+
+    def observe_success(self) -> None:
+        self.error_rate -= self.alpha * self.error_rate
+        self.breaker.record_success()
+        self._publish()
+
+    def observe_failure(self) -> None:
+        self.error_rate += self.alpha * (1.0 - self.error_rate)
+        self.breaker.record_failure()
+        self._publish()
+
+    def score(self, default_ttft_s: float) -> float:
+        """越小越好；没有（或只有过期的）首 token 样本时按 ``default_ttft_s`` 算。"""
+        ttft = (
+            default_ttft_s if self.ewma_ttft_s is None or self._stale()
+            else self.ewma_ttft_s
+        )
+        return ttft * (1.0 + _ERROR_PENALTY * self.error_rate)
+
+    def _stale(self) -> bool:
+        return self._clock() - self._last_sample_at > self.stale_after_s
+
+    def _publish(self) -> None:
+        from vocalize.server.metrics import (
+            LLM_BACKEND_CIRCUIT_STATE,
+            LLM_BACKEND_ERROR_RATE,
+            LLM_BACKEND_EWMA_TTFT_SECONDS,
+        )
+
+        if self.ewma_ttft_s is not None:
+            LLM_BACKEND_EWMA_TTFT_SECONDS.labels(backend=self.name).set(self.ewma_ttft_s)
+        LLM_BACKEND_ERROR_RATE.labels(backend=self.name).set(self.error_rate)
+        LLM_BACKEND_CIRCUIT_STATE.labels(backend=self.name).set(
+            (CircuitBreaker.CLOSED, CircuitBreaker.HALF_OPEN, CircuitBreaker.OPEN)
+            .index(self.breaker.state)
+        )
+
+
+# 进程级：所有会话的 router 共用同一份 backend 统计与熔断状态
+_health: dict[str, BackendHealth] = {}
+
+
+def get_backend_health(
+    name: str, *, failure_threshold: int = 3, reset_timeout_s: float = 30.0,
+) -> BackendHealth:
+    health = _health.get(name)
+    if health is None:
+        health = BackendHealth(
+            name,
+            breaker=CircuitBreaker(
+                failure_threshold=failure_threshold, reset_timeout_s=reset_timeout_s,
+            ),
+        )
+        _health[name] = health
+    return health
+
+
+@dataclass
+class RouteBackend:
+    """router 里的一个 backend：名字（指标 label / ``LLM_ROUTE_LAYERS`` 用）+ 客户端。"""
+
+    name: str
+    client: LLMService
+    health: BackendHealth
+
+
+class LLMRouter:
+    """包住多个 ``LLMService`` 的路由器，本身也是 ``LLMService``（见模块 docstring）。
+
+    Args:
+        backends: ``(name, client)`` 列表，顺序即没有统计时的优先级。
+        layers: prompt 层 → 钉住的 backend 名。
+        first_token_timeout_s: 首 token 超时后 failover；0 = 不设。
+        failure_threshold / reset_timeout_s: 熔断参数（首次创建该 backend 的
+            统计时生效）。
+        default_ttft_s: 没有样本的 backend 按这个首 token 耗时参与排序。
+    """
+
+    def __init__(
+        self,
+        backends: list[tuple[str, LLMService]],
+        *,
+        layers: dict[str, str] | None = None,
+        first_token_timeout_s: float = 5.0,
+        failure_threshold: int = 3,
+        reset_timeout_s: float = 30.0,
+        default_ttft_s: float = 1.0,
+    ) -> None:
+        if not backends:
+            raise ValueError("LLMRouter needs at least one backend")
+        self.backends = [
+            RouteBackend(
+                name=name,
+                client=client,
+                health=get_backend_health(
+                    name,
+                    failure_threshold=failure_threshold,
+                    reset_timeout_s=reset_timeout_s,
+                ),
+            )
+            for name, client in backends
+        ]
+        self._layers = dict(layers or {})
+        self._first_token_timeout_s = first_token_timeout_s
+        self._default_ttft_s = default_ttft_s
+        # 每层最近一次真正出流的 backend（failover 后是接手的那个），见 _model_for
+        self._served: dict[str, RouteBackend] = {}
+
+    @property
+    def model(self) -> str:
+        return self._model_for(DEFAULT_LAYER)
+
+    def for_layer(self, layer: str) -> "RoutedLLM":
+        return RoutedLLM(self, layer)
+
+    def stream_chat(
+        self,
+        messages: list[ChatMessage],
+        tools: list[ToolDef] | None = None,
+    ) -> AsyncIterator[LLMChunk]:
+        return self.stream_layer(DEFAULT_LAYER, messages, tools)
+
+    def candidates(self, layer: str) -> list[RouteBackend]:
+        """本层的尝试顺序：钉住的优先，其余按分数；熔断断开的排最后。"""
+        pinned = self._layers.get(layer)
+        order = sorted(
+            range(len(self.backends)),
+            key=lambda i: (
+                not self.backends[i].health.breaker.available(),
+                self.backends[i].name != pinned,
+                self.backends[i].health.score(self._default_ttft_s),
+                i,
+            ),
+        )
+        return [self.backends[i] for i in order]
+
+    async def stream_layer(
+        self,
+        layer: str,
+        messages: list[ChatMessage],
+        tools: list[ToolDef] | None = None,
+    ) -> AsyncIterator[LLMChunk]:
+        from vocalize.server.metrics import (
+            LLM_ROUTE_FAILOVERS_TOTAL,
+            LLM_ROUTE_REQUESTS_TOTAL,
+        )
+
+        candidates = self.candidates(layer)
+        for index, backend in enumerate(candidates):
+            last = index == len(candidates) - 1
+            timeout = (
+                self._first_token_timeout_s
+                if not last and self._first_token_timeout_s > 0 else None
+            )
+            stream = backend.client.stream_chat(messages, tools)
+            started = time.monotonic()
+            try:
+                first = await asyncio.wait_for(_first_chunk(stream), timeout)
+            except TimeoutError:
+                await _aclose(stream)
+                backend.health.observe_failure()
+                LLM_ROUTE_FAILOVERS_TOTAL.labels(
+                    layer=layer, backend=backend.name, reason="timeout",
+                ).inc()
+                log.warning(
+                    "LLM backend %s: no first token within %.1fs (layer=%s); failing over",
+                    backend.name, timeout, layer,
+                )
+                continue
+            except Exception as exc:
+                await _aclose(stream)
+                if _is_caller_error(exc):
+                    raise
+                backend.health.observe_failure()
+                if last:
+                    raise
+                LLM_ROUTE_FAILOVERS_TOTAL.labels(
+                    layer=layer, backend=backend.name, reason="error",
+                ).inc()
+                log.warning(
+                    "LLM backend %s failed (layer=%s); failing over: %s",
+                    backend.name, layer, exc,
+                )
+                continue
+
+            LLM_ROUTE_REQUESTS_TOTAL.labels(layer=layer, backend=backend.name).inc()
+            self._served[layer] = backend
+            try:
+                if first is not None:
+                    backend.health.observe_ttft(time.monotonic() - started)
+                    yield first
+                    async for chunk in stream:
+                        yield chunk
+            except Exception:
+                backend.health.observe_failure()
+                raise
+            else:
+                backend.health.observe_success()
+            finally:
+                await _aclose(stream)
+            return
+
+    def _model_for(self, layer: str) -> str:
+        """本层的 ``model``：最近一次真正出流的 backend 的模型，还没请求过时取首选。
+
+        调用方（relay 译文缓存）在发请求之前就读它拼 key，所以取的是"上一次谁
+        出的流"而不是按当前分数排第一的候选——failover 到备用 backend 后，后续
+        译文记在备用模型名下。仍有一次滞后：恰好发生切换的那次请求记在切换前的
+        模型名下。
+        """
+        backend = self._served.get(layer) or self.candidates(layer)[0]
+        return getattr(backend.client, "model", "")
+
+
+class RoutedLLM:
+    """``LLMRouter`` 绑定到一个 prompt 层的视图（``LLMService``）。"""
+
+    def __init__(self, router: LLMRouter, layer: str) -> None:
+        self.router = router
+        self.layer = layer
+
+    @property
+    def model(self) -> str:
+        return self.router._model_for(self.layer)
+
+    def stream_chat(
+        self,
+        messages: list[ChatMessage],
+        tools: list[ToolDef] | None = None,
+    ) -> AsyncIterator[LLMChunk]:
+        return self.router.stream_layer(self.layer, messages, tools)
+
+
+def for_layer(llm: Any, layer: str) -> Any:
+    """``llm`` 是 ``LLMRouter`` 时返回 ``layer`` 的视图，否则原样返回。"""
+    if isinstance(llm, LLMRouter):
+        return llm.for_layer(layer)
+    return llm
+
+
+async def _first_chunk(stream: AsyncIterator[LLMChunk]) -> LLMChunk | None:
+    """读第一个 chunk；空流返回 None。"""
+    try:
+        return await stream.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+async def _aclose(stream: AsyncIterator[LLMChunk]) -> None:
+    aclose = getattr(stream, "aclose", None)
+    if aclose is None:
+        return
+    try:
+        await aclose()
+    except Exception:
+        log.debug("error closing routed LLM stream", exc_info=True)
+
+
+def _is_caller_error(exc: BaseException) -> bool:
+    return getattr(exc, "upstream_status", None) in _CALLER_ERROR_STATUSES
+
+
+class LLMBackendSpec(NamedTuple):
+    """``LLM_BACKENDS`` 里的一项：``name|base_url|model|API_KEY_ENV``。"""
+
+    name: str
+    base_url: str
+    model: str
+    api_key: str
+
+
+def parse_backends(raw: str, environ: dict[str, str] | None = None) -> list[LLMBackendSpec]:
+    """解析 ``LLM_BACKENDS``：``;`` 分隔多项，每项 ``name|base_url|model|API_KEY_ENV``。
+
+    API key 按第四段给的环境变量名去读（不把密钥直接写进这个变量）；格式不对、
+    名字重复或 key 缺失的项记 warning 跳过。
+    """
+    env = os.environ if environ is None else environ
+    specs: list[LLMBackendSpec] = []
+    seen = {PRIMARY_BACKEND}
+    for entry in raw.split(";"):
+        entry = entry.strip()
+        if not entry:
+            continue
+        parts = [p.strip() for p in entry.split("|")]
+        if len(parts) != 4 or not all(parts):
+            log.warning("LLM_BACKENDS entry %r is not name|base_url|model|API_KEY_ENV; skipped", entry)
+            continue
+        name, base_url, model, key_env = parts
+        if name in seen:
+            log.warning("LLM_BACKENDS: duplicate backend name %r; skipped", name)
+            continue
+        api_key = env.get(key_env, "").strip()
+        if not api_key:
+            log.warning("LLM_BACKENDS: %s is not set; backend %r skipped", key_env, name)
+            continue
+        seen.add(name)
+        specs.append(LLMBackendSpec(name, base_url, model, api_key))
+    return specs
+
+
+def parse_layers(raw: str) -> dict[str, str]:
+    """解析 ``LLM_ROUTE_LAYERS``：``layer=backend,layer=backend``。"""
+    layers: dict[str, str] = {}
+    for entry in raw.split(","):
+        layer, sep, backend = entry.partition("=")
+        if sep and layer.strip() and backend.strip():
+            layers[layer.strip()] = backend.strip()
+        elif entry.strip():
+            log.warning("LLM_ROUTE_LAYERS entry %r is not layer=backend; skipped", entry)
+    return layers
+
+
+def build_llm_service(cfg: "Config") -> LLMService:
+    """按配置构造会话用的 LLM：配了 ``LLM_BACKENDS`` 时是 ``LLMRouter``，否则单个客户端。"""
+    from vocalize.llm.openai_compat import OpenAICompatClient, OpenAICompatConfig
+
+    primary = OpenAICompatClient.from_app_config(cfg)
+    specs = parse_backends(cfg.llm_backends)
+    if not specs:
+        return primary
+    backends: list[tuple[str, LLMService]] = [(PRIMARY_BACKEND, primary)]
+    for spec in specs:
+        backends.append((spec.name, OpenAICompatClient(
+            OpenAICompatConfig(
+                api_key=spec.api_key,
+                base_url=spec.base_url,
+                model=spec.model,
+                hedge=cfg.llm_hedge_policy(),
+            ),
+            shared=cfg.llm_http_client(
+                base_url=spec.base_url, api_key=spec.api_key, model=spec.model,
+            ),
+        )))
+    return LLMRouter(
+        backends,
+        layers=parse_layers(cfg.llm_route_layers),
+        first_token_timeout_s=max(0, cfg.llm_route_first_token_timeout_ms) / 1000,
+        failure_threshold=cfg.llm_route_failure_threshold,
+        reset_timeout_s=float(cfg.llm_route_reset_s),
+    )
+
+
+__all__ = [
+    "DEFAULT_LAYER",
+    "PRIMARY_BACKEND",
+    "BackendHealth",
+    "CircuitBreaker",
+    "LLMBackendSpec",
+    "LLMRouter",
+    "RouteBackend",
+    "RoutedLLM",
+    "build_llm_service",
+    "for_layer",
+    "get_backend_health",
+    "parse_backends",
+    "parse_layers",
+]
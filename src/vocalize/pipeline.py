@@ -352,37 +352,8 @@ class VoicePipeline:
 
         tts_task = asyncio.create_task(play_tts())
 
-        # 所有写 text_q 的路径都要 short-circuit 已死的 TTS：text_q 是 bounded
-        # (maxsize=32)，TTS 死后 queue 没人消费，再 put 会永久阻塞，整个 turn 挂
-        # 死。这是 B1 死锁的根因——LLM 在 TTS 死后仍可能继续 yield 几十个 sentence。
-        # 注意：TTS 可能在我们 await put 期间才死掉（前几次 put 没填满 queue 同步
-        # 完成，从未让出控制权给 TTS task），所以必须把 put 和 tts_task 完成事件
-        # race，否则填满第 33 段时永久阻塞。
-        async def _safe_put(item: TextChunk | None, *, is_text_chunk: bool = True) -> None:
-            # Phase 4 Plan 02 (D-13 strict) entry-predicate gate：调用方传
-            # ``is_text_chunk=False``（tool 进行中或显式非文本路径）→ 直接
-            # no-op，不进入 race-detection、不进入队列、不触发任何副作用。
-            # 这保留 _safe_put 主体的 race-free 不变量（ARCHITECTURE L259-265）
-            # 不动；guard 严格在最前。
-            if not is_text_chunk:
-                return
-            if tts_task.done():
-                return
-            put_task = asyncio.ensure_future(text_q.put(item))
-            done, _pending = await asyncio.wait(
-                {put_task, tts_task},
-                return_when=asyncio.FIRST_COMPLETED,
-            )
-            if put_task in done:
-                # put 完成；正常路径
-                put_task.result()  # propagate cancellation if any
-                return
-            # tts_task 先 done → cancel 还没完成的 put（会从 queue 把 item 撤掉）
-            put_task.cancel()
-            try:
-                await put_task
-            except (asyncio.CancelledError, Exception):
-                log.debug("safe_put cleanup raised", exc_info=True)
+        # 所有写 text_q 的路径都要 short-circuit 已死的 TTS（见 ``_make_safe_put``）。
+        _safe_put = _make_safe_put(text_q, tts_task)
 
         try:
             llm_stream = self._llm.stream_chat(messages_for_call)
@@ -412,39 +383,7 @@ class VoicePipeline:
                     # is_text_chunk=False → 走短路 no-op；但我们 *需要* 哨兵流走
                     # 完，所以单独放在 finally 分支（已有）里送 None。
                 else:
-                    tail = "".join(buf).strip()
-                    pending = state.pending_first_segment
-                    state.pending_first_segment = None
-                    if pending is not None and not tail:
-                        # Phase 4 Plan 04-03 fix #1：短回复合并路径。唯一一个
-                        # sentence-ender 切出的段就是整个回复 → 直接以
-                        # is_final=True 单帧发出。CosyVoice server.py:948-966 的
-                        # batch dispatch (text_frame_count==0 && is_final) 现在
-                        # 可以命中，省 ~1.5s ttft。
-                        await _safe_put(
-                            TextChunk(
-                                text=pending.text,
-                                language=pending.language,
-                                is_final_segment=True,
-                            )
-                        )
-                    elif pending is not None and tail:
-                        # 罕见：sentence-ender 之后还有无标点尾巴。先 flush pending
-                        # (is_final=False)，再发 tail (is_final=True)，保留原有
-                        # 多段流式语义。
-                        await _safe_put(pending)
-                        await _safe_put(
-                            TextChunk(text=tail, language=language, is_final_segment=True)
-                        )
-                    elif tail:
-                        await _safe_put(
-                            TextChunk(text=tail, language=language, is_final_segment=True)
-                        )
-                    else:
-                        # buffer 为空但前面也没标过 final → 用一个空 final segment 触发 flush
-                        await _safe_put(
-                            TextChunk(text="", language=language, is_final_segment=True)
-                        )
+                    await self._flush_tail(buf, _safe_put, language, state)
             except LLMServiceError as exc:
                 log.error("LLM error mid-turn: %s; abandoning turn", exc)
                 # TTS 任务还活着且在消费 text_q，这里推一句兜底文本告诉用户系统出问题，
@@ -546,6 +485,48 @@ class VoicePipeline:
                     log.debug("tts_task cancel cleanup raised", exc_info=True)
             raise
 
+    async def _flush_tail(
+        self,
+        buf: list[str],
+        safe_put: "_SafePutFn",
+        language: str,
+        state: _TurnRunState,
+    ) -> None:
+        """文本流正常结束：把 pending 首段 / 无标点尾巴作为最后一段（``is_final_segment=True``）送 TTS。"""
+        tail = "".join(buf).strip()
+        pending = state.pending_first_segment
+        state.pending_first_segment = None
+        if pending is not None and not tail:
+            # Phase 4 Plan 04-03 fix #1：短回复合并路径。唯一一个
+            # sentence-ender 切出的段就是整个回复 → 直接以
+            # is_final=True 单帧发出。CosyVoice server.py:948-966 的
+            # batch dispatch (text_frame_count==0 && is_final) 现在
+            # 可以命中，省 ~1.5s ttft。
+            await safe_put(
+                TextChunk(
+                    text=pending.text,
+                    language=pending.language,
+                    is_final_segment=True,
+                )
+            )
+        elif pending is not None and tail:
+            # 罕见：sentence-ender 之后还有无标点尾巴。先 flush pending
+            # (is_final=False)，再发 tail (is_final=True)，保留原有
+            # 多段流式语义。
+            await safe_put(pending)
+            await safe_put(
+                TextChunk(text=tail, language=language, is_final_segment=True)
+            )
+        elif tail:
+            await safe_put(
+                TextChunk(text=tail, language=language, is_final_segment=True)
+            )
+        else:
+            # buffer 为空但前面也没标过 final → 用一个空 final segment 触发 flush
+            await safe_put(
+                TextChunk(text="", language=language, is_final_segment=True)
+            )
+
     async def _handle_llm_chunk(
         self,
         chunk: LLMChunk,
@@ -649,6 +630,56 @@ class VoicePipeline:
 
         await self._transport.output_stream(self._tts.stream_synthesize(_one_chunk()))
 
+    async def speak_stream(
+        self,
+        text_stream: AsyncIterator[str],
+        language: str,
+    ) -> str:
+        """边生成边朗读：``text_stream`` 的增量文本按 ``_handle_llm_chunk`` 同一套
+        句末标点切段，实时送进一条 TTS 流；返回完整文本（供 transcript 记录）。
+
+        用于 cross-lingual relay：``speak()`` 要等整句译文生成完才开口，长句的
+        LLM 生成时间整段都是静音。这里首句切出来就开始合成 / 播音，短译文仍合并
+        成单帧 ``is_final_segment=True``（与 ``_handle_turn`` 一致）。
+
+        ``text_stream`` 抛错时已切出的段不再播放，TTS 任务取消后原样抛出。
+        """
+        state = _TurnRunState(
+            timing=TurnTiming(user_text="", final_at=time.monotonic())
+        )
+        text_q: asyncio.Queue[TextChunk | None] = asyncio.Queue(maxsize=32)
+
+        async def text_chunks() -> AsyncIterator[TextChunk]:
+            while True:
+                item = await text_q.get()
+                if item is None:
+                    return
+                yield item
+
+        tts_task: asyncio.Task[None] = asyncio.create_task(
+            self._transport.output_stream(self._tts.stream_synthesize(text_chunks()))
+        )
+        safe_put = _make_safe_put(text_q, tts_task)
+        buf: list[str] = []
+        try:
+            async for piece in text_stream:
+                if piece:
+                    await self._handle_llm_chunk(
+                        TextDelta(text=piece), buf, safe_put, language, state,
+                    )
+            await self._flush_tail(buf, safe_put, language, state)
+            await safe_put(None)
+            await tts_task
+        except BaseException:
+            if not tts_task.done():
+                tts_task.cancel()
+                try:
+                    await tts_task
+                except (asyncio.CancelledError, Exception):
+                    log.debug("tts_task cancel cleanup raised", exc_info=True)
+            raise
+        return "".join(state.pieces).strip()
+
     @staticmethod
     def _language_prefix(language: str) -> str:
         """轻量 per-message 语言指令；不污染 system prompt。"""
@@ -659,6 +690,48 @@ class VoicePipeline:
         return f"[reply in {language}] "
 
 
+def _make_safe_put(
+    text_q: "asyncio.Queue[TextChunk | None]",
+    tts_task: "asyncio.Task[None]",
+) -> _SafePutFn:
+    """返回往 ``text_q`` 送段的 ``_safe_put``：TTS 任务死了就 short-circuit。
+
+    text_q 是 bounded (maxsize=32)，TTS 死后 queue 没人消费，再 put 会永久阻塞，
+    整个 turn 挂死。这是 B1 死锁的根因——LLM 在 TTS 死后仍可能继续 yield 几十个
+    sentence。注意：TTS 可能在我们 await put 期间才死掉（前几次 put 没填满 queue
+    同步完成，从未让出控制权给 TTS task），所以必须把 put 和 tts_task 完成事件
+    race，否则填满第 33 段时永久阻塞。
+    """
+
+    async def _safe_put(item: TextChunk | None, *, is_text_chunk: bool = True) -> None:
+        # Phase 4 Plan 02 (D-13 strict) entry-predicate gate：调用方传
+        # ``is_text_chunk=False``（tool 进行中或显式非文本路径）→ 直接
+        # no-op，不进入 race-detection、不进入队列、不触发任何副作用。
+        # 这保留 _safe_put 主体的 race-free 不变量（ARCHITECTURE L259-265）
+        # 不动；guard 严格在最前。
+        if not is_text_chunk:
+            return
+        if tts_task.done():
+            return
+        put_task = asyncio.ensure_future(text_q.put(item))
+        done, _pending = await asyncio.wait(
+            {put_task, tts_task},
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        if put_task in done:
+            # put 完成；正常路径
+            put_task.result()  # propagate cancellation if any
+            return
+        # tts_task 先 done → cancel 还没完成的 put（会从 queue 把 item 撤掉）
+        put_task.cancel()
+        try:
+            await put_task
+        except (asyncio.CancelledError, Exception):
+            log.debug("safe_put cleanup raised", exc_info=True)
+
+    return _safe_put
+
+
 def _fmt(v: float | None) -> str:
     return f"{v:.3f}s" if v is not None else "n/a"
 
@@ -6,7 +6,12 @@ that need a fresh app per case can call it directly with a custom
 """
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import logging
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
@@ -19,6 +24,8 @@ from vocalize.server.sessions import register_session_routes
 from vocalize.server.state import SessionRegistry
 from vocalize.server.ws import register_ws_routes
 
+log = logging.getLogger(__name__)
+
 
 def _default_user_pipeline_factory(transport):
     """Build a production VoicePipeline for one WS session.
@@ -32,18 +39,27 @@ def _default_user_pipeline_factory(transport):
     nothing semantic depends on it.
     """
     from vocalize.config import get_config
-    from vocalize.llm.openai_compat import OpenAICompatClient
+    from vocalize.llm.router import build_llm_service
     from vocalize.pipeline import VoicePipeline
     from vocalize.stt.sensevoice import SenseVoiceClient
+    from vocalize.tts.cache import wrap_with_cache
     from vocalize.tts.cosyvoice import CosyVoiceClient
 
     config = get_config()
     return VoicePipeline(
         transport=transport,
         system_prompt="",
-        stt=SenseVoiceClient.from_app_config(config),
-        llm=OpenAICompatClient.from_app_config(config),
-        tts=CosyVoiceClient.from_app_config(config),
+        # One WS per call leg: turns reuse the connection instead of paying a
+        # handshake each (DialogueOrchestratorRunner closes it on teardown).
+        stt=SenseVoiceClient.from_app_config(config).open_stream(),
+        # A multi-provider LLMRouter when LLM_BACKENDS is set.
+        llm=build_llm_service(config),
+        # Likewise one synthesis WS per call leg; fixed lines (fillers,
+        # keepalives, apologies) replay from the process-wide phrase cache
+        # instead of a CosyVoice round trip.
+        tts=wrap_with_cache(
+            CosyVoiceClient.from_app_config(config).open_session(), config
+        ),
     )
 
 
@@ -51,6 +67,70 @@ _DEFAULT_PROD_ORIGINS: list[str] = []
 _DEFAULT_DEV_ORIGINS = ["http://localhost:3000", "http://127.0.0.1:3000"]
 
 
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Warm the shared GPU WebSocket pools, LLM HTTP connections and TTS phrase
+    cache; close on shutdown.
+
+    Pools and the phrase warmup run in the background so an unreachable GPU
+    node or LLM endpoint never delays startup; without ``GPU_HOST`` /
+    ``OPENAI_API_KEY`` there is nothing to warm. Warmup progress is published
+    on ``app.state.tts_warmup`` for ``/health``.
+    """
+    from vocalize.config import get_config
+    from vocalize.llm.http_pool import close_all_clients
+    from vocalize.llm.router import LLMRouter, build_llm_service
+    from vocalize.stt.sensevoice import SenseVoiceClient
+    from vocalize.tts.cache import CachingTTS, wrap_with_cache
+    from vocalize.tts.cosyvoice import CosyVoiceClient
+    from vocalize.tts.warmup import PhraseWarmup
+    from vocalize.ws_pool import close_all_pools
+
+    config = get_config()
+    warmup_task: asyncio.Task[None] | None = None
+    llm_prewarm_tasks: list[asyncio.Task[None]] = []
+    if not config.validate_for_phase("llm"):
+        # Same process-wide clients every session's LLM service uses (one per
+        # routed backend when LLM_BACKENDS is set).
+        llm = build_llm_service(config)
+        clients = (
+            [b.client for b in llm.backends] if isinstance(llm, LLMRouter) else [llm]
+        )
+        for llm_client in clients:
+            shared = getattr(llm_client, "shared", None)
+            if shared is not None:
+                llm_prewarm_tasks.append(asyncio.create_task(
+                    shared.prewarm(), name="llm-prewarm"
+                ))
+                log.info("prewarming LLM connections: %s", shared.base_url)
+    if not config.validate_for_phase("gpu"):
+        # from_app_config registers the same process-wide pools the
+        # per-session clients borrow from.
+        for client in (
+            SenseVoiceClient.from_app_config(config),
+            CosyVoiceClient.from_app_config(config),
+        ):
+            if client.pool is not None:
+                client.pool.start()
+                log.info("prewarming GPU connection pool: %s", client.pool.url)
+        tts = wrap_with_cache(CosyVoiceClient.from_app_config(config), config)
+        if isinstance(tts, CachingTTS) and config.tts_warmup_concurrency > 0:
+            warmup = PhraseWarmup(tts, concurrency=config.tts_warmup_concurrency)
+            app.state.tts_warmup = warmup
+            warmup_task = asyncio.create_task(warmup.run(), name="tts-warmup")
+            log.info("pre-synthesizing %d static TTS phrases", warmup.total)
+    try:
+        yield
+    finally:
+        for task in (warmup_task, *llm_prewarm_tasks):
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        await close_all_pools()
+        await close_all_clients()
+
+
 def create_app() -> FastAPI:
     """Build the production FastAPI app.
 
@@ -66,7 +146,7 @@ def create_app() -> FastAPI:
             In localhost-dev mode the WS URL is derived from the request base_url.
         GPU_HOST / SENSEVOICE_WS_PORT / COSYVOICE_WS_PORT — GPU service targets.
     """
-    app = FastAPI(title="VocalizeAI", version="0.1.0")
+    app = FastAPI(title="VocalizeAI", version="0.1.0", lifespan=_lifespan)
 
     # --- Prometheus metrics (/metrics endpoint) ---
     # Mount BEFORE CORS middleware so the instrumentator middleware sees all
@@ -1,6 +1,6 @@
 """/health endpoint.
 
-Reports two booleans:
+Reports two booleans, plus the startup TTS warmup progress when one runs:
 
 - ``ok``: always True when the server is reachable (the request itself
   proves it).
@@ -8,12 +8,15 @@ Reports two booleans:
   succeeded within a short timeout. The default probe is provided by
   ``make_default_gpu_probe()`` reading the same app config as STT/TTS clients;
   tests inject a fake probe to avoid network.
+- ``tts_warmup``: ``{"ready", "warm", "total", "failed"}`` from the
+  ``PhraseWarmup`` the lifespan stored on ``app.state.tts_warmup``; absent
+  when no warmup was started (no ``GPU_HOST``, cache or warmup disabled).
 """
 from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Awaitable, Callable
+from typing import Any, Awaitable, Callable
 
 from fastapi import FastAPI
 
@@ -69,13 +72,17 @@ def make_default_gpu_probe(
 
 def register_health_routes(app: FastAPI, *, gpu_probe: GpuProbe) -> None:
     @app.get("/health")
-    async def health() -> dict:
+    async def health() -> dict[str, Any]:
         try:
             reachable = await gpu_probe()
         except Exception:
             log.warning("health: gpu_probe raised; reporting unreachable", exc_info=True)
             reachable = False
-        return {"ok": True, "gpu_reachable": reachable}
+        body: dict[str, Any] = {"ok": True, "gpu_reachable": reachable}
+        warmup = getattr(app.state, "tts_warmup", None)
+        if warmup is not None:
+            body["tts_warmup"] = warmup.status()
+        return body
 
 
 __all__ = ["GpuProbe", "make_default_gpu_probe", "register_health_routes"]
@@ -4,6 +4,9 @@ This module is the single source of truth for all ``vocalize_*`` Prometheus
 metrics.  It is imported by:
 - ``src/vocalize/server/__init__.py`` (wires the instrumentator + refresh middleware)
 - ``src/vocalize/server/ws.py`` (increments WS lifecycle counters)
+- GPU service clients (``vocalize.stt.*`` / ``vocalize.tts.*``) — imported
+  lazily inside functions, since importing this module runs
+  ``vocalize.server.__init__``
 
 Design note: the ``refresh_runtime_gauges`` helper is called on every
 ``/metrics`` scrape (not on every request) to keep scrape cost bounded.
@@ -19,7 +22,7 @@ import platform
 import resource
 import time
 
-from prometheus_client import Counter, Gauge
+from prometheus_client import Counter, Gauge, Histogram
 
 # ---------------------------------------------------------------------------
 # Module-level epoch for uptime gauge
@@ -43,6 +46,149 @@ WS_SESSIONS_CLOSED_TOTAL = Counter(
     ["reason"],
 )
 
+# ---------------------------------------------------------------------------
+# GPU service connections (SenseVoiceStream)
+# ---------------------------------------------------------------------------
+STT_WS_HANDSHAKES_TOTAL = Counter(
+    "vocalize_stt_ws_handshakes_total",
+    "WebSocket handshakes performed by session-scoped SenseVoice streams",
+)
+STT_HANDSHAKES_AVOIDED_TOTAL = Counter(
+    "vocalize_stt_handshakes_avoided_total",
+    "STT turns served on an already-open SenseVoice connection",
+)
+STT_STREAM_RECONNECTS_TOTAL = Counter(
+    "vocalize_stt_stream_reconnects_total",
+    "Mid-turn reconnects of session-scoped SenseVoice streams",
+)
+TTS_WS_HANDSHAKES_TOTAL = Counter(
+    "vocalize_tts_ws_handshakes_total",
+    "WebSocket handshakes performed by session-scoped CosyVoice sessions",
+)
+TTS_HANDSHAKES_AVOIDED_TOTAL = Counter(
+    "vocalize_tts_handshakes_avoided_total",
+    "TTS requests served on an already-open CosyVoice connection",
+)
+STT_UPLINK_SUPPRESSED_SECONDS_TOTAL = Counter(
+    "vocalize_stt_uplink_suppressed_seconds_total",
+    "Seconds of silent audio replaced by gap frames on the SenseVoice uplink (DTX)",
+)
+GPU_WS_POOL_IDLE = Gauge(
+    "vocalize_gpu_ws_pool_idle_connections",
+    "Pre-opened idle WebSockets held by the shared GPU connection pool",
+    ["service"],
+)
+GPU_WS_POOL_HITS_TOTAL = Counter(
+    "vocalize_gpu_ws_pool_hits_total",
+    "GPU WebSocket acquisitions served from a pre-opened connection",
+    ["service"],
+)
+GPU_WS_POOL_MISSES_TOTAL = Counter(
+    "vocalize_gpu_ws_pool_misses_total",
+    "GPU WebSocket acquisitions that had to open a new connection",
+    ["service"],
+)
+GPU_WS_POOL_EVICTIONS_TOTAL = Counter(
+    "vocalize_gpu_ws_pool_evictions_total",
+    "Pooled GPU WebSockets discarded before use",
+    ["service", "reason"],
+)
+GPU_WS_POOL_WAIT_SECONDS = Histogram(
+    "vocalize_gpu_ws_pool_wait_seconds",
+    "Time spent acquiring a GPU WebSocket (hit: liveness check; miss: handshake)",
+    ["service"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LLM_HTTP_REQUESTS_TOTAL = Counter(
+    "vocalize_llm_http_requests_total",
+    "LLM HTTP requests by whether they opened a new connection or reused a pooled one",
+    ["connection"],
+)
+LLM_HTTP_CONNECT_SECONDS = Histogram(
+    "vocalize_llm_http_connect_seconds",
+    "TCP + TLS setup time of new LLM HTTP connections",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LLM_TTFT_SECONDS = Histogram(
+    "vocalize_llm_ttft_seconds",
+    "Time from an LLM request to its first streamed token (after hedging)",
+    buckets=(0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0),
+)
+LLM_HEDGE_REQUESTS_TOTAL = Counter(
+    "vocalize_llm_hedge_requests_total",
+    "Hedging-enabled LLM requests by outcome (not_needed / hedged / budget_exhausted)",
+    ["outcome"],
+)
+LLM_HEDGE_WINS_TOTAL = Counter(
+    "vocalize_llm_hedge_wins_total",
+    "Hedged LLM requests by which copy produced the first token",
+    ["winner"],
+)
+LLM_ROUTE_REQUESTS_TOTAL = Counter(
+    "vocalize_llm_route_requests_total",
+    "LLM requests by prompt layer and the backend the router served them from",
+    ["layer", "backend"],
+)
+LLM_ROUTE_FAILOVERS_TOTAL = Counter(
+    "vocalize_llm_route_failovers_total",
+    "LLM requests moved off a backend before the first token",
+    ["layer", "backend", "reason"],
+)
+LLM_BACKEND_TTFT_SECONDS = Histogram(
+    "vocalize_llm_backend_ttft_seconds",
+    "Time to first LLM chunk per routed backend",
+    ["backend"],
+    buckets=(0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0),
+)
+LLM_BACKEND_EWMA_TTFT_SECONDS = Gauge(
+    "vocalize_llm_backend_ewma_ttft_seconds",
+    "EWMA time to first token the LLM router ranks backends by",
+    ["backend"],
+)
+LLM_BACKEND_ERROR_RATE = Gauge(
+    "vocalize_llm_backend_error_rate",
+    "EWMA error rate of each routed LLM backend",
+    ["backend"],
+)
+LLM_BACKEND_CIRCUIT_STATE = Gauge(
+    "vocalize_llm_backend_circuit_state",
+    "LLM backend circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ["backend"],
+)
+TTS_CACHE_HITS_TOTAL = Counter(
+    "vocalize_tts_cache_hits_total",
+    "Fixed-phrase TTS requests served from the phrase cache",
+    ["tier"],
+)
+TTS_CACHE_MISSES_TOTAL = Counter(
+    "vocalize_tts_cache_misses_total",
+    "Cacheable TTS requests that had to be synthesized",
+)
+TTS_CACHE_BYTES = Gauge(
+    "vocalize_tts_cache_bytes",
+    "Audio bytes resident in the TTS phrase cache",
+    ["tier"],
+)
+TTS_CACHE_EVICTIONS_TOTAL = Counter(
+    "vocalize_tts_cache_evictions_total",
+    "TTS phrase cache entries evicted to stay under the size bound",
+    ["tier"],
+)
+RELAY_CACHE_LOOKUPS_TOTAL = Counter(
+    "vocalize_relay_cache_lookups_total",
+    "Cacheable relay translations by outcome (cached / inflight = served without a new LLM call)",
+    ["direction", "outcome"],
+)
+RELAY_CACHE_SAVED_SECONDS_TOTAL = Counter(
+    "vocalize_relay_cache_saved_seconds_total",
+    "LLM translation latency avoided by relay cache hits",
+    ["direction"],
+)
+TTS_WARM_PHRASES = Gauge(
+    "vocalize_tts_warm_phrases",
+    "Static prompt phrases pre-synthesized into the TTS phrase cache at startup",
+)
+
 # ---------------------------------------------------------------------------
 # Gauges
 # ---------------------------------------------------------------------------
@@ -109,6 +255,35 @@ __all__ = [
     "ERROR_LOG_TOTAL",
     "WS_SESSIONS_OPENED_TOTAL",
     "WS_SESSIONS_CLOSED_TOTAL",
+    "STT_WS_HANDSHAKES_TOTAL",
+    "STT_HANDSHAKES_AVOIDED_TOTAL",
+    "STT_STREAM_RECONNECTS_TOTAL",
+    "STT_UPLINK_SUPPRESSED_SECONDS_TOTAL",
+    "TTS_WS_HANDSHAKES_TOTAL",
+    "TTS_HANDSHAKES_AVOIDED_TOTAL",
+    "GPU_WS_POOL_IDLE",
+    "GPU_WS_POOL_HITS_TOTAL",
+    "GPU_WS_POOL_MISSES_TOTAL",
+    "GPU_WS_POOL_EVICTIONS_TOTAL",
+    "GPU_WS_POOL_WAIT_SECONDS",
+    "LLM_HTTP_REQUESTS_TOTAL",
+    "LLM_HTTP_CONNECT_SECONDS",
+    "LLM_TTFT_SECONDS",
+    "LLM_HEDGE_REQUESTS_TOTAL",
+    "LLM_HEDGE_WINS_TOTAL",
+    "LLM_ROUTE_REQUESTS_TOTAL",
+    "LLM_ROUTE_FAILOVERS_TOTAL",
+    "LLM_BACKEND_TTFT_SECONDS",
+    "LLM_BACKEND_EWMA_TTFT_SECONDS",
+    "LLM_BACKEND_ERROR_RATE",
+    "LLM_BACKEND_CIRCUIT_STATE",
+    "TTS_CACHE_HITS_TOTAL",
+    "TTS_CACHE_MISSES_TOTAL",
+    "TTS_CACHE_BYTES",
+    "TTS_CACHE_EVICTIONS_TOTAL",
+    "TTS_WARM_PHRASES",
+    "RELAY_CACHE_LOOKUPS_TOTAL",
+    "RELAY_CACHE_SAVED_SECONDS_TOTAL",
     "ACTIVE_SESSIONS",
     "PROCESS_UPTIME_SECONDS",
     "PROCESS_RSS_BYTES",
@@ -28,7 +28,9 @@ from collections.abc import AsyncIterator, Awaitable
 from datetime import datetime, timezone
 from typing import Callable, Literal, cast
 
+from vocalize.config import get_config
 from vocalize.dialogue.orchestrator import DialogueOrchestrator
+from vocalize.dialogue.relay_cache import get_relay_cache
 from vocalize.dialogue.state import (
     CallbackEntry,
     DialogueOrchestratorError,
@@ -100,6 +102,12 @@ class _RoleTaggedTransport:
     def _on_eos(self, handler: Callable[[], Awaitable[None]] | None) -> None:
         self._delegate._on_eos = handler
 
+    @property
+    def speech_active(self) -> bool:
+        # SenseVoice uplink DTX reads this per block; without it the
+        # pipelines' STT never suppresses silence behind this wrapper.
+        return self._delegate.speech_active
+
     def pop_speech_end_ts(self) -> float | None:
         return self._delegate.pop_speech_end_ts()
 
@@ -390,6 +398,27 @@ class DialogueOrchestratorRunner:
         )
         return user_pipeline, merchant_pipeline
 
+    async def _close_audio_services(self) -> None:
+        """Release per-call-leg GPU connections (e.g. ``SenseVoiceStream``).
+
+        Plain clients own no connection between calls and expose no
+        ``aclose``; only session-scoped streams need closing here.
+        """
+        for pipeline in (self._user_pipeline, self._merchant_pipeline):
+            if pipeline is None:
+                continue
+            for service in (
+                getattr(pipeline, "stt_service", None),
+                getattr(pipeline, "tts_service", None),
+            ):
+                aclose = getattr(service, "aclose", None)
+                if aclose is None:
+                    continue
+                try:
+                    await aclose()
+                except Exception:
+                    log.exception("closing %s failed", type(service).__name__)
+
     async def _consume_takeover_q(self) -> None:
         """Translate user-takeover typed text before merchant TTS when needed."""
         from vocalize.dialogue.relay import user_to_merchant
@@ -408,11 +437,16 @@ class DialogueOrchestratorRunner:
 
             if user_lang != merchant_lang:
                 assert self._llm is not None
+                # 与 orchestrator 的 relay 共用缓存和 key（任务类别 / 转述策略）
+                task_state = self._session.task_state
                 result = await user_to_merchant(
                     text,
                     src=user_lang,
                     dst=merchant_lang,
                     llm=self._llm,
+                    cache=get_relay_cache(get_config()),
+                    task_category=task_state.task_category if task_state else "",
+                    relay_strategy=task_state.relay_strategy if task_state else "",
                 )
                 if not result.failed and result.translated:
                     speak_text = result.translated
@@ -1301,6 +1335,7 @@ class DialogueOrchestratorRunner:
                         await t
                     except (asyncio.CancelledError, Exception):
                         pass
+                await self._close_audio_services()
             return
 
         user_pipeline, merchant_pipeline = self._ensure_audio_pipelines(
@@ -1321,6 +1356,7 @@ class DialogueOrchestratorRunner:
             cache_merchant_transcript=self._cache_merchant_transcript,
             consume_user_hints=self.consume_pending_hints,
             merchant_speak=self._merchant_speak,
+            relay_cache=get_relay_cache(get_config()),
         )
         self._orchestrator = orchestrator
         self._user_channel = channel
@@ -1435,6 +1471,7 @@ class DialogueOrchestratorRunner:
                     await t
                 except (asyncio.CancelledError, Exception):
                     pass
+            await self._close_audio_services()
 
 
 __all__ = ["DialogueOrchestratorRunner", "PipelineFactory", "_translate_event"]
@@ -56,6 +56,8 @@ class Transcript:
     utterance_id: int                                # 同一句话所有 partial+final 共享
     language: str | None = None                      # None 表示尚未检测出
     segments: list[TranscriptSegment] | None = None  # 跨语 utterance 的可选拆解
+    # 增量 partial：``text`` 中不会再变的前缀；None 表示服务端没给（整段重解模式）
+    stable_text: str | None = None
 
 
 @runtime_checkable
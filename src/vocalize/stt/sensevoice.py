@@ -6,7 +6,8 @@
 协议要点（详见 server 模块 docstring）：
 - 服务端 endpoint：``ws://<host>:<port>/ws/transcribe``
 - 客户端 → 服务端：
-  - 二进制：原始 PCM int16 LE，16 kHz mono
+  - 二进制：PCM int16 LE，16 kHz mono；``start`` 帧带 ``"encoding":"mulaw"`` 时为
+    G.711 μ-law（``vocalize.codec``，带宽减半）
   - 文本（JSON）：``{"event":"start"|"end_of_utterance"|"stop", ...}``
 - 服务端 → 客户端：JSON 文本帧，要么是 transcript 要么是 ``{"error":..., "fatal":bool}``
 
@@ -18,26 +19,50 @@
   让上层选择忽略或回退；``fatal=True`` 则抛 ``SenseVoiceError`` 终止流。
 - cancellation：调用方对返回的 AsyncIterator 调 ``aclose()``，本客户端在 finally
   里发送 ``stop`` 并关闭 socket，避免 GPU 端继续占用。
+- 上行攒包：``uplink_coalesce_ms > 0`` 时 PCM 先攒到约该时长再发一条 WS 消息
+  （``_UplinkCoalescer``），任何控制帧（``end_of_utterance`` / ``reset`` /
+  ``stop``）发出前先冲刷，服务端按序处理所以句子边界不变。
+- 上行静音压缩（DTX）：``uplink_dtx=True`` 且 transport 暴露 ``speech_active``
+  （webrtcvad 状态）时，语音结束 hangover 之后的静音不再上行，恢复说话时先发
+  ``{"event":"gap","ms":N}`` 告诉服务端省掉了多久，再补发最近 ~300 ms 的
+  preroll，避免吃掉起音。
+- 会话级长连接：``SenseVoiceClient.open_stream()`` 返回 ``SenseVoiceStream``，
+  一条 WS 跑完整个 call leg 的所有轮次（每轮一次 ``stream_transcribe`` lease），
+  省掉每轮 30-120 ms 的 TCP + WS 握手。轮次边界用 ``reset``/``reset_ack`` 划分。
 """
 from __future__ import annotations
 
 import asyncio
+import collections
+import contextlib
 import json
 import logging
 import sys
 import time
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Awaitable, Callable
 from dataclasses import dataclass, field
 from typing import Any
 
 import websockets
 from websockets.asyncio.client import ClientConnection, connect
 
+from vocalize import codec
 from vocalize.config import Config
 from vocalize.stt.base import Transcript
+from vocalize.transports.base import AudioEncoding
+from vocalize.ws_pool import WsPool
 
 log = logging.getLogger(__name__)
 
+# SenseVoiceStream 重连退避：第 n 次重连前睡 n * 该值秒
+_RECONNECT_BACKOFF_S = 0.2
+# 上行 PCM：int16 mono 16 kHz
+_PCM_BYTES_PER_MS = 16_000 * 2 // 1000
+# DTX：语音结束后继续照发的静音时长（盖住 VAD 判停的抖动 + 句尾拖音）
+_DTX_HANGOVER_MS = 200
+# DTX：被压缩的静音里保留最近这么多毫秒，恢复说话时补发（webrtcvad 起音偏晚）
+_DTX_PREROLL_MS = 300
+
 
 class SenseVoiceError(RuntimeError):
     """Fatal 服务端错误（``error.fatal=True``）或协议级故障。"""
@@ -56,6 +81,12 @@ class SenseVoiceClient:
         connect_timeout_s: TCP/WS 握手超时。
         open_timeout_s: ``websockets`` 库 open_timeout。
         ping_interval_s: 心跳间隔；与服务端 ``ws_ping_interval=20`` 对齐。
+        pool: 可选共享预连接池（``vocalize.ws_pool``）；为 None 时每次直连。
+        uplink_coalesce_ms: 上行 PCM 攒到约这么多毫秒再发一条消息；0 = 每块直发。
+        uplink_dtx: 按 transport 的 ``speech_active`` 压缩上行静音；transport
+            不提供该属性时不生效。
+        link_encoding: 上行音频的链路编码（``vocalize.codec``），在 ``start``
+            帧里告知服务端；服务端不支持时回 fatal error。
     """
 
     host: str
@@ -66,6 +97,10 @@ class SenseVoiceClient:
     connect_timeout_s: float = 5.0
     open_timeout_s: float = 5.0
     ping_interval_s: float = 20.0
+    pool: WsPool | None = field(default=None, repr=False, compare=False)
+    uplink_coalesce_ms: int = 0
+    uplink_dtx: bool = False
+    link_encoding: AudioEncoding = "pcm_s16le"
     # Phase 4 Plan 04-04: stamped the moment the client sends the
     # client-side VAD EOS frame ({"event": "end_of_utterance"}) over WS.
     # Pipeline reads this in TurnTiming.last_speech_end_real to bypass the
@@ -84,23 +119,27 @@ class SenseVoiceClient:
             raise SenseVoiceError(
                 f"missing required env vars: {', '.join(missing)}"
             )
-        return cls(
+        client = cls(
             host=cfg.gpu_host,
             port=cfg.sensevoice_ws_port,
             language_hint=cfg.default_language,
+            uplink_coalesce_ms=cfg.stt_uplink_coalesce_ms,
+            uplink_dtx=cfg.stt_uplink_dtx,
+            link_encoding=cfg.gpu_link_encoding,
         )
+        client.pool = cfg.gpu_ws_pool(client.ws_url, service="sensevoice")
+        return client
 
-    async def stream_transcribe(
-        self, audio_chunks: AsyncIterator[bytes], *, transport: Any = None,
-    ) -> AsyncIterator[Transcript]:
-        """流式转写。
+    def open_stream(self, *, max_reconnects: int = 2) -> "SenseVoiceStream":
+        """返回绑定本客户端配置的会话级长连接（懒连接，首个 lease 时才握手）。"""
+        return SenseVoiceStream(self, max_reconnects=max_reconnects)
 
-        发送顺序：``start`` → 二进制 PCM 帧 * N → ``end_of_utterance`` → ``stop``。
-        服务端在 buffer 跨过 partial 阈值时主动推 partial，``end_of_utterance``
-        / ``stop`` 触发 final。
-        """
+    async def _connect(self) -> ClientConnection:
+        """建 WS 连接（有池时从池借）；握手失败统一转成 ``SenseVoiceError``。"""
         try:
-            ws = await asyncio.wait_for(
+            if self.pool is not None:
+                return await self.pool.acquire()
+            return await asyncio.wait_for(
                 connect(
                     self.ws_url,
                     open_timeout=self.open_timeout_s,
@@ -113,6 +152,47 @@ class SenseVoiceClient:
                 f"failed to connect to {self.ws_url}: {exc}"
             ) from exc
 
+    def _coalescer(
+        self, send: Callable[[str | bytes], Awaitable[None]]
+    ) -> "_UplinkCoalescer":
+        if not self.uplink_dtx:
+            return _UplinkCoalescer(
+                send,
+                self.uplink_coalesce_ms * _PCM_BYTES_PER_MS,
+                encoding=self.link_encoding,
+            )
+        return _UplinkCoalescer(
+            send,
+            self.uplink_coalesce_ms * _PCM_BYTES_PER_MS,
+            encoding=self.link_encoding,
+            dtx=True,
+            hangover_bytes=_DTX_HANGOVER_MS * _PCM_BYTES_PER_MS,
+            preroll_bytes=_DTX_PREROLL_MS * _PCM_BYTES_PER_MS,
+        )
+
+    def _start_message(self) -> str:
+        start_msg: dict[str, object] = {
+            "event": "start",
+            "language": self.language_hint,
+        }
+        if self.session_id is not None:
+            start_msg["session_id"] = self.session_id
+        if self.link_encoding != codec.PCM_S16LE:
+            start_msg["encoding"] = self.link_encoding
+        return json.dumps(start_msg)
+
+    async def stream_transcribe(
+        self, audio_chunks: AsyncIterator[bytes], *, transport: Any = None,
+    ) -> AsyncIterator[Transcript]:
+        """流式转写。
+
+        发送顺序：``start`` → 二进制 PCM 帧 * N → ``end_of_utterance`` → ``stop``。
+        服务端在 buffer 跨过 partial 阈值时主动推 partial，``end_of_utterance``
+        / ``stop`` 触发 final。
+        """
+        ws = await self._connect()
+        uplink = self._coalescer(ws.send)
+
         # Phase 4 Plan 04-04 — register client-side VAD EOS handler on the
         # transport (if it exposes the ``_on_eos`` slot). On a VAD-detected
         # 9-of-10 unvoiced ring, MicrophoneTransport's input_stream consumer
@@ -130,6 +210,7 @@ class SenseVoiceClient:
         async def _handle_eos() -> None:
             self.last_eos_wall_clock = time.monotonic()
             try:
+                await uplink.flush()  # 攒着的音频属于这句话，必须先于 EOS 到达
                 await ws.send(json.dumps({"event": "end_of_utterance"}))
                 log.debug("client VAD EOS sent over WS")
             except websockets.exceptions.ConnectionClosed:
@@ -140,20 +221,20 @@ class SenseVoiceClient:
         if transport is not None and hasattr(transport, "_on_eos"):
             transport._on_eos = _handle_eos
 
-        async for transcript in self._run_session(ws, audio_chunks):
+        async for transcript in self._run_session(
+            ws, audio_chunks, uplink, transport
+        ):
             yield transcript
 
     async def _run_session(
-        self, ws: ClientConnection, audio_chunks: AsyncIterator[bytes]
+        self,
+        ws: ClientConnection,
+        audio_chunks: AsyncIterator[bytes],
+        uplink: "_UplinkCoalescer",
+        transport: Any = None,
     ) -> AsyncIterator[Transcript]:
         """已建连的会话循环：起 sender task，主协程读响应。"""
-        start_msg: dict[str, object] = {
-            "event": "start",
-            "language": self.language_hint,
-        }
-        if self.session_id is not None:
-            start_msg["session_id"] = self.session_id
-        await ws.send(json.dumps(start_msg))
+        await ws.send(self._start_message())
 
         sender_done = asyncio.Event()
         # 标记是否是客户端侧主动发起关闭（sender 失败时 done-callback 触发）。
@@ -163,7 +244,7 @@ class SenseVoiceClient:
         close_initiated_by_us = False
 
         sender_task = asyncio.create_task(
-            self._send_audio(ws, audio_chunks, sender_done)
+            self._send_audio(ws, audio_chunks, sender_done, uplink, transport)
         )
 
         # 如果 sender 因异常提前结束（比如上游音频源 raise），主动关掉 ws，
@@ -263,6 +344,8 @@ class SenseVoiceClient:
         ws: ClientConnection,
         audio_chunks: AsyncIterator[bytes],
         sender_done: asyncio.Event,
+        uplink: "_UplinkCoalescer",
+        transport: Any = None,
     ) -> None:
         """把上游音频 chunk 推到 ws，结束时发 ``end_of_utterance`` + ``stop``。
 
@@ -275,8 +358,9 @@ class SenseVoiceClient:
             async for chunk in audio_chunks:
                 if not chunk:
                     continue
-                await ws.send(chunk)
+                await uplink.push(chunk, speech=_speech_active(transport))
             # 输入流自然结束 → flush 最后一个 utterance 并关闭会话
+            await uplink.flush()
             await ws.send(json.dumps({"event": "end_of_utterance"}))
             await ws.send(json.dumps({"event": "stop"}))
             sender_clean = True
@@ -297,6 +381,434 @@ class SenseVoiceClient:
                 sender_done.set()
 
 
+def _speech_active(transport: Any) -> bool | None:
+    """刚 yield 出来的那块音频是否可能是语音；transport 没有 VAD 时返回 None。
+
+    transport 在 yield 前跑完该块的 VAD，所以消费方拿到块时读到的就是它的状态。
+    """
+    if transport is None:
+        return None
+    return getattr(transport, "speech_active", None)
+
+
+class _UplinkCoalescer:
+    """把上行 PCM 攒成约 ``target_bytes`` 一条的 WS 消息，可选压缩静音（DTX）。
+
+    MicrophoneTransport 30 ms 一块，逐块发就是每路每秒 ~33 条消息，每条都付一次
+    WS 帧头 + 客户端掩码 + 一次 send 调度，服务端也多一次 frombuffer + append。
+    攒到 ~120 ms 一条消息数降到 1/4。攒包只增加 partial 看到音频的延迟（<= 目标
+    时长），final 不受影响：发任何控制帧前调用方先 ``flush()``。
+    ``target_bytes <= 0`` 时逐块直发（旧行为）。
+
+    ``dtx=True`` 时 ``push(chunk, speech=False)`` 的块在 ``hangover_bytes`` 之后
+    不再上行：先进 ``preroll_bytes`` 大小的环，挤出环的部分只记时长。下一个语音块
+    到来（或 ``flush()``）时发一条 ``{"event":"gap","ms":N}``，再补发环里的音频。
+    ``speech=None``（transport 没有 VAD）的块照常发送。
+
+    攒包与 DTX 都按 PCM 字节计；``encoding`` 非 ``pcm_s16le`` 时每条消息发出前
+    才编码（整条消息一次查表）。
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str | bytes], Awaitable[None]],
+        target_bytes: int,
+        *,
+        encoding: AudioEncoding = "pcm_s16le",
+        dtx: bool = False,
+        hangover_bytes: int = 0,
+        preroll_bytes: int = 0,
+    ) -> None:
+        self._send = send
+        self._target = target_bytes
+        self._buf = bytearray()
+        self._encoding = encoding
+        self._dtx = dtx
+        self._hangover = hangover_bytes
+        self._preroll_max = preroll_bytes
+        self._preroll: collections.deque[bytes] = collections.deque()
+        self._preroll_bytes = 0
+        self._silent_bytes = 0  # 最近一次语音块之后的静音字节数
+        self._gap_bytes = 0  # 已压缩、尚未用 gap 帧报告的字节数
+
+    async def push(self, chunk: bytes, *, speech: bool | None = None) -> None:
+        if self._dtx and speech is not None:
+            if speech:
+                self._silent_bytes = 0
+                await self._resume()
+            else:
+                self._silent_bytes += len(chunk)
+                if self._silent_bytes > self._hangover:
+                    self._suppress(chunk)
+                    return
+        await self._push_audio(chunk)
+
+    async def flush(self) -> None:
+        """控制帧之前调用：攒着的音频发出去，压缩中的静音（含 preroll）记成 gap。"""
+        await self._flush_audio()
+        pending = self._gap_bytes + self._preroll_bytes
+        self._preroll.clear()
+        self._preroll_bytes = 0
+        self._gap_bytes = 0
+        if pending:
+            await self._send_gap(pending)
+
+    def clear(self) -> None:
+        self._buf.clear()
+        self._preroll.clear()
+        self._preroll_bytes = 0
+        self._silent_bytes = 0
+        self._gap_bytes = 0
+
+    async def _push_audio(self, chunk: bytes) -> None:
+        if self._target <= 0:
+            await self._send_pcm(chunk)
+            return
+        self._buf += chunk
+        if len(self._buf) >= self._target:
+            await self._flush_audio()
+
+    async def _flush_audio(self) -> None:
+        if not self._buf:
+            return
+        # 先摘下 buffer 再 await：flush 期间新 push 的音频进下一条消息
+        frame = bytes(self._buf)
+        self._buf.clear()
+        await self._send_pcm(frame)
+
+    async def _send_pcm(self, pcm: bytes) -> None:
+        await self._send(codec.encode(self._encoding, pcm))
+
+    def _suppress(self, chunk: bytes) -> None:
+        self._preroll.append(chunk)
+        self._preroll_bytes += len(chunk)
+        while self._preroll_bytes > self._preroll_max:
+            dropped = self._preroll.popleft()
+            self._preroll_bytes -= len(dropped)
+            self._gap_bytes += len(dropped)
+
+    async def _resume(self) -> None:
+        """静音结束：gap 帧 → preroll 音频，顺序与原始时间线一致。"""
+        if self._gap_bytes:
+            gap = self._gap_bytes
+            self._gap_bytes = 0
+            await self._flush_audio()  # hangover 音频在 gap 之前
+            await self._send_gap(gap)
+        while self._preroll:
+            chunk = self._preroll.popleft()
+            self._preroll_bytes -= len(chunk)
+            await self._push_audio(chunk)
+
+    async def _send_gap(self, n_bytes: int) -> None:
+        from vocalize.server.metrics import STT_UPLINK_SUPPRESSED_SECONDS_TOTAL
+
+        ms = round(n_bytes / _PCM_BYTES_PER_MS)
+        STT_UPLINK_SUPPRESSED_SECONDS_TOTAL.inc(ms / 1000)
+        await self._send(json.dumps({"event": "gap", "ms": ms}))
+
+
+@dataclass(frozen=True)
+class _ConnectionLost:
+    """reader → lease 的 inbox 哨兵：``ws`` 这条连接已断开。"""
+
+    ws: ClientConnection
+
+
+class SenseVoiceStream:
+    """Call-leg 级 SenseVoice 长连接：一条 ``/ws/transcribe`` 服务整通电话。
+
+    每次 ``stream_transcribe`` 是一个 lease（``asyncio.Lock`` 串行化，同一时刻只有
+    一个），接口与 ``SenseVoiceClient.stream_transcribe`` 相同，可直接作为
+    ``STTService`` 交给 ``VoicePipeline``。连接在首个 lease 时才建立。
+
+    轮次边界（服务端按序处理帧，``reset_ack`` 之前的帧都属于 reset 之前的音频）：
+
+    - 音频耗尽（干净结束）：发 ``end_of_utterance`` + ``reset(seq)``，收到同 seq
+      的 ``reset_ack`` 时 lease 结束，期间的 final 都交给本 lease。
+    - 调用方提前 ``aclose()``（典型：user channel 拿到首个 final 就返回）：发
+      ``reset(seq)`` 丢弃服务端 buffer；ack 到达前 reader 丢掉所有残余帧，下一个
+      lease 不会读到上一轮的 transcript。
+    - 连接断开：每个 lease 最多重连 ``max_reconnects`` 次并重发 ``start``；重连后
+      当前轮只保留重连之后的音频。干净结束后、ack 之前断开则抛 ``SenseVoiceError``。
+    """
+
+    def __init__(self, client: SenseVoiceClient, *, max_reconnects: int = 2) -> None:
+        self._client = client
+        self._max_reconnects = max_reconnects
+        self._ws: ClientConnection | None = None
+        self._reader: asyncio.Task[None] | None = None
+        self._inbox: asyncio.Queue[dict[str, Any] | _ConnectionLost] = asyncio.Queue()
+        self._lease_lock = asyncio.Lock()
+        self._conn_lock = asyncio.Lock()
+        self._reset_seq = 0
+        self._acked_seq = 0
+        # 被放弃的 lease 发出的最大 reset seq；ack 到达前的帧都是 stale
+        self._discard_through_seq = 0
+        self._lease_reconnects = 0
+        self._closed = False
+        self._uplink = client._coalescer(self._send)
+
+    @property
+    def client(self) -> SenseVoiceClient:
+        return self._client
+
+    @property
+    def last_eos_wall_clock(self) -> float | None:
+        return self._client.last_eos_wall_clock
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None
+
+    async def stream_transcribe(
+        self, audio_chunks: AsyncIterator[bytes], *, transport: Any = None,
+    ) -> AsyncIterator[Transcript]:
+        """在长连接上跑一轮转写；语义同 ``SenseVoiceClient.stream_transcribe``。"""
+        from vocalize.server.metrics import STT_HANDSHAKES_AVOIDED_TOTAL
+
+        async with self._lease_lock:
+            if self._closed:
+                raise SenseVoiceError("SenseVoiceStream is closed")
+            self._lease_reconnects = 0
+            self._drain_inbox()
+            reused = self._ws is not None
+            await self._ensure_connection()
+            if reused:
+                STT_HANDSHAKES_AVOIDED_TOTAL.inc()
+            if transport is not None and hasattr(transport, "_on_eos"):
+                transport._on_eos = self._handle_eos
+
+            sender = asyncio.create_task(self._pump_audio(audio_chunks, transport))
+            pending_get: asyncio.Task[dict[str, Any] | _ConnectionLost] | None = None
+            final_seq: int | None = None
+            clean = False
+            try:
+                while True:
+                    if pending_get is None:
+                        pending_get = asyncio.create_task(self._inbox.get())
+                    waiting: set[asyncio.Task[Any]] = {pending_get}
+                    if not sender.done():
+                        waiting.add(sender)
+                    await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+                    if sender.done() and final_seq is None:
+                        exc = sender.exception()
+                        if isinstance(exc, SenseVoiceError):
+                            raise exc
+                        if exc is not None:
+                            raise SenseVoiceError(f"audio sender failed: {exc}") from exc
+                        final_seq = sender.result()
+                    if not pending_get.done():
+                        continue
+                    item = pending_get.result()
+                    pending_get = None
+
+                    if isinstance(item, _ConnectionLost):
+                        if item.ws is not self._ws:
+                            continue  # 已被替换的旧连接迟到的哨兵
+                        if final_seq is not None:
+                            await self._drop(item.ws)
+                            raise SenseVoiceError(
+                                "connection lost before final transcript"
+                            )
+                        await self._ensure_connection(failed=item.ws)
+                        continue
+                    if item.get("event") == "reset_ack":
+                        if final_seq is not None and int(item.get("seq") or 0) >= final_seq:
+                            clean = True
+                            return
+                        continue
+                    if "error" in item:
+                        err_text = str(item.get("error", "unknown server error"))
+                        if bool(item.get("fatal")):
+                            if self._ws is not None:
+                                await self._drop(self._ws)
+                            raise SenseVoiceError(err_text)
+                        log.warning("sensevoice non-fatal error: %s", err_text)
+                        continue
+                    if "text" in item and "is_final" in item:
+                        yield _msg_to_transcript(item)
+            finally:
+                if pending_get is not None:
+                    pending_get.cancel()
+                if not sender.done():
+                    sender.cancel()
+                try:
+                    await sender
+                except (asyncio.CancelledError, Exception):
+                    pass
+                if not clean:
+                    await self._abandon_turn()
+
+    async def aclose(self) -> None:
+        """结束会话：发 ``stop`` 并关闭连接。幂等。"""
+        if self._closed:
+            return
+        self._closed = True
+        ws, self._ws = self._ws, None
+        reader, self._reader = self._reader, None
+        if ws is not None:
+            with contextlib.suppress(Exception):
+                await ws.send(json.dumps({"event": "stop"}))
+            await _safe_close(ws)
+        if reader is not None:
+            reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await reader
+
+    # ------------------------------------------------------------------
+    # 连接管理
+    # ------------------------------------------------------------------
+    async def _ensure_connection(
+        self, failed: ClientConnection | None = None,
+    ) -> ClientConnection:
+        """返回可用连接；``failed`` 非空表示调用方刚看到它断开，需要重连。"""
+        from vocalize.server.metrics import STT_STREAM_RECONNECTS_TOTAL
+
+        async with self._conn_lock:
+            if self._ws is not None and self._ws is not failed:
+                return self._ws  # 另一侧已经重连过 / 连接正常
+            if self._closed:
+                raise SenseVoiceError("SenseVoiceStream is closed")
+            if failed is not None:
+                await self._drop(failed)
+                if self._lease_reconnects >= self._max_reconnects:
+                    raise SenseVoiceError(
+                        f"connection to {self._client.ws_url} lost; "
+                        f"gave up after {self._lease_reconnects} reconnects"
+                    )
+                self._lease_reconnects += 1
+                STT_STREAM_RECONNECTS_TOTAL.inc()
+                log.warning(
+                    "sensevoice stream connection lost; reconnecting (%d/%d)",
+                    self._lease_reconnects, self._max_reconnects,
+                )
+                await asyncio.sleep(_RECONNECT_BACKOFF_S * self._lease_reconnects)
+            return await self._open()
+
+    async def _open(self) -> ClientConnection:
+        """握手 + ``start`` + 起 reader；调用方持有 ``_conn_lock``。"""
+        from vocalize.server.metrics import STT_WS_HANDSHAKES_TOTAL
+
+        ws = await self._client._connect()
+        STT_WS_HANDSHAKES_TOTAL.inc()
+        try:
+            await ws.send(self._client._start_message())
+        except websockets.exceptions.ConnectionClosed as exc:
+            await _safe_close(ws)
+            raise SenseVoiceError(f"connection closed before start: {exc}") from exc
+        # 新连接上服务端没有旧 buffer，被放弃轮次的残余帧不会再出现
+        self._acked_seq = self._discard_through_seq
+        self._ws = ws
+        self._reader = asyncio.create_task(self._read_loop(ws))
+        return ws
+
+    async def _drop(self, ws: ClientConnection) -> None:
+        if self._ws is ws:
+            self._ws = None
+            reader, self._reader = self._reader, None
+            if reader is not None and reader is not asyncio.current_task():
+                reader.cancel()
+        await _safe_close(ws)
+
+    async def _read_loop(self, ws: ClientConnection) -> None:
+        """解析服务端帧投进 inbox；丢掉被放弃轮次的残余帧。"""
+        try:
+            async for raw in ws:
+                if isinstance(raw, bytes):
+                    raw = raw.decode("utf-8", errors="replace")
+                try:
+                    msg = json.loads(raw)
+                except json.JSONDecodeError:
+                    log.warning("ignoring non-JSON frame: %r", raw[:200])
+                    continue
+                if not isinstance(msg, dict):
+                    continue
+                if msg.get("event") == "reset_ack":
+                    seq = int(msg.get("seq") or 0)
+                    self._acked_seq = max(self._acked_seq, seq)
+                    if seq <= self._discard_through_seq:
+                        continue
+                elif self._acked_seq < self._discard_through_seq:
+                    log.debug("dropping frame from abandoned turn: %r", raw[:200])
+                    continue
+                self._inbox.put_nowait(msg)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        self._inbox.put_nowait(_ConnectionLost(ws))
+
+    def _drain_inbox(self) -> None:
+        """lease 开始前清掉轮次之间到达的帧（正常情况下为空）。"""
+        while True:
+            try:
+                item = self._inbox.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if isinstance(item, _ConnectionLost):
+                if item.ws is self._ws:
+                    self._ws = None
+                    self._reader = None
+            else:
+                log.debug("dropping frame received between turns: %r", item)
+
+    # ------------------------------------------------------------------
+    # 发送侧
+    # ------------------------------------------------------------------
+    def _next_seq(self) -> int:
+        self._reset_seq += 1
+        return self._reset_seq
+
+    async def _send(self, frame: str | bytes) -> None:
+        failed: ClientConnection | None = None
+        while True:
+            ws = await self._ensure_connection(failed)
+            try:
+                await ws.send(frame)
+                return
+            except websockets.exceptions.ConnectionClosed:
+                failed = ws
+
+    async def _pump_audio(
+        self, audio_chunks: AsyncIterator[bytes], transport: Any = None
+    ) -> int:
+        """推音频；耗尽后发 ``end_of_utterance`` + ``reset``，返回该 reset 的 seq。"""
+        async for chunk in audio_chunks:
+            if not chunk:
+                continue
+            await self._uplink.push(chunk, speech=_speech_active(transport))
+        await self._uplink.flush()
+        await self._send(json.dumps({"event": "end_of_utterance"}))
+        seq = self._next_seq()
+        await self._send(json.dumps({"event": "reset", "seq": seq}))
+        return seq
+
+    async def _abandon_turn(self) -> None:
+        """lease 提前结束：reset 服务端 buffer，并把之前的残余帧标为 stale。"""
+        self._uplink.clear()  # 没发出去的音频反正要被 reset 丢掉
+        ws = self._ws
+        if ws is None or self._closed:
+            return
+        seq = self._next_seq()
+        self._discard_through_seq = seq
+        try:
+            await ws.send(json.dumps({"event": "reset", "seq": seq}))
+        except websockets.exceptions.ConnectionClosed:
+            await self._drop(ws)
+
+    async def _handle_eos(self) -> None:
+        """客户端 VAD EOS（见 ``SenseVoiceClient.stream_transcribe``）。"""
+        self._client.last_eos_wall_clock = time.monotonic()
+        ws = self._ws
+        if ws is None:
+            return
+        try:
+            await self._uplink.flush()
+            await ws.send(json.dumps({"event": "end_of_utterance"}))
+            log.debug("client VAD EOS sent over WS")
+        except websockets.exceptions.ConnectionClosed:
+            log.debug("EOS send dropped: ws already closed")
+
+
 async def _safe_close(ws: ClientConnection) -> None:
     """Best-effort ws close used from a done-callback path."""
     try:
@@ -307,6 +819,7 @@ async def _safe_close(ws: ClientConnection) -> None:
 
 def _msg_to_transcript(msg: dict[str, object]) -> Transcript:
     """服务端 transcript JSON → ``Transcript`` dataclass。"""
+    stable_text = msg.get("stable_text")
     return Transcript(
         text=str(msg.get("text", "")),
         is_final=bool(msg.get("is_final", False)),
@@ -315,4 +828,5 @@ def _msg_to_transcript(msg: dict[str, object]) -> Transcript:
         end_time=float(msg.get("end_time", 0.0) or 0.0),
         utterance_id=int(msg.get("utterance_id", 0) or 0),
         language=msg.get("language") if isinstance(msg.get("language"), str) else None,
+        stable_text=stable_text if isinstance(stable_text, str) else None,
     )
@@ -597,6 +597,16 @@ class MicrophoneTransport:
             self._last_first_audible_ts = None
         return ts
 
+    @property
+    def speech_active(self) -> bool:
+        """Whether webrtcvad currently thinks the user may be speaking.
+
+        True while TRIGGERED, or while any of the last 10 frames was voiced
+        (onset not yet confirmed). Read by ``SenseVoiceClient`` per yielded
+        chunk to decide which silence it may suppress on the STT uplink (DTX).
+        """
+        return self._vad_state == "TRIGGERED" or any(self._vad_buffer)
+
     def pop_speech_end_ts(self) -> float | None:
         """Return the wall-clock (monotonic) timestamp of the most recent
         VAD-detected end-of-speech, then reset to ``None``.
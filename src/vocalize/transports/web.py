@@ -148,6 +148,14 @@ class WebUserTransport:
                     await self._on_eos()
                 self._vad_buffer.clear()
 
+    @property
+    def speech_active(self) -> bool:
+        """VAD 认为用户可能在说话：已 TRIGGERED，或最近 10 帧里有任一有声帧。
+
+        ``SenseVoiceClient`` 的上行静音压缩（DTX）按块读取它决定能否省掉该块。
+        """
+        return self._vad_state == "TRIGGERED" or any(self._vad_buffer)
+
     def pop_speech_end_ts(self) -> float | None:
         ts = self._last_speech_end_ts
         self._last_speech_end_ts = None
@@ -28,8 +28,16 @@ class TextChunk:
 
 @runtime_checkable
 class TTSService(Protocol):
-    output_sample_rate: int          # 实现暴露的输出采样率（如 16000、24000）
-    output_encoding: AudioEncoding   # 实现暴露的字节流编码（通常 "pcm_s16le"）
+    # 只读：实现可以是普通字段，也可以是转发给内层的 property（缓存 / 会话包装）
+    @property
+    def output_sample_rate(self) -> int:
+        """实现暴露的输出采样率（如 16000、24000）。"""
+        ...
+
+    @property
+    def output_encoding(self) -> AudioEncoding:
+        """实现暴露的字节流编码（通常 "pcm_s16le"）。"""
+        ...
 
     # 实现是 async generator（``async def`` + ``yield``）；Protocol 必须用
     # ``def -> AsyncIterator``，否则 mypy 当成返回 Coroutine 的函数。
@@ -0,0 +1,398 @@
+"""固定台词的 TTS 短语缓存（内容寻址，内存 LRU + 磁盘 mmap 两级）。
+
+很多播报是固定字符串：``clarification_keepalive_*`` / ``hold_filler_*`` /
+``impatience_end_*``、``_fallback_chunk`` 的道歉、``ReactiveHolding`` 的填充语。
+每次都走一遍 CosyVoice 往返既浪费 GPU，又让本该"立刻响起"的填充语晚几百毫秒。
+
+``CachingTTS`` 包在任意 ``TTSService`` 外面：
+
+- 只缓存白名单里的台词（``phrases``；线上由 ``vocalize.tts.warmup.cacheable_phrases``
+  给出）：首个 chunk 是 ``is_final_segment=True`` 且 ``(text, language)`` 在白名单里。
+  ``speak()`` 会把任意文本包成单个 final chunk——LLM 回复、relay 译文里可能有
+  姓名、电话、订单信息，绝不能因为"够短"就落盘，也不该把真正的固定台词挤出
+  LRU。首个 chunk 之后若还有 chunk，照常交给内层流式合成。
+- key = sha256(text, language, prompt_wav, prompt_text, speed, 输出采样率 / 编码)，
+  换音色 / 语速 / 输出格式自动失效，不需要手动清。
+- 命中时按 ``chunk_ms`` 切片 yield（barge-in 仍能及时打断）；未命中时边转发边
+  攒，**完整**合成结束才写入——被打断 / 出错的半截音频不入缓存。
+- 两级都按字节数设上限、按最近使用淘汰。磁盘层文件名就是 key，进程重启后
+  继续可用；读取用 ``mmap``，页缓存里的热文件零拷贝切片。磁盘读写（open /
+  mmap / utime / 写文件）都在线程池里跑，不占 event loop。
+
+``get_phrase_cache()`` 是按配置去重的进程级单例：每通电话新建的 ``CachingTTS``
+共享同一份缓存。
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import mmap
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterable
+from pathlib import Path
+from typing import Any
+
+from vocalize.config import Config
+from vocalize.transports.base import AudioEncoding
+from vocalize.tts.base import TextChunk, TTSService
+
+log = logging.getLogger(__name__)
+
+_SUFFIX = ".pcm"
+
+
+class PhraseCache:
+    """两级音频缓存：内存 LRU（bytes）+ 磁盘目录（每条一个文件，mmap 读取）。
+
+    Args:
+        memory_max_bytes: 内存层上限；0 关闭内存层。
+        disk_dir: 磁盘层目录（不存在时创建）；None 关闭磁盘层。目录建不了 / 读写
+            不了时记一条 warning 并关掉磁盘层，退回内存层 + 现合成。
+        disk_max_bytes: 磁盘层上限；0 关闭磁盘层。
+    """
+
+    def __init__(
+        self,
+        *,
+        memory_max_bytes: int,
+        disk_dir: str | os.PathLike[str] | None = None,
+        disk_max_bytes: int = 0,
+    ) -> None:
+        self.memory_max_bytes = max(0, memory_max_bytes)
+        self.disk_max_bytes = max(0, disk_max_bytes)
+        self.disk_dir = (
+            Path(disk_dir) if disk_dir is not None and self.disk_max_bytes > 0 else None
+        )
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        # 磁盘索引 key → 文件大小，按最近使用排序；写盘在线程池里跑，要加锁
+        self._disk: OrderedDict[str, int] | None = None
+        self._disk_bytes = 0
+        self._disk_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.memory_max_bytes > 0 or self.disk_dir is not None
+
+    def contains(self, key: str) -> bool:
+        """只查索引、不读音频（启动预热用来跳过已经热的条目）。"""
+        if key in self._memory:
+            return True
+        if self.disk_dir is None:
+            return False
+        with self._disk_lock:
+            index = self._disk_index()
+            return index is not None and key in index
+
+    async def get(self, key: str) -> tuple[str, bytes | mmap.mmap] | None:
+        """返回 ``(tier, audio)``；磁盘命中时 audio 是只读 mmap，用完由调用方关闭。
+
+        磁盘层的 open / mmap / utime 是阻塞 IO，放进线程池。
+        """
+        audio = self._memory.get(key)
+        if audio is not None:
+            self._memory.move_to_end(key)
+            return "memory", audio
+        if self.disk_dir is None:
+            return None
+        mapped = await asyncio.to_thread(self._disk_get, key)
+        if mapped is not None:
+            return "disk", mapped
+        return None
+
+    def put_memory(self, key: str, audio: bytes) -> None:
+        """写内存层（event loop 线程调用）；单条超过上限时不缓存。"""
+        if not audio or len(audio) > self.memory_max_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        self._memory[key] = audio
+        self._memory_bytes += len(audio)
+        evicted = 0
+        while self._memory_bytes > self.memory_max_bytes:
+            _, dropped = self._memory.popitem(last=False)
+            self._memory_bytes -= len(dropped)
+            evicted += 1
+        self._observe("memory", self._memory_bytes, evicted)
+
+    def put_disk(self, key: str, audio: bytes) -> None:
+        """写磁盘层（阻塞 IO，调用方放进线程池）；先写临时文件再原子 rename。"""
+        if self.disk_dir is None or not audio or len(audio) > self.disk_max_bytes:
+            return
+        with self._disk_lock:
+            index = self._disk_index()
+            if index is None or key in index:
+                return
+            disk_dir, path = self.disk_dir, self._path(key)
+        tmp: str | None = None
+        try:
+            fd, tmp = tempfile.mkstemp(dir=disk_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            os.replace(tmp, path)
+        except OSError as exc:
+            if tmp is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp)
+            with self._disk_lock:
+                self._disable_disk(exc)
+            return
+        with self._disk_lock:
+            index = self._disk_index()
+            if index is None:
+                return
+            index[key] = len(audio)
+            self._disk_bytes += len(audio)
+            evicted = 0
+            while self._disk_bytes > self.disk_max_bytes and len(index) > 1:
+                old_key, size = index.popitem(last=False)
+                self._disk_bytes -= size
+                evicted += 1
+                with contextlib.suppress(OSError):
+                    os.unlink(self._path(old_key))
+            self._observe("disk", self._disk_bytes, evicted)
+
+    def _disk_get(self, key: str) -> mmap.mmap | None:
+        """读磁盘层（阻塞 IO，``get`` 放进线程池调用）。"""
+        if self.disk_dir is None:
+            return None
+        with self._disk_lock:
+            index = self._disk_index()
+            if index is None or key not in index:
+                return None
+            index.move_to_end(key)
+            path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            # mtime 充当跨进程重启的"最近使用"时间
+            os.utime(path)
+        except (OSError, ValueError):
+            # 文件被外部删掉 / 截断成空：当作未命中并从索引里去掉
+            with self._disk_lock:
+                if self._disk is not None:
+                    self._disk_bytes -= self._disk.pop(key, 0)
+            return None
+        return mapped
+
+    def _disk_index(self) -> OrderedDict[str, int] | None:
+        """首次访问时扫描目录重建索引（按 mtime 从旧到新）；调用方持有锁。
+
+        磁盘层已关闭 / 目录不可用时返回 None（后者顺带关掉磁盘层）。
+        """
+        if self._disk is not None:
+            return self._disk
+        if self.disk_dir is None:
+            return None
+        entries: list[tuple[float, str, int]] = []
+        try:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            for entry in os.scandir(self.disk_dir):
+                if not entry.name.endswith(_SUFFIX):
+                    continue
+                st = entry.stat()
+                entries.append((st.st_mtime, entry.name[: -len(_SUFFIX)], st.st_size))
+        except OSError as exc:
+            self._disable_disk(exc)
+            return None
+        entries.sort()
+        self._disk = OrderedDict((key, size) for _, key, size in entries)
+        self._disk_bytes = sum(size for _, _, size in entries)
+        self._observe("disk", self._disk_bytes, 0)
+        return self._disk
+
+    def _disable_disk(self, exc: OSError) -> None:
+        """目录不可用：关掉磁盘层（只记一次日志），之后只走内存层；调用方持有锁。"""
+        if self.disk_dir is None:
+            return
+        log.warning(
+            "tts cache: disk tier %s unusable (%s); continuing memory-only",
+            self.disk_dir, exc,
+        )
+        self.disk_dir = None
+        self._disk = None
+        self._disk_bytes = 0
+        self._observe("disk", 0, 0)
+
+    def _path(self, key: str) -> Path:
+        assert self.disk_dir is not None
+        return self.disk_dir / f"{key}{_SUFFIX}"
+
+    @staticmethod
+    def _observe(tier: str, resident: int, evicted: int) -> None:
+        from vocalize.server.metrics import TTS_CACHE_BYTES, TTS_CACHE_EVICTIONS_TOTAL
+
+        TTS_CACHE_BYTES.labels(tier=tier).set(resident)
+        if evicted:
+            TTS_CACHE_EVICTIONS_TOTAL.labels(tier=tier).inc(evicted)
+
+
+class CachingTTS:
+    """在 ``inner`` 前面挂 ``PhraseCache`` 的 ``TTSService``。
+
+    未知属性（``health_check`` / ``pool`` / ``aclose`` 等）透传给 ``inner``。
+
+    Args:
+        inner: 真正合成的 TTS（通常是 ``CosyVoiceClient``）。
+        cache: 共享缓存，见 ``get_phrase_cache``。
+        phrases: 允许缓存的台词白名单（按 ``text.strip()`` + ``language`` 匹配）；
+            不在其中的一律直接交给 ``inner``。
+        chunk_ms: 命中时每次 yield 的音频时长。
+    """
+
+    def __init__(
+        self,
+        inner: TTSService,
+        cache: PhraseCache,
+        *,
+        phrases: Iterable[TextChunk] = (),
+        chunk_ms: int = 100,
+    ) -> None:
+        self.inner = inner
+        self.cache = cache
+        self.phrases = frozenset((p.text.strip(), p.language) for p in phrases)
+        self.chunk_ms = chunk_ms
+
+    @property
+    def output_sample_rate(self) -> int:
+        return self.inner.output_sample_rate
+
+    @property
+    def output_encoding(self) -> AudioEncoding:
+        return self.inner.output_encoding
+
+    def __getattr__(self, name: str) -> Any:
+        # 只在常规查找失败时调用；inner 本身走 __dict__，不会递归
+        return getattr(self.inner, name)
+
+    def cache_key(self, chunk: TextChunk) -> str:
+        """内容地址：影响合成结果的所有参数的 sha256。"""
+        inner = self.inner
+        # 会话级包装（``CosyVoiceSession``）的音色参数在它的 ``client`` 上
+        voice = getattr(inner, "client", inner)
+        material = json.dumps(
+            [
+                chunk.text,
+                chunk.language,
+                getattr(voice, "prompt_wav", None),
+                getattr(voice, "prompt_text", None),
+                getattr(voice, "speed", None),
+                inner.output_sample_rate,
+                inner.output_encoding,
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _cacheable(self, chunk: TextChunk) -> bool:
+        return (
+            chunk.is_final_segment
+            and (chunk.text.strip(), chunk.language) in self.phrases
+        )
+
+    async def stream_synthesize(
+        self, text_chunks: AsyncIterator[TextChunk]
+    ) -> AsyncIterator[bytes]:
+        first = await anext(text_chunks, None)
+        if first is None:
+            return
+        if not self.cache.enabled or not self._cacheable(first):
+            async for audio in self.inner.stream_synthesize(_chain(first, text_chunks)):
+                yield audio
+            return
+
+        async for audio in self._synthesize_phrase(first):
+            yield audio
+        # 整句之后若还有 chunk（少见），按原样流式合成
+        rest = await anext(text_chunks, None)
+        if rest is not None:
+            async for audio in self.inner.stream_synthesize(_chain(rest, text_chunks)):
+                yield audio
+
+    async def _synthesize_phrase(self, chunk: TextChunk) -> AsyncIterator[bytes]:
+        from vocalize.server.metrics import (
+            TTS_CACHE_HITS_TOTAL,
+            TTS_CACHE_MISSES_TOTAL,
+        )
+
+        key = self.cache_key(chunk)
+        hit = await self.cache.get(key)
+        if hit is not None:
+            tier, audio = hit
+            TTS_CACHE_HITS_TOTAL.labels(tier=tier).inc()
+            try:
+                step = self._chunk_bytes()
+                for i in range(0, len(audio), step):
+                    yield audio[i:i + step]
+                if tier == "disk":
+                    self.cache.put_memory(key, audio[:])
+            finally:
+                if isinstance(audio, mmap.mmap):
+                    audio.close()
+            return
+
+        TTS_CACHE_MISSES_TOTAL.inc()
+        parts: list[bytes] = []
+        async for audio in self.inner.stream_synthesize(_chain(chunk, None)):
+            parts.append(audio)
+            yield audio
+        # 只有内层正常跑完才走到这里：被打断（aclose）/ 抛错都不缓存
+        phrase = b"".join(parts)
+        self.cache.put_memory(key, phrase)
+        if self.cache.disk_dir is not None:
+            await asyncio.to_thread(self.cache.put_disk, key, phrase)
+
+    def _chunk_bytes(self) -> int:
+        bytes_per_sample = 2 if self.output_encoding == "pcm_s16le" else 1
+        step = self.output_sample_rate * self.chunk_ms // 1000 * bytes_per_sample
+        return max(step, bytes_per_sample)
+
+
+async def _chain(
+    first: TextChunk, rest: AsyncIterator[TextChunk] | None
+) -> AsyncIterator[TextChunk]:
+    yield first
+    if rest is not None:
+        async for chunk in rest:
+            yield chunk
+
+
+_caches: dict[tuple[int, str, int], PhraseCache] = {}
+
+
+def get_phrase_cache(cfg: Config) -> PhraseCache | None:
+    """按配置取进程级共享缓存；两级都关掉时返回 None。"""
+    memory_max = max(0, cfg.tts_cache_memory_mb) * 1024 * 1024
+    disk_max = max(0, cfg.tts_cache_disk_mb) * 1024 * 1024 if cfg.tts_cache_dir else 0
+    if memory_max == 0 and disk_max == 0:
+        return None
+    ident = (memory_max, cfg.tts_cache_dir, disk_max)
+    cache = _caches.get(ident)
+    if cache is None:
+        cache = PhraseCache(
+            memory_max_bytes=memory_max,
+            disk_dir=cfg.tts_cache_dir or None,
+            disk_max_bytes=disk_max,
+        )
+        _caches[ident] = cache
+    return cache
+
+
+def wrap_with_cache(tts: TTSService, cfg: Config) -> TTSService:
+    """``TTS_CACHE_*`` 打开时把 ``tts`` 包进 ``CachingTTS``，否则原样返回。"""
+    from vocalize.tts.warmup import cacheable_phrases
+
+    cache = get_phrase_cache(cfg)
+    if cache is None:
+        return tts
+    return CachingTTS(tts, cache, phrases=cacheable_phrases())
+
+
+__all__ = ["CachingTTS", "PhraseCache", "get_phrase_cache", "wrap_with_cache"]
@@ -1,18 +1,22 @@
 """CosyVoice2 WebSocket 客户端 — 流式 TTS (Phase 3)。
 
 连远端 CosyVoice2 推理服务（``infra/gpu-services/cosyvoice/server.py``），把
-``AsyncIterator[TextChunk]`` 翻译成服务端协议帧，并把服务端推回的 PCM 音频字节
-原样作为 ``AsyncIterator[bytes]`` yield 给上层 transport。
+``AsyncIterator[TextChunk]`` 翻译成服务端协议帧，并把服务端推回的音频字节
+按 ``output_sample_rate`` / ``output_encoding`` 作为 ``AsyncIterator[bytes]`` yield
+给上层 transport。
 
 协议要点（详见 server 模块 docstring）：
 - 服务端 endpoint：``ws://<host>:<port>/ws/synthesize``
 - 客户端 → 服务端（JSON 文本帧）：
   - ``{"event":"start","session_id":..,"language":..,"speed":..,
-       "prompt_wav":<opt>,"prompt_text":<opt>}``
+       "prompt_wav":<opt>,"prompt_text":<opt>,"encoding":<opt>,
+       "sample_rate":..}``
   - ``{"event":"text","text":..,"language":..,"is_final_segment":bool}`` * N
+  - ``{"event":"cancel","utterance_id":<opt>}``（仅 ``CosyVoiceSession``）
   - ``{"event":"stop"}``
 - 服务端 → 客户端：
-  - 二进制：PCM int16 LE，mono，sample_rate = ``audio_start.sample_rate``
+  - 二进制：mono，sample_rate = ``audio_start.sample_rate``，编码 =
+    ``audio_start.encoding``（``pcm_s16le`` / ``mulaw`` / ``alaw``）
   - JSON 文本：``audio_start`` / ``audio_end`` / ``{"error":..,"fatal":bool}``
 
 设计取舍（与 ``stt.sensevoice`` 对齐）：
@@ -20,10 +24,18 @@
   避免 receive loop 永远等不会到的帧；sender 失败时通过 done-callback 主动关 ws。
 - ``is_final_segment=True`` 直接转发给服务端：服务端用它触发 inference flush，
   这是流式 TTS 拿到完整尾音的硬性条件。
-- ``output_sample_rate`` / ``output_encoding`` 是硬性客户端配置：服务端当前固定
-  ``pcm_s16le`` @ 24 kHz（``infra/gpu-services/cosyvoice/server.py``）。若服务端
-  ``audio_start`` 报告不一致只 log warning 不 mutate——下游 transport 已经按客户端
-  配置开了 PortAudio output stream，运行时改 SR 会导致 pitch-shift。
+- 输出格式在 ``start`` 帧协商：``sample_rate`` = ``output_sample_rate``（服务端
+  支持 8 / 16 / 24 kHz），``output_encoding`` 为 ``mulaw`` / ``alaw`` 时直接请求该
+  编码。服务端流式重采样 + 编码，电话腿拿到的字节原样透传，Pi 上不再逐帧转码。
+  ``output_sample_rate`` / ``output_encoding`` 仍是硬性客户端配置：老服务端不认
+  ``sample_rate`` 时 ``audio_start`` 报告的采样率不一致，只 log warning 不 mutate——
+  下游 transport 已经按客户端配置开了 output stream，运行时改 SR 会导致 pitch-shift。
+- 链路编码：``output_encoding`` 是 PCM 时按 ``link_encoding`` 请求下行字节，解回
+  PCM 再 yield。服务端以 ``audio_start.encoding`` 为准——老服务端不认 ``encoding``
+  字段时照发 PCM，客户端按需编码成 ``output_encoding``，不会错解。
+- 会话复用：``open_session()`` 返回 call-leg 级 ``CosyVoiceSession``，一条 WS 连续
+  合成多句，按 ``utterance_id`` 分流音频，barge-in 只发 ``cancel`` 取消当前句；
+  ``CosyVoiceClient.stream_synthesize`` 仍是一次一连接。
 - cancellation：caller 对返回的 AsyncIterator ``aclose()`` / ``break`` →
   ``finally`` 里 best-effort 发 ``stop`` + 关 socket。这是 Phase 5 barge-in 的硬性
   前置：用户打断时必须立刻让 GPU 端停止合成。
@@ -33,6 +45,7 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import json
 import logging
 import sys
@@ -42,10 +55,13 @@ from typing import Any
 
 import websockets
 from websockets.asyncio.client import ClientConnection, connect
+from websockets.protocol import State
 
+from vocalize import codec
 from vocalize.config import Config
 from vocalize.transports.base import AudioEncoding
 from vocalize.tts.base import TextChunk
+from vocalize.ws_pool import WsPool
 
 log = logging.getLogger(__name__)
 
@@ -87,8 +103,14 @@ class CosyVoiceClient:
         connect_timeout_s: TCP/WS 握手超时。
         open_timeout_s: ``websockets`` 库 open_timeout。
         ping_interval_s: 心跳间隔；与服务端 ``ws_ping_interval=20`` 对齐。
-        output_sample_rate: 默认输出 SR；若服务端 ``audio_start`` 不一致则被覆盖。
-        output_encoding: 默认输出编码；当前服务端固定 ``pcm_s16le``。
+        output_sample_rate: 交给 transport 的采样率，在 ``start`` 帧向服务端请求；
+            服务端不支持时只 log warning（见 ``_wire_encoding``）。
+        output_encoding: 交给 transport 的编码（``codec.OUTPUT_ENCODINGS``）；
+            ``mulaw`` / ``alaw`` 直接向服务端请求，字节原样透传。
+        link_encoding: ``output_encoding`` 为 PCM 时向服务端请求的下行链路编码
+            （``vocalize.codec``）；客户端解回 PCM 再交给 transport。
+        pool: 可选共享预连接池（``vocalize.ws_pool``）；为 None 时每次直连。
+            ``health_check`` 总是直连，不消耗池里的连接。
     """
 
     host: str
@@ -104,6 +126,8 @@ class CosyVoiceClient:
     ping_interval_s: float = 20.0
     output_sample_rate: int = 24_000
     output_encoding: AudioEncoding = field(default="pcm_s16le")
+    link_encoding: AudioEncoding = "pcm_s16le"
+    pool: WsPool | None = field(default=None, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if not (1 <= self.port <= 65535):
@@ -132,6 +156,16 @@ class CosyVoiceClient:
             raise CosyVoiceError(
                 f"output_sample_rate must be > 0, got {self.output_sample_rate}"
             )
+        if self.output_encoding not in codec.OUTPUT_ENCODINGS:
+            raise CosyVoiceError(
+                f"output_encoding must be one of {codec.OUTPUT_ENCODINGS}, "
+                f"got {self.output_encoding!r}"
+            )
+        if self.link_encoding not in codec.LINK_ENCODINGS:
+            raise CosyVoiceError(
+                f"link_encoding must be one of {codec.LINK_ENCODINGS}, "
+                f"got {self.link_encoding!r}"
+            )
         # zero-shot 声纹克隆需要 wav + 对应文本同时给出，缺一不可
         if (self.prompt_wav is None) != (self.prompt_text is None):
             raise CosyVoiceError(
@@ -151,11 +185,14 @@ class CosyVoiceClient:
             raise CosyVoiceError(
                 f"missing required env vars: {', '.join(missing)}"
             )
-        return cls(
+        client = cls(
             host=cfg.gpu_host,
             port=cfg.cosyvoice_ws_port,
             default_language=cfg.default_language,
+            link_encoding=cfg.gpu_link_encoding,
         )
+        client.pool = cfg.gpu_ws_pool(client.ws_url, service="cosyvoice")
+        return client
 
     async def stream_synthesize(
         self, text_chunks: AsyncIterator[TextChunk]
@@ -166,8 +203,20 @@ class CosyVoiceClient:
         is_final_segment）→ ``stop``。服务端在每个 ``is_final_segment=True``
         关 generator 触发 flush；二进制 PCM 帧按到达顺序透传。
         """
+        ws = await self._connect()
+        async for audio in self._run_session(ws, text_chunks):
+            yield audio
+
+    def open_session(self) -> "CosyVoiceSession":
+        """返回绑定本客户端配置的会话级长连接（懒连接，首次合成时才握手）。"""
+        return CosyVoiceSession(self)
+
+    async def _connect(self) -> ClientConnection:
+        """建 WS 连接（有池时从池借）；握手失败统一转成 ``CosyVoiceError``。"""
         try:
-            ws = await asyncio.wait_for(
+            if self.pool is not None:
+                return await self.pool.acquire()
+            return await asyncio.wait_for(
                 connect(
                     self.ws_url,
                     open_timeout=self.open_timeout_s,
@@ -180,8 +229,62 @@ class CosyVoiceClient:
                 f"failed to connect to {self.ws_url}: {exc}"
             ) from exc
 
-        async for audio in self._run_session(ws, text_chunks):
-            yield audio
+    def _start_message(self) -> str:
+        start_msg: dict[str, Any] = {
+            "event": "start",
+            "language": self.default_language,
+            "speed": self.speed,
+        }
+        if self.prompt_wav is not None:
+            start_msg["prompt_wav"] = self.prompt_wav
+        if self.prompt_text is not None:
+            start_msg["prompt_text"] = self.prompt_text
+        if self.session_id is not None:
+            start_msg["session_id"] = self.session_id
+        start_msg["sample_rate"] = self.output_sample_rate
+        encoding = self._requested_encoding()
+        if encoding != codec.PCM_S16LE:
+            start_msg["encoding"] = encoding
+        return json.dumps(start_msg)
+
+    def _requested_encoding(self) -> AudioEncoding:
+        """G.711 输出直接要服务端编好；PCM 输出按 ``link_encoding`` 走链路。"""
+        if self.output_encoding != codec.PCM_S16LE:
+            return self.output_encoding
+        return self.link_encoding
+
+    def _to_output(self, wire_encoding: AudioEncoding, raw: bytes) -> bytes:
+        """下行字节 → ``output_encoding``；协商成功时原样透传。"""
+        if wire_encoding == self.output_encoding:
+            return raw
+        return codec.encode(self.output_encoding, codec.decode(wire_encoding, raw))
+
+    def _wire_encoding(self, audio_start: dict[str, Any]) -> AudioEncoding:
+        """从 ``audio_start`` 读下行字节的实际编码（不认识时按 PCM）。
+
+        不要在运行时 mutate output_sample_rate / output_encoding：下游 transport
+        已经按客户端配置的 SR 打开了 PortAudio output stream，运行时改 SR 会导致
+        pitch-shift。采样率在 ``start`` 帧协商；不一致（老服务端 / 不支持的 SR）
+        只 log warning，让客户端配置说了算。
+        """
+        sr = audio_start.get("sample_rate")
+        if isinstance(sr, int) and sr > 0 and sr != self.output_sample_rate:
+            log.warning(
+                "server reports sample_rate=%d but client configured "
+                "%d; downstream transport may pitch-shift. "
+                "Trusting client config.",
+                sr, self.output_sample_rate,
+            )
+        enc = audio_start.get("encoding")
+        if isinstance(enc, str) and enc in codec.OUTPUT_ENCODINGS:
+            return enc
+        if isinstance(enc, str) and enc != self.output_encoding:
+            log.warning(
+                "server reports encoding=%r but client configured "
+                "%r; trusting client config.",
+                enc, self.output_encoding,
+            )
+        return codec.PCM_S16LE
 
     async def health_check(self) -> bool:
         """轻量握手检查：能 connect + 立刻关闭即视为健康。
@@ -212,18 +315,9 @@ class CosyVoiceClient:
         text_chunks: AsyncIterator[TextChunk],
     ) -> AsyncIterator[bytes]:
         """已建连的会话循环：起 sender task 推 text 帧，主协程读音频/控制帧。"""
-        start_msg: dict[str, Any] = {
-            "event": "start",
-            "language": self.default_language,
-            "speed": self.speed,
-        }
-        if self.prompt_wav is not None:
-            start_msg["prompt_wav"] = self.prompt_wav
-        if self.prompt_text is not None:
-            start_msg["prompt_text"] = self.prompt_text
-        if self.session_id is not None:
-            start_msg["session_id"] = self.session_id
-        await ws.send(json.dumps(start_msg))
+        await ws.send(self._start_message())
+        # 下行字节的实际编码，以服务端 audio_start 为准
+        wire_encoding: AudioEncoding = codec.PCM_S16LE
 
         sender_done = asyncio.Event()
         # 标记是否是客户端侧主动发起关闭（sender 失败时 done-callback 触发）。
@@ -252,8 +346,8 @@ class CosyVoiceClient:
         try:
             async for raw in ws:
                 if isinstance(raw, bytes):
-                    # 二进制 = PCM 音频帧，原样透传
-                    yield raw
+                    # 二进制 = 音频帧；已是 output_encoding 时原样透传
+                    yield self._to_output(wire_encoding, raw)
                     continue
 
                 try:
@@ -272,27 +366,7 @@ class CosyVoiceClient:
 
                 event = msg.get("event")
                 if event == "audio_start":
-                    # 不要在运行时 mutate output_sample_rate / output_encoding：
-                    # 下游 transport 已经按客户端配置的 SR 打开了 PortAudio
-                    # output stream，运行时改 SR 会导致 pitch-shift。服务端
-                    # 当前固定 24 kHz pcm_s16le；不一致只 log warning，让客户端
-                    # 配置说了算。Phase 4 若需要服务端动态选 SR，得在握手阶段
-                    # 协商，不能在 audio_start 帧。
-                    sr = msg.get("sample_rate")
-                    if isinstance(sr, int) and sr > 0 and sr != self.output_sample_rate:
-                        log.warning(
-                            "server reports sample_rate=%d but client configured "
-                            "%d; downstream transport may pitch-shift. "
-                            "Trusting client config.",
-                            sr, self.output_sample_rate,
-                        )
-                    enc = msg.get("encoding")
-                    if isinstance(enc, str) and enc != self.output_encoding:
-                        log.warning(
-                            "server reports encoding=%r but client configured "
-                            "%r; trusting client config.",
-                            enc, self.output_encoding,
-                        )
+                    wire_encoding = self._wire_encoding(msg)
                 # audio_end 当前不需要客户端动作；服务端会继续等下一个 text 段或 stop
 
             # 受到 graceful close（code=1000/1001）时 websockets 的 async-for 迭代器
@@ -385,6 +459,281 @@ class CosyVoiceClient:
                 sender_done.set()
 
 
+class _ConnectionLost:
+    """reader 退出时投进 inbox 的哨兵；``ws`` 用来识别已被替换的旧连接。"""
+
+    def __init__(self, ws: ClientConnection) -> None:
+        self.ws = ws
+
+
+class CosyVoiceSession:
+    """Call-leg 级 CosyVoice 长连接：一条 ``/ws/synthesize`` 合成整通电话的所有播报。
+
+    每次 ``stream_synthesize`` 是一个 lease（``asyncio.Lock`` 串行化），接口与
+    ``CosyVoiceClient.stream_synthesize`` 相同，可直接作为 ``TTSService`` 交给
+    ``VoicePipeline``；``speak()`` / ``_merchant_speak`` / takeover 播报因此不再
+    每句握手一次。连接在首个 lease 时才建立。
+
+    句子边界（服务端按收到顺序给每句分配递增的 ``utterance_id``，串行合成）：
+
+    - 客户端按同样的规则计数：每句的首个 text 帧分配下一个 id，``is_final_segment``
+      关句；lease 的 text 耗尽时若还有未关的句子，补一个空的 final 哨兵。
+    - 二进制帧属于最近一个 ``audio_start`` 的 id；lease 只 yield 自己的句子，
+      收到最后一句的 ``audio_end`` 即结束。
+    - 调用方提前 ``aclose()``（barge-in）：发 ``cancel``，服务端只取消本 lease 已
+      发出的句子（排队的不合成、在合成的丢弃剩余音频），连接继续给下一句用；
+      迟到的残余帧按 id 丢弃。
+    - 连接断开：当前 lease 抛 ``CosyVoiceError``，下一个 lease 重新连接。
+    """
+
+    def __init__(self, client: CosyVoiceClient) -> None:
+        self._client = client
+        self._ws: ClientConnection | None = None
+        self._reader: asyncio.Task[None] | None = None
+        self._inbox: asyncio.Queue[
+            tuple[int, bytes] | dict[str, Any] | _ConnectionLost
+        ] = asyncio.Queue()
+        self._lease_lock = asyncio.Lock()
+        # 下一句的 id（与服务端分配规则一致；新连接从 0 开始）
+        self._next_utterance_id = 0
+        # <= 该 id 的句子属于被取消的 lease，残余帧一律丢弃
+        self._discard_through_id = -1
+        # reader 侧：最近一个 audio_start 的 id 与下行编码
+        self._current_utterance: int | None = None
+        self._wire_encoding: AudioEncoding = codec.PCM_S16LE
+        self._closed = False
+
+    @property
+    def client(self) -> CosyVoiceClient:
+        return self._client
+
+    @property
+    def output_sample_rate(self) -> int:
+        return self._client.output_sample_rate
+
+    @property
+    def output_encoding(self) -> AudioEncoding:
+        return self._client.output_encoding
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None
+
+    async def health_check(self) -> bool:
+        return await self._client.health_check()
+
+    async def stream_synthesize(
+        self, text_chunks: AsyncIterator[TextChunk]
+    ) -> AsyncIterator[bytes]:
+        """在长连接上合成一段（可含多句）；语义同 ``CosyVoiceClient.stream_synthesize``。"""
+        from vocalize.server.metrics import TTS_HANDSHAKES_AVOIDED_TOTAL
+
+        async with self._lease_lock:
+            if self._closed:
+                raise CosyVoiceError("CosyVoiceSession is closed")
+            self._drain_inbox()
+            reused = self._ws is not None
+            ws = await self._ensure_connection()
+            if reused:
+                TTS_HANDSHAKES_AVOIDED_TOTAL.inc()
+
+            first_id = self._next_utterance_id
+            sender = asyncio.create_task(self._send_text(ws, text_chunks))
+            pending_get: asyncio.Task[Any] | None = None
+            last_id: int | None = None  # sender 结束后才知道本 lease 的最后一句
+            ended_through = first_id - 1
+            clean = False
+            try:
+                while True:
+                    if last_id is None and sender.done():
+                        exc = sender.exception()
+                        if isinstance(exc, websockets.exceptions.ConnectionClosed):
+                            await self._drop(ws)
+                            raise CosyVoiceError(
+                                f"connection closed mid-stream: {exc}"
+                            ) from exc
+                        if exc is not None:
+                            raise CosyVoiceError(f"text sender failed: {exc}") from exc
+                        last_id = self._next_utterance_id - 1
+                    if last_id is not None and ended_through >= last_id:
+                        clean = True
+                        return
+
+                    if pending_get is None:
+                        pending_get = asyncio.create_task(self._inbox.get())
+                    waiting: set[asyncio.Task[Any]] = {pending_get}
+                    if not sender.done():
+                        waiting.add(sender)
+                    await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                    if not pending_get.done():
+                        continue
+                    item = pending_get.result()
+                    pending_get = None
+
+                    if isinstance(item, _ConnectionLost):
+                        if item.ws is not ws:
+                            continue  # 已被替换的旧连接迟到的哨兵
+                        await self._drop(ws)
+                        raise CosyVoiceError(
+                            "connection closed mid-stream: server closed the session"
+                        )
+                    if isinstance(item, tuple):
+                        utterance_id, audio = item
+                        if utterance_id >= first_id:
+                            yield audio
+                        continue
+                    if "error" in item:
+                        err_text = str(item.get("error", "unknown server error"))
+                        if bool(item.get("fatal")):
+                            await self._drop(ws)
+                            raise CosyVoiceError(err_text)
+                        log.warning("cosyvoice non-fatal error: %s", err_text)
+                        continue
+                    if item.get("event") == "audio_end":
+                        ended_through = max(
+                            ended_through, int(item.get("utterance_id", -1))
+                        )
+            finally:
+                if pending_get is not None:
+                    pending_get.cancel()
+                if not sender.done():
+                    sender.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await sender
+                if not clean:
+                    await self._cancel_lease()
+
+    async def aclose(self) -> None:
+        """结束会话：发 ``stop`` 并关闭连接。幂等。"""
+        if self._closed:
+            return
+        self._closed = True
+        ws, self._ws = self._ws, None
+        reader, self._reader = self._reader, None
+        if ws is not None:
+            with contextlib.suppress(Exception):
+                await ws.send(json.dumps({"event": "stop"}))
+            await _safe_close(ws)
+        if reader is not None:
+            reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await reader
+
+    async def _ensure_connection(self) -> ClientConnection:
+        """返回可用连接；没有（或已断）时握手 + ``start`` + 起 reader。"""
+        from vocalize.server.metrics import TTS_WS_HANDSHAKES_TOTAL
+
+        if self._ws is not None:
+            if self._ws.state is State.OPEN:
+                return self._ws
+            await self._drop(self._ws)  # 两次 lease 之间断开：重新握手
+        ws = await self._client._connect()
+        TTS_WS_HANDSHAKES_TOTAL.inc()
+        try:
+            await ws.send(self._client._start_message())
+        except websockets.exceptions.ConnectionClosed as exc:
+            await _safe_close(ws)
+            raise CosyVoiceError(f"connection closed before start: {exc}") from exc
+        # 新连接 = 新的服务端会话，utterance_id 从 0 重新计数
+        self._next_utterance_id = 0
+        self._discard_through_id = -1
+        self._current_utterance = None
+        self._wire_encoding = codec.PCM_S16LE
+        self._ws = ws
+        self._reader = asyncio.create_task(self._read_loop(ws))
+        return ws
+
+    async def _drop(self, ws: ClientConnection) -> None:
+        if self._ws is ws:
+            self._ws = None
+            reader, self._reader = self._reader, None
+            if reader is not None and reader is not asyncio.current_task():
+                reader.cancel()
+        await _safe_close(ws)
+
+    async def _read_loop(self, ws: ClientConnection) -> None:
+        """按 ``audio_start`` 给二进制帧打上 utterance_id 投进 inbox；丢掉被取消句子的帧。"""
+        try:
+            async for raw in ws:
+                if isinstance(raw, bytes):
+                    uid = self._current_utterance
+                    if uid is None or uid <= self._discard_through_id:
+                        continue
+                    raw = self._client._to_output(self._wire_encoding, raw)
+                    self._inbox.put_nowait((uid, raw))
+                    continue
+                try:
+                    msg = json.loads(raw)
+                except json.JSONDecodeError:
+                    log.warning("ignoring non-JSON text frame: %r", raw[:200])
+                    continue
+                if not isinstance(msg, dict):
+                    continue
+                event = msg.get("event")
+                if event == "audio_start":
+                    uid = msg.get("utterance_id")
+                    self._current_utterance = uid if isinstance(uid, int) else None
+                    self._wire_encoding = self._client._wire_encoding(msg)
+                    continue
+                if event == "audio_end":
+                    self._current_utterance = None
+                    if int(msg.get("utterance_id", -1)) <= self._discard_through_id:
+                        continue
+                self._inbox.put_nowait(msg)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        self._inbox.put_nowait(_ConnectionLost(ws))
+
+    def _drain_inbox(self) -> None:
+        """lease 开始前清掉两次 lease 之间到达的帧（正常情况下为空）。"""
+        while True:
+            try:
+                item = self._inbox.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if isinstance(item, _ConnectionLost) and item.ws is self._ws:
+                self._ws = None
+                self._reader = None
+
+    async def _send_text(
+        self, ws: ClientConnection, text_chunks: AsyncIterator[TextChunk]
+    ) -> None:
+        """推 text 帧并按服务端规则给每句分配 id；结束时关掉未关的句子。"""
+        utterance_open = False
+        async for chunk in text_chunks:
+            if not chunk.text and not (chunk.is_final_segment and utterance_open):
+                continue  # 空的 final 哨兵只在有未关的句子时才有意义
+            if not utterance_open:
+                self._next_utterance_id += 1
+                utterance_open = True
+            await ws.send(json.dumps({
+                "event": "text",
+                "text": chunk.text,
+                "language": chunk.language,
+                "is_final_segment": chunk.is_final_segment,
+            }, ensure_ascii=False))
+            if chunk.is_final_segment:
+                utterance_open = False
+        if utterance_open:
+            await ws.send(json.dumps({
+                "event": "text",
+                "text": "",
+                "language": self._client.default_language,
+                "is_final_segment": True,
+            }))
+
+    async def _cancel_lease(self) -> None:
+        """lease 提前结束：取消服务端已收到的本 lease 句子，并把它们的残余帧标为 stale。"""
+        self._discard_through_id = self._next_utterance_id - 1
+        ws = self._ws
+        if ws is None or self._closed:
+            return
+        try:
+            await ws.send(json.dumps({"event": "cancel"}))
+        except websockets.exceptions.ConnectionClosed:
+            await self._drop(ws)
+
+
 async def _safe_close(ws: ClientConnection) -> None:
     """Best-effort ws close used from a done-callback path."""
     try:
@@ -0,0 +1,169 @@
+"""启动时预合成静态台词，把 ``vocalize.tts.cache`` 先填热。
+
+短语缓存只在第一次播报之后才有用：每天第一句 keepalive / hold filler 仍要等 GPU。
+``PhraseWarmup`` 在 app lifespan 里后台跑一遍 ``vocalize.dialogue.prompts`` 里会被
+原样念出来的静态台词（``WARM_PROMPTS`` × ``WARM_LANGUAGES``），用的就是线上那条
+``CachingTTS`` 路径，所以 key 与运行时逐字节一致。
+
+- 有界并发（``concurrency``）：GPU 端每条合成占一个会话名额，不和真实来电抢。
+- 已经在缓存里（磁盘层跨重启保留）的条目直接算热，不再合成。
+- 单条失败不影响其余；整轮结束后对失败的条目隔 ``retry_delay_s`` 重试，最多
+  ``attempts`` 轮——GPU 节点常常比编排器晚起。
+- ``status()`` 给 ``/health``，``vocalize_tts_warm_phrases`` 给 Prometheus。
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from typing import Any
+
+from vocalize.dialogue.prompts import load_prompt
+from vocalize.tts.base import TextChunk
+from vocalize.tts.cache import CachingTTS
+
+log = logging.getLogger(__name__)
+
+# 运行时原样 ``load_prompt(...).strip()`` 后直接念的文件（keepalive.py /
+# reactive_holding.py）；其余 prompt 是 LLM system message，不在此列
+WARM_PROMPTS: tuple[str, ...] = (
+    "clarification_keepalive",
+    "hold_filler",
+    "impatience_end",
+)
+WARM_LANGUAGES: tuple[str, ...] = ("zh", "en")
+
+
+def static_phrases() -> list[TextChunk]:
+    """与 ``KeepaliveTimer`` / ``ReactiveHolding`` 播报时完全相同的 chunk。"""
+    return [
+        TextChunk(
+            text=load_prompt(f"{name}_{lang}").strip(),
+            language=lang,
+            is_final_segment=True,
+        )
+        for name in WARM_PROMPTS
+        for lang in WARM_LANGUAGES
+    ]
+
+
+def cacheable_phrases() -> list[TextChunk]:
+    """``CachingTTS`` 的白名单：静态台词 + LLM/TTS 出错时的兜底道歉。
+
+    其余文本（LLM 回复、relay 译文）可能含个人信息，一律不缓存。
+    """
+    from vocalize.pipeline import _fallback_chunk
+
+    return static_phrases() + [_fallback_chunk(lang) for lang in WARM_LANGUAGES]
+
+
+class PhraseWarmup:
+    """把 ``phrases`` 合成进 ``tts.cache``。
+
+    Args:
+        tts: 带缓存的 TTS（``wrap_with_cache`` 的返回值）。
+        phrases: 要预热的 chunk；默认 ``static_phrases()``。
+        concurrency: 同时在合成的条数。
+        timeout_s: 单条合成超时。
+        attempts: 最多跑几轮（第一轮 + 重试）。
+        retry_delay_s: 两轮之间的等待。
+    """
+
+    def __init__(
+        self,
+        tts: CachingTTS,
+        phrases: list[TextChunk] | None = None,
+        *,
+        concurrency: int = 2,
+        timeout_s: float = 30.0,
+        attempts: int = 3,
+        retry_delay_s: float = 10.0,
+    ) -> None:
+        self._tts = tts
+        self._phrases = static_phrases() if phrases is None else phrases
+        self._concurrency = max(1, concurrency)
+        self._timeout_s = timeout_s
+        self._attempts = max(1, attempts)
+        self._retry_delay_s = retry_delay_s
+        self._warm: set[str] = set()
+        self._failed: set[str] = set()
+        self._finished = asyncio.Event()
+
+    @property
+    def total(self) -> int:
+        return len({self._tts.cache_key(p) for p in self._phrases})
+
+    @property
+    def ready(self) -> bool:
+        return len(self._warm) == self.total
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "warm": len(self._warm),
+            "total": self.total,
+            "failed": len(self._failed),
+        }
+
+    async def wait(self) -> None:
+        """等到预热结束（全部热，或重试轮数用完）。"""
+        await self._finished.wait()
+
+    async def run(self) -> None:
+        try:
+            pending = self._phrases
+            for attempt in range(self._attempts):
+                if attempt:
+                    await asyncio.sleep(self._retry_delay_s)
+                sem = asyncio.Semaphore(self._concurrency)
+                await asyncio.gather(*(self._warm_one(p, sem) for p in pending))
+                pending = [
+                    p for p in self._phrases if self._tts.cache_key(p) in self._failed
+                ]
+                if not pending:
+                    break
+            log.info("tts warmup finished: %s", self.status())
+        finally:
+            self._finished.set()
+
+    async def _warm_one(self, phrase: TextChunk, sem: asyncio.Semaphore) -> None:
+        key = self._tts.cache_key(phrase)
+        if key in self._warm:
+            return
+        if not self._tts.cache.contains(key):
+            async with sem:
+                try:
+                    await asyncio.wait_for(self._synthesize(phrase), self._timeout_s)
+                except Exception as exc:
+                    # CosyVoiceError / 连接失败 / 超时都只影响这一条
+                    log.warning("tts warmup failed for %r: %s", phrase.text, exc)
+                    self._failed.add(key)
+                    return
+            if not self._tts.cache.contains(key):
+                # 空音频或超过单条上限：缓存不收，重试也没用
+                log.warning("tts warmup: %r was not cacheable", phrase.text)
+                return
+        self._failed.discard(key)
+        self._warm.add(key)
+        self._publish()
+
+    async def _synthesize(self, phrase: TextChunk) -> None:
+        async def _one_chunk() -> AsyncIterator[TextChunk]:
+            yield phrase
+
+        async for _ in self._tts.stream_synthesize(_one_chunk()):
+            pass
+
+    def _publish(self) -> None:
+        from vocalize.server.metrics import TTS_WARM_PHRASES
+
+        TTS_WARM_PHRASES.set(len(self._warm))
+
+
+__all__ = [
+    "WARM_LANGUAGES",
+    "WARM_PROMPTS",
+    "PhraseWarmup",
+    "cacheable_phrases",
+    "static_phrases",
+]
@@ -0,0 +1,312 @@
+"""GPU 服务 WebSocket 预连接池（进程级共享）。
+
+SenseVoice / CosyVoice 的每条连接都承载一次服务端会话（``start`` 之后绑定
+language / session_id，``stop`` 之后服务端关连接），所以连接 **借出即消耗**，
+不归还。池子做的是"提前把握手做完"：后台维持 ``min_idle`` 条已握手、活着的
+空闲连接，``acquire()`` 直接拿一条，新电话的第一轮就和第十轮一样不付握手。
+
+- 容量：目标空闲数 = 最近 ``demand_window_s`` 内的借出次数，夹在
+  ``[min_idle, max_size]`` 之间——突发来电时多预热几条，闲下来再由空闲淘汰缩回
+  ``min_idle``。注意空闲连接在 GPU 服务端也算活跃会话：两个服务都在
+  ``active_session_count >= MAX_CONCURRENT_SESSIONS * 2`` 时拒绝新连接
+  （SenseVoice 默认 8，CosyVoice 默认 4）。``max_size`` 因此按服务分别配置，
+  并满足 ``max_size × 编排进程数 + 峰值并发通话 ≤ MAX_CONCURRENT_SESSIONS × 2``，
+  否则预热的空闲连接会把真正的通话挤到 admission 拒绝上。
+- 存活检测：websockets 自带 keepalive ping 会关掉死连接；借出时空闲超过
+  ``ping_after_idle_s`` 的连接再主动 ping 一次，失败就丢弃换下一条。
+- 空闲淘汰：超出 ``min_idle`` 的连接空闲超过 ``idle_timeout_s`` 后关闭。
+- 未命中（池空 / GPU 刚恢复）时直接现建连接，语义与不用池完全一致。
+
+池绑定创建它的 event loop；在另一个 loop 上使用（测试里每个用例一个 loop）
+会先丢掉旧连接再重新开始。``get_pool()`` 是按 URL 去重的进程级注册表，
+``close_all_pools()`` 在 app 关闭时调用。
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from websockets.asyncio.client import ClientConnection, connect
+from websockets.protocol import State
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class _IdleConn:
+    ws: ClientConnection
+    idle_since: float
+
+
+class WsPool:
+    """单个 GPU 服务 URL 的预连接池。
+
+    Args:
+        url: ``ws://host:port/path``。
+        service: metrics label（``"sensevoice"`` / ``"cosyvoice"``）。
+        min_idle: 后台维持的空闲连接数；0 表示不预连，只做直连。
+        max_size: 空闲 + 建立中的连接上限（需求高时的预热上限）。
+        idle_timeout_s: 超出 ``min_idle`` 的空闲连接存活时间。
+        ping_after_idle_s: 借出前空闲超过该值的连接需要 ping 通。
+        ping_timeout_s: 借出前 ping 的超时。
+        connect_timeout_s / open_timeout_s / ping_interval_s: 同各 client 字段。
+        maintenance_interval_s: 后台淘汰 + 补齐的周期。
+        demand_window_s: 统计近期借出次数的窗口。
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        service: str,
+        min_idle: int = 1,
+        max_size: int = 4,
+        idle_timeout_s: float = 60.0,
+        ping_after_idle_s: float = 5.0,
+        ping_timeout_s: float = 2.0,
+        connect_timeout_s: float = 5.0,
+        open_timeout_s: float = 5.0,
+        ping_interval_s: float = 20.0,
+        maintenance_interval_s: float = 5.0,
+        demand_window_s: float = 10.0,
+    ) -> None:
+        if min_idle < 0 or max_size < 1 or min_idle > max_size:
+            raise ValueError(
+                f"need 0 <= min_idle <= max_size and max_size >= 1, "
+                f"got min_idle={min_idle} max_size={max_size}"
+            )
+        self.url = url
+        self.service = service
+        self.min_idle = min_idle
+        self.max_size = max_size
+        self.idle_timeout_s = idle_timeout_s
+        self.ping_after_idle_s = ping_after_idle_s
+        self.ping_timeout_s = ping_timeout_s
+        self.connect_timeout_s = connect_timeout_s
+        self.open_timeout_s = open_timeout_s
+        self.ping_interval_s = ping_interval_s
+        self.maintenance_interval_s = maintenance_interval_s
+        self.demand_window_s = demand_window_s
+        self._recent_acquires: deque[float] = deque()
+        self._idle: deque[_IdleConn] = deque()
+        self._opening = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._maintainer: asyncio.Task[None] | None = None
+        self._refill_task: asyncio.Task[None] | None = None
+        # 后台关闭被淘汰连接的任务；持有引用，免得被 GC 中途回收
+        self._closing: set[asyncio.Task[None]] = set()
+        self._closed = False
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def start(self) -> None:
+        """起后台维护任务（幂等）；需要在 running loop 里调用。"""
+        self._bind_loop()
+        if self._closed or self.min_idle == 0:
+            return
+        if self._maintainer is None or self._maintainer.done():
+            self._maintainer = asyncio.create_task(self._maintain_forever())
+
+    async def prewarm(self) -> None:
+        """同步补齐到 ``min_idle``（失败只记日志），并起后台维护。"""
+        self.start()
+        await self._refill()
+
+    async def acquire(self) -> ClientConnection:
+        """借出一条已握手连接；池空时现建。连接归调用方所有，用完自行关闭。"""
+        from vocalize.server.metrics import (
+            GPU_WS_POOL_HITS_TOTAL,
+            GPU_WS_POOL_MISSES_TOTAL,
+            GPU_WS_POOL_WAIT_SECONDS,
+        )
+
+        self.start()
+        self._recent_acquires.append(time.monotonic())
+        t0 = time.perf_counter()
+        try:
+            while self._idle:
+                conn = self._idle.popleft()
+                self._publish_size()
+                if await self._is_alive(conn):
+                    GPU_WS_POOL_HITS_TOTAL.labels(service=self.service).inc()
+                    return conn.ws
+                self._evict(conn.ws, reason="dead")
+            GPU_WS_POOL_MISSES_TOTAL.labels(service=self.service).inc()
+            return await self._open()
+        finally:
+            GPU_WS_POOL_WAIT_SECONDS.labels(service=self.service).observe(
+                time.perf_counter() - t0
+            )
+            self._schedule_refill()
+
+    async def close(self) -> None:
+        """关闭所有空闲连接并停止维护任务。"""
+        self._closed = True
+        for task in (self._maintainer, self._refill_task):
+            if task is not None and not task.done():
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await task
+        self._maintainer = None
+        self._refill_task = None
+        while self._idle:
+            conn = self._idle.popleft()
+            with contextlib.suppress(Exception):
+                await conn.ws.close()
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+        self._publish_size()
+
+    # ------------------------------------------------------------------
+    # internals
+    # ------------------------------------------------------------------
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None:
+            # 旧 loop 上的连接 / 任务无法在这里 await，直接丢弃
+            log.debug("ws pool %s rebound to a new event loop", self.url)
+            self._idle.clear()
+            self._opening = 0
+            self._maintainer = None
+            self._refill_task = None
+            self._closing.clear()
+            self._publish_size()
+        self._loop = loop
+
+    async def _open(self) -> ClientConnection:
+        return await asyncio.wait_for(
+            connect(
+                self.url,
+                open_timeout=self.open_timeout_s,
+                ping_interval=self.ping_interval_s,
+            ),
+            timeout=self.connect_timeout_s,
+        )
+
+    async def _is_alive(self, conn: _IdleConn) -> bool:
+        if conn.ws.state is not State.OPEN:
+            return False
+        if time.monotonic() - conn.idle_since < self.ping_after_idle_s:
+            return True
+        try:
+            pong = await conn.ws.ping()
+            await asyncio.wait_for(pong, timeout=self.ping_timeout_s)
+        except Exception:
+            return False
+        return True
+
+    def _evict(self, ws: ClientConnection, *, reason: str) -> None:
+        from vocalize.server.metrics import GPU_WS_POOL_EVICTIONS_TOTAL
+
+        GPU_WS_POOL_EVICTIONS_TOTAL.labels(service=self.service, reason=reason).inc()
+        task = asyncio.create_task(_close_quietly(ws))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def _schedule_refill(self) -> None:
+        if self._closed or self.min_idle == 0:
+            return
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.create_task(self._refill())
+
+    def _target_idle(self) -> int:
+        cutoff = time.monotonic() - self.demand_window_s
+        while self._recent_acquires and self._recent_acquires[0] < cutoff:
+            self._recent_acquires.popleft()
+        return min(self.max_size, max(self.min_idle, len(self._recent_acquires)))
+
+    async def _refill(self) -> None:
+        while (
+            not self._closed
+            and len(self._idle) + self._opening < self._target_idle()
+        ):
+            self._opening += 1
+            try:
+                ws = await self._open()
+            except Exception as exc:
+                # GPU 不可达时不刷屏：下个维护周期再试
+                log.debug("ws pool %s refill failed: %s", self.url, exc)
+                return
+            finally:
+                self._opening -= 1
+            # 握手期间可能已 close()；读 property，免得 mypy 沿用循环条件的收窄
+            if self.closed:
+                await _close_quietly(ws)
+                return
+            self._idle.append(_IdleConn(ws=ws, idle_since=time.monotonic()))
+            self._publish_size()
+
+    def _sweep(self) -> None:
+        now = time.monotonic()
+        kept: deque[_IdleConn] = deque()
+        for conn in self._idle:
+            if conn.ws.state is not State.OPEN:
+                self._evict(conn.ws, reason="dead")
+            elif (
+                len(kept) >= self.min_idle
+                and now - conn.idle_since > self.idle_timeout_s
+            ):
+                self._evict(conn.ws, reason="idle")
+            else:
+                kept.append(conn)
+        self._idle = kept
+        self._publish_size()
+
+    async def _maintain_forever(self) -> None:
+        while not self._closed:
+            self._sweep()
+            await self._refill()
+            await asyncio.sleep(self.maintenance_interval_s)
+
+    def _publish_size(self) -> None:
+        from vocalize.server.metrics import GPU_WS_POOL_IDLE
+
+        GPU_WS_POOL_IDLE.labels(service=self.service).set(len(self._idle))
+
+
+async def _close_quietly(ws: ClientConnection) -> None:
+    with contextlib.suppress(Exception):
+        await ws.close()
+
+
+# ---------------------------------------------------------------------------
+# 进程级注册表
+# ---------------------------------------------------------------------------
+_pools: dict[str, WsPool] = {}
+
+
+def get_pool(url: str, *, service: str, **kwargs: Any) -> WsPool:
+    """按 URL 取（或创建）进程级共享池；同一 URL 的后续调用忽略 ``kwargs``。"""
+    pool = _pools.get(url)
+    if pool is None or pool.closed:
+        pool = WsPool(url, service=service, **kwargs)
+        _pools[url] = pool
+    return pool
+
+
+def all_pools() -> list[WsPool]:
+    return list(_pools.values())
+
+
+async def close_all_pools() -> None:
+    """关闭并清空所有共享池（app 关闭 / 测试清理）。"""
+    pools = list(_pools.values())
+    _pools.clear()
+    for pool in pools:
+        await pool.close()
+
+
+__all__ = ["WsPool", "all_pools", "close_all_pools", "get_pool"]
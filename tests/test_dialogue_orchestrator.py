@@ -425,6 +425,7 @@ def _build_minimal_orchestrator_for_transcript_test(
     orch._merchant = _Merchant()
     orch._llm = object()
     orch._relay_tasks = set()
+    orch._relay_cache = None
 
     async def _emit(event: dict[str, Any]) -> None:
         if emitted_events is not None:
@@ -516,7 +517,9 @@ async def test_cross_lingual_merchant_utterance_emits_translation_pair(
 
     relay_calls: list[tuple[str, str, str]] = []
 
-    async def fake_relay(text: str, *, src: str, dst: str, llm: Any) -> RelayResult:
+    async def fake_relay(
+        text: str, *, src: str, dst: str, llm: Any, **_: Any
+    ) -> RelayResult:
         relay_calls.append((text, src, dst))
         return RelayResult(translated="你好", skipped=False)
 
@@ -578,7 +581,9 @@ async def test_cross_lingual_translation_does_not_block_merchant_turn(
     relay_can_finish = asyncio.Event()
     relay_started = asyncio.Event()
 
-    async def fake_relay(text: str, *, src: str, dst: str, llm: Any) -> RelayResult:
+    async def fake_relay(
+        text: str, *, src: str, dst: str, llm: Any, **_: Any
+    ) -> RelayResult:
         relay_started.set()
         await relay_can_finish.wait()
         return RelayResult(translated="你好")
@@ -629,7 +634,9 @@ async def test_finish_relay_tasks_cancels_slow_translation_on_shutdown(
 
     relay_started = asyncio.Event()
 
-    async def fake_relay(text: str, *, src: str, dst: str, llm: Any) -> RelayResult:
+    async def fake_relay(
+        text: str, *, src: str, dst: str, llm: Any, **_: Any
+    ) -> RelayResult:
         relay_started.set()
         await asyncio.Event().wait()
         return RelayResult(translated="你好")
@@ -673,7 +680,9 @@ async def test_same_lang_merchant_utterance_no_translation_frame(
 
     relay_calls = 0
 
-    async def fake_relay(text: str, *, src: str, dst: str, llm: Any) -> RelayResult:
+    async def fake_relay(
+        text: str, *, src: str, dst: str, llm: Any, **_: Any
+    ) -> RelayResult:
         nonlocal relay_calls
         relay_calls += 1
         return RelayResult(translated=text, skipped=True)
@@ -716,7 +725,9 @@ async def test_auto_translate_off_skips_relay(
 
     relay_calls = 0
 
-    async def fake_relay(text: str, *, src: str, dst: str, llm: Any) -> RelayResult:
+    async def fake_relay(
+        text: str, *, src: str, dst: str, llm: Any, **_: Any
+    ) -> RelayResult:
         nonlocal relay_calls
         relay_calls += 1
         return RelayResult(translated="x")
@@ -759,7 +770,9 @@ async def test_relay_failure_does_not_break_conversation(
     relay_can_finish = asyncio.Event()
     relay_started = asyncio.Event()
 
-    async def fake_relay(text: str, *, src: str, dst: str, llm: Any) -> RelayResult:
+    async def fake_relay(
+        text: str, *, src: str, dst: str, llm: Any, **_: Any
+    ) -> RelayResult:
         relay_started.set()
         await relay_can_finish.wait()
         return RelayResult(translated=None, failed=True)
@@ -2806,6 +2819,186 @@ async def test_run_relay_falls_back_when_target_lang_matches_source() -> None:
     )
 
 
+@pytest.mark.asyncio
+async def test_run_relay_serves_repeated_phrase_from_relay_cache() -> None:
+    """A repeated short relay is answered from the relay cache: no second
+    LLM call, and the cached translation is still spoken to the user."""
+    from vocalize.dialogue.relay_cache import RelayCache
+
+    state = TaskState(session_id="test-relay-cache")
+    tts_recorder: list[tuple[str, TextChunk]] = []
+    orch, _, _, llm, _, _ = _build_orchestrator(
+        state=state,
+        user_dial_now_phrase="现在打",
+        user_lang="zh",
+        merchant_lang="en",
+        merchant_transcripts=[],
+        llm_scripts=[_text_chunks("请稍等")],
+        tts_recorder=tts_recorder,
+        skip_task_planner_script=True,
+    )
+    orch._relay_cache = RelayCache(max_entries=8)
+
+    first = await orch._run_relay(
+        calling_channel=orch._merchant, target_lang="zh", source_text="Please hold.",
+    )
+    second = await orch._run_relay(
+        calling_channel=orch._merchant, target_lang="zh", source_text="please hold",
+    )
+
+    assert first == second == "请稍等"
+    assert len(llm.calls) == 1
+    spoken = [c.text for label, c in tts_recorder if label == "user_tts"]
+    assert spoken.count("请稍等") == 2
+
+
+@pytest.mark.asyncio
+async def test_run_relay_streams_translation_sentences_into_tts() -> None:
+    """A multi-sentence relay is segmented as it streams: the first sentence
+    is handed to TTS as a mid segment, and the full text is still returned."""
+    state = TaskState(session_id="test-relay-stream")
+    tts_recorder: list[tuple[str, TextChunk]] = []
+    orch, _, _, _, _, _ = _build_orchestrator(
+        state=state,
+        user_dial_now_phrase="现在打",
+        user_lang="zh",
+        merchant_lang="en",
+        merchant_transcripts=[],
+        llm_scripts=[[
+            _td("今晚七点有位子。"), _td("请问"), _td("几位？"),
+            FinishChunk(reason="stop"),
+        ]],
+        tts_recorder=tts_recorder,
+        skip_task_planner_script=True,
+    )
+
+    translated = await orch._run_relay(
+        calling_channel=orch._merchant,
+        target_lang="zh",
+        source_text="We have a table at seven tonight. How many people?",
+    )
+
+    assert translated == "今晚七点有位子。请问几位？"
+    chunks = [c for label, c in tts_recorder if label == "user_tts"]
+    assert chunks[0].text == "今晚七点有位子。"
+    assert chunks[0].is_final_segment is False
+    assert chunks[-1].is_final_segment is True
+    assert "".join(c.text for c in chunks) == translated
+
+
+class _GatedRelayLLM:
+    """Relay LLM that emits its first sentence, then waits for ``release``."""
+
+    model = "gated"
+
+    def __init__(self) -> None:
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.calls = 0
+        self.closed = 0
+
+    async def stream_chat(self, messages: Any, tools: Any = None) -> Any:
+        self.calls += 1
+        self.started.set()
+        try:
+            yield _td("今晚七点有位子。")
+            await self.release.wait()
+            yield _td("请问几位？")
+            yield FinishChunk(reason="stop")
+        finally:
+            self.closed += 1
+
+
+@pytest.mark.asyncio
+async def test_streamed_relay_is_not_shared_across_sessions() -> None:
+    """A streamed relay speaks into its own session's TTS, so it must not be
+    a shared single-flight call: a second session with the same phrase runs
+    its own translation, and cancelling the first session (barge-in) stops
+    its stream without affecting the second."""
+    from vocalize.dialogue.relay_cache import RelayCache
+
+    cache = RelayCache(max_entries=8)
+    sessions = []
+    for sid in ("a", "b"):
+        recorder: list[tuple[str, TextChunk]] = []
+        orch, _, _, _, _, _ = _build_orchestrator(
+            state=TaskState(session_id=f"test-relay-stream-{sid}"),
+            user_dial_now_phrase="现在打",
+            user_lang="zh",
+            merchant_lang="en",
+            merchant_transcripts=[],
+            llm_scripts=[],
+            tts_recorder=recorder,
+            skip_task_planner_script=True,
+        )
+        orch._relay_cache = cache
+        orch._llm = _GatedRelayLLM()
+        sessions.append((orch, recorder))
+    (orch_a, spoken_a), (orch_b, spoken_b) = sessions
+    llm_a, llm_b = orch_a._llm, orch_b._llm
+
+    def relay(orch: DialogueOrchestrator) -> asyncio.Task[str]:
+        return asyncio.create_task(orch._run_relay(
+            calling_channel=orch._merchant, target_lang="zh",
+            source_text="We have a table at seven tonight. How many people?",
+        ))
+
+    task_a = relay(orch_a)
+    await asyncio.wait_for(llm_a.started.wait(), 1.0)
+    task_b = relay(orch_b)
+    await asyncio.wait_for(llm_b.started.wait(), 1.0)
+
+    task_a.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task_a
+    assert llm_a.closed == 1
+
+    llm_b.release.set()
+    assert await asyncio.wait_for(task_b, 1.0) == "今晚七点有位子。请问几位？"
+    chunks_b = [c for label, c in spoken_b if label == "user_tts"]
+    assert chunks_b[0].is_final_segment is False
+    assert "".join(c.text for c in chunks_b) == "今晚七点有位子。请问几位？"
+    assert "请问几位？" not in "".join(c.text for _, c in spoken_a)
+    assert llm_a.calls == llm_b.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_llm_calls_route_by_prompt_layer() -> None:
+    """With an ``LLMRouter`` installed, relay calls use the ``relay`` layer
+    (here pinned to a second backend) and channels map to their prompt layer."""
+    from vocalize.llm import router as router_mod
+    from vocalize.llm.router import LLMRouter
+
+    router_mod._health.clear()
+    state = TaskState(session_id="test-llm-route-layer")
+    tts_recorder: list[tuple[str, TextChunk]] = []
+    orch, _, _, primary, _, _ = _build_orchestrator(
+        state=state,
+        user_dial_now_phrase="现在打",
+        user_lang="zh",
+        merchant_lang="en",
+        merchant_transcripts=[],
+        llm_scripts=[_text_chunks("不该用到")],
+        tts_recorder=tts_recorder,
+        skip_task_planner_script=True,
+    )
+    relay_backend = make_scripted_llm(_text_chunks("请稍等"))
+    orch._llm = LLMRouter(
+        [("primary", primary), ("relay-fast", relay_backend)],
+        layers={"relay": "relay-fast"},
+    )
+
+    translated = await orch._run_relay(
+        calling_channel=orch._merchant, target_lang="zh", source_text="Please hold.",
+    )
+
+    assert translated == "请稍等"
+    assert primary.calls == [] and len(relay_backend.calls) == 1
+    assert orch._prompt_layer(orch._merchant) == "merchant_agent"
+    assert orch._prompt_layer(orch._user) == "preflight_collector"
+    router_mod._health.clear()
+
+
 # ---------------------------------------------------------------------------
 # event_stream() — terminal-event contract (post-merge audit gap)
 # ---------------------------------------------------------------------------
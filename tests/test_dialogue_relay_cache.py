@@ -0,0 +1,212 @@
+"""``vocalize.dialogue.relay_cache`` relay 译文缓存测试。
+
+- 归一化：大小写 / 全角 / 句末标点 / 多余空白不影响 key；长句不缓存
+- 重复短句第二次不调 LLM，命中和省下的延迟进 Prometheus
+- 同 key 并发请求只发一次 LLM 调用；一方取消不影响另一方
+- LRU 容量、TTL 过期；失败译文不入缓存
+- key 区分方向 / task_category / relay_strategy / model
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+from prometheus_client import REGISTRY
+
+from vocalize.config import Config
+from vocalize.dialogue.relay import merchant_text_to_user_lang, user_to_merchant
+from vocalize.dialogue.relay_cache import (
+    RelayCache,
+    get_relay_cache,
+    normalize_relay_text,
+)
+from vocalize.llm.base import ChatMessage, LLMChunk, TextDelta
+
+
+class _SlowLLM:
+    def __init__(self, reply: str = "好的", delay: float = 0.0, model: str = "m") -> None:
+        self.reply = reply
+        self.delay = delay
+        self.model = model
+        self.calls = 0
+        self.fail = False
+
+    async def stream_chat(
+        self,
+        *,
+        messages: list[ChatMessage],
+    ) -> AsyncIterator[LLMChunk]:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("LLM unavailable")
+        yield TextDelta(self.reply)
+
+
+def _lookups(direction: str, outcome: str) -> float:
+    return REGISTRY.get_sample_value(
+        "vocalize_relay_cache_lookups_total",
+        {"direction": direction, "outcome": outcome},
+    ) or 0.0
+
+
+def _saved(direction: str) -> float:
+    return REGISTRY.get_sample_value(
+        "vocalize_relay_cache_saved_seconds_total", {"direction": direction}
+    ) or 0.0
+
+
+def test_normalize_ignores_case_width_punctuation_and_spacing() -> None:
+    assert normalize_relay_text("  OK. ") == normalize_relay_text("ok")
+    assert normalize_relay_text("ＯＫ，") == "ok"
+    assert normalize_relay_text("please   hold") == "please hold"
+    assert normalize_relay_text("好的。") == "好的"
+
+
+def test_normalize_keeps_question_and_exclamation_marks() -> None:
+    # "OK?" 是在问对方，"OK" 是应答：译文不同，不能共用一条缓存
+    assert normalize_relay_text("OK?") != normalize_relay_text("OK")
+    assert normalize_relay_text("好的？") == normalize_relay_text("好的?") == "好的?"
+    assert normalize_relay_text("ＯＫ！") == "ok!"
+    cache = RelayCache(max_entries=8)
+    assert cache.key(direction="d", text="OK?") != cache.key(direction="d", text="OK.")
+
+
+def test_key_skips_long_or_empty_text() -> None:
+    cache = RelayCache(max_entries=8, max_chars=10)
+    assert cache.key(direction="d", text="OK") is not None
+    assert cache.key(direction="d", text="...") is None
+    assert cache.key(direction="d", text="x" * 11) is None
+    assert RelayCache(max_entries=0).key(direction="d", text="OK") is None
+
+
+async def test_repeated_phrase_hits_cache_and_exports_saved_latency() -> None:
+    cache = RelayCache(max_entries=8)
+    llm = _SlowLLM(delay=0.02)
+    direction = "en->zh:relay_zh"
+    hits_before = _lookups(direction, "cached")
+    saved_before = _saved(direction)
+
+    first = await merchant_text_to_user_lang("OK.", src="en", dst="zh", llm=llm, cache=cache)
+    second = await merchant_text_to_user_lang("ok", src="en", dst="zh", llm=llm, cache=cache)
+
+    assert first.translated == second.translated == "好的"
+    assert not second.failed
+    assert llm.calls == 1
+    assert _lookups(direction, "cached") == hits_before + 1
+    assert _saved(direction) - saved_before >= 0.02
+
+
+async def test_concurrent_duplicates_share_one_llm_call() -> None:
+    cache = RelayCache(max_entries=8)
+    llm = _SlowLLM(delay=0.05)
+
+    results = await asyncio.gather(*(
+        user_to_merchant("please hold", src="en", dst="zh", llm=llm, cache=cache)
+        for _ in range(3)
+    ))
+
+    assert [r.translated for r in results] == ["好的"] * 3
+    assert llm.calls == 1
+
+
+async def test_cancelled_waiter_does_not_cancel_shared_call() -> None:
+    cache = RelayCache(max_entries=8)
+    llm = _SlowLLM(delay=0.05)
+
+    def relay() -> asyncio.Task[object]:
+        return asyncio.create_task(
+            merchant_text_to_user_lang("yes", src="en", dst="zh", llm=llm, cache=cache)
+        )
+
+    first, second = relay(), relay()
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert (await second).translated == "好的"  # type: ignore[attr-defined]
+    assert first.cancelled()
+    assert llm.calls == 1
+
+
+async def test_failure_is_not_cached() -> None:
+    cache = RelayCache(max_entries=8)
+    llm = _SlowLLM()
+    llm.fail = True
+
+    out = await merchant_text_to_user_lang("OK", src="en", dst="zh", llm=llm, cache=cache)
+    assert out.failed is True
+    assert len(cache) == 0
+
+    llm.fail = False
+    out = await merchant_text_to_user_lang("OK", src="en", dst="zh", llm=llm, cache=cache)
+    assert out.translated == "好的"
+    assert llm.calls == 2
+
+
+async def test_key_separates_direction_context_and_model() -> None:
+    cache = RelayCache(max_entries=8)
+    llm = _SlowLLM()
+
+    await merchant_text_to_user_lang("OK", src="en", dst="zh", llm=llm, cache=cache)
+    await merchant_text_to_user_lang("OK", src="zh", dst="en", llm=llm, cache=cache)
+    await merchant_text_to_user_lang(
+        "OK", src="en", dst="zh", llm=llm, cache=cache, task_category="booking"
+    )
+    await merchant_text_to_user_lang(
+        "OK", src="en", dst="zh", llm=llm, cache=cache, relay_strategy="summarize"
+    )
+    await merchant_text_to_user_lang(
+        "OK", src="en", dst="zh", llm=_SlowLLM(model="other"), cache=cache
+    )
+
+    assert len(cache) == 5
+
+
+def test_lru_bound_and_ttl() -> None:
+    cache = RelayCache(max_entries=2, ttl_s=60)
+    a, b, c = (cache.key(direction="d", text=t) for t in ("a", "b", "c"))
+    assert a is not None and b is not None and c is not None
+    cache.put(a, "A")
+    cache.put(b, "B")
+    assert cache.get(a) == "A"  # a 变成最近使用
+    cache.put(c, "C")
+    assert cache.get(b) is None
+    assert cache.get(a) == "A" and cache.get(c) == "C"
+
+    expired = RelayCache(max_entries=2, ttl_s=1e-9)
+    expired.put(a, "A")
+    assert expired.get(a) is None
+    assert len(expired) == 0
+
+
+def test_get_relay_cache_dedupes_by_config() -> None:
+    cfg = Config(relay_cache_max_entries=32)
+    assert get_relay_cache(cfg) is get_relay_cache(Config(relay_cache_max_entries=32))
+    assert get_relay_cache(Config(relay_cache_max_entries=0)) is None
+
+
+async def test_unshared_produce_runs_in_caller_task_and_is_still_cached() -> None:
+    cache = RelayCache(max_entries=8)
+    key = cache.key(direction="d", text="one moment")
+    release = asyncio.Event()
+    runs: list[asyncio.Task[object] | None] = []
+
+    async def produce() -> str:
+        runs.append(asyncio.current_task())
+        await release.wait()
+        return "稍等"
+
+    caller = asyncio.create_task(cache.translate(key, produce, shared=False))
+    await asyncio.sleep(0.01)
+    assert runs == [caller]
+    assert not cache._inflight  # 别的请求不会合并进来
+
+    caller.cancel()  # 调用方取消 → produce 跟着停
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    assert len(cache) == 0
+
+    release.set()
+    assert await cache.translate(key, produce, shared=False) == "稍等"
+    assert cache.get(key) == "稍等"  # type: ignore[arg-type]
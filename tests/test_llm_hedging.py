@@ -0,0 +1,282 @@
+"""LLM 请求对冲测试（``vocalize.llm.hedging`` + ``OpenAICompatClient``）。
+
+起一个本地 SSE server（``asyncio.start_server``），按请求序号注入首 token 延迟，
+用真实 openai SDK 走完整 HTTP 路径，覆盖：
+
+- 原请求首 token 慢于阈值 → 发对冲请求，对冲先出 token 胜出，慢的连接被关掉
+- 原请求够快 → 不对冲，只发一个请求，流完整读到 finish
+- 预算用完 → 不再对冲，老老实实等原请求
+- 阈值：样本不足用初始值；够了取 TTFT 分位数，夹在上下限之间
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+from prometheus_client import REGISTRY
+
+from vocalize.config import Config
+from vocalize.llm.base import ChatMessage, FinishChunk, TextDelta
+from vocalize.llm.hedging import HedgeBudget, HedgePolicy, TTFTWindow
+from vocalize.llm.openai_compat import OpenAICompatClient, OpenAICompatConfig
+
+
+def _event(payload: dict[str, object]) -> bytes:
+    body = {"id": "c", "object": "chat.completion.chunk", "created": 0, "model": "m", **payload}
+    return f"data: {json.dumps(body)}\n\n".encode()
+
+
+class _LatencySSEServer:
+    """按请求头 ``X-Test-Attempt``（第几次发请求，见 ``_client``）取首 token 延迟。
+
+    不按 POST 到达顺序取：原请求连接慢时对冲请求可能先到，延迟会错配。回复是
+    ``parts`` 个文本 delta（``reply-<attempt>``、`` part2`` ...），相邻 delta
+    间隔 ``gap`` 秒。
+    """
+
+    def __init__(self, delays: list[float], *, parts: int = 1, gap: float = 0.0) -> None:
+        self.delays = list(delays)
+        self.parts = parts
+        self.gap = gap
+        self.posts = 0
+        self.disconnected = 0
+        self.port = 0
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode().split("\r\n")
+                length = 0
+                attempt = 0
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    if name.lower() == "content-length":
+                        length = int(value)
+                    elif name.lower() == "x-test-attempt":
+                        attempt = int(value)
+                if length:
+                    await reader.readexactly(length)
+                self.posts += 1
+                delay = self.delays[attempt - 1] if 0 < attempt <= len(self.delays) else 0.0
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                    b"Transfer-Encoding: chunked\r\n\r\n"
+                )
+                # 首个事件只有 role、没有内容：不算首 token
+                await self._send(writer, _event(
+                    {"choices": [{"index": 0, "delta": {"role": "assistant"}, "finish_reason": None}]}
+                ))
+                await asyncio.sleep(delay)
+                for i in range(self.parts):
+                    if i:
+                        await asyncio.sleep(self.gap)
+                    text = f"reply-{attempt}" if i == 0 else f" part{i + 1}"
+                    await self._send(writer, _event(
+                        {"choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}]}
+                    ))
+                await self._send(writer, _event(
+                    {"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+                ))
+                await self._send(writer, b"data: [DONE]\n\n")
+                writer.write(b"0\r\n\r\n")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.disconnected += 1
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, data: bytes) -> None:
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        await writer.drain()
+
+
+async def _server(
+    delays: list[float], *, parts: int = 1, gap: float = 0.0,
+) -> _LatencySSEServer:
+    srv = _LatencySSEServer(delays, parts=parts, gap=gap)
+    await srv.start()
+    return srv
+
+
+def _client(srv: _LatencySSEServer, policy: HedgePolicy) -> OpenAICompatClient:
+    """客户端的每次 ``create`` 调用带上递增的 ``X-Test-Attempt``。
+
+    原请求的 ``create`` 在对冲任务创建之前就已经开始执行，序号因此确定：
+    原请求 1、它的对冲 2，下一次 ``stream_chat`` 从 3 起。
+    """
+    client = OpenAICompatClient(
+        OpenAICompatConfig(api_key="sk-test", base_url=srv.base_url, model="m", hedge=policy)
+    )
+    completions = client._client.chat.completions
+    create = completions.create
+    attempts = 0
+
+    async def numbered_create(**kwargs: Any) -> Any:
+        nonlocal attempts
+        attempts += 1
+        return await create(**kwargs, extra_headers={"X-Test-Attempt": str(attempts)})
+
+    completions.create = numbered_create  # type: ignore[method-assign]
+    return client
+
+
+async def _collect(client: OpenAICompatClient) -> list[object]:
+    return [c async for c in client.stream_chat([ChatMessage(role="user", content="q")])]
+
+
+def _sample(name: str, labels: dict[str, str]) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+_FAST_POLICY = HedgePolicy(min_delay_s=0.05, max_delay_s=0.05, initial_delay_s=0.05)
+
+
+@pytest.fixture
+async def slow_then_fast() -> AsyncIterator[_LatencySSEServer]:
+    srv = await _server([2.0, 0.0])
+    try:
+        yield srv
+    finally:
+        await srv.stop()
+
+
+async def test_slow_first_token_is_hedged_and_hedge_wins(
+    slow_then_fast: _LatencySSEServer,
+) -> None:
+    client = _client(slow_then_fast, _FAST_POLICY)
+    hedged_before = _sample("vocalize_llm_hedge_requests_total", {"outcome": "hedged"})
+    wins_before = _sample("vocalize_llm_hedge_wins_total", {"winner": "hedge"})
+
+    started = time.monotonic()
+    out = await _collect(client)
+    elapsed = time.monotonic() - started
+
+    assert out == [TextDelta(text="reply-2"), FinishChunk(reason="stop")]
+    assert elapsed < 1.0
+    assert slow_then_fast.posts == 2
+    assert _sample("vocalize_llm_hedge_requests_total", {"outcome": "hedged"}) == hedged_before + 1
+    assert _sample("vocalize_llm_hedge_wins_total", {"winner": "hedge"}) == wins_before + 1
+    # 输掉的慢请求被关掉，不等它生成完
+    for _ in range(100):
+        if slow_then_fast.disconnected:
+            break
+        await asyncio.sleep(0.01)
+    assert slow_then_fast.disconnected >= 1
+
+
+async def test_fast_first_token_is_not_hedged_and_streams_to_the_end() -> None:
+    # delta 之间有间隔：没对冲时返回的流必须完整读完，不能读完首个 chunk 就被关
+    srv = await _server([0.0], parts=3, gap=0.1)
+    try:
+        client = _client(srv, HedgePolicy(min_delay_s=0.5, max_delay_s=0.5))
+        not_needed_before = _sample(
+            "vocalize_llm_hedge_requests_total", {"outcome": "not_needed"}
+        )
+
+        out = await _collect(client)
+
+        assert out == [
+            TextDelta(text="reply-1"), TextDelta(text=" part2"),
+            TextDelta(text=" part3"), FinishChunk(reason="stop"),
+        ]
+        assert srv.posts == 1
+        assert _sample(
+            "vocalize_llm_hedge_requests_total", {"outcome": "not_needed"}
+        ) == not_needed_before + 1
+    finally:
+        await srv.stop()
+
+
+async def test_budget_caps_hedges_per_client() -> None:
+    srv = await _server([0.3, 0.0, 0.3], parts=3, gap=0.1)
+    try:
+        policy = HedgePolicy(
+            min_delay_s=0.05, max_delay_s=0.05, initial_delay_s=0.05,
+            budget_ratio=0.0, budget_burst=1,
+        )
+        client = _client(srv, policy)
+        exhausted_before = _sample(
+            "vocalize_llm_hedge_requests_total", {"outcome": "budget_exhausted"}
+        )
+
+        first = await _collect(client)
+        second = await _collect(client)
+
+        tail = [TextDelta(text=" part2"), TextDelta(text=" part3"), FinishChunk(reason="stop")]
+        assert first == [TextDelta(text="reply-2"), *tail]  # 对冲胜出
+        assert second == [TextDelta(text="reply-3"), *tail]  # 没预算了，等原请求读完
+        assert srv.posts == 3
+        assert _sample(
+            "vocalize_llm_hedge_requests_total", {"outcome": "budget_exhausted"}
+        ) == exhausted_before + 1
+    finally:
+        await srv.stop()
+
+
+def test_policy_delay_tracks_ttft_percentile_within_bounds() -> None:
+    policy = HedgePolicy(
+        percentile=0.9, min_delay_s=0.2, max_delay_s=1.5,
+        initial_delay_s=0.8, min_samples=10,
+    )
+    window = TTFTWindow(size=100)
+    assert policy.delay(window) == 0.8
+
+    for i in range(1, 11):
+        window.observe(i / 10)  # 0.1 .. 1.0
+    assert policy.delay(window) == pytest.approx(0.9)
+
+    fast = TTFTWindow()
+    for _ in range(10):
+        fast.observe(0.05)
+    assert policy.delay(fast) == 0.2
+
+    slow = TTFTWindow()
+    for _ in range(10):
+        slow.observe(4.0)
+    assert policy.delay(slow) == 1.5
+
+
+def test_budget_allows_burst_plus_ratio_of_requests() -> None:
+    budget = HedgeBudget(ratio=0.1, burst=1)
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
+    for _ in range(10):
+        budget.note_request()
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
+
+
+def test_config_hedge_policy_is_opt_in() -> None:
+    assert Config().llm_hedge_policy() is None
+    policy = Config(
+        llm_hedge=True, llm_hedge_percentile=95,
+        llm_hedge_min_delay_ms=100, llm_hedge_max_delay_ms=900,
+        llm_hedge_budget_pct=20,
+    ).llm_hedge_policy()
+    assert policy is not None
+    assert policy.percentile == 0.95
+    assert (policy.min_delay_s, policy.max_delay_s) == (0.1, 0.9)
+    assert policy.initial_delay_s == pytest.approx(0.5)
+    assert policy.budget_ratio == 0.2
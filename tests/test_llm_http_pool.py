@@ -0,0 +1,193 @@
+"""``vocalize.llm.http_pool`` 共享 LLM 客户端测试。
+
+起一个真实的 HTTP/1.1 keep-alive server（``asyncio.start_server``，按 SSE 回一段
+chat completion），记录 TCP 连接数，覆盖：
+
+- 同一 ``(base_url, api_key, model)`` 只建一个客户端；不同 key 分开
+- prewarm 先把连接握手建好，之后的首轮 ``stream_chat`` 复用它、不再新建连接
+- 复用 / 新建连接与建连耗时进 Prometheus
+- 生成中途 ``aclose()``（barge-in）仍立刻断开连接，不会等流读完
+- ``Config`` → ``OpenAICompatClient.from_app_config`` 走共享客户端
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+
+import pytest
+from prometheus_client import REGISTRY
+
+from vocalize.config import Config
+from vocalize.llm.base import ChatMessage, TextDelta
+from vocalize.llm.http_pool import close_all_clients, get_client
+from vocalize.llm.openai_compat import OpenAICompatClient, OpenAICompatConfig
+
+
+def _sse_body() -> bytes:
+    chunks = [
+        {"choices": [{"index": 0, "delta": {"content": "hi"}, "finish_reason": None}]},
+        {"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]},
+    ]
+    lines = [
+        f"data: {json.dumps({'id': 'c', 'object': 'chat.completion.chunk', 'created': 0, 'model': 'm', **c})}\n\n"
+        for c in chunks
+    ]
+    return ("".join(lines) + "data: [DONE]\n\n").encode()
+
+
+class _KeepAliveServer:
+    def __init__(self) -> None:
+        self.connections = 0
+        self.requests: list[str] = []
+        # True：POST 只发第一个事件就挂住，模拟还在生成的流
+        self.stall = False
+        self.disconnected = asyncio.Event()
+        self.port = 0
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode().split("\r\n")
+                self.requests.append(lines[0])
+                length = 0
+                for line in lines[1:]:
+                    if line.lower().startswith("content-length:"):
+                        length = int(line.split(":", 1)[1])
+                if length:
+                    await reader.readexactly(length)
+                if lines[0].startswith("POST"):
+                    body = _sse_body()
+                    ctype = "text/event-stream"
+                else:
+                    body, ctype = b"", "text/plain"
+                payload = b"" if lines[0].startswith("HEAD") else body
+                if self.stall and payload:
+                    payload = payload[: payload.index(b"\n\n") + 2]
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    + f"Content-Type: {ctype}\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+                if self.stall and payload:
+                    await reader.read()  # 等客户端断开
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.disconnected.set()
+            writer.close()
+
+
+@pytest.fixture
+async def http_server() -> AsyncIterator[_KeepAliveServer]:
+    srv = _KeepAliveServer()
+    await srv.start()
+    try:
+        yield srv
+    finally:
+        await close_all_clients()
+        await srv.stop()
+
+
+def _requests(connection: str) -> float:
+    return REGISTRY.get_sample_value(
+        "vocalize_llm_http_requests_total", {"connection": connection}
+    ) or 0.0
+
+
+async def test_registry_dedupes_by_base_url_key_and_model(
+    http_server: _KeepAliveServer,
+) -> None:
+    a = get_client(base_url=http_server.base_url, api_key="sk-a", model="m")
+    assert get_client(base_url=http_server.base_url, api_key="sk-a", model="m") is a
+    assert get_client(base_url=http_server.base_url, api_key="sk-b", model="m") is not a
+    assert get_client(base_url=http_server.base_url, api_key="sk-a", model="n") is not a
+
+
+async def test_prewarmed_connection_serves_first_turn(
+    http_server: _KeepAliveServer,
+) -> None:
+    shared = get_client(
+        base_url=http_server.base_url, api_key="sk-test", model="m",
+        http2=False, prewarm_connections=1,
+    )
+    connect_before = REGISTRY.get_sample_value(
+        "vocalize_llm_http_connect_seconds_count"
+    ) or 0.0
+    await shared.prewarm()
+    assert http_server.connections == 1
+    reused_before = _requests("reused")
+
+    # 两个会话各自的客户端，共用同一个连接池
+    for _ in range(2):
+        client = OpenAICompatClient(
+            OpenAICompatConfig(api_key="sk-test", base_url=http_server.base_url, model="m"),
+            shared=shared,
+        )
+        out = [c async for c in client.stream_chat([ChatMessage(role="user", content="q")])]
+        assert TextDelta(text="hi") in out
+
+    assert http_server.connections == 1
+    assert [r.split()[0] for r in http_server.requests] == ["HEAD", "POST", "POST"]
+    assert _requests("reused") - reused_before == 2
+    assert REGISTRY.get_sample_value(
+        "vocalize_llm_http_connect_seconds_count"
+    ) == connect_before + 1
+
+
+async def test_from_app_config_uses_shared_client(
+    http_server: _KeepAliveServer,
+) -> None:
+    cfg = Config(
+        openai_api_key="sk-test", openai_base_url=http_server.base_url,
+        openai_model="m",
+    )
+    first = OpenAICompatClient.from_app_config(cfg)
+    second = OpenAICompatClient.from_app_config(cfg)
+
+    assert first.shared is not None
+    assert first.shared is second.shared
+    assert first._client is second._client
+
+
+def test_llm_http_client_without_api_key_raises() -> None:
+    with pytest.raises(ValueError, match="OPENAI_API_KEY"):
+        Config(openai_api_key=None).llm_http_client()
+
+
+async def test_barge_in_close_drops_connection_without_draining(
+    http_server: _KeepAliveServer,
+) -> None:
+    http_server.stall = True
+    shared = get_client(
+        base_url=http_server.base_url, api_key="sk-test", model="m", http2=False,
+    )
+    client = OpenAICompatClient(
+        OpenAICompatConfig(api_key="sk-test", base_url=http_server.base_url, model="m"),
+        shared=shared,
+    )
+    stream = client.stream_chat([ChatMessage(role="user", content="q")])
+    assert await stream.__anext__() == TextDelta(text="hi")
+
+    await asyncio.wait_for(stream.aclose(), timeout=1.0)
+    await asyncio.wait_for(http_server.disconnected.wait(), timeout=1.0)
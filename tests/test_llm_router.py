@@ -0,0 +1,325 @@
+"""多 provider LLM 路由测试（``vocalize.llm.router``）。
+
+用假 backend（实现 ``LLMService``）覆盖：首 token 前失败 / 超时 failover、
+吐过 chunk 后不切换、tool call 透传、按 EWMA 首 token 耗时选路与按层钉住、
+熔断开合、调用方错误不计入 backend、``LLM_BACKENDS`` 解析与构造。
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+
+import pytest
+from prometheus_client import REGISTRY
+
+from vocalize.config import Config
+from vocalize.llm import router as router_mod
+from vocalize.llm.base import (
+    ChatMessage,
+    FinishChunk,
+    LLMChunk,
+    TextDelta,
+    ToolCallDelta,
+    ToolDef,
+)
+from vocalize.llm.openai_compat import LLMServiceError, OpenAICompatClient
+from vocalize.llm.router import (
+    BackendHealth,
+    CircuitBreaker,
+    LLMRouter,
+    RoutedLLM,
+    build_llm_service,
+    for_layer,
+    parse_backends,
+    parse_layers,
+)
+
+
+class _Backend:
+    """假 backend：首 chunk 前等 ``delay`` 秒，可在首 chunk 前 / 后抛错。"""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        delay: float = 0.0,
+        fail_before: Exception | None = None,
+        fail_after: Exception | None = None,
+        chunks: list[LLMChunk] | None = None,
+    ) -> None:
+        self.model = f"{name}-model"
+        self.delay = delay
+        self.fail_before = fail_before
+        self.fail_after = fail_after
+        self.chunks = chunks if chunks is not None else [
+            TextDelta(text=f"from-{name}"), FinishChunk(reason="stop"),
+        ]
+        self.calls: list[list[ToolDef] | None] = []
+        self.closed = 0
+
+    async def stream_chat(
+        self,
+        messages: list[ChatMessage],
+        tools: list[ToolDef] | None = None,
+    ) -> AsyncIterator[LLMChunk]:
+        self.calls.append(tools)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail_before is not None:
+                raise self.fail_before
+            yield self.chunks[0]
+            if self.fail_after is not None:
+                raise self.fail_after
+            for chunk in self.chunks[1:]:
+                yield chunk
+        finally:
+            self.closed += 1
+
+
+@pytest.fixture(autouse=True)
+def _fresh_health() -> Iterator[None]:
+    router_mod._health.clear()
+    yield
+    router_mod._health.clear()
+
+
+def _sample(name: str, labels: dict[str, str]) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+async def _collect(llm: object, tools: list[ToolDef] | None = None) -> list[LLMChunk]:
+    return [
+        c async for c in llm.stream_chat(  # type: ignore[attr-defined]
+            [ChatMessage(role="user", content="q")], tools
+        )
+    ]
+
+
+_MSG = [ChatMessage(role="user", content="q")]
+
+
+async def test_error_before_first_chunk_fails_over() -> None:
+    a = _Backend("a", fail_before=LLMServiceError("boom", upstream_status=503))
+    b = _Backend("b")
+    router = LLMRouter([("a", a), ("b", b)])
+    failovers_before = _sample(
+        "vocalize_llm_route_failovers_total",
+        {"layer": "relay", "backend": "a", "reason": "error"},
+    )
+    served_before = _sample(
+        "vocalize_llm_route_requests_total", {"layer": "relay", "backend": "b"}
+    )
+
+    out = await _collect(router.for_layer("relay"))
+
+    assert out == [TextDelta(text="from-b"), FinishChunk(reason="stop")]
+    assert _sample(
+        "vocalize_llm_route_failovers_total",
+        {"layer": "relay", "backend": "a", "reason": "error"},
+    ) == failovers_before + 1
+    assert _sample(
+        "vocalize_llm_route_requests_total", {"layer": "relay", "backend": "b"}
+    ) == served_before + 1
+    assert router.backends[0].health.error_rate > 0
+
+
+async def test_slow_first_token_fails_over_after_timeout() -> None:
+    a = _Backend("a", delay=5.0)
+    b = _Backend("b")
+    router = LLMRouter([("a", a), ("b", b)], first_token_timeout_s=0.05)
+
+    out = await asyncio.wait_for(_collect(router), 1.0)
+
+    assert out[0] == TextDelta(text="from-b")
+    assert a.closed == 1  # 超时的请求被取消、流已关闭
+
+
+async def test_last_candidate_has_no_first_token_timeout() -> None:
+    only = _Backend("only", delay=0.1)
+    router = LLMRouter([("only", only)], first_token_timeout_s=0.01)
+
+    out = await _collect(router)
+
+    assert out[0] == TextDelta(text="from-only")
+
+
+async def test_no_failover_after_first_chunk() -> None:
+    a = _Backend("a", fail_after=LLMServiceError("mid-stream", upstream_status=None))
+    b = _Backend("b")
+    router = LLMRouter([("a", a), ("b", b)])
+    seen: list[LLMChunk] = []
+
+    with pytest.raises(LLMServiceError, match="mid-stream"):
+        async for chunk in router.stream_chat(_MSG):
+            seen.append(chunk)
+
+    assert seen == [TextDelta(text="from-a")]
+    assert b.calls == []
+    assert router.backends[0].health.error_rate > 0
+
+
+async def test_all_backends_failing_raises_last_error() -> None:
+    router = LLMRouter([
+        ("a", _Backend("a", fail_before=LLMServiceError("a down"))),
+        ("b", _Backend("b", fail_before=LLMServiceError("b down"))),
+    ])
+
+    with pytest.raises(LLMServiceError, match="b down"):
+        await _collect(router)
+
+
+async def test_caller_error_is_not_failed_over_or_counted() -> None:
+    a = _Backend("a", fail_before=LLMServiceError("bad request", upstream_status=400))
+    b = _Backend("b")
+    router = LLMRouter([("a", a), ("b", b)])
+
+    with pytest.raises(LLMServiceError, match="bad request"):
+        await _collect(router)
+
+    assert b.calls == []
+    assert router.backends[0].health.error_rate == 0
+
+
+async def test_tool_calls_pass_through_unchanged() -> None:
+    tool = ToolDef(name="emit", description="d", parameters={"type": "object"})
+    chunks: list[LLMChunk] = [
+        ToolCallDelta(tool_call_index=0, tool_call_id="call_1", name="emit",
+                      arguments_delta='{"a"'),
+        ToolCallDelta(tool_call_index=0, tool_call_id=None, name=None,
+                      arguments_delta=": 1}"),
+        FinishChunk(reason="tool_calls"),
+    ]
+    a = _Backend("a", fail_before=LLMServiceError("down"))
+    b = _Backend("b", chunks=chunks)
+    router = LLMRouter([("a", a), ("b", b)])
+
+    out = await _collect(router.for_layer("task_planner"), tools=[tool])
+
+    assert out == chunks
+    assert a.calls == [[tool]] and b.calls == [[tool]]
+
+
+async def test_routes_to_lowest_ewma_ttft_and_honours_pinned_layers() -> None:
+    slow = _Backend("slow", delay=0.05)
+    fast = _Backend("fast")
+    router = LLMRouter(
+        [("slow", slow), ("fast", fast)], layers={"task_planner": "slow"},
+    )
+    router.backends[0].health.observe_ttft(0.8)
+    router.backends[1].health.observe_ttft(0.2)
+
+    assert (await _collect(router.for_layer("relay")))[0] == TextDelta(text="from-fast")
+    assert (await _collect(router.for_layer("task_planner")))[0] == TextDelta(text="from-slow")
+    assert router.for_layer("relay").model == "fast-model"
+    assert router.for_layer("task_planner").model == "slow-model"
+
+
+async def test_model_follows_the_backend_that_served_after_failover() -> None:
+    a = _Backend("a", fail_before=LLMServiceError("down", upstream_status=503))
+    b = _Backend("b")
+    router = LLMRouter([("a", a), ("b", b)], layers={"relay": "a"})
+    relay = router.for_layer("relay")
+    assert relay.model == "a-model"  # 还没请求过：首选
+
+    await _collect(relay)
+
+    # 钉住的 a 仍排第一，但出流的是 b：缓存 key 记在 b 名下
+    assert router.candidates("relay")[0].name == "a"
+    assert relay.model == "b-model"
+
+
+def test_error_rate_penalises_score_and_stale_ewma_is_forgotten() -> None:
+    now = [0.0]
+    health = BackendHealth("x", stale_after_s=60.0, clock=lambda: now[0])
+    now[0] = 10.0
+    health.observe_ttft(0.5)
+    assert health.score(default_ttft_s=1.0) == pytest.approx(0.5)
+
+    health.observe_failure()  # 错误率 0.2 → 分数 × 1.8
+    assert health.score(default_ttft_s=1.0) == pytest.approx(0.9)
+
+    now[0] = 100.0  # 首 token 样本过期，按默认值算（错误率照旧）
+    assert health.score(default_ttft_s=1.0) == pytest.approx(1.8)
+
+
+def test_circuit_breaker_opens_half_opens_and_closes() -> None:
+    now = [0.0]
+    breaker = CircuitBreaker(
+        failure_threshold=2, reset_timeout_s=30.0, clock=lambda: now[0],
+    )
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.available()
+
+    now[0] = 31.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN and breaker.available()
+    breaker.record_failure()  # 半开探测失败：立刻再断开
+    assert breaker.state == CircuitBreaker.OPEN
+
+    now[0] = 62.0
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+async def test_open_circuit_moves_backend_to_the_back() -> None:
+    a = _Backend("a", fail_before=LLMServiceError("down", upstream_status=503))
+    b = _Backend("b")
+    # 钉住 a：熔断前每次都先打 a；断开后即使钉住也排到最后
+    router = LLMRouter(
+        [("a", a), ("b", b)], layers={"default": "a"}, failure_threshold=2,
+    )
+
+    for _ in range(2):
+        await _collect(router)
+    assert router.backends[0].health.breaker.state == CircuitBreaker.OPEN
+    assert _sample("vocalize_llm_backend_circuit_state", {"backend": "a"}) == 2
+
+    await _collect(router)
+    assert len(a.calls) == 2  # 断开后不再先打 a
+    assert [c.name for c in router.candidates("default")] == ["b", "a"]
+
+
+async def test_for_layer_leaves_plain_services_alone() -> None:
+    plain = _Backend("plain")
+    assert for_layer(plain, "relay") is plain
+
+    router = LLMRouter([("a", _Backend("a"))])
+    view = for_layer(router, "relay")
+    assert isinstance(view, RoutedLLM) and view.layer == "relay"
+
+
+def test_parse_backends_reads_keys_from_named_env_vars() -> None:
+    raw = (
+        "qwen|https://dashscope.example/v1|qwen-plus|QWEN_KEY;"
+        "broken|https://x;"
+        "nokey|https://y/v1|m|MISSING_KEY;"
+        "primary|https://z/v1|m|QWEN_KEY"
+    )
+    specs = parse_backends(raw, environ={"QWEN_KEY": "sk-q"})
+
+    assert [(s.name, s.base_url, s.model, s.api_key) for s in specs] == [
+        ("qwen", "https://dashscope.example/v1", "qwen-plus", "sk-q"),
+    ]
+    assert parse_layers("task_planner=primary, relay = qwen,bogus") == {
+        "task_planner": "primary", "relay": "qwen",
+    }
+
+
+def test_build_llm_service_returns_router_only_with_backends(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    single = build_llm_service(Config(openai_api_key="sk-test"))
+    assert isinstance(single, OpenAICompatClient)
+
+    monkeypatch.setenv("BACKUP_KEY", "sk-backup")
+    routed = build_llm_service(Config(
+        openai_api_key="sk-test",
+        llm_backends="backup|https://backup.example/v1|backup-model|BACKUP_KEY",
+        llm_route_layers="task_planner=primary",
+        llm_route_first_token_timeout_ms=1500,
+    ))
+    assert isinstance(routed, LLMRouter)
+    assert [b.name for b in routed.backends] == ["primary", "backup"]
+    assert routed.for_layer("task_planner").model == "deepseek-chat"
+    assert routed._first_token_timeout_s == 1.5
@@ -834,3 +834,88 @@ async def test_bistream_dispatch_multi_segment_unchanged() -> None:
     assert chunks[-1].is_final_segment is True
     full = "".join(c.text for c in chunks)
     assert "好的" in full and "明天给你确认" in full
+
+
+class _LiveTTS:
+    """每收到一段就立刻 yield 音频（模拟真正的流式合成）。"""
+
+    output_sample_rate: int = 24000
+    output_encoding: AudioEncoding = "pcm_s16le"
+
+    def __init__(self) -> None:
+        self.chunks: list[TextChunk] = []
+
+    async def stream_synthesize(
+        self, text_chunks: AsyncIterator[TextChunk]
+    ) -> AsyncIterator[bytes]:
+        async for c in text_chunks:
+            self.chunks.append(c)
+            yield c.text.encode()
+
+
+async def test_speak_stream_plays_first_sentence_before_text_completes() -> None:
+    transport = FakeTransport()
+    tts = _LiveTTS()
+    pipeline = VoicePipeline(
+        transport=transport, stt=FakeSTT([]), llm=FakeLLM([]), tts=tts,
+        system_prompt="sys", default_language="zh",
+    )
+    release = asyncio.Event()
+
+    async def text() -> AsyncIterator[str]:
+        for piece in ("您好，", "今晚七点", "有位子。", "请问"):
+            yield piece
+        await release.wait()
+        for piece in ("几位？",):
+            yield piece
+
+    task = asyncio.create_task(pipeline.speak_stream(text(), "zh"))
+    for _ in range(100):
+        await asyncio.sleep(0.01)
+        if transport.output_blocks:
+            break
+    # 第一句已经在播，文本流还卡在第二句中间
+    assert not task.done()
+    assert tts.chunks[0].text == "您好，今晚七点有位子。"
+    assert tts.chunks[0].is_final_segment is False
+    assert transport.output_blocks
+
+    release.set()
+    full = await asyncio.wait_for(task, timeout=2.0)
+
+    assert full == "您好，今晚七点有位子。请问几位？"
+    assert "".join(c.text for c in tts.chunks) == full
+    assert tts.chunks[-1].is_final_segment is True
+    assert transport.output_calls == 1
+
+
+async def test_speak_stream_short_text_is_single_final_frame() -> None:
+    transport = FakeTransport()
+    tts = _LiveTTS()
+    pipeline = VoicePipeline(
+        transport=transport, stt=FakeSTT([]), llm=FakeLLM([]), tts=tts,
+        system_prompt="sys", default_language="en",
+    )
+
+    async def text() -> AsyncIterator[str]:
+        for piece in ("Please ", "hold."):
+            yield piece
+
+    assert await pipeline.speak_stream(text(), "en") == "Please hold."
+    assert [(c.text, c.is_final_segment) for c in tts.chunks] == [("Please hold.", True)]
+
+
+async def test_speak_stream_text_error_cancels_tts_and_propagates() -> None:
+    transport = FakeTransport()
+    tts = _LiveTTS()
+    pipeline = VoicePipeline(
+        transport=transport, stt=FakeSTT([]), llm=FakeLLM([]), tts=tts,
+        system_prompt="sys", default_language="zh",
+    )
+
+    async def text() -> AsyncIterator[str]:
+        yield "好的。"
+        raise LLMServiceError("boom")
+
+    with pytest.raises(LLMServiceError):
+        await asyncio.wait_for(pipeline.speak_stream(text(), "zh"), timeout=2.0)
@@ -291,6 +291,38 @@ async def test_role_tagged_transport_keeps_overlapping_stream_roles() -> None:
     ]
 
 
+@pytest.mark.asyncio
+async def test_role_tagged_transport_exposes_vad_speech_active(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """SenseVoice uplink DTX must see the web VAD state through the wrapper
+    both production pipelines use."""
+    from vocalize.stt.sensevoice import _speech_active
+    from vocalize.transports.web import WebUserTransport
+
+    async def outbound_send(role: str, pcm: bytes) -> None:
+        pass
+
+    transport = WebUserTransport(
+        inbound_queue=asyncio.Queue(),
+        outbound_send=outbound_send,
+    )
+    voiced_pattern = [False] * 2 + [True] * 3
+
+    def fake_is_speech(audio: bytes, sample_rate: int) -> bool:
+        return voiced_pattern.pop(0)
+
+    monkeypatch.setattr(transport._vad, "is_speech", fake_is_speech)
+    for _ in range(5):
+        transport.push_inbound(b"\x01" * 960)
+    await transport.close()
+    wrapped = _RoleTaggedTransport(transport, "ai_to_user")
+
+    seen = [_speech_active(wrapped) async for _ in wrapped.input_stream()]
+
+    assert seen == [False, False, True, True, True]
+
+
 @pytest.mark.asyncio
 async def test_on_demand_translate_emits_translation_transcript() -> None:
     state = TaskState(
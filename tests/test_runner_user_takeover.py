@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Iterator
 from typing import Any
 
 import pytest
 
+from vocalize.dialogue import relay_cache as relay_cache_mod
 from vocalize.dialogue.state import TaskPhase, TaskState
 from vocalize.dialogue.user_channel import WebSocketUserChannel
 from vocalize.llm.base import LLMChunk, TextDelta
@@ -13,6 +14,14 @@ from vocalize.server.runner import DialogueOrchestratorRunner
 from vocalize.server.state import Session
 
 
+@pytest.fixture(autouse=True)
+def _fresh_relay_cache() -> Iterator[None]:
+    # takeover 走进程级 relay 缓存；用例之间不能串
+    relay_cache_mod._caches.clear()
+    yield
+    relay_cache_mod._caches.clear()
+
+
 def _build_runner_for_test(session: Session) -> DialogueOrchestratorRunner:
     runner = DialogueOrchestratorRunner.__new__(DialogueOrchestratorRunner)
     runner.text_frames = []
@@ -250,3 +259,45 @@ async def test_runner_consume_takeover_q_relay_failure_falls_back_to_original()
 
     assert spoken == [("Hello", "zh")]
     assert events == []
+
+
+@pytest.mark.asyncio
+async def test_runner_consume_takeover_q_uses_shared_relay_cache() -> None:
+    from vocalize.config import get_config
+    from vocalize.dialogue.relay_cache import get_relay_cache
+
+    state = TaskState(
+        session_id="s",
+        user_task_description="t",
+        phase=TaskPhase.EXECUTION_ACTIVE,
+        user_lang="en",
+        merchant_lang="zh",
+        user_takeover_active=True,
+        task_category="restaurant_booking",
+        relay_strategy="polite",
+    )
+    runner = _build_runner_for_test(
+        Session(session_id="s", task_description="t", task_state=state)
+    )
+    order: list[str] = []
+    spoken: list[tuple[str, str]] = []
+    events: list[dict[str, Any]] = []
+    llm = _FakeLLM(chunks=[TextDelta("请稍等")])
+    runner._merchant_lang_supplier = lambda: "zh"
+    runner._merchant_tts = _MerchantTTS(spoken, order)
+    runner._llm = llm
+    runner._user_channel = _PushChannel(events, order)
+    runner._orchestrator = _OrchestratorWithSegment()
+
+    for _ in range(2):
+        runner._takeover_q = asyncio.Queue()
+        runner._takeover_q.put_nowait(("Please hold.", "en", "pf-1"))
+        runner._merchant_transport = _MerchantTransport()
+        await _drive_takeover_once(runner)
+
+    assert spoken == [("请稍等", "zh")] * 2
+    assert llm.call_count == 1
+    cache = get_relay_cache(get_config())
+    assert cache is not None
+    [key] = cache._entries
+    assert (key.task_category, key.relay_strategy) == ("restaurant_booking", "polite")
@@ -7,9 +7,10 @@ from vocalize.config import reset_config
 from vocalize.llm.openai_compat import OpenAICompatClient
 from vocalize.server import _default_user_pipeline_factory
 from vocalize.server import create_app
-from vocalize.stt.sensevoice import SenseVoiceClient
+from vocalize.stt.sensevoice import SenseVoiceClient, SenseVoiceStream
 from vocalize.stt.sensevoice import SenseVoiceError
-from vocalize.tts.cosyvoice import CosyVoiceClient
+from vocalize.tts.cache import CachingTTS
+from vocalize.tts.cosyvoice import CosyVoiceClient, CosyVoiceSession
 
 
 class _FakeTransport:
@@ -30,14 +31,21 @@ def test_default_pipeline_factory_builds_clients_from_app_config(monkeypatch) ->
 
     pipeline = _default_user_pipeline_factory(_FakeTransport())
 
-    assert isinstance(pipeline._stt, SenseVoiceClient)
-    assert pipeline._stt.host == "127.0.0.1"
-    assert pipeline._stt.port == 18000
-    assert pipeline._stt.language_hint == "zh"
+    # STT is a per-call-leg stream wrapping a client built from app config.
+    assert isinstance(pipeline._stt, SenseVoiceStream)
+    assert isinstance(pipeline._stt.client, SenseVoiceClient)
+    assert pipeline._stt.client.host == "127.0.0.1"
+    assert pipeline._stt.client.port == 18000
+    assert pipeline._stt.client.language_hint == "zh"
+    assert pipeline._stt.client.uplink_coalesce_ms == 120
+    assert pipeline._stt.client.uplink_dtx is False
     assert isinstance(pipeline._llm, OpenAICompatClient)
-    assert isinstance(pipeline._tts, CosyVoiceClient)
-    assert pipeline._tts.host == "127.0.0.1"
-    assert pipeline._tts.port == 18001
+    # TTS is a per-call-leg session behind the process-wide phrase cache.
+    assert isinstance(pipeline._tts, CachingTTS)
+    assert isinstance(pipeline._tts.inner, CosyVoiceSession)
+    assert isinstance(pipeline._tts.client, CosyVoiceClient)
+    assert pipeline._tts.client.host == "127.0.0.1"
+    assert pipeline._tts.client.port == 18001
 
 
 def test_sensevoice_from_app_config_requires_gpu_host(monkeypatch) -> None:
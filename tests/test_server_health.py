@@ -43,6 +43,20 @@ async def test_health_reports_gpu_unreachable() -> None:
     assert body == {"ok": True, "gpu_reachable": False}
 
 
+async def test_health_reports_tts_warmup_progress() -> None:
+    class _Warmup:
+        def status(self) -> dict:
+            return {"ready": False, "warm": 4, "total": 6, "failed": 1}
+
+    async def probe() -> bool:
+        return True
+
+    app = _app(probe)
+    app.state.tts_warmup = _Warmup()
+    body = await _request(app)
+    assert body["tts_warmup"] == {"ready": False, "warm": 4, "total": 6, "failed": 1}
+
+
 async def test_health_swallows_probe_exception() -> None:
     """A flaky probe (DNS error, timeout) MUST not 500 the health endpoint —
     operations relies on /health being always up.
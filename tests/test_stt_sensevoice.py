@@ -9,6 +9,7 @@
 - 非 fatal error 帧不中断流
 - fatal error 帧抛 ``SenseVoiceError``
 - 调用方 cancel 时客户端发出 ``stop`` 并关闭 socket
+- ``SenseVoiceStream``：多轮复用一条连接、被放弃轮次的残余帧不串到下一轮、断线重连
 """
 from __future__ import annotations
 
@@ -21,7 +22,7 @@ import websockets
 from websockets.asyncio.server import ServerConnection, serve
 
 from vocalize.stt.base import Transcript
-from vocalize.stt.sensevoice import SenseVoiceClient, SenseVoiceError
+from vocalize.stt.sensevoice import SenseVoiceClient, SenseVoiceError, SenseVoiceStream
 
 
 # ---------------------------------------------------------------------------
@@ -37,9 +38,15 @@ class FakeServer:
     def __init__(self) -> None:
         self.received_text: list[dict] = []      # 解析后的 JSON 控制帧
         self.received_audio: list[bytes] = []    # 原样二进制帧
+        self.received_order: list[str] = []      # "audio:<bytes>" / 事件名，按到达顺序
         self.script: list[dict] | None = None    # 收到第一个 PCM 后向客户端发的消息序列
         self.fatal_after_start: dict | None = None  # 一收到 start 就发的 fatal
         self.send_on_end_of_utterance: list[dict] | None = None
+        # 每收到一次 end_of_utterance 弹出一条 final（多轮长连接测试用）
+        self.finals_on_eou: list[dict] = []
+        # 第一条连接收到这么多 PCM 帧后异常断开（重连测试用）
+        self.drop_first_after_audio: int | None = None
+        self.connections = 0
         self._server = None
         self.port: int = 0
 
@@ -55,11 +62,15 @@ class FakeServer:
 
     async def _handler(self, ws: ServerConnection) -> None:
         sent_script = False
+        self.connections += 1
+        conn_no = self.connections
+        audio_frames = 0
         try:
             async for msg in ws:
                 if isinstance(msg, str):
                     parsed = json.loads(msg)
                     self.received_text.append(parsed)
+                    self.received_order.append(str(parsed.get("event")))
                     if parsed.get("event") == "start" and self.fatal_after_start:
                         await ws.send(json.dumps(self.fatal_after_start))
                         await ws.close()
@@ -68,11 +79,23 @@ class FakeServer:
                             self.send_on_end_of_utterance:
                         for item in self.send_on_end_of_utterance:
                             await ws.send(json.dumps(item))
+                    if parsed.get("event") == "end_of_utterance" and self.finals_on_eou:
+                        await ws.send(json.dumps(self.finals_on_eou.pop(0)))
+                    if parsed.get("event") == "reset":
+                        await ws.send(json.dumps({
+                            "event": "reset_ack", "seq": parsed.get("seq"),
+                            "utterance_id": 0,
+                        }))
                     if parsed.get("event") == "stop":
                         await ws.close()
                         return
                 else:
                     self.received_audio.append(bytes(msg))
+                    self.received_order.append(f"audio:{len(msg)}")
+                    audio_frames += 1
+                    if conn_no == 1 and audio_frames == self.drop_first_after_audio:
+                        await ws.close(code=1011, reason="gpu worker restarted")
+                        return
                     if not sent_script and self.script:
                         sent_script = True
                         for item in self.script:
@@ -157,6 +180,25 @@ async def test_parses_partial_then_final_with_language(
     assert out[0].utterance_id == out[1].utterance_id == 0
 
 
+async def test_parses_stable_text_of_incremental_partials(
+    fake_server: FakeServer,
+) -> None:
+    fake_server.script = [
+        {"text": "我想订一张，明天的", "stable_text": "我想订一张，", "is_final": False,
+         "confidence": 1.0, "start_time": 0.0, "end_time": 7.5, "utterance_id": 0,
+         "language": "zh"},
+        {"text": "我想订一张，明天的桌子。", "is_final": True, "confidence": 1.0,
+         "start_time": 0.0, "end_time": 8.0, "utterance_id": 0, "language": "zh"},
+    ]
+    client = SenseVoiceClient(host="127.0.0.1", port=fake_server.port)
+
+    out = [t async for t in client.stream_transcribe(_audio_iter([b"\x00" * 960]))]
+
+    assert out[0].stable_text == "我想订一张，"
+    assert out[0].text.startswith(out[0].stable_text)
+    assert out[1].stable_text is None  # final / 整段重解模式不带
+
+
 async def test_non_fatal_error_does_not_break_stream(
     fake_server: FakeServer,
 ) -> None:
@@ -478,3 +520,240 @@ async def test_server_crash_mid_send_is_not_silently_swallowed() -> None:
     finally:
         server.close()
         await server.wait_closed()
+
+
+async def test_uplink_coalesces_blocks_and_flushes_before_eos(
+    fake_server: FakeServer,
+) -> None:
+    fake_server.finals_on_eou = [_final("第一句", 0)]
+    # 120 ms @ 16 kHz int16 = 3840 bytes = 4 个 30 ms 块
+    client = SenseVoiceClient(
+        host="127.0.0.1", port=fake_server.port, uplink_coalesce_ms=120,
+    )
+    blocks = [bytes([i]) * 960 for i in range(10)]
+
+    out = [t async for t in client.stream_transcribe(_audio_iter(blocks))]
+
+    assert [t.text for t in out] == ["第一句"]
+    assert b"".join(fake_server.received_audio) == b"".join(blocks)
+    assert fake_server.received_order == [
+        "start", "audio:3840", "audio:3840", "audio:1920", "end_of_utterance", "stop",
+    ]
+
+
+async def test_stream_vad_eos_flushes_coalesced_audio_first(
+    fake_server: FakeServer,
+) -> None:
+    class _VadTransport:
+        _on_eos = None
+
+    transport = _VadTransport()
+
+    async def speech_then_eos() -> AsyncIterator[bytes]:
+        yield b"\x01" * 960
+        yield b"\x02" * 960
+        await transport._on_eos()  # type: ignore[misc]  # 客户端 VAD 判定说完
+        yield b"\x03" * 960
+
+    fake_server.finals_on_eou = [_final("好的", 0), _final("", 0)]
+    stream = SenseVoiceClient(
+        host="127.0.0.1", port=fake_server.port, uplink_coalesce_ms=200,
+    ).open_stream()
+    try:
+        async for _ in stream.stream_transcribe(speech_then_eos(), transport=transport):
+            pass
+    finally:
+        await stream.aclose()
+
+    assert fake_server.received_order[:5] == [
+        "start", "audio:1920", "end_of_utterance", "audio:960", "end_of_utterance",
+    ]
+
+
+async def test_uplink_dtx_replaces_silence_with_gap_and_preroll(
+    fake_server: FakeServer,
+) -> None:
+    class _VadTransport:
+        speech_active = False
+
+    transport = _VadTransport()
+    speech, silence = b"\x01" * 960, b"\x00" * 960
+
+    async def talk() -> AsyncIterator[bytes]:
+        # 说 2 块 → 停顿 20 块（600 ms）→ 说 1 块 → 句尾静音 10 块
+        for active, block, n in (
+            (True, speech, 2), (False, silence, 20), (True, speech, 1),
+            (False, silence, 10),
+        ):
+            for _ in range(n):
+                transport.speech_active = active
+                yield block
+
+    fake_server.finals_on_eou = [_final("好的", 0)]
+    client = SenseVoiceClient(
+        host="127.0.0.1", port=fake_server.port, uplink_dtx=True,
+    )
+    out = [t async for t in client.stream_transcribe(talk(), transport=transport)]
+
+    assert [t.text for t in out] == ["好的"]
+    # 停顿：200 ms hangover 照发（6 块），其余 14 块中最老的 4 块（120 ms）只记成
+    # gap，最近 10 块（300 ms preroll）在恢复说话时补发在 gap 之后
+    # 句尾：hangover 6 块照发，剩下 4 块在 EOS 前的 flush 里记成 gap
+    assert fake_server.received_order == (
+        ["start"] + ["audio:960"] * 8 + ["gap"] + ["audio:960"] * 17
+        + ["gap", "end_of_utterance", "stop"]
+    )
+    gaps = [m["ms"] for m in fake_server.received_text if m.get("event") == "gap"]
+    assert gaps == [120, 120]
+
+
+async def test_uplink_dtx_sends_everything_without_transport_vad(
+    fake_server: FakeServer,
+) -> None:
+    fake_server.finals_on_eou = [_final("好的", 0)]
+    client = SenseVoiceClient(
+        host="127.0.0.1", port=fake_server.port, uplink_dtx=True,
+    )
+    blocks = [b"\x00" * 960] * 20
+
+    out = [t async for t in client.stream_transcribe(_audio_iter(blocks))]
+
+    assert [t.text for t in out] == ["好的"]
+    assert b"".join(fake_server.received_audio) == b"".join(blocks)
+    assert "gap" not in fake_server.received_order
+
+
+async def test_mulaw_link_encoding_is_declared_and_halves_uplink(
+    fake_server: FakeServer,
+) -> None:
+    from vocalize import codec
+
+    fake_server.finals_on_eou = [_final("好的", 0)]
+    client = SenseVoiceClient(
+        host="127.0.0.1", port=fake_server.port,
+        uplink_coalesce_ms=60, link_encoding="mulaw",
+    )
+    blocks = [bytes([i, 0x10]) * 480 for i in range(4)]
+
+    out = [t async for t in client.stream_transcribe(_audio_iter(blocks))]
+
+    assert [t.text for t in out] == ["好的"]
+    assert fake_server.received_text[0]["encoding"] == "mulaw"
+    # 60 ms 攒包按 PCM 计（2 块 = 1920 字节），编码后每条 960 字节
+    assert fake_server.received_order[1:3] == ["audio:960", "audio:960"]
+    wire = b"".join(fake_server.received_audio)
+    assert wire == codec.encode("mulaw", b"".join(blocks))
+
+
+# ---------------------------------------------------------------------------
+# SenseVoiceStream：call-leg 级长连接
+# ---------------------------------------------------------------------------
+def _final(text: str, utterance_id: int = 0) -> dict:
+    return {"text": text, "is_final": True, "confidence": 0.9, "start_time": 0.0,
+            "end_time": 0.4, "utterance_id": utterance_id, "language": "zh"}
+
+
+async def test_stream_reuses_one_connection_across_turns(
+    fake_server: FakeServer,
+) -> None:
+    from prometheus_client import REGISTRY
+
+    fake_server.finals_on_eou = [_final("第一句", 0), _final("第二句", 1)]
+    stream = SenseVoiceClient(
+        host="127.0.0.1", port=fake_server.port,
+    ).open_stream()
+    avoided_before = REGISTRY.get_sample_value(
+        "vocalize_stt_handshakes_avoided_total"
+    ) or 0.0
+
+    try:
+        first = [t async for t in stream.stream_transcribe(_audio_iter([b"\x01" * 320]))]
+        second = [t async for t in stream.stream_transcribe(_audio_iter([b"\x02" * 320]))]
+    finally:
+        await stream.aclose()
+
+    assert [t.text for t in first] == ["第一句"]
+    assert [t.text for t in second] == ["第二句"]
+    assert fake_server.connections == 1
+    events = [m.get("event") for m in fake_server.received_text]
+    assert events == [
+        "start", "end_of_utterance", "reset", "end_of_utterance", "reset", "stop",
+    ]
+    assert REGISTRY.get_sample_value(
+        "vocalize_stt_handshakes_avoided_total"
+    ) == avoided_before + 1
+
+
+async def test_stream_abandoned_turn_does_not_leak_into_next(
+    fake_server: FakeServer,
+) -> None:
+    """调用方拿到首个 final 就 aclose（user channel 的用法），同一轮后续到达的
+    final 不能被下一轮读到。"""
+    fake_server.script = [_final("要的", 0), _final("残余", 0)]
+    fake_server.finals_on_eou = [_final("下一轮", 1)]
+    stream = SenseVoiceStream(
+        SenseVoiceClient(host="127.0.0.1", port=fake_server.port),
+    )
+
+    async def endless_audio() -> AsyncIterator[bytes]:
+        while True:
+            await asyncio.sleep(0.01)
+            yield b"\x00" * 320
+
+    try:
+        lease = stream.stream_transcribe(endless_audio())
+        got = await lease.__anext__()
+        await lease.aclose()
+        await asyncio.sleep(0.05)  # 让 "残余" 和 reset_ack 都到达
+        nxt = [t async for t in stream.stream_transcribe(_audio_iter([b"\x00" * 320]))]
+    finally:
+        await stream.aclose()
+
+    assert got.text == "要的"
+    assert [t.text for t in nxt] == ["下一轮"]
+    assert fake_server.connections == 1
+
+
+async def test_stream_reconnects_when_server_drops_mid_turn(
+    fake_server: FakeServer,
+) -> None:
+    fake_server.drop_first_after_audio = 2
+    fake_server.finals_on_eou = [_final("重连后", 0)]
+    stream = SenseVoiceClient(
+        host="127.0.0.1", port=fake_server.port,
+    ).open_stream(max_reconnects=1)
+
+    try:
+        out = [
+            t async for t in stream.stream_transcribe(
+                _audio_iter([b"\x00" * 320] * 6, delay=0.02),
+            )
+        ]
+    finally:
+        await stream.aclose()
+
+    assert [t.text for t in out] == ["重连后"]
+    assert fake_server.connections == 2
+    events = [m.get("event") for m in fake_server.received_text]
+    assert events.count("start") == 2
+
+
+async def test_stream_gives_up_after_max_reconnects() -> None:
+    async def handler(ws):  # type: ignore[no-untyped-def]
+        await ws.close(code=1011, reason="boom")
+
+    server = await serve(handler, "127.0.0.1", 0)
+    try:
+        port = server.sockets[0].getsockname()[1]
+        stream = SenseVoiceClient(host="127.0.0.1", port=port).open_stream(
+            max_reconnects=1,
+        )
+        with pytest.raises(SenseVoiceError):
+            async for _ in stream.stream_transcribe(
+                _audio_iter([b"\x00" * 320] * 20, delay=0.02),
+            ):
+                pass
+        await stream.aclose()
+    finally:
+        server.close()
+        await server.wait_closed()
@@ -344,3 +344,26 @@ async def test_web_vad_eos_fires_callback_after_silence(
     assert transport._vad_state == "NOTTRIGGERED"
     assert transport.pop_speech_end_ts() is not None
     assert transport.pop_speech_end_ts() is None
+
+
+async def test_web_vad_speech_active_follows_each_yielded_block(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    transport = WebUserTransport(
+        inbound_queue=asyncio.Queue(),
+        outbound_send=_noop_send,
+    )
+    voiced_pattern = [False] * 3 + [True] * 10 + [False] * 12
+
+    def fake_is_speech(audio: bytes, sample_rate: int) -> bool:
+        return voiced_pattern.pop(0)
+
+    monkeypatch.setattr(transport._vad, "is_speech", fake_is_speech)
+    for _ in range(25):
+        transport.push_inbound(b"\x01" * 960)
+    await transport.close()
+
+    seen = [transport.speech_active async for _ in transport.input_stream()]
+
+    # 起音第一帧即为 True；触发 EOS 的那一帧起清空环，之后的静音为 False
+    assert seen == [False] * 3 + [True] * 18 + [False] * 4
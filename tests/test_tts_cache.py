@@ -0,0 +1,263 @@
+"""``vocalize.tts.cache`` 短语缓存测试。
+
+用脚本化的假 TTS（记录每次收到的 chunk），覆盖：
+
+- 白名单整句：第一次合成并写入，第二次从内存层命中、内层不再被调用
+- LLM 式流式输入（首个 chunk 非 final）/ 不在白名单的整句（哪怕很短）直接透传、不缓存
+- 被打断（aclose）的合成不入缓存
+- 磁盘层跨实例（进程重启）可用，读盘在线程池里，命中后提升到内存层
+- 两级都按字节上限做 LRU 淘汰
+- key 随音色 / 语速变化
+"""
+from __future__ import annotations
+
+import threading
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+
+import pytest
+from prometheus_client import REGISTRY
+
+from vocalize.config import Config
+from vocalize.pipeline import _fallback_chunk
+from vocalize.tts.base import TextChunk
+from vocalize.tts.cache import (
+    CachingTTS,
+    PhraseCache,
+    get_phrase_cache,
+    wrap_with_cache,
+)
+from vocalize.tts.warmup import static_phrases
+
+
+@dataclass
+class _FakeTTS:
+    output_sample_rate: int = 8_000
+    output_encoding: str = "pcm_s16le"
+    speed: float = 1.0
+    prompt_wav: str | None = None
+    prompt_text: str | None = None
+    calls: list[list[TextChunk]] = field(default_factory=list)
+
+    async def stream_synthesize(
+        self, text_chunks: AsyncIterator[TextChunk]
+    ) -> AsyncIterator[bytes]:
+        seen: list[TextChunk] = []
+        self.calls.append(seen)
+        async for chunk in text_chunks:
+            seen.append(chunk)
+            # 每个字 400 字节（25 ms @ 8 kHz），分两块推
+            audio = chunk.text.encode("utf-8").ljust(400 * len(chunk.text), b"\x01")
+            half = len(audio) // 2
+            yield audio[:half]
+            yield audio[half:]
+
+    async def health_check(self) -> bool:
+        return True
+
+
+async def _one(text: str, *, final: bool = True) -> AsyncIterator[TextChunk]:
+    yield TextChunk(text=text, language="zh", is_final_segment=final)
+
+
+def _allow(*texts: str) -> list[TextChunk]:
+    return [TextChunk(text=t, language="zh", is_final_segment=True) for t in texts]
+
+
+async def _collect(tts: CachingTTS, chunks: AsyncIterator[TextChunk]) -> list[bytes]:
+    return [audio async for audio in tts.stream_synthesize(chunks)]
+
+
+def _hits(tier: str) -> float:
+    return REGISTRY.get_sample_value(
+        "vocalize_tts_cache_hits_total", {"tier": tier}
+    ) or 0.0
+
+
+def _misses() -> float:
+    return REGISTRY.get_sample_value("vocalize_tts_cache_misses_total") or 0.0
+
+
+async def test_fixed_phrase_is_synthesized_once_then_served_from_memory() -> None:
+    inner = _FakeTTS()
+    tts = CachingTTS(
+        inner, PhraseCache(memory_max_bytes=1 << 20), phrases=_allow("请稍等"), chunk_ms=100,
+    )
+    hits, misses = _hits("memory"), _misses()
+
+    first = await _collect(tts, _one("请稍等"))
+    second = await _collect(tts, _one("请稍等"))
+
+    assert len(inner.calls) == 1
+    assert b"".join(second) == b"".join(first)
+    # 命中时按 chunk_ms 切片：100 ms @ 8 kHz int16 = 1600 字节
+    assert [len(c) for c in second] == [1200]
+    assert _misses() == misses + 1
+    assert _hits("memory") == hits + 1
+    # 透传的属性
+    assert tts.output_sample_rate == 8_000
+    assert await tts.health_check() is True
+
+
+async def test_streaming_and_dynamic_text_bypass_the_cache() -> None:
+    inner = _FakeTTS()
+    tts = CachingTTS(inner, PhraseCache(memory_max_bytes=1 << 20), phrases=_allow("请稍等"))
+
+    async def llm_like() -> AsyncIterator[TextChunk]:
+        yield TextChunk(text="好的，", is_final_segment=False)
+        yield TextChunk(text="马上", is_final_segment=True)
+
+    for _ in range(2):
+        await _collect(tts, llm_like())
+        # 短也不行：LLM 回复 / relay 译文可能带个人信息
+        await _collect(tts, _one("尾号1234"))
+
+    assert len(inner.calls) == 4
+    assert [c.text for c in inner.calls[0]] == ["好的，", "马上"]
+    assert not tts.cache._memory
+
+
+async def test_chunks_after_a_cached_phrase_are_still_synthesized() -> None:
+    inner = _FakeTTS()
+    tts = CachingTTS(
+        inner, PhraseCache(memory_max_bytes=1 << 20), phrases=_allow("你好", "再见"),
+    )
+    await _collect(tts, _one("你好"))
+
+    async def phrase_then_more() -> AsyncIterator[TextChunk]:
+        yield TextChunk(text="你好", is_final_segment=True)
+        yield TextChunk(text="再见", is_final_segment=True)
+
+    audio = b"".join(await _collect(tts, phrase_then_more()))
+
+    assert [[c.text for c in call] for call in inner.calls] == [["你好"], ["再见"]]
+    assert audio.startswith("你好".encode())
+    assert "再见".encode() in audio
+
+
+async def test_interrupted_synthesis_is_not_cached() -> None:
+    inner = _FakeTTS()
+    tts = CachingTTS(inner, PhraseCache(memory_max_bytes=1 << 20), phrases=_allow("请稍等"))
+
+    gen = tts.stream_synthesize(_one("请稍等"))
+    await anext(gen)
+    await gen.aclose()  # barge-in
+    await _collect(tts, _one("请稍等"))
+
+    assert len(inner.calls) == 2
+
+
+async def test_disk_tier_survives_restart_and_promotes_to_memory(
+    tmp_path, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    inner = _FakeTTS()
+    phrases = _allow("请稍等")
+    cache = PhraseCache(memory_max_bytes=1 << 20, disk_dir=tmp_path, disk_max_bytes=1 << 20)
+    expected = b"".join(
+        await _collect(CachingTTS(inner, cache, phrases=phrases), _one("请稍等"))
+    )
+    assert len(list(tmp_path.glob("*.pcm"))) == 1
+
+    restarted = PhraseCache(
+        memory_max_bytes=1 << 20, disk_dir=tmp_path, disk_max_bytes=1 << 20
+    )
+    tts = CachingTTS(inner, restarted, phrases=phrases)
+    disk_hits, memory_hits = _hits("disk"), _hits("memory")
+    loop_thread = threading.get_ident()
+    read_threads: list[int] = []
+    disk_get = restarted._disk_get
+
+    def tracking_disk_get(key: str):
+        read_threads.append(threading.get_ident())
+        return disk_get(key)
+
+    monkeypatch.setattr(restarted, "_disk_get", tracking_disk_get)
+
+    assert b"".join(await _collect(tts, _one("请稍等"))) == expected
+    assert b"".join(await _collect(tts, _one("请稍等"))) == expected
+    assert len(inner.calls) == 1
+    assert _hits("disk") == disk_hits + 1
+    assert _hits("memory") == memory_hits + 1
+    # open / mmap / utime 不在 event loop 线程上做
+    assert read_threads and loop_thread not in read_threads
+
+
+async def test_unusable_disk_dir_falls_back_to_memory(tmp_path) -> None:
+    not_a_dir = tmp_path / "file"
+    not_a_dir.write_bytes(b"")
+    inner = _FakeTTS()
+    cache = PhraseCache(
+        memory_max_bytes=1 << 20, disk_dir=not_a_dir / "tts", disk_max_bytes=1 << 20
+    )
+    tts = CachingTTS(inner, cache, phrases=_allow("请稍等"))
+
+    assert await cache.get("k") is None
+    assert cache.disk_dir is None  # 磁盘层关掉，不再每次重试
+    first = await _collect(tts, _one("请稍等"))
+    assert first and await _collect(tts, _one("请稍等")) == [b"".join(first)]
+    assert len(inner.calls) == 1  # 内存层照常命中
+
+
+def test_disk_write_failure_disables_disk_tier(tmp_path) -> None:
+    disk = tmp_path / "tts"
+    cache = PhraseCache(memory_max_bytes=0, disk_dir=disk, disk_max_bytes=1 << 20)
+    assert not cache.contains("k")  # 目录建好、索引为空
+    disk.rmdir()
+    disk.write_bytes(b"")  # 运行中目录被换成了文件
+
+    cache.put_disk("k", b"\x00" * 10)
+
+    assert cache.disk_dir is None
+    assert not cache.contains("k")
+
+
+async def test_both_tiers_evict_least_recently_used(tmp_path) -> None:
+    inner = _FakeTTS()
+    # 每条 2 个字 = 800 字节；两级都只放得下两条
+    cache = PhraseCache(memory_max_bytes=1_600, disk_dir=tmp_path, disk_max_bytes=1_600)
+    tts = CachingTTS(inner, cache, phrases=_allow("一一", "二二", "三三"))
+    await _collect(tts, _one("一一"))
+    await _collect(tts, _one("二二"))
+    await _collect(tts, _one("一一"))  # 刷新"一一"的最近使用
+    await _collect(tts, _one("三三"))
+
+    assert len(cache._memory) == 2
+    assert tts.cache_key(TextChunk("二二", is_final_segment=True)) not in cache._memory
+    assert len(list(tmp_path.glob("*.pcm"))) == 2
+    assert REGISTRY.get_sample_value(
+        "vocalize_tts_cache_bytes", {"tier": "memory"}
+    ) == 1_600
+
+    calls = len(inner.calls)
+    await _collect(tts, _one("一一"))
+    assert len(inner.calls) == calls
+
+
+def test_key_changes_with_voice_and_speed() -> None:
+    cache = PhraseCache(memory_max_bytes=1 << 20)
+    chunk = TextChunk("请稍等", is_final_segment=True)
+    base = CachingTTS(_FakeTTS(), cache).cache_key(chunk)
+
+    assert CachingTTS(_FakeTTS(speed=1.2), cache).cache_key(chunk) != base
+    assert CachingTTS(
+        _FakeTTS(prompt_wav="a.wav", prompt_text="a"), cache
+    ).cache_key(chunk) != base
+    assert CachingTTS(_FakeTTS(), cache).cache_key(
+        TextChunk("请稍等", language="en", is_final_segment=True)
+    ) != base
+
+
+def test_wrap_with_cache_shares_one_cache_and_can_be_disabled(tmp_path) -> None:
+    cfg = Config(tts_cache_dir=str(tmp_path))
+    a = wrap_with_cache(_FakeTTS(), cfg)
+    b = wrap_with_cache(_FakeTTS(), cfg)
+    assert isinstance(a, CachingTTS) and isinstance(b, CachingTTS)
+    assert a.cache is b.cache is get_phrase_cache(cfg)
+    # 白名单 = 静态台词 + 兜底道歉
+    assert a._cacheable(_fallback_chunk("zh")) and a._cacheable(_fallback_chunk("en"))
+    assert all(a._cacheable(p) for p in static_phrases())
+    assert not a._cacheable(TextChunk("张三，电话 13800000000", is_final_segment=True))
+
+    off = Config(tts_cache_memory_mb=0, tts_cache_disk_mb=0)
+    inner = _FakeTTS()
+    assert wrap_with_cache(inner, off) is inner
@@ -8,6 +8,7 @@ error），覆盖：
 - 多个 text 帧 + 最后一个 is_final_segment 完整 forward
 - 二进制 PCM 帧按顺序透传
 - audio_start.sample_rate 覆盖 client.output_sample_rate
+- 输出格式协商（start 帧 sample_rate / encoding），G.711 输出原样透传
 - 非 fatal error 不中断流；fatal error → CosyVoiceError
 - caller break / aclose() → server 收到 stop
 - health_check 在健康/故障时分别返回 True/False
@@ -20,6 +21,7 @@ import json
 from collections.abc import AsyncIterator
 from typing import Any
 
+import numpy as np
 import pytest
 import websockets
 from websockets.asyncio.server import ServerConnection, serve
@@ -128,6 +130,8 @@ async def test_start_frame_fields(fake_server: FakeServer) -> None:
     assert start["prompt_wav"] == "/tmp/x.wav"
     assert start["prompt_text"] == "hi"
     assert start["session_id"] == "sess-99"
+    assert start["sample_rate"] == 24000
+    assert "encoding" not in start
 
 
 async def test_multiple_text_frames_with_final_flush(
@@ -171,6 +175,98 @@ async def test_pcm_bytes_pass_through_in_order(fake_server: FakeServer) -> None:
     assert out == blocks
 
 
+async def test_mulaw_link_encoding_is_requested_and_decoded(
+    fake_server: FakeServer, caplog: pytest.LogCaptureFixture,
+) -> None:
+    from vocalize import codec
+
+    pcm = bytes(range(256)) * 4
+    fake_server.audio_start = {
+        "event": "audio_start", "sample_rate": 24000,
+        "encoding": "mulaw", "channels": 1, "utterance_id": 0,
+        "mode": "zero_shot",
+    }
+    fake_server.per_text_script = [[codec.encode("mulaw", pcm)]]
+    client = CosyVoiceClient(
+        host="127.0.0.1", port=fake_server.port, link_encoding="mulaw",
+    )
+    with caplog.at_level("WARNING", logger="vocalize.tts.cosyvoice"):
+        out = [b async for b in client.stream_synthesize(_text_iter([
+            TextChunk(text="x", language="zh", is_final_segment=True),
+        ]))]
+
+    assert fake_server.received_text[0]["encoding"] == "mulaw"
+    # transport 拿到的仍是 PCM int16（长度恢复，值为 μ-law 量化后）
+    assert out == [codec.decode("mulaw", codec.encode("mulaw", pcm))]
+    assert not caplog.records
+
+
+async def test_mulaw_request_falls_back_to_pcm_from_old_server(
+    fake_server: FakeServer,
+) -> None:
+    fake_server.audio_start = {
+        "event": "audio_start", "sample_rate": 24000,
+        "encoding": "pcm_s16le", "channels": 1, "utterance_id": 0,
+        "mode": "zero_shot",
+    }
+    fake_server.per_text_script = [[b"\x01\x02" * 8]]
+    client = CosyVoiceClient(
+        host="127.0.0.1", port=fake_server.port, link_encoding="mulaw",
+    )
+    out = [b async for b in client.stream_synthesize(_text_iter([
+        TextChunk(text="x", language="zh", is_final_segment=True),
+    ]))]
+    assert out == [b"\x01\x02" * 8]
+
+
+async def test_telephony_output_format_is_negotiated_and_passed_through(
+    fake_server: FakeServer, caplog: pytest.LogCaptureFixture,
+) -> None:
+    wire = bytes(range(256)) * 2
+    fake_server.audio_start = {
+        "event": "audio_start", "sample_rate": 8000,
+        "encoding": "alaw", "channels": 1, "utterance_id": 0,
+        "mode": "zero_shot",
+    }
+    fake_server.per_text_script = [[wire]]
+    client = CosyVoiceClient(
+        host="127.0.0.1", port=fake_server.port,
+        output_sample_rate=8000, output_encoding="alaw", link_encoding="mulaw",
+    )
+    with caplog.at_level("WARNING", logger="vocalize.tts.cosyvoice"):
+        out = [b async for b in client.stream_synthesize(_text_iter([
+            TextChunk(text="x", language="zh", is_final_segment=True),
+        ]))]
+
+    start = fake_server.received_text[0]
+    assert start["sample_rate"] == 8000
+    assert start["encoding"] == "alaw"
+    # 服务端已编好：字节原样交给 transport，不在编排器侧转码
+    assert out == [wire]
+    assert not caplog.records
+
+
+async def test_g711_output_is_encoded_locally_for_old_pcm_server(
+    fake_server: FakeServer,
+) -> None:
+    from vocalize import codec
+
+    pcm = np.array([0, 1000, -1000, 32767], dtype="<i2").tobytes()
+    fake_server.audio_start = {
+        "event": "audio_start", "sample_rate": 24000,
+        "encoding": "pcm_s16le", "channels": 1, "utterance_id": 0,
+        "mode": "zero_shot",
+    }
+    fake_server.per_text_script = [[pcm]]
+    client = CosyVoiceClient(
+        host="127.0.0.1", port=fake_server.port, output_encoding="mulaw",
+    )
+    out = [b async for b in client.stream_synthesize(_text_iter([
+        TextChunk(text="x", language="zh", is_final_segment=True),
+    ]))]
+    assert out == [codec.encode("mulaw", pcm)]
+
+
 async def test_audio_start_mismatch_logs_warning_no_mutation(
     fake_server: FakeServer, caplog: pytest.LogCaptureFixture,
 ) -> None:
@@ -386,6 +482,16 @@ def test_post_init_rejects_prompt_wav_without_text() -> None:
         CosyVoiceClient(host="x", prompt_wav="/tmp/x.wav", prompt_text=None)
 
 
+def test_post_init_rejects_unknown_link_encoding() -> None:
+    with pytest.raises(CosyVoiceError, match="link_encoding"):
+        CosyVoiceClient(host="x", link_encoding="opus")
+
+
+def test_post_init_rejects_unknown_output_encoding() -> None:
+    with pytest.raises(CosyVoiceError, match="output_encoding"):
+        CosyVoiceClient(host="x", output_encoding="opus")
+
+
 async def test_from_app_config_missing_gpu_host() -> None:
     from vocalize.config import Config
     cfg = Config(gpu_host="")
@@ -401,3 +507,162 @@ async def test_from_app_config_ok() -> None:
     assert client.host == "example.test"
     assert client.port == 9000
     assert client.default_language == "en"
+
+
+# ---------------------------------------------------------------------------
+# CosyVoiceSession：一条 WS 合成多句
+# ---------------------------------------------------------------------------
+class SessionServer:
+    """按多句协议行为的假服务端：每句首个 text 帧分配 utterance_id，句末排队串行
+    "合成"（``chunks`` 块、每块内容 = id 字节），支持 ``cancel``。"""
+
+    def __init__(self, *, chunks: int = 3, delay_s: float = 0.0) -> None:
+        self.chunks = chunks
+        self.delay_s = delay_s
+        self.handshakes = 0
+        self.received: list[dict] = []
+        self.live: list[ServerConnection] = []
+        self._server: Any = None
+        self.port = 0
+
+    async def start(self) -> None:
+        self._server = await serve(self._handler, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handler(self, ws: ServerConnection) -> None:
+        self.handshakes += 1
+        self.live.append(ws)
+        jobs: asyncio.Queue[int | None] = asyncio.Queue()
+        cancelled: set[int] = set()
+        pending: set[int] = set()
+        next_id = 0
+        open_id: int | None = None
+
+        async def worker() -> None:
+            while (uid := await jobs.get()) is not None:
+                if uid not in cancelled:
+                    await ws.send(json.dumps({"event": "audio_start", "utterance_id": uid}))
+                    for _ in range(self.chunks):
+                        await asyncio.sleep(self.delay_s)
+                        if uid in cancelled:
+                            break
+                        await ws.send(bytes([uid]) * 4)
+                end: dict[str, Any] = {"event": "audio_end", "utterance_id": uid}
+                if uid in cancelled:
+                    end["cancelled"] = True
+                await ws.send(json.dumps(end))
+                pending.discard(uid)
+
+        task = asyncio.create_task(worker())
+        try:
+            async for raw in ws:
+                msg = json.loads(raw)
+                self.received.append(msg)
+                if msg["event"] == "text":
+                    if open_id is None:
+                        open_id, next_id = next_id, next_id + 1
+                        pending.add(open_id)
+                        await jobs.put(open_id)
+                    if msg["is_final_segment"]:
+                        open_id = None
+                elif msg["event"] == "cancel":
+                    cancelled.update(pending)
+                    open_id = None
+                elif msg["event"] == "stop":
+                    break
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            await jobs.put(None)
+            with contextlib.suppress(Exception):
+                await task
+
+
+@pytest.fixture
+async def session_server() -> AsyncIterator[SessionServer]:
+    srv = SessionServer()
+    await srv.start()
+    try:
+        yield srv
+    finally:
+        await srv.stop()
+
+
+def _final(text: str) -> TextChunk:
+    return TextChunk(text=text, is_final_segment=True)
+
+
+async def test_session_reuses_one_connection_across_utterances(
+    session_server: SessionServer,
+) -> None:
+    session = CosyVoiceClient(host="127.0.0.1", port=session_server.port).open_session()
+
+    first = [b async for b in session.stream_synthesize(_text_iter([_final("一")]))]
+    # 一段里两句：流式分句 + 句末，再一个整句
+    second = [b async for b in session.stream_synthesize(_text_iter([
+        TextChunk(text="二", is_final_segment=False),
+        _final("二"),
+        _final("三"),
+    ]))]
+    await session.aclose()
+
+    assert first == [b"\x00" * 4] * 3
+    assert second == [b"\x01" * 4] * 3 + [b"\x02" * 4] * 3
+    assert session_server.handshakes == 1
+    assert [m["event"] for m in session_server.received].count("start") == 1
+    assert session_server.received[-1] == {"event": "stop"}
+
+
+async def test_session_closes_a_trailing_open_utterance(
+    session_server: SessionServer,
+) -> None:
+    session = CosyVoiceClient(host="127.0.0.1", port=session_server.port).open_session()
+
+    out = [b async for b in session.stream_synthesize(_text_iter([
+        TextChunk(text="没有句末", is_final_segment=False),
+    ]))]
+    await session.aclose()
+
+    assert out == [b"\x00" * 4] * 3
+    texts = [m for m in session_server.received if m["event"] == "text"]
+    assert texts[-1]["text"] == "" and texts[-1]["is_final_segment"] is True
+
+
+async def test_session_barge_in_cancels_only_the_current_utterance() -> None:
+    srv = SessionServer(chunks=20, delay_s=0.01)
+    await srv.start()
+    try:
+        session = CosyVoiceClient(host="127.0.0.1", port=srv.port).open_session()
+        gen = session.stream_synthesize(_text_iter([_final("很长的一句")]))
+        assert await anext(gen) == b"\x00" * 4
+        await gen.aclose()  # barge-in
+
+        nxt = [b async for b in session.stream_synthesize(_text_iter([_final("下一句")]))]
+        await session.aclose()
+    finally:
+        await srv.stop()
+
+    assert {"event": "cancel"} in srv.received
+    # 被取消那句的残余帧不会混进下一句
+    assert nxt == [b"\x01" * 4] * 20
+    assert srv.handshakes == 1
+
+
+async def test_session_reconnects_after_connection_drops_between_utterances(
+    session_server: SessionServer,
+) -> None:
+    session = CosyVoiceClient(host="127.0.0.1", port=session_server.port).open_session()
+    assert [b async for b in session.stream_synthesize(_text_iter([_final("一")]))]
+
+    await session_server.live[0].close()
+    await asyncio.sleep(0.05)
+    out = [b async for b in session.stream_synthesize(_text_iter([_final("二")]))]
+    await session.aclose()
+
+    # 新连接 = 新服务端会话，id 从 0 重新计数
+    assert out == [b"\x00" * 4] * 3
+    assert session_server.handshakes == 2
@@ -0,0 +1,104 @@
+"""``vocalize.tts.warmup`` 启动预热测试。
+
+用脚本化的假 TTS：覆盖静态台词枚举、有界并发、已缓存条目跳过、失败重试，
+以及预热结果与运行时 ``_one_chunk()`` 播报命中同一条缓存。
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+from vocalize.dialogue.prompts import load_prompt
+from vocalize.tts.base import TextChunk
+from vocalize.tts.cache import CachingTTS, PhraseCache
+from vocalize.tts.warmup import PhraseWarmup, static_phrases
+
+
+class _FakeTTS:
+    output_sample_rate = 8_000
+    output_encoding = "pcm_s16le"
+
+    def __init__(self, *, fail_first: int = 0) -> None:
+        self.texts: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._fail_first = fail_first
+
+    async def stream_synthesize(
+        self, text_chunks: AsyncIterator[TextChunk]
+    ) -> AsyncIterator[bytes]:
+        async for chunk in text_chunks:
+            self.texts.append(chunk.text)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(0.01)
+                if self._fail_first > 0:
+                    self._fail_first -= 1
+                    raise RuntimeError("gpu not up yet")
+                yield b"\x01\x00" * 100
+            finally:
+                self.in_flight -= 1
+
+
+def test_static_phrases_cover_spoken_prompts_in_both_languages() -> None:
+    phrases = static_phrases()
+
+    assert len(phrases) == 6
+    assert {p.language for p in phrases} == {"zh", "en"}
+    assert all(p.is_final_segment for p in phrases)
+    assert TextChunk(
+        text=load_prompt("hold_filler_zh").strip(), language="zh", is_final_segment=True
+    ) in phrases
+
+
+async def test_warmup_fills_cache_with_bounded_concurrency() -> None:
+    inner = _FakeTTS()
+    tts = CachingTTS(inner, PhraseCache(memory_max_bytes=1 << 20), phrases=static_phrases())
+    warmup = PhraseWarmup(tts, concurrency=2)
+    assert warmup.status() == {"ready": False, "warm": 0, "total": 6, "failed": 0}
+
+    await warmup.run()
+
+    assert warmup.status() == {"ready": True, "warm": 6, "total": 6, "failed": 0}
+    assert inner.max_in_flight == 2
+    # 运行时的整句播报直接命中，不再合成
+    line = load_prompt("clarification_keepalive_en").strip()
+
+    async def _one_chunk() -> AsyncIterator[TextChunk]:
+        yield TextChunk(text=line, language="en", is_final_segment=True)
+
+    calls = len(inner.texts)
+    assert [a async for a in tts.stream_synthesize(_one_chunk())]
+    assert len(inner.texts) == calls
+
+
+async def test_warmup_skips_cached_and_retries_failures() -> None:
+    inner = _FakeTTS(fail_first=2)
+    tts = CachingTTS(inner, PhraseCache(memory_max_bytes=1 << 20), phrases=static_phrases())
+    phrases = static_phrases()
+    tts.cache.put_memory(tts.cache_key(phrases[0]), b"\x00\x00" * 50)
+    warmup = PhraseWarmup(tts, concurrency=1, retry_delay_s=0.0)
+
+    await warmup.run()
+
+    assert warmup.status() == {"ready": True, "warm": 6, "total": 6, "failed": 0}
+    assert phrases[0].text not in inner.texts
+    # 5 条要合成，其中 2 条第一轮失败、第二轮补上
+    assert len(inner.texts) == 7
+
+
+async def test_warmup_survives_unusable_disk_dir(tmp_path) -> None:
+    not_a_dir = tmp_path / "file"
+    not_a_dir.write_bytes(b"")
+    cache = PhraseCache(
+        memory_max_bytes=1 << 20, disk_dir=not_a_dir / "tts", disk_max_bytes=1 << 20
+    )
+    warmup = PhraseWarmup(
+        CachingTTS(_FakeTTS(), cache, phrases=static_phrases()), concurrency=2
+    )
+
+    await warmup.run()
+
+    assert warmup.status() == {"ready": True, "warm": 6, "total": 6, "failed": 0}
+    assert cache.disk_dir is None
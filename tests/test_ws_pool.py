@@ -0,0 +1,208 @@
+"""``vocalize.ws_pool`` 预连接池测试。
+
+起一个真实的 ``websockets`` server（只 accept、不说话），覆盖：
+
+- prewarm 后 acquire 命中空闲连接，不再新握手；借出后后台补齐
+- 池空时 acquire 直接现建（miss），语义与直连一致
+- 服务端已关闭的空闲连接借出前被丢弃
+- 超出 min_idle 的空闲连接按 idle_timeout 淘汰
+- client 配了 ``pool`` 时 ``_connect`` 从池借连接
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+import websockets
+from prometheus_client import REGISTRY
+from websockets.asyncio.server import ServerConnection, serve
+
+from vocalize.ws_pool import WsPool, _IdleConn, close_all_pools, get_pool
+
+
+class _AcceptServer:
+    def __init__(self) -> None:
+        self.handshakes = 0
+        self.live: list[ServerConnection] = []
+        self._server = None
+        self.port = 0
+
+    async def start(self) -> None:
+        self._server = await serve(self._handler, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handler(self, ws: ServerConnection) -> None:
+        self.handshakes += 1
+        self.live.append(ws)
+        try:
+            async for _ in ws:
+                pass
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self.port}/ws/transcribe"
+
+
+@pytest.fixture
+async def accept_server() -> AsyncIterator[_AcceptServer]:
+    srv = _AcceptServer()
+    await srv.start()
+    try:
+        yield srv
+    finally:
+        await close_all_pools()
+        await srv.stop()
+
+
+def _sample(name: str, service: str) -> float:
+    return REGISTRY.get_sample_value(name, {"service": service}) or 0.0
+
+
+async def _wait_for(pred, timeout: float = 2.0) -> None:  # type: ignore[no-untyped-def]
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not pred():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not reached in time")
+        await asyncio.sleep(0.01)
+
+
+async def test_acquire_hits_prewarmed_connection_and_refills(
+    accept_server: _AcceptServer,
+) -> None:
+    pool = WsPool(accept_server.url, service="test-hit", min_idle=1, max_size=2)
+    await pool.prewarm()
+    assert pool.idle_count == 1
+    assert accept_server.handshakes == 1
+
+    ws = await pool.acquire()
+    assert _sample("vocalize_gpu_ws_pool_hits_total", "test-hit") == 1
+    assert accept_server.handshakes == 1  # 借出的是预热好的那条
+    await ws.send("ping")
+
+    # 借出后后台补齐；一次借出使目标空闲数仍为 1
+    await _wait_for(lambda: pool.idle_count == 1)
+    assert accept_server.handshakes == 2
+    await ws.close()
+    await pool.close()
+
+
+async def test_acquire_on_empty_pool_opens_directly(
+    accept_server: _AcceptServer,
+) -> None:
+    pool = WsPool(accept_server.url, service="test-miss", min_idle=0, max_size=1)
+    ws = await pool.acquire()
+    assert _sample("vocalize_gpu_ws_pool_misses_total", "test-miss") == 1
+    assert accept_server.handshakes == 1
+    assert pool.idle_count == 0  # min_idle=0：不预热
+    await ws.close()
+    await pool.close()
+
+
+async def test_dead_idle_connection_is_discarded(
+    accept_server: _AcceptServer,
+) -> None:
+    pool = WsPool(
+        accept_server.url, service="test-dead", min_idle=1, max_size=1,
+        maintenance_interval_s=60.0,
+    )
+    await pool.prewarm()
+    # 服务端把预热好的连接关掉（比如 GPU 服务重启）
+    await accept_server.live[0].close()
+    await asyncio.sleep(0.05)
+
+    ws = await pool.acquire()
+    await ws.send("still works")
+    assert _sample("vocalize_gpu_ws_pool_misses_total", "test-dead") == 1
+    assert REGISTRY.get_sample_value(
+        "vocalize_gpu_ws_pool_evictions_total",
+        {"service": "test-dead", "reason": "dead"},
+    ) == 1
+    await ws.close()
+    await pool.close()
+
+
+async def test_excess_idle_connections_are_evicted(
+    accept_server: _AcceptServer,
+) -> None:
+    pool = WsPool(
+        accept_server.url, service="test-idle", min_idle=1, max_size=3,
+        idle_timeout_s=0.05, maintenance_interval_s=60.0,
+    )
+    await pool.prewarm()
+    # 模拟突发需求留下的两条多余空闲连接（早已过了 idle_timeout）
+    for _ in range(2):
+        ws = await pool._open()
+        pool._idle.append(_IdleConn(ws=ws, idle_since=0.0))
+    assert pool.idle_count == 3
+
+    pool._sweep()
+    assert pool.idle_count == 1
+    assert REGISTRY.get_sample_value(
+        "vocalize_gpu_ws_pool_evictions_total",
+        {"service": "test-idle", "reason": "idle"},
+    ) == 2
+    await pool.close()
+
+
+async def test_get_pool_is_shared_per_url(accept_server: _AcceptServer) -> None:
+    a = get_pool(accept_server.url, service="sensevoice", min_idle=0)
+    b = get_pool(accept_server.url, service="sensevoice", min_idle=1)
+    assert a is b
+    await close_all_pools()
+    assert get_pool(accept_server.url, service="sensevoice") is not a
+
+
+async def test_clients_borrow_from_pool(accept_server: _AcceptServer) -> None:
+    from vocalize.stt.sensevoice import SenseVoiceClient
+
+    pool = WsPool(accept_server.url, service="test-client", min_idle=1, max_size=1)
+    await pool.prewarm()
+    client = SenseVoiceClient(host="127.0.0.1", port=accept_server.port, pool=pool)
+    ws = await client._connect()
+    assert _sample("vocalize_gpu_ws_pool_hits_total", "test-client") == 1
+    assert accept_server.handshakes == 1
+    await ws.close()
+    await pool.close()
+
+
+async def test_evicted_connections_are_closed_by_tracked_tasks(
+    accept_server: _AcceptServer,
+) -> None:
+    pool = WsPool(
+        accept_server.url, service="test-closing", min_idle=0, max_size=2,
+        idle_timeout_s=0.0,
+    )
+    ws = await pool._open()
+    pool._idle.append(_IdleConn(ws=ws, idle_since=0.0))
+
+    pool._sweep()
+    assert len(pool._closing) == 1  # 关连接的任务有引用，不会被 GC 回收
+    await pool.close()
+    assert not pool._closing
+    assert ws.state is websockets.protocol.State.CLOSED
+
+
+async def test_config_caps_each_pool_below_the_gpu_admission_limit(
+    accept_server: _AcceptServer,
+) -> None:
+    from vocalize.config import Config
+
+    cfg = Config()
+    stt = cfg.gpu_ws_pool(accept_server.url, service="sensevoice")
+    tts = cfg.gpu_ws_pool(accept_server.url + "?tts", service="cosyvoice")
+    assert stt is not None and tts is not None
+    # 服务端默认上限：SenseVoice 4*2、CosyVoice 2*2；空闲连接要给通话留名额
+    assert stt.max_size < 8 and tts.max_size < 4
+    assert stt.max_size != tts.max_size
+    assert Config(gpu_ws_pool_max_size_cosyvoice=0).gpu_ws_pool(
+        accept_server.url + "?off", service="cosyvoice"
+    ) is None
+    await close_all_pools()